@@ -43,7 +43,7 @@ try:
         PHASE_DIRS, OUTPUT_FILES, DQI_WEIGHTS, THRESHOLDS,
         RISK_COLORS, NUMERIC_ISSUE_COLUMNS, CLUSTERING_FEATURES
     )
-    from utils import get_risk_distribution, calculate_risk_rates
+    from utils import get_risk_distribution, calculate_risk_rates, read_table, table_exists, load_component_store
 except ImportError:
     # Fallback for standalone testing
     PHASE_DIRS = {'phase_03': Path('outputs/phase03')}
@@ -58,6 +58,12 @@ except ImportError:
         return df[col].value_counts().to_dict()
     def calculate_risk_rates(df, col):
         return {}
+    def read_table(path, columns=None):
+        return pd.read_csv(path, usecols=columns)
+    def table_exists(path):
+        return Path(path).exists()
+    def load_component_store(path=None, mmap=True):
+        return None
 
 # =============================================================================
 # PAGE CONFIG
@@ -314,11 +320,17 @@ def find_output_dir() -> Path:
         Path(__file__).parent.parent / "outputs",
     ]
     for p in candidates:
-        if (p / "phase03" / "master_subject_with_dqi.csv").exists():
+        if table_exists(p / "phase03" / "master_subject_with_dqi.csv"):
             return p
     return candidates[0]
 
 
+@st.cache_resource(ttl=300)
+def load_components():
+    """Open the memory-mapped DQI component store (None if Phase 03 did not write one)."""
+    return load_component_store(find_output_dir() / "phase03" / "dqi_components.npy")
+
+
 @st.cache_data(ttl=300)
 def load_all_data() -> dict:
     """Load ALL phase outputs."""
@@ -327,7 +339,7 @@ def load_all_data() -> dict:
 
     def load_csv(phase, filename):
         path = base / phase / filename
-        return pd.read_csv(path) if path.exists() else pd.DataFrame()
+        return read_table(path) if table_exists(path) else pd.DataFrame()
 
     def load_json(phase, filename):
         path = base / phase / filename
@@ -376,6 +388,9 @@ def load_all_data() -> dict:
     data['geographic_patterns'] = load_csv('phase09', 'geographic_patterns.csv')
     data['root_cause_summary'] = load_json('phase09', 'root_cause_summary.json')
 
+    # Validation: bootstrap confidence intervals (validation.py --bootstrap B)
+    data['bootstrap_ci'] = load_csv('validation', 'bootstrap_ci.csv')
+
     return data
 
 # =============================================================================
@@ -1369,6 +1384,88 @@ def page_action_center(data: dict):
 # PAGE 6: DEEP DIVE (ENHANCED)
 # =============================================================================
 
+def render_score_explanation(subjects: pd.DataFrame, filtered_subjects: pd.DataFrame):
+    """Per-feature breakdown of one subject's DQI score, read from the component store."""
+    store = load_components()
+    if store is None or not store.aligned_with(subjects):
+        return
+    scored = filtered_subjects[filtered_subjects['dqi_score'] > 0] if 'dqi_score' in filtered_subjects.columns \
+        else filtered_subjects
+    if scored.empty:
+        return
+
+    st.markdown("##### 🧮 Score Explanation")
+    candidates = scored.nlargest(100, 'dqi_score') if 'dqi_score' in scored.columns else scored.head(100)
+    labels = {idx: f"{row['subject_id']} ({row['study']}) - DQI {row.get('dqi_score', 0):.4f}"
+              for idx, row in candidates.iterrows()}
+    row = st.selectbox("Explain subject", list(labels), format_func=labels.get, key="dd_explain")
+
+    parts = store.explain(row)
+    if parts.empty:
+        st.caption("No feature contributes to this subject's score.")
+        return
+    parts = parts.sort_values('component')
+    fig = go.Figure(go.Bar(
+        y=[format_issue(f) for f in parts['feature']], x=parts['component'], orientation='h',
+        marker_color='#3b82f6',
+        text=[f"{s:.0%}" for s in parts['share']],
+        textposition='outside',
+        textfont=dict(color='#e2e8f0')
+    ))
+    fig.update_layout(
+        height=max(200, 40 * len(parts)), margin=dict(l=20,r=60,t=20,b=40),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e2e8f0'),
+        xaxis=dict(gridcolor='#334155', title='DQI Component'),
+        yaxis=dict(gridcolor='#334155')
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    top = parts.iloc[-1]
+    st.caption(f"{format_issue(top['feature'])} accounts for {top['share']:.0%} of this subject's DQI score "
+               f"(weight {top['weight']:.0%}).")
+
+
+def render_site_confidence(bootstrap_ci: pd.DataFrame, study: str, site: str = None):
+    """Bootstrap CIs of site DQI: error bars for a study's top sites, or a caption for one site."""
+    if bootstrap_ci.empty or 'metric' not in bootstrap_ci.columns:
+        return
+    study_ci = bootstrap_ci[(bootstrap_ci['level'] == 'site') & (bootstrap_ci['study'] == study)]
+    dqi_ci = study_ci[study_ci['metric'] == 'avg_dqi_score']
+    if dqi_ci.empty:
+        return
+    confidence = f"{dqi_ci['confidence'].iloc[0]:.0%}"
+
+    if site is not None:
+        site_ci = study_ci[study_ci['site_id'].astype(str) == str(site)].set_index('metric')
+        if 'avg_dqi_score' not in site_ci.index:
+            return
+        dqi, rank = site_ci.loc['avg_dqi_score'], site_ci.loc['rank'] if 'rank' in site_ci.index else None
+        text = f"{confidence} bootstrap CI: DQI {dqi['ci_low']:.4f} – {dqi['ci_high']:.4f}"
+        if rank is not None and pd.notna(rank['estimate']):
+            text += f" · portfolio rank #{rank['estimate']:.0f} (#{rank['ci_low']:.0f} – #{rank['ci_high']:.0f})"
+        st.caption(text)
+        return
+
+    top = dqi_ci.nlargest(15, 'estimate').sort_values('estimate')
+    st.markdown(f"##### 📏 Site DQI with {confidence} Bootstrap CI")
+    fig = go.Figure(go.Bar(
+        y=top['site_id'].astype(str), x=top['estimate'], orientation='h',
+        marker_color='#3b82f6',
+        error_x=dict(type='data', symmetric=False, array=top['ci_high'] - top['estimate'],
+                     arrayminus=top['estimate'] - top['ci_low'], color='#e2e8f0')
+    ))
+    fig.update_layout(
+        height=max(200, 28 * len(top)), margin=dict(l=20,r=20,t=20,b=40),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e2e8f0'),
+        xaxis=dict(gridcolor='#334155', title='Avg DQI Score'),
+        yaxis=dict(gridcolor='#334155')
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Top {len(top)} sites by average DQI; bars show {int(dqi_ci['n_boot'].iloc[0]):,} bootstrap replicates "
+               f"(subjects resampled within site). Overlapping intervals are not reliably different.")
+
+
 def page_deep_dive(data: dict):
     """Study → Site → Subject drill-down page."""
     subjects = data.get('subjects', pd.DataFrame())
@@ -1377,6 +1474,7 @@ def page_deep_dive(data: dict):
     recommendations = data.get('recommendations', pd.DataFrame())
     clusters = data.get('clusters', pd.DataFrame())
     agent_analysis = data.get('agent_analysis', {})
+    bootstrap_ci = data.get('bootstrap_ci', pd.DataFrame())
 
     st.markdown("### 🔎 Deep Dive")
     st.caption("Study → Site → Subject exploration")
@@ -1450,6 +1548,8 @@ def page_deep_dive(data: dict):
                     f"**{selected_study}** has a **{hr_rate:.1f}%** high-risk rate across {int(study_data.get('site_count', 0))} sites. "
                     f"Multi-agent consensus: **{agent_risk}** risk. Focus on sites with highest DQI scores for maximum impact."
                 )
+            if selected_site == 'All Sites':
+                render_site_confidence(bootstrap_ci, selected_study)
             st.markdown("---")
 
     # Site Profile (if specific site selected)
@@ -1459,6 +1559,7 @@ def page_deep_dive(data: dict):
             site_row = site_data.iloc[0].to_dict()
             st.markdown("##### 🏥 Site Profile")
             render_site_profile_card(site_row)
+            render_site_confidence(bootstrap_ci, site_row.get('study', selected_study), selected_site)
 
             # Site-specific insight
             risk = site_row.get('site_risk_category', site_row.get('risk_category', 'Unknown'))
@@ -1514,6 +1615,8 @@ def page_deep_dive(data: dict):
         if len(filtered_subjects) > 100:
             st.caption(f"Showing first 100 of {len(filtered_subjects):,} subjects. Export for full data.")
 
+        render_score_explanation(subjects, filtered_subjects)
+
     # =========================================================================
     # ENHANCED VISUALIZATIONS (NEW)
     # =========================================================================
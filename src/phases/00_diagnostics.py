@@ -29,16 +29,21 @@ Output:
 
 Usage:
     python src/phases/00_diagnostics.py
+    python src/phases/00_diagnostics.py --workers 4
+
+CLI Options:
+    --workers   Worker processes for the per-file checks (default: 1 = serial,
+                0 = all cores). Each workbook is parsed once either way.
 """
 
 import os
-import re
 import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import json
 import warnings
 
@@ -115,22 +120,21 @@ except ImportError:
 
 FILE_MAPPING_PATH = PHASE_DIRS['phase_01'] / "file_mapping.csv"
 
+from utils.data_loader import read_pipeline_workbook
+from utils.column_resolver import ColumnResolver
+from utils.subject_index import normalize_subject_ids
+
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+_COLUMN_RESOLVER = ColumnResolver(mode='per_name')
+
+
 def find_column(df_columns, possible_names):
     """Find the actual column name from a list of possibilities."""
-    df_columns_lower = [str(c).lower().strip() for c in df_columns]
-    for name in possible_names:
-        if name in df_columns:
-            return name
-        name_lower = name.lower().strip()
-        for i, col_lower in enumerate(df_columns_lower):
-            if name_lower in col_lower or col_lower in name_lower:
-                return df_columns[i]
-    return None
+    return _COLUMN_RESOLVER.find(df_columns, possible_names)
 
 
 def read_excel_smart(filepath, file_type):
@@ -138,74 +142,139 @@ def read_excel_smart(filepath, file_type):
     Read Excel file - SAME LOGIC AS PIPELINE.
     Handles multi-sheet files for SAE Dashboard and Missing Pages.
 
+    Parsing is utils.data_loader.read_pipeline_workbook, the same loader
+    (and cache entries) as Phase 02.
+
     Returns:
         tuple: (DataFrame, error_message or None, is_legitimately_empty)
     """
     try:
-        if file_type=='edc_metrics':
-            df = pd.read_excel(filepath, sheet_name=0, header=None)
-            header_row = 0
-            for i in range(min(5, len(df))):
-                row_str = ' '.join(df.iloc[i].astype(str).tolist())
-                if 'Subject ID' in row_str or 'Project Name' in row_str:
-                    header_row = i
-                    break
-            df = pd.read_excel(filepath, sheet_name=0, header=header_row)
-            if 'Subject ID' in df.columns:
-                df = df[df['Subject ID'].notna()]
-                df = df[~df['Subject ID'].astype(str).str.contains('Subject ID|Responsible', na=False)]
-            return df, None, df.empty
-
-        elif file_type=='sae_dashboard':
-            xl = pd.ExcelFile(filepath)
-            sheet_names = xl.sheet_names
-
-            all_dfs = []
-            for sheet in sheet_names:
-                if 'SAE' in sheet or 'Dashboard' in sheet:
-                    df_sheet = pd.read_excel(filepath, sheet_name=sheet)
-                    if not df_sheet.empty:
-                        df_sheet['_source_sheet'] = sheet
-                        all_dfs.append(df_sheet)
-
-            if all_dfs:
-                df = pd.concat(all_dfs, ignore_index=True, sort=False)
-                return df, None, False
-            else:
-                return pd.DataFrame(), None, True
-
-        elif file_type=='missing_pages':
-            xl = pd.ExcelFile(filepath)
-            sheet_names = xl.sheet_names
-
-            all_dfs = []
-            for sheet in sheet_names:
-                df_sheet = pd.read_excel(filepath, sheet_name=sheet)
-                if not df_sheet.empty:
-                    df_sheet['_source_sheet'] = sheet
-                    all_dfs.append(df_sheet)
-
-            if all_dfs:
-                df = pd.concat(all_dfs, ignore_index=True, sort=False)
-                return df, None, False
-            else:
-                return pd.DataFrame(), None, True
-        else:
-            df = pd.read_excel(filepath, sheet_name=0)
-            return df, None, df.empty
+        df = read_pipeline_workbook(filepath, file_type)
+        return df, None, df.empty
 
     except Exception as e:
         return pd.DataFrame(), str(e), False
 
 
-def standardize_subject_id(value):
-    """Standardize subject ID for comparison."""
-    if pd.isna(value):
-        return None
-    s = str(value).strip().upper()
-    s = re.sub(r'^(SUBJECT|SUBJ|SUB|PATIENT|PAT|PT)[_\-\s]*', '', s, flags=re.IGNORECASE)
-    s = s.lstrip('0') or '0'
-    return s
+def standardize_subject_ids(ids):
+    """Canonical subject keys (as joined by Phase 02) of a set of IDs."""
+    return set(normalize_subject_ids(pd.Series([x for x in ids if x], dtype=object)).dropna())
+
+
+def _find_outliers(df):
+    """Issue 12: IQR * 3 outliers per numeric column with more than 10 values."""
+    numeric = df.select_dtypes(include=[np.number])
+    numeric = numeric.loc[:, numeric.notna().sum() > 10]
+    if numeric.empty:
+        return []
+
+    # One quantile pass over all eligible columns
+    quantiles = numeric.quantile([0.25, 0.75, 0.99])
+    outliers_found = []
+    for col in numeric.columns:
+        Q1, Q3, p99 = quantiles[col].tolist()
+        IQR = Q3 - Q1
+        if IQR > 0:
+            outlier_mask = (numeric[col] < Q1 - 3 * IQR) | (numeric[col] > Q3 + 3 * IQR)
+            outlier_count = outlier_mask.sum()
+            if outlier_count > 0:
+                outliers_found.append({
+                    'column':col,
+                    'outlier_count':int(outlier_count),
+                    'max_value':float(numeric[col].max()),
+                    'p99_value':float(p99)
+                })
+    return outliers_found
+
+
+def diagnose_file(study, file_type, filepath, has_edc, edc_ids):
+    """
+    Parse one file once and run every per-file check on it.
+
+    Checks: file errors / empty files (8), duplicates (5), left join loss (4),
+    ID format mismatch (7) and outliers (12). Runs in a worker process when
+    diagnostics are parallel, so it only takes and returns plain values.
+
+    Args:
+        study: Study name
+        file_type: File type
+        filepath: Workbook path
+        has_edc: Whether the study has an EDC baseline
+        edc_ids: Stripped EDC subject IDs of the study (None when the
+            baseline has no subject column)
+
+    Returns:
+        dict: findings fragment for DiagnosticsRunner._merge_fragment
+    """
+    fragment = {
+        'study':study, 'file_type':file_type, 'status':'data',
+        'file_errors':[], 'empty_files':[], 'duplicates':[],
+        'id_format_issue':None, 'left_join_loss':None, 'outliers':[],
+    }
+
+    df, error, is_empty = read_excel_smart(filepath, file_type)
+
+    if error:
+        fragment['status'] = 'error'
+        fragment['file_errors'].append({
+            'study':study,
+            'file_type':file_type,
+            'filepath':filepath,
+            'error':error,
+            'severity':'HIGH'
+        })
+        return fragment
+
+    if is_empty:
+        fragment['status'] = 'empty'
+        fragment['empty_files'].append({
+            'study':study,
+            'file_type':file_type,
+            'reason':'No data (legitimately empty - no issues of this type)'
+        })
+        return fragment
+
+    if has_edc:
+        mappings = COLUMN_MAPPINGS.get(file_type, {})
+        subject_col = find_column(df.columns.tolist(), mappings.get('subject_id', []))
+
+        if subject_col:
+            dup_count = df[subject_col].duplicated().sum()
+            if dup_count > 0:
+                fragment['duplicates'].append({
+                    'study':study,
+                    'file_type':file_type,
+                    'duplicate_count':int(dup_count)
+                })
+
+            if edc_ids is not None:
+                file_ids = set(df[subject_col].dropna().astype(str).str.strip())
+                direct_match = len(file_ids.intersection(edc_ids))
+                unmatched = len(file_ids - edc_ids)
+
+                if unmatched > 0:
+                    file_ids_std = standardize_subject_ids(file_ids)
+                    edc_ids_std = standardize_subject_ids(edc_ids)
+                    std_match = len(file_ids_std.intersection(edc_ids_std))
+
+                    improvement = std_match - direct_match
+                    if improvement > 0:
+                        fragment['id_format_issue'] = {
+                            'study':study,
+                            'file_type':file_type,
+                            'direct_match':direct_match,
+                            'std_match':std_match,
+                            'improvement':improvement
+                        }
+
+                    fragment['left_join_loss'] = {
+                        'total_records':len(file_ids),
+                        'matched_records':direct_match,
+                        'unmatched_records':unmatched
+                    }
+
+    fragment['outliers'] = _find_outliers(df)
+    return fragment
 
 
 # ============================================================================
@@ -218,6 +287,10 @@ class DiagnosticsRunner:
     def __init__(self):
         self.file_mapping = None
         self.edc_data = {}
+        self.edc_ids = {}
+        # (study, file_type, filepath) -> 'error' | 'empty' | 'data', filled by
+        # the single parse in run_file_checks and reused by later checks
+        self.file_status = {}
         self.findings = {
             'issue_1_fillna_impact':{},
             'issue_2_empty_categoricals':[],
@@ -274,108 +347,62 @@ class DiagnosticsRunner:
             else:
                 self.edc_data[study] = df
 
-        print(f"   [OK] Loaded EDC data for {len(self.edc_data)} studies")
-
-    def check_file_type(self, file_type):
-        """Check a specific file type against EDC baseline."""
-        files = self.file_mapping[self.file_mapping['file_type']==file_type]
-
-        if files.empty:
-            return
-
-        print(f"   Checking {file_type}...")
-
-        for _, row in files.iterrows():
-            study = row['study']
-            filepath = row['filepath']
-
-            df, error, is_empty = read_excel_smart(filepath, file_type)
-
-            if error:
-                self.findings['issue_8_file_errors'].append({
-                    'study':study,
-                    'file_type':file_type,
-                    'filepath':filepath,
-                    'error':error,
-                    'severity':'HIGH'
-                })
-                continue
-
-            if is_empty:
-                self.findings['issue_8_empty_files'].append({
-                    'study':study,
-                    'file_type':file_type,
-                    'reason':'No data (legitimately empty - no issues of this type)'
-                })
-                continue
+        # Subject IDs per study, computed once and shared with every file check
+        edc_subject_names = COLUMN_MAPPINGS['edc_metrics']['subject_id']
+        for study, df in self.edc_data.items():
+            edc_subject_col = find_column(df.columns.tolist(), edc_subject_names)
+            self.edc_ids[study] = set(df[edc_subject_col].dropna().astype(str).str.strip()) \
+                if edc_subject_col else None
 
-            if study in self.edc_data:
-                edc_df = self.edc_data[study]
-                mappings = COLUMN_MAPPINGS.get(file_type, {})
+        print(f"   [OK] Loaded EDC data for {len(self.edc_data)} studies")
 
-                subject_col = find_column(df.columns.tolist(), mappings.get('subject_id', []))
+    def run_file_checks(self, file_types, workers=1):
+        """
+        Parse and check every file of the given types, each exactly once.
 
-                if subject_col:
-                    dup_count = df[subject_col].duplicated().sum()
-                    if dup_count > 0:
-                        self.findings['issue_5_duplicates'].append({
-                            'study':study,
-                            'file_type':file_type,
-                            'duplicate_count':int(dup_count)
-                        })
-
-                    file_ids = set(df[subject_col].dropna().astype(str).str.strip())
-                    edc_subject_col = find_column(edc_df.columns.tolist(),
-                                                  COLUMN_MAPPINGS['edc_metrics']['subject_id'])
-                    if edc_subject_col:
-                        edc_ids = set(edc_df[edc_subject_col].dropna().astype(str).str.strip())
-
-                        direct_match = len(file_ids.intersection(edc_ids))
-                        unmatched = len(file_ids - edc_ids)
-
-                        if unmatched > 0:
-                            file_ids_std = {standardize_subject_id(x) for x in file_ids if x}
-                            edc_ids_std = {standardize_subject_id(x) for x in edc_ids if x}
-                            std_match = len(file_ids_std.intersection(edc_ids_std))
-
-                            improvement = std_match - direct_match
-                            if improvement > 0:
-                                if 'id_format_issues' not in self.findings['issue_7_id_format_mismatch']:
-                                    self.findings['issue_7_id_format_mismatch']['id_format_issues'] = []
-                                self.findings['issue_7_id_format_mismatch']['id_format_issues'].append({
-                                    'study':study,
-                                    'file_type':file_type,
-                                    'direct_match':direct_match,
-                                    'std_match':std_match,
-                                    'improvement':improvement
-                                })
-
-                            self.findings['issue_4_left_join_loss'][f"{study}_{file_type}"] = {
-                                'total_records':len(file_ids),
-                                'matched_records':direct_match,
-                                'unmatched_records':unmatched
-                            }
-
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            outliers_found = []
-            for col in numeric_cols:
-                if df[col].notna().sum() > 10:
-                    Q1 = df[col].quantile(0.25)
-                    Q3 = df[col].quantile(0.75)
-                    IQR = Q3 - Q1
-                    if IQR > 0:
-                        outlier_mask = (df[col] < Q1 - 3 * IQR) | (df[col] > Q3 + 3 * IQR)
-                        outlier_count = outlier_mask.sum()
-                        if outlier_count > 0:
-                            outliers_found.append({
-                                'column':col,
-                                'outlier_count':int(outlier_count),
-                                'max_value':float(df[col].max()),
-                                'p99_value':float(df[col].quantile(0.99))
-                            })
-
-            if outliers_found:
-                self.findings['issue_12_outliers'][f"{study}_{file_type}"] = outliers_found
+        Files are independent work units, so they run in a process pool when
+        workers > 1. Fragments are merged in file_mapping order, so findings
+        are identical to the serial run.
+        """
+        units = []
+        for file_type in file_types:
+            files = self.file_mapping[self.file_mapping['file_type']==file_type]
+            for _, row in files.iterrows():
+                units.append((row['study'], file_type, row['filepath'],
+                              row['study'] in self.edc_data, self.edc_ids.get(row['study'])))
+
+        if workers > 1 and len(units) > 1:
+            print(f"   Checking {len(units)} files with {workers} workers...")
+            results = [None] * len(units)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(diagnose_file, *unit): i for i, unit in enumerate(units)}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        else:
+            results = []
+            for unit in units:
+                if not results or unit[1]!=results[-1]['file_type']:
+                    print(f"   Checking {unit[1]}...")
+                results.append(diagnose_file(*unit))
+
+        for (study, file_type, filepath, _, _), result in zip(units, results):
+            self.file_status[(study, file_type, filepath)] = result['status']
+            self._merge_fragment(result)
+
+    def _merge_fragment(self, fragment):
+        """Fold one file's findings into the run's findings."""
+        findings = self.findings
+        findings['issue_8_file_errors'].extend(fragment['file_errors'])
+        findings['issue_8_empty_files'].extend(fragment['empty_files'])
+        findings['issue_5_duplicates'].extend(fragment['duplicates'])
+        if fragment['id_format_issue']:
+            findings['issue_7_id_format_mismatch'].setdefault('id_format_issues', []).append(
+                fragment['id_format_issue'])
+        key = f"{fragment['study']}_{fragment['file_type']}"
+        if fragment['left_join_loss']:
+            findings['issue_4_left_join_loss'][key] = fragment['left_join_loss']
+        if fragment['outliers']:
+            findings['issue_12_outliers'][key] = fragment['outliers']
 
     def check_fillna_impact(self):
         """Issue 1: Check impact of fillna(0) on missing data."""
@@ -393,9 +420,12 @@ class DiagnosticsRunner:
                 study = row['study']
                 filepath = row['filepath']
 
-                df, error, is_empty = read_excel_smart(filepath, file_type)
+                status = self.file_status.get((study, file_type, filepath))
+                if status is None:
+                    _, error, is_empty = read_excel_smart(filepath, file_type)
+                    status = 'error' if error else 'empty' if is_empty else 'data'
 
-                if error or is_empty or df.empty:
+                if status!='data':
                     studies_empty.add(study)
                 else:
                     studies_with_data.add(study)
@@ -429,8 +459,17 @@ class DiagnosticsRunner:
                         'pct_small_sites':round(small_sites / len(site_counts) * 100, 1)
                     }
 
-    def run_all_diagnostics(self):
-        """Run all diagnostic checks."""
+    def run_all_diagnostics(self, workers=1):
+        """
+        Run all diagnostic checks.
+
+        Args:
+            workers: Worker processes for the per-file checks (1 = serial,
+                0 = all cores)
+        """
+        if workers==0:
+            workers = os.cpu_count() or 1
+
         print("=" * 70)
         print("JAVELIN.AI - DATA QUALITY DIAGNOSTICS")
         print("=" * 70)
@@ -447,8 +486,7 @@ class DiagnosticsRunner:
         file_types = ['visit_tracker', 'missing_lab', 'sae_dashboard', 'missing_pages',
                       'meddra_coding', 'whodd_coding', 'inactivated', 'edrr']
 
-        for file_type in file_types:
-            self.check_file_type(file_type)
+        self.run_file_checks(file_types, workers)
 
         self.check_fillna_impact()
         self.check_small_samples()
@@ -571,10 +609,10 @@ class DiagnosticsRunner:
 # MAIN
 # ============================================================================
 
-def main():
+def main(workers=1):
     runner = DiagnosticsRunner()
 
-    if runner.run_all_diagnostics():
+    if runner.run_all_diagnostics(workers=workers):
         runner.save_outputs()
         print("\n")
         print(runner.generate_report())
@@ -585,4 +623,12 @@ def main():
 
 
 if __name__=="__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JAVELIN.AI Data Quality Diagnostics")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for the per-file checks (1 = serial, 0 = all cores)")
+
+    args = parser.parse_args()
+
+    main(workers=args.workers)
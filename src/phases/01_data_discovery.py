@@ -6,6 +6,13 @@ Run this FIRST before anything else (after diagnostics).
 
 Usage:
     python src/phases/01_data_discovery.py
+    python src/phases/01_data_discovery.py --workers 4
+
+CLI Options:
+    --workers   Worker processes for header scanning (default: 1 = serial,
+                0 = all cores). Output is identical to the serial run.
+    --rescan    Scan every file. By default, files whose size, mtime and
+                content hash match file_mapping.csv reuse the last result.
 
 Output:
     - outputs/phase01/file_mapping.csv       # Which file is which type
@@ -24,6 +31,7 @@ import sys
 import pandas as pd
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import warnings
 
 warnings.filterwarnings('ignore')
@@ -159,6 +167,16 @@ except ImportError:
         },
     }
 
+from utils.workbook_cache import read_workbook_cached, file_fingerprint
+from utils.data_loader import read_sheet_rows, frame_from_rows
+from utils.incremental import config_digest
+
+# Bump when the header detection in _read_header_preview changes, so that
+# files recorded in an older file_mapping.csv are scanned again
+_SCANNER_VERSION = 2
+
+FINGERPRINT_COLUMNS = ['file_size', 'file_mtime_ns', 'file_sha256', 'scan_digest']
+
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -181,22 +199,32 @@ def classify_file(filename):
     return 'unknown'
 
 
-def get_excel_columns(filepath):
-    """Read Excel file and return column names from the first sheet."""
-    try:
-        df = pd.read_excel(filepath, sheet_name=0, nrows=5)
+def _read_header_preview(filepath):
+    """Read the first rows of the first sheet with the detected header row."""
+    # Stream the first rows once; every header candidate is built in memory
+    rows = read_sheet_rows(filepath, max_rows=11)
 
-        first_col = str(df.columns[0])
+    df = frame_from_rows([list(r) for r in rows], header=0, nrows=5)
 
-        if 'Unnamed' in first_col or first_col in ['Project Name', 'Study', 'Country']:
-            df_raw = pd.read_excel(filepath, sheet_name=0, header=None, nrows=10)
+    first_col = str(df.columns[0])
+
+    if 'Unnamed' in first_col or first_col in ['Project Name', 'Study', 'Country']:
+        df_raw = frame_from_rows([list(r) for r in rows], header=None, nrows=10)
+
+        for i in range(min(5, len(df_raw))):
+            row_str = ' '.join(df_raw.iloc[i].astype(str).tolist())
+            if 'Subject' in row_str or 'Patient' in row_str:
+                df = frame_from_rows([list(r) for r in rows], header=i, nrows=5)
+                break
+
+    return df
 
-            for i in range(min(5, len(df_raw))):
-                row_str = ' '.join(df_raw.iloc[i].astype(str).tolist())
-                if 'Subject' in row_str or 'Patient' in row_str:
-                    df = pd.read_excel(filepath, sheet_name=0, header=i, nrows=5)
-                    break
 
+def get_excel_columns(filepath):
+    """Read Excel file and return column names from the first sheet."""
+    try:
+        df = read_workbook_cached(filepath, 'header_preview', _read_header_preview,
+                                  loader_name='phase01.get_excel_columns', loader_version=2)
         return list(df.columns), None
     except Exception as e:
         return [], str(e)
@@ -224,17 +252,197 @@ def find_column_mapping(actual_columns, expected_columns_dict):
     return mapping, missing
 
 
+# ============================================================================
+# SCANNING
+# ============================================================================
+
+def _scan_digest(file_type):
+    """Digest of everything a file's scan result depends on besides its content."""
+    return config_digest(_SCANNER_VERSION, file_type, EXPECTED_COLUMNS.get(file_type, {}))[:16]
+
+
+def scan_file(filepath, file_type, sha256=None):
+    """
+    Fingerprint one workbook and read its header row.
+
+    Runs in a worker process when discovery is parallel, so it only takes
+    and returns plain values.
+
+    Args:
+        filepath: Workbook path
+        file_type: Classified file type
+        sha256: Known content hash (skips hashing when size/mtime are unchanged)
+
+    Returns:
+        dict: fingerprint columns, 'columns' and 'error'
+    """
+    try:
+        if sha256 is None:
+            fingerprint = file_fingerprint(filepath)
+        else:
+            st = Path(filepath).stat()
+            fingerprint = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256}
+    except OSError as e:
+        return {'file_size': None, 'file_mtime_ns': None, 'file_sha256': None,
+                'scan_digest': None, 'columns': [], 'error': str(e)}
+
+    columns, error = get_excel_columns(filepath)
+    return {
+        'file_size': fingerprint['size'],
+        'file_mtime_ns': fingerprint['mtime_ns'],
+        'file_sha256': fingerprint['sha256'],
+        'scan_digest': _scan_digest(file_type) if not error else None,
+        'columns': [str(c) for c in columns],
+        'error': error,
+    }
+
+
+def load_previous_scan(output_dir):
+    """
+    Load the scan results recorded by the last discovery run.
+
+    Args:
+        output_dir: Phase 01 output directory
+
+    Returns:
+        dict: filepath -> (file_mapping row, column_report row); empty when
+        there is no previous run or it predates file fingerprints
+    """
+    mapping_path = Path(output_dir) / "file_mapping.csv"
+    report_path = Path(output_dir) / "column_report.csv"
+    try:
+        mapping = pd.read_csv(mapping_path, dtype=str, keep_default_na=False)
+        report = pd.read_csv(report_path, dtype=str, keep_default_na=False)
+    except (OSError, ValueError):
+        return {}
+    if not set(FINGERPRINT_COLUMNS) <= set(mapping.columns):
+        return {}
+
+    reports = {(r['study'], r['filename']): r for r in report.to_dict('records')}
+    previous = {}
+    for row in mapping.to_dict('records'):
+        report_row = reports.get((row['study'], row['filename']))
+        if report_row is not None and row['scan_digest']:
+            previous[row['filepath']] = (row, report_row)
+    return previous
+
+
+def _parse_int(value):
+    """Integer recorded in file_mapping.csv, or None when empty or unparseable."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _reuse_previous(previous_entry):
+    """Return a scan result rebuilt from the previous run's rows (None if they are unusable)."""
+    mapping_row, report_row = previous_entry
+    values = {col: _parse_int(mapping_row.get(col)) for col in ('file_size', 'file_mtime_ns', 'num_columns')}
+    if None in values.values() or not mapping_row['file_sha256']:
+        return None
+    return {
+        'file_size': values['file_size'],
+        'file_mtime_ns': values['file_mtime_ns'],
+        'file_sha256': mapping_row['file_sha256'],
+        'scan_digest': mapping_row['scan_digest'],
+        'num_columns': values['num_columns'],
+        'report': report_row,
+        'error': None,
+    }
+
+
+def _is_unchanged(previous_entry, file_type, st):
+    """Whether a previous scan result still applies to the file on disk."""
+    mapping_row, _ = previous_entry
+    return (mapping_row['file_type'] == file_type
+            and mapping_row['scan_digest'] == _scan_digest(file_type)
+            and _parse_int(mapping_row['file_size']) == st.st_size
+            and _parse_int(mapping_row['file_mtime_ns']) == st.st_mtime_ns)
+
+
+def scan_files(units, previous, workers=1):
+    """
+    Scan workbooks, skipping files unchanged since the previous run.
+
+    A file is skipped when its size and mtime match the previous record.
+    When they differ the file is hashed, and if the content hash still
+    matches, the previous result is kept with the new size/mtime.
+
+    Args:
+        units: List of (filepath, file_type)
+        previous: Output of load_previous_scan
+        workers: Worker processes for header reads (1 = serial)
+
+    Returns:
+        tuple: (list of scan results in unit order, number of files skipped)
+    """
+    results = [None] * len(units)
+    pending = []
+    for i, (filepath, file_type) in enumerate(units):
+        entry = previous.get(str(filepath))
+        try:
+            st = Path(filepath).stat()
+        except OSError:
+            entry = None
+        reused = _reuse_previous(entry) if entry is not None and _is_unchanged(entry, file_type, st) else None
+        if reused is not None:
+            results[i] = reused
+        else:
+            pending.append(i)
+
+    skipped = len(units) - len(pending)
+
+    # Hash changed files first; a pure mtime change keeps the previous result
+    to_read = []
+    for i in pending:
+        filepath, file_type = units[i]
+        entry = previous.get(str(filepath))
+        if entry is not None and entry[0]['file_type'] == file_type \
+                and entry[0]['scan_digest'] == _scan_digest(file_type):
+            try:
+                fingerprint = file_fingerprint(filepath)
+            except OSError:
+                fingerprint = None
+            result = _reuse_previous(entry) if fingerprint and fingerprint['sha256'] == entry[0]['file_sha256'] \
+                else None
+            if result is not None:
+                result['file_size'] = fingerprint['size']
+                result['file_mtime_ns'] = fingerprint['mtime_ns']
+                results[i] = result
+                skipped += 1
+                continue
+            if fingerprint:
+                to_read.append((i, fingerprint['sha256']))
+                continue
+        to_read.append((i, None))
+
+    if workers > 1 and len(to_read) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(scan_file, str(units[i][0]), units[i][1], sha256): i
+                       for i, sha256 in to_read}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+    else:
+        for i, sha256 in to_read:
+            results[i] = scan_file(str(units[i][0]), units[i][1], sha256)
+
+    return results, skipped
+
+
 # ============================================================================
 # MAIN DISCOVERY FUNCTION
 # ============================================================================
 
-def run_discovery(data_dir=None, output_dir=None):
+def run_discovery(data_dir=None, output_dir=None, workers=1, rescan=False):
     """
     Main function to discover and classify all files.
 
     Args:
         data_dir: Optional override for data directory
         output_dir: Optional override for output directory
+        workers: Worker processes for header scanning (1 = serial, 0 = all cores)
+        rescan: Ignore the previous file_mapping.csv and scan every file
 
     Returns:
         bool: True if successful, False otherwise
@@ -275,13 +483,26 @@ def run_discovery(data_dir=None, output_dir=None):
 
     print(f"\n[INFO] Found {len(study_folders)} study folders")
 
+    # List and classify every file first, then scan all headers in one pass
+    studies = []
+    units = []
     for study_folder in sorted(study_folders):
+        excel_files = list(study_folder.glob("*.xlsx")) + list(study_folder.glob("*.xls"))
+        studies.append((study_folder, excel_files, len(units)))
+        units.extend((excel_file, classify_file(excel_file.name)) for excel_file in excel_files)
+
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    previous = {} if rescan else load_previous_scan(_output_dir)
+    scans, skipped = scan_files(units, previous, workers)
+    print(f"[INFO] Scanned {len(units) - skipped} files, {skipped} unchanged since last run"
+          + (f" ({workers} workers)" if workers > 1 else ""))
+
+    for study_folder, excel_files, offset in studies:
         study_name = extract_study_name(study_folder.name)
         print(f"\n{'-' * 50}")
         print(f"Processing: {study_name}")
 
-        excel_files = list(study_folder.glob("*.xlsx")) + list(study_folder.glob("*.xls"))
-
         if not excel_files:
             issues.append(f"WARNING: No Excel files found in {study_folder.name}")
             continue
@@ -290,23 +511,38 @@ def run_discovery(data_dir=None, output_dir=None):
 
         classified_count = defaultdict(int)
 
-        for excel_file in excel_files:
-            file_type = classify_file(excel_file.name)
+        for i, excel_file in enumerate(excel_files):
+            file_type = units[offset + i][1]
+            scan = scans[offset + i]
             classified_count[file_type] += 1
 
-            columns, error = get_excel_columns(excel_file)
-
-            if error:
-                issues.append(f"ERROR reading {excel_file.name}: {error}")
-                columns = []
-
-            column_mapping = {}
-            missing_columns = []
-            if file_type!='unknown' and columns:
-                column_mapping, missing_columns = find_column_mapping(
-                    columns,
-                    EXPECTED_COLUMNS.get(file_type, {})
-                )
+            if scan['error']:
+                issues.append(f"ERROR reading {excel_file.name}: {scan['error']}")
+
+            if 'report' in scan:
+                report = dict(scan['report'])
+                num_columns = scan['num_columns']
+                missing_columns = report['missing_expected'].split('|') \
+                    if report['missing_expected']!='None' else []
+            else:
+                columns = scan['columns']
+                num_columns = len(columns)
+                column_mapping = {}
+                missing_columns = []
+                if file_type!='unknown' and columns:
+                    column_mapping, missing_columns = find_column_mapping(
+                        columns,
+                        EXPECTED_COLUMNS.get(file_type, {})
+                    )
+                report = {
+                    'study':study_name,
+                    'filename':excel_file.name,
+                    'file_type':file_type,
+                    'columns_found':'|'.join(columns[:20]),
+                    'subject_id_col':column_mapping.get('subject_id', 'NOT FOUND'),
+                    'site_id_col':column_mapping.get('site_id', 'NOT FOUND'),
+                    'missing_expected':'|'.join(missing_columns) if missing_columns else 'None',
+                }
 
             file_mapping.append({
                 'study':study_name,
@@ -314,18 +550,11 @@ def run_discovery(data_dir=None, output_dir=None):
                 'filename':excel_file.name,
                 'file_type':file_type,
                 'filepath':str(excel_file),
-                'num_columns':len(columns),
+                'num_columns':num_columns,
+                **{col: scan[col] for col in FINGERPRINT_COLUMNS},
             })
 
-            column_report.append({
-                'study':study_name,
-                'filename':excel_file.name,
-                'file_type':file_type,
-                'columns_found':'|'.join(columns[:20]),
-                'subject_id_col':column_mapping.get('subject_id', 'NOT FOUND'),
-                'site_id_col':column_mapping.get('site_id', 'NOT FOUND'),
-                'missing_expected':'|'.join(missing_columns) if missing_columns else 'None',
-            })
+            column_report.append(report)
 
             if file_type=='unknown':
                 issues.append(f"UNKNOWN FILE TYPE: {study_name}/{excel_file.name}")
@@ -348,6 +577,11 @@ def run_discovery(data_dir=None, output_dir=None):
     print("=" * 70)
 
     df_files = pd.DataFrame(file_mapping)
+    # Nullable integers: a file that could not be stat'ed must not turn the
+    # other rows' sizes and mtimes into floats
+    for col in ('file_size', 'file_mtime_ns'):
+        if col in df_files.columns:
+            df_files[col] = pd.array([row[col] for row in file_mapping], dtype='Int64')
     df_files.to_csv(_output_dir / "file_mapping.csv", index=False)
     print(f"\n[OK] Saved: {_output_dir / 'file_mapping.csv'} ({len(df_files)} files)")
 
@@ -407,6 +641,16 @@ def run_discovery(data_dir=None, output_dir=None):
 # ============================================================================
 
 if __name__=="__main__":
-    success = run_discovery()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JAVELIN.AI Data Discovery")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for header scanning (1 = serial, 0 = all cores)")
+    parser.add_argument("--rescan", action="store_true",
+                        help="Scan every file, ignoring fingerprints from the last run")
+
+    args = parser.parse_args()
+
+    success = run_discovery(workers=args.workers, rescan=args.rescan)
     if not success:
         exit(1)
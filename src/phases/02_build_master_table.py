@@ -11,6 +11,14 @@ Prerequisites:
 
 Usage:
     python src/phases/02_build_master_table.py
+    python src/phases/02_build_master_table.py --workers 8
+    python src/phases/02_build_master_table.py --incremental
+
+CLI Options:
+    --workers       Worker processes for workbook ingestion (default: 1 = serial,
+                    0 = all cores). Output is identical to the serial path.
+    --incremental   Re-aggregate only studies whose input files changed since
+                    the last run and splice them into the master tables.
 
 Output:
     - outputs/phase02/master_subject.csv    # One row per subject with all metrics
@@ -19,17 +27,22 @@ Output:
 
 Features:
     - Merges data from 9 different source types
+    - Source aggregation is declared in config.AGGREGATION_SPECS
     - Handles missing values and outliers
     - Creates subject-site lookup table
     - Aggregates metrics at multiple levels
 """
 
+import io
 import os
 import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from functools import partial
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -49,7 +62,7 @@ if str(_SRC_DIR) not in sys.path:
 try:
     from config import (
         PROJECT_ROOT, DATA_DIR, OUTPUT_DIR, PHASE_DIRS, COLUMN_MAPPINGS, THRESHOLDS,
-        NUMERIC_ISSUE_COLUMNS, OUTLIER_CAP_COLUMNS, CATEGORICAL_COLUMNS
+        NUMERIC_ISSUE_COLUMNS, OUTLIER_CAP_COLUMNS, CATEGORICAL_COLUMNS, AGGREGATION_SPECS
     )
     _USING_CONFIG = True
 except ImportError:
@@ -102,9 +115,19 @@ except ImportError:
     NUMERIC_ISSUE_COLUMNS = ['missing_visit_count', 'max_days_outstanding', 'lab_issues_count', 'sae_total_count', 'sae_pending_count', 'missing_pages_count', 'max_days_page_missing', 'uncoded_meddra_count', 'uncoded_whodd_count', 'inactivated_forms_count', 'edrr_open_issues']
     OUTLIER_CAP_COLUMNS = ['max_days_outstanding', 'max_days_page_missing', 'lab_issues_count', 'inactivated_forms_count']
     CATEGORICAL_COLUMNS = ['country', 'region', 'subject_status']
+    from utils.source_aggregation import get_aggregation_specs
+    AGGREGATION_SPECS = get_aggregation_specs()
 
 FILE_MAPPING_PATH = PHASE_DIRS['phase_01'] / "file_mapping.csv"
 
+from utils.data_loader import read_pipeline_workbook
+from utils.subject_index import SubjectIndex, SUBJECT_KEY, add_subject_key
+from utils.validation import clean_text
+from utils.incremental import PartialStore, fingerprint_inputs, diff_fingerprints, config_digest
+from utils.table_io import write_table
+from utils.source_aggregation import aggregate_source_frame, merge_source_aggregates, spec_metric_columns
+from utils.column_resolver import ColumnResolver
+
 # ============================================================================
 # DATA QUALITY FUNCTIONS
 # ============================================================================
@@ -172,71 +195,22 @@ def fill_missing_categoricals(df, categorical_cols=None):
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Files of one export share headers, so rename plans are resolved once per header
+COLUMN_RESOLVER = ColumnResolver(COLUMN_MAPPINGS, mode='per_name')
+
 def find_column(df_columns, possible_names):
-    df_columns_lower = [str(c).lower().strip() for c in df_columns]
-    for name in possible_names:
-        if name in df_columns:
-            return name
-        name_lower = name.lower().strip()
-        for i, col_lower in enumerate(df_columns_lower):
-            if name_lower in col_lower or col_lower in name_lower:
-                return df_columns[i]
-    return None
+    return COLUMN_RESOLVER.find(df_columns, possible_names)
 
 def standardize_columns(df, file_type):
-    mapping = COLUMN_MAPPINGS.get(file_type, {})
-    rename_dict = {}
-    for standard_name, possible_names in mapping.items():
-        actual_col = find_column(df.columns.tolist(), possible_names)
-        if actual_col and actual_col != standard_name:
-            rename_dict[actual_col] = standard_name
-    if rename_dict:
-        df = df.rename(columns=rename_dict)
-    return df
+    return COLUMN_RESOLVER.standardize(df, file_type)
 
 def read_excel_smart(filepath, file_type):
+    # Same loader (and cache entries) as 00_diagnostics.py
     try:
-        if file_type == 'edc_metrics':
-            df = pd.read_excel(filepath, sheet_name=0, header=None)
-            header_row = 0
-            for i in range(min(5, len(df))):
-                row_str = ' '.join(df.iloc[i].astype(str).tolist())
-                if 'Subject ID' in row_str or 'Project Name' in row_str:
-                    header_row = i
-                    break
-            df = pd.read_excel(filepath, sheet_name=0, header=header_row)
-            if 'Subject ID' in df.columns:
-                df = df[df['Subject ID'].notna()]
-                df = df[~df['Subject ID'].astype(str).str.contains('Subject ID|Responsible', na=False)]
-        elif file_type == 'sae_dashboard':
-            xl = pd.ExcelFile(filepath)
-            all_dfs = []
-            for sheet in xl.sheet_names:
-                if 'SAE' in sheet or 'Dashboard' in sheet:
-                    df_sheet = pd.read_excel(filepath, sheet_name=sheet)
-                    if not df_sheet.empty:
-                        df_sheet['_source_sheet'] = sheet
-                        all_dfs.append(df_sheet)
-            if all_dfs:
-                df = pd.concat(all_dfs, ignore_index=True, sort=False)
-                print(f"      Combined {len(all_dfs)} SAE sheets: {sum(len(d) for d in all_dfs)} total rows")
-            else:
-                df = pd.DataFrame()
-        elif file_type == 'missing_pages':
-            xl = pd.ExcelFile(filepath)
-            all_dfs = []
-            for sheet in xl.sheet_names:
-                df_sheet = pd.read_excel(filepath, sheet_name=sheet)
-                if not df_sheet.empty:
-                    df_sheet['_source_sheet'] = sheet
-                    all_dfs.append(df_sheet)
-            if all_dfs:
-                df = pd.concat(all_dfs, ignore_index=True, sort=False)
-                print(f"      Combined {len(all_dfs)} Missing Pages sheets: {sum(len(d) for d in all_dfs)} total rows")
-            else:
-                df = pd.DataFrame()
-        else:
-            df = pd.read_excel(filepath, sheet_name=0)
+        df = read_pipeline_workbook(filepath, file_type)
+        if file_type in ('sae_dashboard', 'missing_pages') and '_source_sheet' in df.columns:
+            label = 'SAE' if file_type == 'sae_dashboard' else 'Missing Pages'
+            print(f"      Combined {df['_source_sheet'].nunique()} {label} sheets: {len(df)} total rows")
         if not df.empty:
             df, _ = validate_loaded_data(df, file_type, filepath)
         return df
@@ -244,312 +218,287 @@ def read_excel_smart(filepath, file_type):
         print(f"    [WARN] Error reading {filepath}: {e}")
         return pd.DataFrame()
 
-def load_edc_lookup(file_mapping_df):
-    print("\n[INFO] Building Subject -> Site lookup table from EDC Metrics...")
-    edc_files = file_mapping_df[file_mapping_df['file_type'] == 'edc_metrics']
-    lookup_records = []
-    for _, row in tqdm(edc_files.iterrows(), total=len(edc_files), desc="   Loading EDC files"):
-        study = row['study']
-        filepath = row['filepath']
-        df = read_excel_smart(filepath, 'edc_metrics')
-        if df.empty:
-            continue
-        df = standardize_columns(df, 'edc_metrics')
-        if 'subject_id' in df.columns and 'site_id' in df.columns:
-            for _, r in df.iterrows():
-                if pd.notna(r.get('subject_id')):
-                    lookup_records.append({
-                        'study': study,
-                        'subject_id': str(r['subject_id']).strip(),
-                        'site_id': str(r.get('site_id', '')).strip() if pd.notna(r.get('site_id')) else '',
-                        'country': str(r.get('country', '')).strip() if pd.notna(r.get('country')) else '',
-                        'region': str(r.get('region', '')).strip() if pd.notna(r.get('region')) else '',
-                    })
-    lookup_df = pd.DataFrame(lookup_records)
-    print(f"   [OK] Lookup table: {len(lookup_df)} subject-site mappings")
-    return lookup_df
+# ============================================================================
+# PARALLEL INGESTION
+# ============================================================================
+
+def _collect_parts(files, process_fn, subject_index, file_results=None, desc="   Processing"):
+    """
+    Gather per-file results in file_mapping order.
+
+    Serial mode parses each file here. When file_results is given (parallel
+    mode), the results were already produced by a worker and the output the
+    worker printed for that file is replayed so logs read the same.
+    """
+    parts = []
+    if file_results is None:
+        for _, row in tqdm(files.iterrows(), total=len(files), desc=desc):
+            parts.append(process_fn(row['study'], row['filepath'], subject_index))
+    else:
+        for idx in files.index:
+            part, output = file_results[idx]
+            if output:
+                print(output, end='')
+            parts.append(part)
+    return parts
+
+def _run_work_unit(file_type, study, filepath, subject_index):
+    """Process one (study, file_type, filepath) unit in a worker, capturing its output."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        part = FILE_PROCESSORS[file_type](study, filepath, subject_index)
+    return part, buffer.getvalue()
+
+def ingest_files_parallel(file_mapping_df, file_types, subject_index, workers, processor=None,
+                          desc="   Parsing workbooks"):
+    """
+    Fan work units out to a process pool.
+
+    Each worker only receives the subject index for its own study. Results are
+    keyed by file_mapping index so callers can merge them in file order,
+    which keeps the output identical to the serial path. `processor`
+    overrides the FILE_PROCESSORS key used for every unit.
+
+    Returns:
+        dict: file_mapping index -> (per-file result, captured stdout)
+    """
+    units = file_mapping_df[file_mapping_df['file_type'].isin(file_types)]
+    if units.empty:
+        return {}
+
+    file_results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for idx, row in units.iterrows():
+            unit_index = subject_index.for_study(row['study']) if subject_index is not None else None
+            future = executor.submit(_run_work_unit, processor or row['file_type'], row['study'], row['filepath'], unit_index)
+            futures[future] = idx
+        for future in tqdm(as_completed(futures), total=len(futures), desc=desc):
+            file_results[futures[future]] = future.result()
+    return file_results
 
 # ============================================================================
 # AGGREGATION FUNCTIONS
 # ============================================================================
 
-def aggregate_edc_metrics(file_mapping_df, lookup_df):
-    print("\n[INFO] Processing EDC Metrics (base table)...")
-    edc_files = file_mapping_df[file_mapping_df['file_type'] == 'edc_metrics']
-    all_records = []
-    for _, row in tqdm(edc_files.iterrows(), total=len(edc_files), desc="   Processing"):
-        study = row['study']
-        filepath = row['filepath']
-        df = read_excel_smart(filepath, 'edc_metrics')
-        if df.empty:
-            continue
-        df = standardize_columns(df, 'edc_metrics')
-        for _, r in df.iterrows():
-            if pd.notna(r.get('subject_id')):
-                all_records.append({
-                    'study': study,
-                    'subject_id': str(r.get('subject_id', '')).strip(),
-                    'site_id': str(r.get('site_id', '')).strip() if pd.notna(r.get('site_id')) else '',
-                    'country': str(r.get('country', '')).strip() if pd.notna(r.get('country')) else '',
-                    'region': str(r.get('region', '')).strip() if pd.notna(r.get('region')) else '',
-                    'subject_status': str(r.get('subject_status', '')).strip() if pd.notna(r.get('subject_status')) else '',
-                    'latest_visit': str(r.get('latest_visit', '')).strip() if pd.notna(r.get('latest_visit')) else '',
-                })
-    result_df = pd.DataFrame(all_records)
-    print(f"   [OK] EDC Metrics: {len(result_df)} subjects")
-    return result_df
+EDC_BASE_COLUMNS = ['study', 'subject_id', 'site_id', 'country', 'region', 'subject_status', 'latest_visit']
+LOOKUP_COLUMNS = ['study', 'subject_id', SUBJECT_KEY, 'site_id', 'country', 'region']
 
-def aggregate_visit_tracker(file_mapping_df, lookup_df):
-    print("\n[INFO] Processing Visit Tracker...")
-    files = file_mapping_df[file_mapping_df['file_type'] == 'visit_tracker']
-    all_records = []
-    for _, row in tqdm(files.iterrows(), total=len(files), desc="   Processing"):
-        study = row['study']
-        filepath = row['filepath']
-        df = read_excel_smart(filepath, 'visit_tracker')
-        if df.empty:
-            continue
-        df = standardize_columns(df, 'visit_tracker')
-        if 'subject_id' not in df.columns:
-            subject_col = find_column(df.columns.tolist(), ['Subject', 'Subject ID', 'SubjectID'])
-            if subject_col:
-                df = df.rename(columns={subject_col: 'subject_id'})
-            else:
-                continue
-        for subject_id, group in df.groupby('subject_id'):
-            if pd.isna(subject_id):
-                continue
-            site_id = ''
-            if 'site_id' in group.columns and group['site_id'].notna().any():
-                site_id = str(group['site_id'].iloc[0]).strip()
-            else:
-                lookup_match = lookup_df[(lookup_df['study'] == study) & (lookup_df['subject_id'] == str(subject_id).strip())]
-                if not lookup_match.empty:
-                    site_id = lookup_match['site_id'].iloc[0]
-            days_col = find_column(group.columns.tolist(), ['days_outstanding', '# Days Outstanding', 'Days Outstanding'])
-            max_days = 0
-            if days_col and days_col in group.columns:
-                max_days = pd.to_numeric(group[days_col], errors='coerce').max()
-                if pd.isna(max_days):
-                    max_days = 0
-            all_records.append({'study': study, 'subject_id': str(subject_id).strip(), 'site_id': site_id, 'missing_visit_count': len(group), 'max_days_outstanding': max_days})
-    result_df = pd.DataFrame(all_records)
-    print(f"   [OK] Visit Tracker: {len(result_df)} subject records")
-    return result_df
+def _process_edc_file(study, filepath, subject_index=None):
+    """
+    Parse one EDC Metrics workbook into base-table rows.
 
-def aggregate_missing_lab(file_mapping_df, lookup_df):
-    print("\n[INFO] Processing Missing Lab...")
-    files = file_mapping_df[file_mapping_df['file_type'] == 'missing_lab']
-    all_records = []
-    for _, row in tqdm(files.iterrows(), total=len(files), desc="   Processing"):
-        study = row['study']
-        filepath = row['filepath']
-        df = read_excel_smart(filepath, 'missing_lab')
-        if df.empty:
-            continue
-        df = standardize_columns(df, 'missing_lab')
-        if 'subject_id' not in df.columns:
-            subject_col = find_column(df.columns.tolist(), ['Subject', 'Subject ID'])
-            if subject_col:
-                df = df.rename(columns={subject_col: 'subject_id'})
-            else:
-                continue
-        for subject_id, group in df.groupby('subject_id'):
-            if pd.isna(subject_id):
-                continue
-            site_id = ''
-            if 'site_id' in group.columns and group['site_id'].notna().any():
-                site_id = str(group['site_id'].iloc[0]).strip()
-            else:
-                lookup_match = lookup_df[(lookup_df['study'] == study) & (lookup_df['subject_id'] == str(subject_id).strip())]
-                if not lookup_match.empty:
-                    site_id = lookup_match['site_id'].iloc[0]
-            all_records.append({'study': study, 'subject_id': str(subject_id).strip(), 'site_id': site_id, 'lab_issues_count': len(group)})
-    result_df = pd.DataFrame(all_records)
-    print(f"   [OK] Missing Lab: {len(result_df)} subject records")
-    return result_df
+    Returns (rows, feeds_lookup): rows holds EDC_BASE_COLUMNS as stripped
+    strings ('' when missing) plus the canonical subject_key join column;
+    feeds_lookup is True when the file has a site column, i.e. its rows also
+    belong in the subject -> site lookup.
+    """
+    df = read_excel_smart(filepath, 'edc_metrics')
+    if df.empty:
+        return pd.DataFrame(columns=EDC_BASE_COLUMNS + [SUBJECT_KEY]), False
+    df = standardize_columns(df, 'edc_metrics')
+    if 'subject_id' not in df.columns:
+        return pd.DataFrame(columns=EDC_BASE_COLUMNS + [SUBJECT_KEY]), False
+    df = df[df['subject_id'].notna()]
+    rows = pd.DataFrame({col: clean_text(df, col) for col in EDC_BASE_COLUMNS[1:]}, index=df.index)
+    rows.insert(0, 'study', study)
+    return add_subject_key(rows.reset_index(drop=True)), 'site_id' in df.columns
+
+def load_edc_metrics(file_mapping_df, file_results=None):
+    """
+    Read every EDC Metrics file once and derive both EDC tables from it.
+
+    Returns:
+        (edc_df, lookup_df): the base subject table and the subject -> site
+        lookup (rows of files that carry a site column)
+    """
+    print("\n[INFO] Loading EDC Metrics (base table + subject -> site lookup)...")
+    edc_files = file_mapping_df[file_mapping_df['file_type'] == 'edc_metrics']
+    parts = _collect_parts(edc_files, _process_edc_file, None, file_results, desc="   Loading EDC files")
+    parts = [(rows, feeds_lookup) for rows, feeds_lookup in parts if not rows.empty]
 
-def aggregate_sae_dashboard(file_mapping_df, lookup_df):
-    print("\n[INFO] Processing SAE Dashboard...")
-    files = file_mapping_df[file_mapping_df['file_type'] == 'sae_dashboard']
-    all_records = []
-    for _, row in tqdm(files.iterrows(), total=len(files), desc="   Processing"):
-        study = row['study']
-        filepath = row['filepath']
-        df = read_excel_smart(filepath, 'sae_dashboard')
-        if df.empty:
-            continue
-        df = standardize_columns(df, 'sae_dashboard')
-        if 'subject_id' not in df.columns:
-            subject_col = find_column(df.columns.tolist(), ['Patient ID', 'Subject', 'Subject ID'])
-            if subject_col:
-                df = df.rename(columns={subject_col: 'subject_id'})
-            else:
-                continue
-        for subject_id, group in df.groupby('subject_id'):
-            if pd.isna(subject_id):
-                continue
-            site_id = ''
-            if 'site_id' in group.columns and group['site_id'].notna().any():
-                site_id = str(group['site_id'].iloc[0]).strip()
-            else:
-                lookup_match = lookup_df[(lookup_df['study'] == study) & (lookup_df['subject_id'] == str(subject_id).strip())]
-                if not lookup_match.empty:
-                    site_id = lookup_match['site_id'].iloc[0]
-            pending_count = 0
-            if 'review_status' in group.columns:
-                pending_count = len(group[group['review_status'] != 'Review Completed'])
-            else:
-                pending_count = len(group)
-            all_records.append({'study': study, 'subject_id': str(subject_id).strip(), 'site_id': site_id, 'sae_total_count': len(group), 'sae_pending_count': pending_count})
-    result_df = pd.DataFrame(all_records)
-    print(f"   [OK] SAE Dashboard: {len(result_df)} subject records")
-    return result_df
+    if parts:
+        edc_df = pd.concat([rows for rows, _ in parts], ignore_index=True)
+        feeds_lookup = np.repeat([flag for _, flag in parts], [len(rows) for rows, _ in parts])
+        lookup_df = edc_df.loc[feeds_lookup, LOOKUP_COLUMNS].reset_index(drop=True)
+    else:
+        edc_df, lookup_df = pd.DataFrame(), pd.DataFrame()
 
-def aggregate_missing_pages(file_mapping_df, lookup_df):
-    print("\n[INFO] Processing Missing Pages...")
-    files = file_mapping_df[file_mapping_df['file_type'] == 'missing_pages']
-    all_records = []
-    for _, row in tqdm(files.iterrows(), total=len(files), desc="   Processing"):
-        study = row['study']
-        filepath = row['filepath']
-        df = read_excel_smart(filepath, 'missing_pages')
-        if df.empty:
-            continue
-        df = standardize_columns(df, 'missing_pages')
-        if 'subject_id' not in df.columns:
-            subject_col = find_column(df.columns.tolist(), ['Subject Name', 'SubjectName', 'Subject'])
-            if subject_col:
-                df = df.rename(columns={subject_col: 'subject_id'})
-            else:
-                continue
-        for subject_id, group in df.groupby('subject_id'):
-            if pd.isna(subject_id):
-                continue
-            site_id = ''
-            if 'site_id' in group.columns and group['site_id'].notna().any():
-                site_id = str(group['site_id'].iloc[0]).strip()
-            else:
-                lookup_match = lookup_df[(lookup_df['study'] == study) & (lookup_df['subject_id'] == str(subject_id).strip())]
-                if not lookup_match.empty:
-                    site_id = lookup_match['site_id'].iloc[0]
-            max_days = 0
-            days_col = find_column(group.columns.tolist(), ['days_missing', 'No. #Days Page Missing', '# of Days Missing'])
-            if days_col and days_col in group.columns:
-                max_days = pd.to_numeric(group[days_col], errors='coerce').max()
-                if pd.isna(max_days):
-                    max_days = 0
-            all_records.append({'study': study, 'subject_id': str(subject_id).strip(), 'site_id': site_id, 'missing_pages_count': len(group), 'max_days_page_missing': max_days})
-    result_df = pd.DataFrame(all_records)
-    print(f"   [OK] Missing Pages: {len(result_df)} subject records")
-    return result_df
+    print(f"   [OK] Lookup table: {len(lookup_df)} subject-site mappings")
+    print(f"   [OK] EDC Metrics: {len(edc_df)} subjects")
+    return edc_df, lookup_df
 
-def aggregate_coding(file_mapping_df, lookup_df, coding_type='meddra'):
-    file_type = f'{coding_type}_coding'
-    print(f"\n[INFO] Processing {coding_type.upper()} Coding...")
+def _process_source_file(study, filepath, subject_index, file_type):
+    """Reduce one non-EDC source file to one row per subject using its spec."""
+    spec = AGGREGATION_SPECS[file_type]
+    df = read_excel_smart(filepath, file_type)
+    if df.empty:
+        return pd.DataFrame()
+    df = standardize_columns(df, file_type)
+    if 'subject_id' not in df.columns:
+        subject_col = find_column(df.columns.tolist(), spec.get('subject_columns', ['Subject', 'Subject ID']))
+        if subject_col:
+            df = df.rename(columns={subject_col: 'subject_id'})
+        else:
+            return pd.DataFrame()
+    df = add_subject_key(df[df['subject_id'].notna()])
+    return aggregate_source_frame(df, study, spec, subject_index, column_finder=find_column)
+
+def aggregate_source(file_mapping_df, subject_index, file_type, file_results=None):
+    """Aggregate every file of one source type (driven by AGGREGATION_SPECS)."""
+    spec = AGGREGATION_SPECS[file_type]
+    label = spec.get('label', file_type)
+    print(f"\n[INFO] Processing {label}...")
     files = file_mapping_df[file_mapping_df['file_type'] == file_type]
-    all_records = []
-    for _, row in tqdm(files.iterrows(), total=len(files), desc="   Processing"):
-        study = row['study']
-        filepath = row['filepath']
-        df = read_excel_smart(filepath, file_type)
-        if df.empty:
-            continue
-        df = standardize_columns(df, file_type)
-        if 'subject_id' not in df.columns:
-            subject_col = find_column(df.columns.tolist(), ['Subject', 'Subject ID'])
-            if subject_col:
-                df = df.rename(columns={subject_col: 'subject_id'})
-            else:
-                continue
-        uncoded_df = df.copy()
-        if 'coding_status' in df.columns:
-            uncoded_df = df[df['coding_status'].str.contains('UnCoded|Uncoded|Not Coded', case=False, na=False)]
-        for subject_id, group in uncoded_df.groupby('subject_id'):
-            if pd.isna(subject_id):
-                continue
-            site_id = ''
-            lookup_match = lookup_df[(lookup_df['study'] == study) & (lookup_df['subject_id'] == str(subject_id).strip())]
-            if not lookup_match.empty:
-                site_id = lookup_match['site_id'].iloc[0]
-            all_records.append({'study': study, 'subject_id': str(subject_id).strip(), 'site_id': site_id, f'uncoded_{coding_type}_count': len(group)})
-    result_df = pd.DataFrame(all_records)
-    print(f"   [OK] {coding_type.upper()} Coding: {len(result_df)} subject records with uncoded terms")
+    parts = _collect_parts(files, partial(_process_source_file, file_type=file_type), subject_index, file_results)
+    parts = [part for part in parts if not part.empty]
+    result_df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    print(f"   [OK] {label}: {len(result_df)} {spec.get('record_label', 'subject records')}")
     return result_df
 
-def aggregate_inactivated(file_mapping_df, lookup_df):
-    print("\n[INFO] Processing Inactivated Forms...")
-    files = file_mapping_df[file_mapping_df['file_type'] == 'inactivated']
-    all_records = []
-    for _, row in tqdm(files.iterrows(), total=len(files), desc="   Processing"):
-        study = row['study']
-        filepath = row['filepath']
-        df = read_excel_smart(filepath, 'inactivated')
-        if df.empty:
-            continue
-        df = standardize_columns(df, 'inactivated')
-        if 'subject_id' not in df.columns:
-            subject_col = find_column(df.columns.tolist(), ['Subject', 'Subject ID'])
-            if subject_col:
-                df = df.rename(columns={subject_col: 'subject_id'})
-            else:
-                continue
-        for subject_id, group in df.groupby('subject_id'):
-            if pd.isna(subject_id):
-                continue
-            site_id = ''
-            if 'site_id' in group.columns and group['site_id'].notna().any():
-                site_id = str(group['site_id'].iloc[0]).strip()
-            else:
-                lookup_match = lookup_df[(lookup_df['study'] == study) & (lookup_df['subject_id'] == str(subject_id).strip())]
-                if not lookup_match.empty:
-                    site_id = lookup_match['site_id'].iloc[0]
-            all_records.append({'study': study, 'subject_id': str(subject_id).strip(), 'site_id': site_id, 'inactivated_forms_count': len(group)})
-    result_df = pd.DataFrame(all_records)
-    print(f"   [OK] Inactivated: {len(result_df)} subject records")
-    return result_df
+# Per-file processors, used by worker processes in parallel mode
+FILE_PROCESSORS = {
+    'edc_metrics': _process_edc_file,
+    **{file_type: partial(_process_source_file, file_type=file_type) for file_type in AGGREGATION_SPECS},
+}
 
-def aggregate_edrr(file_mapping_df, lookup_df):
-    print("\n[INFO] Processing EDRR...")
-    files = file_mapping_df[file_mapping_df['file_type'] == 'edrr']
-    all_records = []
-    for _, row in tqdm(files.iterrows(), total=len(files), desc="   Processing"):
-        study = row['study']
-        filepath = row['filepath']
-        df = read_excel_smart(filepath, 'edrr')
-        if df.empty:
-            continue
-        df = standardize_columns(df, 'edrr')
-        if 'subject_id' not in df.columns:
-            subject_col = find_column(df.columns.tolist(), ['Subject', 'Subject ID'])
-            if subject_col:
-                df = df.rename(columns={subject_col: 'subject_id'})
-            else:
-                continue
-        for _, r in df.iterrows():
-            subject_id = r.get('subject_id')
-            if pd.isna(subject_id):
-                continue
-            site_id = ''
-            lookup_match = lookup_df[(lookup_df['study'] == study) & (lookup_df['subject_id'] == str(subject_id).strip())]
-            if not lookup_match.empty:
-                site_id = lookup_match['site_id'].iloc[0]
-            open_issues = 0
-            issues_col = find_column(df.columns.tolist(), ['open_issues', 'Total Open issue Count per subject', 'Open Issues'])
-            if issues_col and issues_col in r.index:
-                open_issues = pd.to_numeric(r[issues_col], errors='coerce')
-                if pd.isna(open_issues):
-                    open_issues = 0
-            all_records.append({'study': study, 'subject_id': str(subject_id).strip(), 'site_id': site_id, 'edrr_open_issues': int(open_issues)})
-    result_df = pd.DataFrame(all_records)
-    print(f"   [OK] EDRR: {len(result_df)} subject records")
-    return result_df
+# ============================================================================
+# INCREMENTAL BUILD
+# ============================================================================
+
+# Bump when the pre-capping subject rows change shape or meaning
+_INCREMENTAL_STATE_VERSION = 2
+SITE_KEYS = ['study', 'site_id', 'country', 'region']
+
+def _build_digest():
+    """Hash of the configuration the per-study partials depend on."""
+    return config_digest(_INCREMENTAL_STATE_VERSION, COLUMN_MAPPINGS, AGGREGATION_SPECS)
+
+def _study_order(file_mapping_df):
+    """Studies in the order their rows appear in a full build (first EDC file first)."""
+    edc_studies = file_mapping_df.loc[file_mapping_df['file_type'] == 'edc_metrics', 'study']
+    return list(dict.fromkeys(list(edc_studies.astype(str)) + list(file_mapping_df['study'].astype(str))))
+
+def _order_columns(master_subject):
+    """Restore full-build column order after splicing partials with differing columns."""
+    ordered = [c for c in EDC_BASE_COLUMNS if c in master_subject.columns]
+    for spec in AGGREGATION_SPECS.values():
+        ordered += [c for c in spec_metric_columns(spec)[0] if c in master_subject.columns and c not in ordered]
+    ordered += [c for c in master_subject.columns if c not in ordered]
+    return master_subject[ordered]
+
+def ingest_studies(file_mapping_df, workers=1):
+    """
+    Ingest and merge the files of the given file mapping.
+
+    Returns the merged subject table before outlier capping and fills, so
+    rows of one study depend only on that study's input files.
+    """
+    edc_results, file_results = None, None
+    if workers > 1:
+        print(f"\n[INFO] Parallel ingestion with {workers} workers")
+        edc_results = ingest_files_parallel(file_mapping_df, ['edc_metrics'], None, workers)
+
+    # One pass over the EDC workbooks feeds both the base table and the index
+    edc_df, lookup_df = load_edc_metrics(file_mapping_df, edc_results)
+    subject_index = SubjectIndex(lookup_df)
+
+    if workers > 1:
+        file_results = ingest_files_parallel(file_mapping_df, list(AGGREGATION_SPECS), subject_index, workers)
+
+    source_frames = {
+        file_type: aggregate_source(file_mapping_df, subject_index, file_type, file_results)
+        for file_type in AGGREGATION_SPECS
+    }
+
+    print("\n" + "=" * 70)
+    print("MERGING INTO MASTER SUBJECT TABLE")
+    print("=" * 70)
+
+    # Every merge joins on the canonical key; the key itself is not an output column
+    merged = merge_source_aggregates(edc_df, source_frames, AGGREGATION_SPECS, ['study', SUBJECT_KEY])
+    return merged.drop(columns=SUBJECT_KEY, errors='ignore')
+
+def _studies_with_changed_rows(previous, current):
+    """Studies whose final subject rows differ from the previous build."""
+    previous_rows = {study: rows.reset_index(drop=True) for study, rows in previous.groupby('study', sort=False)}
+    changed = set(previous_rows) - set(current['study'])
+    for study, rows in current.groupby('study', sort=False):
+        before = previous_rows.get(study)
+        if before is None or not before.equals(rows.reset_index(drop=True)):
+            changed.add(study)
+    return changed
+
+def _splice_rollup(previous, master_subject, affected, builder, sort_keys):
+    """Rebuild rollup rows of the affected studies and splice them into the previous table."""
+    kept = previous[~previous['study'].isin(affected)]
+    rebuilt = builder(master_subject[master_subject['study'].isin(affected)])
+    parts = [part for part in (kept, rebuilt) if not part.empty]
+    if not parts:
+        return builder(master_subject)
+    return pd.concat(parts, ignore_index=True).sort_values(sort_keys).reset_index(drop=True)
+
+def save_build_state(store, inputs, digest, manifest, dirty, removed, partial_rows, tables):
+    """
+    Store per-study partials, output tables and the manifest for the next run.
+
+    Only partials of rebuilt studies are rewritten. The manifest is written
+    last, so an interrupted save forces a full build next time.
+    """
+    try:
+        if not manifest:
+            store.clear()
+        store.begin_save()
+        keys = set(manifest.get('partials', [])) - set(removed) - set(dirty)
+        for study in removed:
+            store.delete_partial(study)
+        if not partial_rows.empty:
+            for study, rows in partial_rows.groupby('study', sort=False):
+                if str(study) in dirty:
+                    store.write_partial(str(study), rows)
+                    keys.add(str(study))
+        for study in set(dirty) - keys:
+            store.delete_partial(study)
+        for name, table in tables.items():
+            store.write_table(name, table)
+        store.save_manifest(inputs, digest, keys)
+        print(f"[OK] Saved build state: {store.dir} ({len(keys)} study partials)")
+    except Exception as e:
+        print(f"[WARN] Could not save build state: {e}")
+
+# ============================================================================
+# ROLLUP FUNCTIONS
+# ============================================================================
+
+def build_site_table(master_subject):
+    site_agg_cols = {'subject_id': 'count', 'missing_visit_count': 'sum', 'lab_issues_count': 'sum', 'sae_total_count': 'sum', 'sae_pending_count': 'sum', 'missing_pages_count': 'sum', 'uncoded_meddra_count': 'sum', 'uncoded_whodd_count': 'sum', 'inactivated_forms_count': 'sum', 'edrr_open_issues': 'sum'}
+    site_agg_cols = {k: v for k, v in site_agg_cols.items() if k in master_subject.columns}
+    master_site = master_subject.groupby(SITE_KEYS).agg(site_agg_cols).reset_index()
+    return master_site.rename(columns={'subject_id': 'subject_count'})
+
+def build_study_table(master_subject):
+    study_agg_cols = {'subject_id': 'count', 'site_id': 'nunique', 'missing_visit_count': 'sum', 'lab_issues_count': 'sum', 'sae_total_count': 'sum', 'sae_pending_count': 'sum', 'missing_pages_count': 'sum', 'total_uncoded_count': 'sum', 'inactivated_forms_count': 'sum', 'edrr_open_issues': 'sum'}
+    study_agg_cols = {k: v for k, v in study_agg_cols.items() if k in master_subject.columns}
+    master_study = master_subject.groupby('study').agg(study_agg_cols).reset_index()
+    return master_study.rename(columns={'subject_id': 'subject_count', 'site_id': 'site_count'})
 
 # ============================================================================
 # MAIN BUILD FUNCTION
 # ============================================================================
 
-def build_master_tables(output_dir=None):
+def build_master_tables(output_dir=None, workers=1, incremental=False):
+    """
+    Build the master subject, site and study tables.
+
+    Args:
+        output_dir: Output directory (defaults to outputs/phase02)
+        workers: Number of worker processes for workbook ingestion.
+            1 keeps the serial path; 0 uses all available cores.
+        incremental: Re-ingest only studies whose input files changed since
+            the last build and reuse the stored partials of the others.
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
     _output_dir = Path(output_dir) if output_dir else PHASE_DIRS['phase_02']
     _file_mapping_path = PHASE_DIRS['phase_01'] / "file_mapping.csv"
 
@@ -567,55 +516,44 @@ def build_master_tables(output_dir=None):
     file_mapping_df = pd.read_csv(_file_mapping_path)
     print(f"\n[INFO] Loaded file mapping: {len(file_mapping_df)} files from {file_mapping_df['study'].nunique()} studies")
 
-    lookup_df = load_edc_lookup(file_mapping_df)
-    edc_df = aggregate_edc_metrics(file_mapping_df, lookup_df)
-    visit_df = aggregate_visit_tracker(file_mapping_df, lookup_df)
-    lab_df = aggregate_missing_lab(file_mapping_df, lookup_df)
-    sae_df = aggregate_sae_dashboard(file_mapping_df, lookup_df)
-    pages_df = aggregate_missing_pages(file_mapping_df, lookup_df)
-    meddra_df = aggregate_coding(file_mapping_df, lookup_df, 'meddra')
-    whodd_df = aggregate_coding(file_mapping_df, lookup_df, 'whodd')
-    inactivated_df = aggregate_inactivated(file_mapping_df, lookup_df)
-    edrr_df = aggregate_edrr(file_mapping_df, lookup_df)
-
-    print("\n" + "=" * 70)
-    print("MERGING INTO MASTER SUBJECT TABLE")
-    print("=" * 70)
-
-    master_subject = edc_df.copy()
-    merge_keys = ['study', 'subject_id']
-
-    if not visit_df.empty:
-        visit_df_agg = visit_df.groupby(merge_keys).agg({'missing_visit_count': 'sum', 'max_days_outstanding': 'max'}).reset_index()
-        master_subject = master_subject.merge(visit_df_agg, on=merge_keys, how='left')
-
-    if not lab_df.empty:
-        lab_df_agg = lab_df.groupby(merge_keys).agg({'lab_issues_count': 'sum'}).reset_index()
-        master_subject = master_subject.merge(lab_df_agg, on=merge_keys, how='left')
-
-    if not sae_df.empty:
-        sae_df_agg = sae_df.groupby(merge_keys).agg({'sae_total_count': 'sum', 'sae_pending_count': 'sum'}).reset_index()
-        master_subject = master_subject.merge(sae_df_agg, on=merge_keys, how='left')
-
-    if not pages_df.empty:
-        pages_df_agg = pages_df.groupby(merge_keys).agg({'missing_pages_count': 'sum', 'max_days_page_missing': 'max'}).reset_index()
-        master_subject = master_subject.merge(pages_df_agg, on=merge_keys, how='left')
-
-    if not meddra_df.empty:
-        meddra_df_agg = meddra_df.groupby(merge_keys).agg({'uncoded_meddra_count': 'sum'}).reset_index()
-        master_subject = master_subject.merge(meddra_df_agg, on=merge_keys, how='left')
-
-    if not whodd_df.empty:
-        whodd_df_agg = whodd_df.groupby(merge_keys).agg({'uncoded_whodd_count': 'sum'}).reset_index()
-        master_subject = master_subject.merge(whodd_df_agg, on=merge_keys, how='left')
-
-    if not inactivated_df.empty:
-        inactivated_df_agg = inactivated_df.groupby(merge_keys).agg({'inactivated_forms_count': 'sum'}).reset_index()
-        master_subject = master_subject.merge(inactivated_df_agg, on=merge_keys, how='left')
+    # Change detection
+    store = PartialStore('phase02')
+    digest = _build_digest()
+    studies = _study_order(file_mapping_df)
+    inputs = fingerprint_inputs(file_mapping_df) if store.available else {}
+    manifest = {}
+    if incremental:
+        if not store.available:
+            print("\n[WARN] pyarrow not installed - incremental build unavailable, running a full build")
+        else:
+            manifest = store.load_manifest(digest)
+            if not manifest:
+                print("\n[INFO] No usable state from a previous build - running a full build")
+
+    if manifest:
+        dirty, removed = diff_fingerprints(manifest['inputs'], inputs)
+        print(f"\n[INFO] Incremental build: {len(dirty)} of {len(studies)} studies changed, {len(removed)} removed")
+        for study in sorted(dirty):
+            print(f"   - {study}")
+    else:
+        dirty, removed = set(studies), set()
 
-    if not edrr_df.empty:
-        edrr_df_agg = edrr_df.groupby(merge_keys).agg({'edrr_open_issues': 'sum'}).reset_index()
-        master_subject = master_subject.merge(edrr_df_agg, on=merge_keys, how='left')
+    if dirty:
+        merged = ingest_studies(file_mapping_df[file_mapping_df['study'].astype(str).isin(dirty)], workers)
+    else:
+        print("\n[OK] No input changes since the last build")
+        merged = pd.DataFrame()
+
+    if manifest:
+        rebuilt = {str(study): rows for study, rows in merged.groupby('study', sort=False)} if not merged.empty else {}
+        parts = [rebuilt[study] if study in dirty else store.read_partial(study)
+                 for study in studies if study in rebuilt or (study not in dirty and study in manifest['partials'])]
+        parts = [part for part in parts if not part.empty]
+        master_subject = _order_columns(pd.concat(parts, ignore_index=True)) if parts else pd.DataFrame()
+        print(f"[OK] Reused stored partials for {len(studies) - len(dirty)} unchanged studies")
+    else:
+        master_subject = merged
+    partial_rows = master_subject.copy() if store.available else None
 
     # Data quality fixes
     print("\n[INFO] Applying outlier capping (IQR * 3)...")
@@ -644,27 +582,36 @@ def build_master_tables(output_dir=None):
     print(f"\n[OK] Master Subject Table: {len(master_subject)} rows")
     print(f"   Columns: {list(master_subject.columns)}")
 
+    # Rollups: splice rebuilt rows of affected studies into the previous tables
+    previous = {name: store.read_table(name) for name in ('master_subject', 'master_site', 'master_study')} if manifest else {}
+    affected = None
+    if manifest and all(table is not None for table in previous.values()) \
+            and list(previous['master_subject'].columns) == list(master_subject.columns):
+        affected = _studies_with_changed_rows(previous['master_subject'], master_subject)
+
     # Site-level aggregation
     print("\n" + "=" * 70)
     print("CREATING SITE-LEVEL AGGREGATION")
     print("=" * 70)
 
-    site_agg_cols = {'subject_id': 'count', 'missing_visit_count': 'sum', 'lab_issues_count': 'sum', 'sae_total_count': 'sum', 'sae_pending_count': 'sum', 'missing_pages_count': 'sum', 'uncoded_meddra_count': 'sum', 'uncoded_whodd_count': 'sum', 'inactivated_forms_count': 'sum', 'edrr_open_issues': 'sum'}
-    site_agg_cols = {k: v for k, v in site_agg_cols.items() if k in master_subject.columns}
-    master_site = master_subject.groupby(['study', 'site_id', 'country', 'region']).agg(site_agg_cols).reset_index()
-    master_site = master_site.rename(columns={'subject_id': 'subject_count'})
-    print(f"[OK] Master Site Table: {len(master_site)} rows")
+    if affected is None:
+        master_site = build_site_table(master_subject)
+        print(f"[OK] Master Site Table: {len(master_site)} rows")
+    else:
+        master_site = _splice_rollup(previous['master_site'], master_subject, affected, build_site_table, SITE_KEYS)
+        print(f"[OK] Master Site Table: {len(master_site)} rows ({len(affected)} studies recomputed)")
 
     # Study-level aggregation
     print("\n" + "=" * 70)
     print("CREATING STUDY-LEVEL AGGREGATION")
     print("=" * 70)
 
-    study_agg_cols = {'subject_id': 'count', 'site_id': 'nunique', 'missing_visit_count': 'sum', 'lab_issues_count': 'sum', 'sae_total_count': 'sum', 'sae_pending_count': 'sum', 'missing_pages_count': 'sum', 'total_uncoded_count': 'sum', 'inactivated_forms_count': 'sum', 'edrr_open_issues': 'sum'}
-    study_agg_cols = {k: v for k, v in study_agg_cols.items() if k in master_subject.columns}
-    master_study = master_subject.groupby('study').agg(study_agg_cols).reset_index()
-    master_study = master_study.rename(columns={'subject_id': 'subject_count', 'site_id': 'site_count'})
-    print(f"[OK] Master Study Table: {len(master_study)} rows")
+    if affected is None:
+        master_study = build_study_table(master_subject)
+        print(f"[OK] Master Study Table: {len(master_study)} rows")
+    else:
+        master_study = _splice_rollup(previous['master_study'], master_subject, affected, build_study_table, ['study'])
+        print(f"[OK] Master Study Table: {len(master_study)} rows ({len(affected)} studies recomputed)")
 
     # Save outputs
     print("\n" + "=" * 70)
@@ -672,13 +619,17 @@ def build_master_tables(output_dir=None):
     print("=" * 70)
 
     _output_dir.mkdir(exist_ok=True)
-    master_subject.to_csv(_output_dir / "master_subject.csv", index=False)
+    write_table(master_subject, _output_dir / "master_subject.csv")
     print(f"[OK] Saved: {_output_dir}/master_subject.csv ({len(master_subject)} subjects)")
-    master_site.to_csv(_output_dir / "master_site.csv", index=False)
+    write_table(master_site, _output_dir / "master_site.csv")
     print(f"[OK] Saved: {_output_dir}/master_site.csv ({len(master_site)} sites)")
-    master_study.to_csv(_output_dir / "master_study.csv", index=False)
+    write_table(master_study, _output_dir / "master_study.csv")
     print(f"[OK] Saved: {_output_dir}/master_study.csv ({len(master_study)} studies)")
 
+    if store.available:
+        save_build_state(store, inputs, digest, manifest, dirty, removed, partial_rows,
+                         {'master_subject': master_subject, 'master_site': master_site, 'master_study': master_study})
+
     # Summary
     print("\n" + "=" * 70)
     print("SUMMARY STATISTICS")
@@ -707,4 +658,17 @@ def build_master_tables(output_dir=None):
 # ============================================================================
 
 if __name__ == "__main__":
-    build_master_tables()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JAVELIN.AI Build Master Tables")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for workbook ingestion (1 = serial, 0 = all cores)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Rebuild only studies whose input files changed since the last run")
+
+    args = parser.parse_args()
+
+    success = build_master_tables(workers=args.workers, incremental=args.incremental)
+
+    if not success:
+        exit(1)
@@ -10,6 +10,27 @@ Prerequisites:
 
 Usage:
     python src/phases/03_calculate_dqi.py
+    python src/phases/03_calculate_dqi.py --frozen
+    python src/phases/03_calculate_dqi.py --incremental
+    python src/phases/03_calculate_dqi.py --score changed_subjects.csv
+    python src/phases/03_calculate_dqi.py --chunk-size 500000
+
+CLI Options:
+    --frozen        Score against the saved scoring model instead of
+                    re-estimating reference maxima and the High threshold
+                    (re-baselining is a full run without this flag).
+    --incremental   Rescore only subjects whose master_subject row changed since
+                    the last run, against the saved model, and update site
+                    aggregates by retracting old and adding new rows.
+    --score FILE    Score only the subject rows in FILE (CSV or Parquet, the
+                    master_subject columns) against the saved model and write
+                    outputs/phase03/scored_subjects.csv; the rest of the
+                    portfolio is not read.
+    --chunk-size N  Out-of-core mode for portfolios that do not fit in memory:
+                    a statistics pass (sketched reference maxima and High
+                    threshold; skipped with --frozen) and a scoring pass that
+                    streams N subjects at a time, writes the subject table per
+                    chunk and accumulates site aggregates in the rollup cube.
 
 Output:
     - outputs/phase03/master_subject_with_dqi.csv    # Subjects with DQI scores
@@ -18,6 +39,9 @@ Output:
     - outputs/phase03/master_region_with_dqi.csv     # Regional quality metrics
     - outputs/phase03/master_country_with_dqi.csv    # Country-level metrics
     - outputs/phase03/dqi_report.txt                 # Human-readable summary
+    - outputs/phase03/dqi_scoring_model.json         # Frozen scoring baseline
+    - outputs/phase03/rollup_cube.parquet            # Site-grain cube for any rollup
+    - outputs/phase03/dqi_components.npy             # Per-feature component scores
 
 DQI Scoring:
     - 0.00 = Perfect (no issues)
@@ -93,6 +117,19 @@ except ImportError:
         SITE_MEDIUM_PERCENTILE = 0.50
 
 MASTER_SUBJECT_PATH = PHASE_DIRS['phase_02'] / "master_subject.csv"
+SCORING_MODEL_PATH = PHASE_DIRS['phase_03'] / "dqi_scoring_model.json"
+SCORED_SUBJECTS_PATH = PHASE_DIRS['phase_03'] / "scored_subjects.csv"
+ROLLUP_CUBE_PATH = PHASE_DIRS['phase_03'] / "rollup_cube.parquet"
+COMPONENT_STORE_PATH = PHASE_DIRS['phase_03'] / "dqi_components.npy"
+
+from utils.table_io import read_table, write_table, table_exists, widen_float32, HAS_PYARROW, \
+    iter_table, TableWriter
+from utils.dqi_calculator import feature_matrix, reference_maxima, dqi_kernel
+from utils.scoring_model import ScoringModel, load_scoring_model
+from utils.incremental import PartialStore, config_digest
+from utils.rollup_cube import RollupCube, CUBE_DIMENSIONS
+from utils.quantile_sketch import KLLSketch
+from utils.component_store import ComponentStore, ComponentWriter, drop_component_columns
 
 _total_weight = sum(f['weight'] for f in FEATURE_WEIGHTS.values())
 assert abs(_total_weight - 1.0) < 0.001, f"Weights must sum to 1.0, got {_total_weight}"
@@ -102,60 +139,62 @@ assert abs(_total_weight - 1.0) < 0.001, f"Weights must sum to 1.0, got {_total_
 # SCORING FUNCTIONS
 # ============================================================================
 
-def calculate_component_score(series, weight):
-    """Calculate weighted score for a single feature using Binary + Severity."""
-    if series.max()==0:
-        return pd.Series(0.0, index=series.index)
-
-    binary = (series > 0).astype(float)
-    non_zero_values = series[series > 0]
-    MIN_SAMPLES = getattr(THRESHOLDS, 'MIN_SAMPLES_FOR_PERCENTILE', 20)
-
-    if len(non_zero_values) >= MIN_SAMPLES:
-        p95 = non_zero_values.quantile(0.95)
-        reference_max = p95 if p95 > 0 else non_zero_values.max()
-    elif len(non_zero_values) > 0:
-        reference_max = non_zero_values.max()
+def calculate_subject_dqi(df, model=None):
+    """
+    Calculate DQI score for each subject (one matrix pass, see utils.dqi_kernel).
+
+    Reference maxima are estimated from df, or taken from a frozen
+    ScoringModel (whose features and weights are then used as well).
+    """
+    if model is not None:
+        features, weights, refs = model.features, model.weights, model.reference_maxima
+        issue_columns = [f for f in features if f!='n_issue_types']
+        n_issue_types = (df[issue_columns] > 0).sum(axis=1)
+        source = df.assign(n_issue_types=n_issue_types)
+        X = feature_matrix(source, features)
     else:
-        reference_max = 1.0
+        issue_columns = [col for col in FEATURE_WEIGHTS.keys() if col in df.columns and col!='n_issue_types']
+        n_issue_types = (df[issue_columns] > 0).sum(axis=1)
+        source = df.assign(n_issue_types=n_issue_types)
 
-    severity = (series / reference_max).clip(0, 1)
-    score = weight * (0.5 * binary + 0.5 * severity)
-    return score
+        features = [f for f in FEATURE_WEIGHTS.keys() if f in source.columns]
+        weights = [FEATURE_WEIGHTS[f]['weight'] for f in features]
+        MIN_SAMPLES = getattr(THRESHOLDS, 'MIN_SAMPLES_FOR_PERCENTILE', 20)
+        X = feature_matrix(source, features)
+        refs = reference_maxima(X, min_samples=MIN_SAMPLES, min_reference=None)
 
+    scores, component_matrix = dqi_kernel(X, weights, refs=refs)
 
-def calculate_subject_dqi(df):
-    """Calculate DQI score for each subject."""
-    df = df.copy()
-    issue_columns = [col for col in FEATURE_WEIGHTS.keys() if col in df.columns and col!='n_issue_types']
-    df['n_issue_types'] = (df[issue_columns] > 0).sum(axis=1)
-
-    df['dqi_score'] = 0.0
+    new_columns = {'n_issue_types':n_issue_types, 'dqi_score':widen_float32(scores)}
     components = {}
-
-    for feature, config in FEATURE_WEIGHTS.items():
-        if feature not in df.columns:
-            continue
-        component = calculate_component_score(df[feature], config['weight'])
-        df[f'{feature}_component'] = component
-        df['dqi_score'] += component
+    for j, feature in enumerate(features):
+        component = widen_float32(component_matrix[:, j])
+        new_columns[f'{feature}_component'] = component
+        raw = source[feature]
 
         components[feature] = {
-            'weight':config['weight'],
-            'tier':config['tier'],
-            'subjects_with_issue':(df[feature] > 0).sum(),
-            'mean_raw_value':df[feature].mean(),
-            'max_raw_value':df[feature].max(),
-            'mean_component':component.mean(),
-            'max_component':component.max(),
+            'weight':weights[j],
+            'tier':FEATURE_WEIGHTS.get(feature, {}).get('tier', 'Unknown'),
+            'reference_max':float(refs[j]),
+            'subjects_with_issue':(raw > 0).sum(),
+            'mean_raw_value':raw.mean(),
+            'max_raw_value':raw.max(),
+            'mean_component':np.nanmean(component) if len(component) else np.nan,
+            'max_component':np.nanmax(component) if len(component) else np.nan,
         }
 
-    df['dqi_score'] = df['dqi_score'].clip(0, 1)
+    df = df.drop(columns=[c for c in new_columns if c in df.columns])
+    df = pd.concat([df, pd.DataFrame(new_columns, index=df.index)], axis=1)
     return df, components
 
 
-def assign_risk_categories(df):
-    """Assign risk categories based on DQI score with guaranteed capture."""
+def assign_risk_categories(df, high_threshold=None):
+    """
+    Assign risk categories based on DQI score with guaranteed capture.
+
+    The High threshold is the 90th percentile of non-SAE scores unless a
+    frozen one is passed in.
+    """
     df = df.copy()
     df['has_issues'] = (df['n_issue_types'] > 0).astype(int)
 
@@ -163,13 +202,13 @@ def assign_risk_categories(df):
     if 'sae_pending_count' in df.columns:
         sae_mask = df['sae_pending_count'] > 0
 
-    non_sae_with_issues = df[(df['has_issues']==1) & (~sae_mask)]
-
-    if len(non_sae_with_issues) > 0:
-        high_threshold = non_sae_with_issues['dqi_score'].quantile(0.90)
-        high_threshold = max(high_threshold, 0.10)
-    else:
-        high_threshold = 0.20
+    if high_threshold is None:
+        non_sae_with_issues = df[(df['has_issues']==1) & (~sae_mask)]
+        if len(non_sae_with_issues) > 0:
+            high_threshold = non_sae_with_issues['dqi_score'].quantile(0.90)
+            high_threshold = max(high_threshold, 0.10)
+        else:
+            high_threshold = 0.20
 
     medium_threshold = 0.001
 
@@ -187,43 +226,26 @@ def assign_risk_categories(df):
     return df, thresholds, overrides
 
 
-def aggregate_site_dqi(df):
-    """Aggregate subject-level DQI to site level."""
-    df = df.copy()
-    df['is_high'] = (df['risk_category']=='High').astype(int)
-    df['is_medium'] = (df['risk_category']=='Medium').astype(int)
-
-    agg_dict = {
-        'subject_id':'count',
-        'dqi_score':['mean', 'max', 'std'],
-        'n_issue_types':['sum', 'mean'],
-        'is_high':'sum',
-        'is_medium':'sum',
-        'has_issues':'sum',
-    }
-
-    for feature in FEATURE_WEIGHTS.keys():
-        if feature in df.columns and feature!='n_issue_types':
-            agg_dict[feature] = 'sum'
-
-    site_df = df.groupby(['study', 'site_id', 'country', 'region']).agg(agg_dict)
-    site_df.columns = ['_'.join(col).strip('_') if isinstance(col, tuple) else col for col in site_df.columns]
-    site_df = site_df.reset_index()
-
-    rename_map = {
-        'subject_id_count':'subject_count',
-        'dqi_score_mean':'avg_dqi_score',
-        'dqi_score_max':'max_dqi_score',
-        'dqi_score_std':'std_dqi_score',
-        'n_issue_types_sum':'total_issue_types',
-        'n_issue_types_mean':'avg_issue_types',
-        'is_high_sum':'high_risk_count',
-        'is_medium_sum':'medium_risk_count',
-        'has_issues_sum':'subjects_with_issues',
-    }
-    site_df = site_df.rename(columns=rename_map)
-    site_df['std_dqi_score'] = site_df['std_dqi_score'].fillna(0)
-
+def site_table_from_cube(cube):
+    """Site table (one row per cube cell) with site risk categories."""
+    cells = cube.cells
+    scores = cube.site_scores()
+    site_df = cells[CUBE_DIMENSIONS].copy()
+    site_df['subject_count'] = cells['subject_count']
+    site_df['avg_dqi_score'] = scores['avg_dqi_score']
+    site_df['max_dqi_score'] = cells['max_dqi_score']
+    site_df['std_dqi_score'] = scores['std_dqi_score']
+    site_df['total_issue_types'] = cells['total_issue_types']
+    site_df['avg_issue_types'] = cells['total_issue_types'] / cells['subject_count']
+    for col in ['high_risk_count', 'medium_risk_count', 'subjects_with_issues']:
+        site_df[col] = cells[col]
+    for feature in cube.sum_features:
+        site_df[f'{feature}_sum'] = cells[f'{feature}_sum']
+    return assign_site_risk(site_df)
+
+
+def assign_site_risk(site_df):
+    """Assign site risk categories from percentiles of the average site DQI."""
     sites_with_issues = site_df[site_df['avg_dqi_score'] > 0]['avg_dqi_score']
     if len(sites_with_issues) > 0:
         site_high_thresh = sites_with_issues.quantile(0.85)
@@ -242,48 +264,18 @@ def aggregate_site_dqi(df):
     return site_df, site_thresholds
 
 
-def aggregate_to_study_level(site_df):
-    """Aggregate site-level DQI to study level."""
-    agg_dict = {
-        'site_id':'count',
-        'subject_count':'sum',
-        'avg_dqi_score':['mean', 'max', 'std'],
-        'high_risk_count':'sum',
-        'medium_risk_count':'sum',
-        'subjects_with_issues':'sum',
-    }
-
+def aggregate_to_study_level(cube):
+    """Roll the site cells up to study level (cube with site risk)."""
     issue_cols = ['sae_pending_count_sum', 'missing_visit_count_sum', 'missing_pages_count_sum',
                   'lab_issues_count_sum', 'uncoded_meddra_count_sum', 'uncoded_whodd_count_sum',
                   'inactivated_forms_count_sum', 'edrr_open_issues_sum']
-    for col in issue_cols:
-        if col in site_df.columns:
-            agg_dict[col] = 'sum'
-
-    study_df = site_df.groupby('study').agg(agg_dict)
-    study_df.columns = ['_'.join(col).strip('_') if isinstance(col, tuple) else col for col in study_df.columns]
-    study_df = study_df.reset_index()
-
-    rename_map = {
-        'site_id_count':'site_count',
-        'subject_count_sum':'subject_count',
-        'avg_dqi_score_mean':'avg_dqi_score',
-        'avg_dqi_score_max':'max_site_dqi_score',
-        'avg_dqi_score_std':'std_dqi_score',
-        'high_risk_count_sum':'high_risk_subjects',
-        'medium_risk_count_sum':'medium_risk_subjects',
-        'subjects_with_issues_sum':'subjects_with_issues',
-    }
-    study_df = study_df.rename(columns=rename_map)
-    if 'std_dqi_score' in study_df.columns:
-        study_df['std_dqi_score'] = study_df['std_dqi_score'].fillna(0)
-
-    study_df['high_risk_rate'] = study_df['high_risk_subjects'] / study_df['subject_count']
-    study_df['issue_rate'] = study_df['subjects_with_issues'] / study_df['subject_count']
-
-    high_risk_sites = site_df[site_df['site_risk_category']=='High'].groupby('study').size()
-    study_df['high_risk_sites'] = study_df['study'].map(high_risk_sites).fillna(0).astype(int)
-    study_df['high_risk_site_rate'] = study_df['high_risk_sites'] / study_df['site_count']
+    study_df = cube.rollup('study')
+    columns = ['study', 'site_count', 'subject_count', 'avg_dqi_score', 'max_site_dqi_score', 'std_dqi_score',
+               'high_risk_subjects', 'medium_risk_subjects', 'subjects_with_issues'] + \
+              [col for col in issue_cols if col in study_df.columns] + \
+              ['high_risk_rate', 'issue_rate', 'high_risk_sites', 'high_risk_site_rate']
+    # Issue totals keep the '<feature>_sum_sum' names of the published study table
+    study_df = study_df[columns].rename(columns={col:f'{col}_sum' for col in issue_cols})
 
     studies_with_issues = study_df[study_df['avg_dqi_score'] > 0]['avg_dqi_score']
     if len(studies_with_issues) > 0:
@@ -304,57 +296,26 @@ def aggregate_to_study_level(site_df):
     return study_df, study_thresholds
 
 
-def aggregate_to_region_level(site_df):
-    """Aggregate site-level DQI to region and country levels."""
-    # Region aggregation
-    region_agg = {
-        'site_id':'count', 'subject_count':'sum', 'avg_dqi_score':['mean', 'max', 'std'],
-        'high_risk_count':'sum', 'medium_risk_count':'sum', 'subjects_with_issues':'sum',
-        'study':'nunique', 'country':'nunique',
-    }
-    region_df = site_df.groupby('region').agg(region_agg)
-    region_df.columns = ['_'.join(col).strip('_') if isinstance(col, tuple) else col for col in region_df.columns]
-    region_df = region_df.reset_index()
-    region_df = region_df.rename(columns={
-        'site_id_count':'site_count', 'subject_count_sum':'subject_count',
-        'avg_dqi_score_mean':'avg_dqi_score', 'avg_dqi_score_max':'max_dqi_score',
-        'avg_dqi_score_std':'std_dqi_score', 'high_risk_count_sum':'high_risk_subjects',
-        'medium_risk_count_sum':'medium_risk_subjects', 'subjects_with_issues_sum':'subjects_with_issues',
-        'study_nunique':'study_count', 'country_nunique':'country_count',
-    })
-    region_df['std_dqi_score'] = region_df['std_dqi_score'].fillna(0)
-    region_df['high_risk_rate'] = region_df['high_risk_subjects'] / region_df['subject_count']
-    region_df['issue_rate'] = region_df['subjects_with_issues'] / region_df['subject_count']
-    high_risk_sites = site_df[site_df['site_risk_category']=='High'].groupby('region').size()
-    region_df['high_risk_sites'] = region_df['region'].map(high_risk_sites).fillna(0).astype(int)
-    region_df['high_risk_site_rate'] = region_df['high_risk_sites'] / region_df['site_count']
+def aggregate_to_region_level(cube):
+    """Roll the site cells up to region and country levels (cube with site risk)."""
+    rollup_columns = ['site_count', 'subject_count', 'avg_dqi_score', 'max_dqi_score', 'std_dqi_score',
+                      'high_risk_subjects', 'medium_risk_subjects', 'subjects_with_issues']
+    rate_columns = ['high_risk_rate', 'issue_rate', 'high_risk_sites', 'high_risk_site_rate']
+
+    # Region aggregation (max_dqi_score is the highest site average, as at study level)
+    region_df = cube.rollup('region').drop(columns='max_dqi_score').rename(
+        columns={'max_site_dqi_score':'max_dqi_score'})
+    region_df = region_df[['region'] + rollup_columns + ['study_count', 'country_count'] + rate_columns]
     region_df['region_risk_category'] = 'Low'
     region_df.loc[region_df['avg_dqi_score'] >= region_df['avg_dqi_score'].median(), 'region_risk_category'] = 'Medium'
     region_df.loc[
         region_df['avg_dqi_score'] >= region_df['avg_dqi_score'].quantile(0.75), 'region_risk_category'] = 'High'
 
     # Country aggregation
-    country_agg = {
-        'site_id':'count', 'subject_count':'sum', 'avg_dqi_score':['mean', 'max', 'std'],
-        'high_risk_count':'sum', 'medium_risk_count':'sum', 'subjects_with_issues':'sum',
-        'study':'nunique', 'region':'first',
-    }
-    country_df = site_df.groupby('country').agg(country_agg)
-    country_df.columns = ['_'.join(col).strip('_') if isinstance(col, tuple) else col for col in country_df.columns]
-    country_df = country_df.reset_index()
-    country_df = country_df.rename(columns={
-        'site_id_count':'site_count', 'subject_count_sum':'subject_count',
-        'avg_dqi_score_mean':'avg_dqi_score', 'avg_dqi_score_max':'max_dqi_score',
-        'avg_dqi_score_std':'std_dqi_score', 'high_risk_count_sum':'high_risk_subjects',
-        'medium_risk_count_sum':'medium_risk_subjects', 'subjects_with_issues_sum':'subjects_with_issues',
-        'study_nunique':'study_count', 'region_first':'region',
-    })
-    country_df['std_dqi_score'] = country_df['std_dqi_score'].fillna(0)
-    country_df['high_risk_rate'] = country_df['high_risk_subjects'] / country_df['subject_count']
-    country_df['issue_rate'] = country_df['subjects_with_issues'] / country_df['subject_count']
-    high_risk_sites = site_df[site_df['site_risk_category']=='High'].groupby('country').size()
-    country_df['high_risk_sites'] = country_df['country'].map(high_risk_sites).fillna(0).astype(int)
-    country_df['high_risk_site_rate'] = country_df['high_risk_sites'] / country_df['site_count']
+    country_df = cube.rollup('country').drop(columns='max_dqi_score').rename(
+        columns={'max_site_dqi_score':'max_dqi_score'})
+    country_df['region'] = country_df['country'].map(cube.cells.groupby('country')['region'].first())
+    country_df = country_df[['country'] + rollup_columns + ['study_count', 'region'] + rate_columns]
     country_df['country_risk_category'] = 'Low'
     country_df.loc[
         country_df['avg_dqi_score'] >= country_df['avg_dqi_score'].median(), 'country_risk_category'] = 'Medium'
@@ -364,71 +325,343 @@ def aggregate_to_region_level(site_df):
     return region_df, country_df
 
 
-def validate_results(df, site_df, thresholds):
-    """Run validation checks on the DQI results."""
-    validations = {}
+def subject_tallies(df):
+    """
+    Additive subject counts behind the validation checks.
 
+    Tallies of separate chunks can be added together (see add_tallies), so
+    the checks do not need the whole subject table in memory.
+    """
+    risk = df['risk_category']
+    tallies = {
+        'subjects':len(df),
+        'subjects_with_issues':int(df['has_issues'].sum()),
+        'flagged':int((risk!='Low').sum()),
+    }
+    for cat in ['High', 'Medium', 'Low']:
+        in_cat = risk==cat
+        tallies[f'{cat.lower()}_count'] = int(in_cat.sum())
+        tallies[f'{cat.lower()}_score_sum'] = float(df.loc[in_cat, 'dqi_score'].sum())
     if 'sae_pending_count' in df.columns:
-        sae_subjects = df[df['sae_pending_count'] > 0]
-        sae_in_high = (sae_subjects['risk_category']=='High').sum()
+        sae = df['sae_pending_count'] > 0
+        tallies['total_sae'] = int(sae.sum())
+        tallies['sae_in_high'] = int((sae & (risk=='High')).sum())
+    return tallies
+
+
+def add_tallies(total, tallies):
+    """Add one chunk's subject_tallies into a running total."""
+    for key, value in tallies.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+
+def validate_results(df, site_df, thresholds, tallies=None):
+    """
+    Run validation checks on the DQI results.
+
+    Args:
+        df: Scored subjects (unused when tallies are given)
+        site_df: Site table with site_risk_category
+        thresholds: Subject risk thresholds
+        tallies: Pre-computed subject_tallies (e.g. summed over chunks)
+    """
+    if tallies is None:
+        tallies = subject_tallies(df)
+    validations = {}
+
+    if 'total_sae' in tallies:
+        total_sae, sae_in_high = tallies['total_sae'], tallies['sae_in_high']
         validations['sae_capture'] = {
-            'total_sae':len(sae_subjects), 'in_high':sae_in_high,
-            'rate':sae_in_high / len(sae_subjects) if len(sae_subjects) > 0 else 1.0,
-            'pass':sae_in_high==len(sae_subjects)
+            'total_sae':total_sae, 'in_high':sae_in_high,
+            'rate':sae_in_high / total_sae if total_sae > 0 else 1.0,
+            'pass':sae_in_high==total_sae
         }
 
-    subjects_with_issues = df['has_issues'].sum()
-    flagged = (df['risk_category']!='Low').sum()
+    subjects_with_issues = tallies['subjects_with_issues']
+    flagged = tallies['flagged']
     validations['capture_rate'] = {
         'subjects_with_issues':subjects_with_issues, 'flagged':flagged,
         'rate':flagged / subjects_with_issues if subjects_with_issues > 0 else 0,
         'pass':(flagged / subjects_with_issues >= 0.99) if subjects_with_issues > 0 else True
     }
 
-    high_count = (df['risk_category']=='High').sum()
-    medium_count = (df['risk_category']=='Medium').sum()
+    high_count = tallies['high_count']
+    medium_count = tallies['medium_count']
     validations['pyramid_shape'] = {'high':high_count, 'medium':medium_count, 'pass':medium_count >= high_count}
 
     site_high = (site_df['site_risk_category']=='High').sum()
     site_medium = (site_df['site_risk_category']=='Medium').sum()
     validations['site_pyramid'] = {'high':site_high, 'medium':site_medium, 'pass':site_medium >= site_high}
 
-    high_scores = df[df['risk_category']=='High']['dqi_score']
-    medium_scores = df[df['risk_category']=='Medium']['dqi_score']
-    low_scores = df[df['risk_category']=='Low']['dqi_score']
+    means = {cat:tallies[f'{cat}_score_sum'] / tallies[f'{cat}_count'] if tallies[f'{cat}_count'] > 0 else 0
+             for cat in ['high', 'medium', 'low']}
     validations['score_alignment'] = {
-        'high_mean':high_scores.mean() if len(high_scores) > 0 else 0,
-        'medium_mean':medium_scores.mean() if len(medium_scores) > 0 else 0,
-        'low_mean':low_scores.mean() if len(low_scores) > 0 else 0,
-        'pass':(high_scores.mean() if len(high_scores) > 0 else 0) > (
-            medium_scores.mean() if len(medium_scores) > 0 else 0) > (low_scores.mean() if len(low_scores) > 0 else 0)
+        'high_mean':means['high'],
+        'medium_mean':means['medium'],
+        'low_mean':means['low'],
+        'pass':means['high'] > means['medium'] > means['low']
     }
 
     return validations
 
 
+# ============================================================================
+# INCREMENTAL RESCORING
+# ============================================================================
+
+# Bump when the snapshot or rollup cube layout changes
+_INCREMENTAL_STATE_VERSION = 2
+SUBJECT_KEYS = ['study', 'subject_id']
+SITE_KEYS = CUBE_DIMENSIONS
+
+
+def _state_digest():
+    """Hash of the configuration the stored snapshot depends on."""
+    return config_digest(_INCREMENTAL_STATE_VERSION, FEATURE_WEIGHTS)
+
+
+def _sum_features(df):
+    return [f for f in FEATURE_WEIGHTS.keys() if f in df.columns and f!='n_issue_types']
+
+
+def _row_hashes(df):
+    """Subject keys with a content hash of each input row."""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return df[SUBJECT_KEYS].assign(_row_hash=hashes.view(np.int64))
+
+
+def load_incremental_state(store, model, df):
+    """
+    Return the stored snapshot if df can be rescored incrementally, else None.
+
+    The snapshot must come from the same scoring model and input columns,
+    and subjects must be unique per study.
+    """
+    if not store.available:
+        print("\n[WARN] pyarrow not installed - incremental rescoring unavailable, scoring all subjects")
+        return None
+    if df.duplicated(SUBJECT_KEYS).any():
+        print("\n[WARN] Duplicate subject IDs in the master table - scoring all subjects")
+        return None
+    manifest = store.load_manifest(_state_digest())
+    if manifest.get('model_id')!=model.model_id or manifest.get('columns')!=list(df.columns):
+        print("\n[INFO] No snapshot scored with this model and input layout - scoring all subjects")
+        return None
+    state = {name:store.read_table(name) for name in ('subjects', 'row_hashes', 'cube')}
+    if any(table is None for table in state.values()):
+        print("\n[INFO] Incomplete incremental snapshot - scoring all subjects")
+        return None
+    state['cube'] = RollupCube(state['cube'])
+    return state
+
+
+def rescore_changed_subjects(df, model, state):
+    """
+    Rescore only subjects whose input row changed since the last snapshot.
+
+    Args:
+        df: Current master subject table
+        model: Frozen ScoringModel the snapshot was scored with
+        state: Snapshot from load_incremental_state
+
+    Returns:
+        Tuple of (scored subject table in df's row order, updated
+        RollupCube, {'changed', 'removed'} counts)
+    """
+    current = _row_hashes(df)
+    matched = current.merge(state['row_hashes'], on=SUBJECT_KEYS + ['_row_hash'], how='left', indicator=True)
+    changed = (matched['_merge']=='left_only').to_numpy()
+
+    previous = state['subjects']
+    previous_keys = pd.MultiIndex.from_frame(previous[SUBJECT_KEYS])
+    retract = ~previous_keys.isin(pd.MultiIndex.from_frame(df.loc[~changed, SUBJECT_KEYS]))
+    removed = int((~previous_keys.isin(pd.MultiIndex.from_frame(df[SUBJECT_KEYS]))).sum())
+
+    rescored, _ = calculate_subject_dqi(df[changed], model)
+    rescored, _, _ = assign_risk_categories(rescored, model.high_threshold)
+
+    kept = df.loc[~changed, SUBJECT_KEYS].merge(previous, on=SUBJECT_KEYS, how='left')
+    kept.index = df.index[~changed]
+    columns = list(rescored.columns)
+    scored = pd.concat([kept[columns], rescored]).loc[df.index].reset_index(drop=True)
+
+    cube = state['cube'].apply_delta(previous[retract], rescored, scored)
+    return scored, cube, {'changed':int(changed.sum()), 'removed':removed}
+
+
+def save_incremental_state(store, model, input_hashes, input_columns, scored, cube):
+    """Store the scored snapshot for the next --incremental run (manifest last)."""
+    try:
+        store.begin_save()
+        store.write_table('subjects', scored)
+        store.write_table('row_hashes', input_hashes)
+        store.write_table('cube', cube.cells)
+        store.save_manifest({}, _state_digest(), [],
+                            extra={'model_id':model.model_id, 'columns':list(input_columns)})
+        print(f"[OK] Saved scoring snapshot: {store.dir}")
+    except Exception as e:
+        print(f"[WARN] Could not save scoring snapshot: {e}")
+
+
+# ============================================================================
+# OUT-OF-CORE SCORING
+# ============================================================================
+
+def _with_issue_count(chunk, issue_columns):
+    return chunk.assign(n_issue_types=(chunk[issue_columns] > 0).sum(axis=1))
+
+
+def fit_model_in_chunks(chunk_size):
+    """
+    Statistics pass: estimate the scoring baseline with bounded memory.
+
+    Only the feature columns are read, in chunks, twice: first for the
+    reference maxima (KLL sketches of each feature's non-zero values), then
+    for the High threshold (sketch of the non-SAE scores with issues, which
+    depend on the reference maxima).
+
+    Returns:
+        Tuple of (ScoringModel, score sketch), or (None, None) when the
+        master table has no rows
+    """
+    feature_columns = [f for f in FEATURE_WEIGHTS.keys() if f!='n_issue_types']
+    MIN_SAMPLES = getattr(THRESHOLDS, 'MIN_SAMPLES_FOR_PERCENTILE', 20)
+
+    features, issue_columns, sketches, n_subjects = None, None, None, 0
+    for chunk in iter_table(MASTER_SUBJECT_PATH, chunk_size, columns=feature_columns):
+        if features is None:
+            issue_columns = [f for f in feature_columns if f in chunk.columns]
+            features = [f for f in FEATURE_WEIGHTS.keys() if f in issue_columns or f=='n_issue_types']
+            sketches = [KLLSketch() for _ in features]
+        X = feature_matrix(_with_issue_count(chunk, issue_columns), features)
+        for j, sketch in enumerate(sketches):
+            column = X[:, j]
+            sketch.update(column[column > 0])
+        n_subjects += len(chunk)
+    if not n_subjects:
+        return None, None
+
+    weights = [FEATURE_WEIGHTS[f]['weight'] for f in features]
+    refs = reference_maxima(None, min_samples=MIN_SAMPLES, min_reference=None, sketches=sketches)
+
+    score_sketch = KLLSketch()
+    for chunk in iter_table(MASTER_SUBJECT_PATH, chunk_size, columns=feature_columns):
+        source = _with_issue_count(chunk, issue_columns)
+        scores, _ = dqi_kernel(feature_matrix(source, features), weights, refs=refs)
+        candidates = source['n_issue_types'] > 0
+        if 'sae_pending_count' in source.columns:
+            candidates &= ~(source['sae_pending_count'] > 0)
+        score_sketch.update(widen_float32(scores)[candidates.to_numpy()])
+
+    high_threshold = max(score_sketch.quantile(0.90), 0.10) if score_sketch.n else 0.20
+    model = ScoringModel(features=features, weights=weights, reference_maxima=refs,
+                         high_threshold=high_threshold, n_subjects=n_subjects)
+    return model, score_sketch
+
+
+def score_in_chunks(model, chunk_size, subject_path):
+    """
+    Scoring pass: score, categorize and write subjects chunk by chunk.
+
+    Each chunk is scored against model, appended to the subject table (one
+    Parquet row group per chunk) and the component store, and folded into
+    the rollup cube, the validation tallies and a score sketch. No chunk is
+    kept once written, so memory is bounded by chunk_size and the number of
+    sites.
+
+    Returns:
+        Tuple of (RollupCube, subject tallies, score sketch, studies seen,
+        number of chunks)
+    """
+    cube, tallies, studies = None, {}, set()
+    score_sketch = KLLSketch()
+    weights = dict(zip(model.features, model.weights))
+    with TableWriter(subject_path) as writer, \
+            ComponentWriter(COMPONENT_STORE_PATH, weights=weights, model_id=model.model_id) as components:
+        for chunk in iter_table(MASTER_SUBJECT_PATH, chunk_size):
+            scored, _ = calculate_subject_dqi(chunk, model)
+            scored, _, _ = assign_risk_categories(scored, model.high_threshold)
+            components.write(scored)
+            writer.write(drop_component_columns(scored))
+
+            chunk_cube = RollupCube.from_subjects(scored, _sum_features(scored))
+            cube = chunk_cube if cube is None else cube.merge(chunk_cube)
+            add_tallies(tallies, subject_tallies(scored))
+            score_sketch.update(scored['dqi_score'])
+            studies.update(scored['study'].dropna().unique())
+    return cube, tallies, score_sketch, studies, writer.chunks
+
+
 # ============================================================================
 # MAIN FUNCTION
 # ============================================================================
 
-def calculate_dqi():
-    """Main function to calculate and save DQI scores."""
+def _load_frozen_model(df):
+    """Return the saved scoring model if it can score df, else None (re-baseline)."""
+    model = load_scoring_model(SCORING_MODEL_PATH)
+    if model is None:
+        print(f"\n[WARN] No scoring model at {SCORING_MODEL_PATH} - re-baselining")
+        return None
+    missing = [f for f in model.features if f!='n_issue_types' and f not in df.columns]
+    if missing:
+        print(f"\n[WARN] Scoring model features missing from the master table ({missing}) - re-baselining")
+        return None
+    if not model.weights_match(FEATURE_WEIGHTS):
+        print("\n[WARN] Config weights differ from the scoring model - scoring with the model's weights;"
+              " run without --frozen to re-baseline")
+    print(f"\n[INFO] Using frozen scoring model {model.model_id} "
+          f"(fitted {model.fitted_at} on {model.n_subjects:,} subjects)")
+    return model
+
+
+def calculate_dqi(frozen=False, incremental=False, chunk_size=None):
+    """
+    Main function to calculate and save DQI scores.
+
+    Args:
+        frozen: Score against the saved scoring model instead of re-baselining
+        incremental: Rescore only subjects changed since the last snapshot
+            (implies frozen) and update site rollups with deltas
+        chunk_size: Stream subjects in chunks of this many rows (out-of-core
+            mode: a statistics pass, then a scoring pass that writes the
+            subject table chunk by chunk)
+    """
     print("=" * 70)
     print("JAVELIN.AI - DATA QUALITY INDEX (DQI) CALCULATION")
     print("=" * 70)
     if _USING_CONFIG:
         print("(Using centralized config)")
 
-    if not MASTER_SUBJECT_PATH.exists():
+    if not table_exists(MASTER_SUBJECT_PATH):
         print(f"\n[ERROR] {MASTER_SUBJECT_PATH} not found!")
         print("Please run 02_build_master_table.py first.")
         return False
 
-    print(f"\nLoading {MASTER_SUBJECT_PATH}...")
-    df = pd.read_csv(MASTER_SUBJECT_PATH)
-    print(f"  Loaded {len(df):,} subjects")
-    print(f"  Studies: {df['study'].nunique()}")
-    print(f"  Sites: {df.groupby(['study', 'site_id']).ngroups:,}")
+    chunked = chunk_size is not None
+    if chunked:
+        if incremental:
+            print("\n[WARN] --incremental is not available with --chunk-size - scoring all subjects")
+            incremental = False
+        print(f"\nStreaming {MASTER_SUBJECT_PATH} in chunks of {chunk_size:,} subjects...")
+        df = next(iter_table(MASTER_SUBJECT_PATH, 1), None)
+        if df is None:
+            print(f"\n[ERROR] {MASTER_SUBJECT_PATH} has no subjects")
+            return False
+    else:
+        print(f"\nLoading {MASTER_SUBJECT_PATH}...")
+        df = read_table(MASTER_SUBJECT_PATH)
+        print(f"  Loaded {len(df):,} subjects")
+        print(f"  Studies: {df['study'].nunique()}")
+        print(f"  Sites: {df.groupby(['study', 'site_id']).ngroups:,}")
+    model = _load_frozen_model(df) if frozen or incremental else None
+    refit = model is None
+
+    store = PartialStore('phase03')
+    state = load_incremental_state(store, model, df) if incremental and model is not None else None
+    input_columns = list(df.columns)
+    input_hashes = _row_hashes(df) if not chunked and store.available and not df.duplicated(SUBJECT_KEYS).any() \
+        else None
 
     # Step 1: Display Methodology
     print("\n" + "=" * 70)
@@ -453,40 +686,83 @@ def calculate_dqi():
     print("\n" + "=" * 70)
     print("STEP 2: CALCULATE SUBJECT-LEVEL DQI")
     print("=" * 70)
-    df, components = calculate_subject_dqi(df)
-    print("\nComponent Statistics:")
-    print(f"{'Feature':<30} {'Weight':>7} {'Subjects':>10} {'Max Score':>10}")
-    print("-" * 60)
-    for feature, stats in sorted(components.items(), key=lambda x:-x[1]['weight']):
-        print(
-            f"{feature:<30} {stats['weight']:>6.0%} {stats['subjects_with_issue']:>10,} {stats['max_component']:>10.3f}")
+    subject_path = PHASE_DIRS['phase_03'] / "master_subject_with_dqi.csv"
+    tallies = None
+    if chunked:
+        if model is None:
+            print("\nStatistics pass (reference maxima and High threshold from sketches)...")
+            model, baseline_sketch = fit_model_in_chunks(chunk_size)
+            if model is None:
+                print(f"\n[ERROR] {MASTER_SUBJECT_PATH} has no subjects")
+                return False
+            print(f"  Baseline from {model.n_subjects:,} subjects "
+                  f"(sketch rank error {baseline_sketch.error:.2%})")
+            print(f"\n{'Feature':<30} {'Weight':>7} {'Reference Max':>14}")
+            print("-" * 54)
+            for feature, weight, ref in sorted(zip(model.features, model.weights, model.reference_maxima),
+                                               key=lambda x:-x[1]):
+                print(f"{feature:<30} {weight:>6.0%} {ref:>14.3f}")
+        print("\nScoring pass...")
+        PHASE_DIRS['phase_03'].mkdir(parents=True, exist_ok=True)
+        cube, tallies, score_sketch, studies, n_chunks = score_in_chunks(model, chunk_size, subject_path)
+        n_subjects = tallies['subjects']
+        print(f"  Scored {n_subjects:,} subjects in {n_chunks:,} chunks ({len(studies)} studies)")
+        score_min, score_median, score_max = score_sketch.min, score_sketch.quantile(0.5), score_sketch.max
+        median_note = '' if score_sketch.exact else ' (sketch estimate)'
+    elif state is not None:
+        df, cube, delta = rescore_changed_subjects(df, model, state)
+        print(f"\n[INFO] Incremental: rescored {delta['changed']:,} changed subjects, "
+              f"{delta['removed']:,} removed, {len(df) - delta['changed']:,} reused from the last snapshot")
+    else:
+        df, components = calculate_subject_dqi(df, model)
+        print("\nComponent Statistics:")
+        print(f"{'Feature':<30} {'Weight':>7} {'Subjects':>10} {'Max Score':>10}")
+        print("-" * 60)
+        for feature, stats in sorted(components.items(), key=lambda x:-x[1]['weight']):
+            print(
+                f"{feature:<30} {stats['weight']:>6.0%} {stats['subjects_with_issue']:>10,} {stats['max_component']:>10.3f}")
+    if not chunked:
+        n_subjects, studies, median_note = len(df), df['study'].dropna().unique(), ''
+        score_min, score_median, score_max = df['dqi_score'].min(), df['dqi_score'].median(), df['dqi_score'].max()
     print(f"\nDQI Score Distribution:")
-    print(f"  Min:    {df['dqi_score'].min():.4f}")
-    print(f"  Median: {df['dqi_score'].median():.4f}")
-    print(f"  Max:    {df['dqi_score'].max():.4f}")
+    print(f"  Min:    {score_min:.4f}")
+    print(f"  Median: {score_median:.4f}{median_note}")
+    print(f"  Max:    {score_max:.4f}")
 
     # Step 3: Assign Risk Categories
     print("\n" + "=" * 70)
     print("STEP 3: ASSIGN RISK CATEGORIES")
     print("=" * 70)
-    df, thresholds, overrides = assign_risk_categories(df)
+    if chunked or state is not None:
+        thresholds = {'high':model.high_threshold, 'medium':0.001}
+    else:
+        df, thresholds, overrides = assign_risk_categories(df, model.high_threshold if model else None)
+    if tallies is None:
+        tallies = subject_tallies(df)
     print(f"\nThresholds:")
     print(f"  High:   SAE pending OR score >= {thresholds['high']:.4f}")
     print(f"  Medium: Any issue (score > 0)")
     print(f"  Low:    No issues")
-    risk_counts = df['risk_category'].value_counts()
+    risk_counts = {cat:tallies[f'{cat.lower()}_count'] for cat in ['High', 'Medium', 'Low']}
     print("\nRisk Distribution:")
     for cat in ['High', 'Medium', 'Low']:
         count = risk_counts.get(cat, 0)
-        pct = count / len(df) * 100
+        pct = count / n_subjects * 100
         print(f"  {cat:<8} {count:>8,} subjects ({pct:>5.1f}%)")
 
     # Step 4: Aggregate to Site Level
     print("\n" + "=" * 70)
     print("STEP 4: AGGREGATE TO SITE LEVEL")
     print("=" * 70)
-    site_df, site_thresholds = aggregate_site_dqi(df)
-    print(f"\nAggregated {len(df):,} subjects to {len(site_df):,} sites")
+    if chunked:
+        print(f"\nAccumulated {n_subjects:,} subjects into {len(cube):,} sites")
+    elif state is not None:
+        print(f"\nUpdated {len(cube):,} sites from the changed subjects")
+    else:
+        cube = RollupCube.from_subjects(df, _sum_features(df))
+        print(f"\nAggregated {len(df):,} subjects to {len(cube):,} sites")
+    site_df, site_thresholds = site_table_from_cube(cube)
+    cube = cube.with_site_risk(site_df)
     site_risk_counts = site_df['site_risk_category'].value_counts()
     print("\nSite Risk Distribution:")
     for cat in ['High', 'Medium', 'Low']:
@@ -498,7 +774,7 @@ def calculate_dqi():
     print("\n" + "=" * 70)
     print("STEP 4b: AGGREGATE TO STUDY LEVEL")
     print("=" * 70)
-    study_df, study_thresholds = aggregate_to_study_level(site_df)
+    study_df, study_thresholds = aggregate_to_study_level(cube)
     print(f"\nAggregated to {len(study_df):,} studies")
     study_risk_counts = study_df['study_risk_category'].value_counts()
     print("\nStudy Risk Distribution:")
@@ -510,14 +786,14 @@ def calculate_dqi():
     print("\n" + "=" * 70)
     print("STEP 4c: AGGREGATE TO REGION/COUNTRY LEVEL")
     print("=" * 70)
-    region_df, country_df = aggregate_to_region_level(site_df)
+    region_df, country_df = aggregate_to_region_level(cube)
     print(f"\nAggregated to {len(region_df)} regions and {len(country_df)} countries")
 
     # Step 5: Validation
     print("\n" + "=" * 70)
     print("STEP 5: VALIDATION")
     print("=" * 70)
-    validations = validate_results(df, site_df, thresholds)
+    validations = validate_results(df, site_df, thresholds, tallies)
     all_pass = True
     for check_name, result in validations.items():
         status = "PASS" if result['pass'] else "FAIL"
@@ -530,44 +806,73 @@ def calculate_dqi():
     print("STEP 6: SAVE OUTPUTS")
     print("=" * 70)
     PHASE_DIRS['phase_03'].mkdir(parents=True, exist_ok=True)
-    df_out = df.drop(columns=['is_high', 'is_medium'], errors='ignore')
-
-    df_out.to_csv(PHASE_DIRS['phase_03'] / "master_subject_with_dqi.csv", index=False)
-    print(f"\n[OK] Saved: master_subject_with_dqi.csv ({len(df_out):,} subjects)")
-
-    site_df.to_csv(PHASE_DIRS['phase_03'] / "master_site_with_dqi.csv", index=False)
+    if model is None:
+        model = ScoringModel(
+            features=list(components),
+            weights=[c['weight'] for c in components.values()],
+            reference_maxima=[c['reference_max'] for c in components.values()],
+            high_threshold=thresholds['high'],
+            n_subjects=len(df),
+        )
+    if chunked:
+        print(f"\n[OK] Saved: master_subject_with_dqi.csv ({n_subjects:,} subjects, written per chunk)")
+        print(f"[OK] Saved: dqi_components.npy ({n_subjects:,} x {len(model.features)} component scores)")
+    else:
+        df_out = df.drop(columns=['is_high', 'is_medium'], errors='ignore')
+        write_table(drop_component_columns(df_out), subject_path)
+        print(f"\n[OK] Saved: master_subject_with_dqi.csv ({len(df_out):,} subjects)")
+        component_store = ComponentStore.from_frame(df_out, weights=dict(zip(model.features, model.weights)),
+                                                    model_id=model.model_id)
+        component_store.save(COMPONENT_STORE_PATH)
+        print(f"[OK] Saved: dqi_components.npy ({len(component_store):,} x {len(component_store.features)}"
+              f" component scores)")
+
+    write_table(site_df, PHASE_DIRS['phase_03'] / "master_site_with_dqi.csv")
     print(f"[OK] Saved: master_site_with_dqi.csv ({len(site_df):,} sites)")
 
-    study_df.to_csv(PHASE_DIRS['phase_03'] / "master_study_with_dqi.csv", index=False)
+    write_table(study_df, PHASE_DIRS['phase_03'] / "master_study_with_dqi.csv")
     print(f"[OK] Saved: master_study_with_dqi.csv ({len(study_df)} studies)")
 
-    region_df.to_csv(PHASE_DIRS['phase_03'] / "master_region_with_dqi.csv", index=False)
+    write_table(region_df, PHASE_DIRS['phase_03'] / "master_region_with_dqi.csv")
     print(f"[OK] Saved: master_region_with_dqi.csv ({len(region_df)} regions)")
 
-    country_df.to_csv(PHASE_DIRS['phase_03'] / "master_country_with_dqi.csv", index=False)
+    write_table(country_df, PHASE_DIRS['phase_03'] / "master_country_with_dqi.csv")
     print(f"[OK] Saved: master_country_with_dqi.csv ({len(country_df)} countries)")
 
     # Save weights
     weights_data = [{'feature':f, 'weight':c['weight'], 'tier':c['tier'], 'rationale':c['rationale']} for f, c in
                     FEATURE_WEIGHTS.items()]
     weights_df = pd.DataFrame(weights_data).sort_values('weight', ascending=False)
-    weights_df.to_csv(PHASE_DIRS['phase_03'] / "dqi_weights.csv", index=False)
+    write_table(weights_df, PHASE_DIRS['phase_03'] / "dqi_weights.csv")
     print(f"[OK] Saved: dqi_weights.csv")
 
+    if refit:
+        model.save(SCORING_MODEL_PATH)
+        print(f"[OK] Saved: dqi_scoring_model.json (model {model.model_id})")
+
+    if HAS_PYARROW:
+        cube.save(ROLLUP_CUBE_PATH)
+        print(f"[OK] Saved: rollup_cube.parquet ({len(cube):,} site cells)")
+
+    if input_hashes is not None:
+        save_incremental_state(store, model, input_hashes, input_columns, df_out, cube)
+
     # Save report
     with open(PHASE_DIRS['phase_03'] / "dqi_model_report.txt", 'w', encoding='utf-8') as f:
         f.write("JAVELIN.AI - DATA QUALITY INDEX (DQI) MODEL REPORT\n")
         f.write("=" * 60 + "\n\n")
-        f.write(f"Total Subjects: {len(df):,}\n")
+        f.write(f"Total Subjects: {n_subjects:,}\n")
         f.write(f"Total Sites: {len(site_df):,}\n")
-        f.write(f"Studies: {df['study'].nunique()}\n")
-        f.write(f"Subjects with Issues: {df['has_issues'].sum():,} ({df['has_issues'].mean():.1%})\n\n")
+        f.write(f"Studies: {len(studies)}\n")
+        with_issues = tallies['subjects_with_issues']
+        f.write(f"Subjects with Issues: {with_issues:,} ({with_issues / n_subjects:.1%})\n\n")
         f.write("RISK DISTRIBUTION\n" + "-" * 40 + "\n")
         for cat in ['High', 'Medium', 'Low']:
             count = risk_counts.get(cat, 0)
-            f.write(f"  {cat}: {count:,} ({count / len(df) * 100:.1f}%)\n")
+            f.write(f"  {cat}: {count:,} ({count / n_subjects * 100:.1f}%)\n")
         f.write(f"\nCapture Rate: {validations['capture_rate']['rate']:.1%}\n")
         f.write(f"SAE Capture: {validations['sae_capture']['rate']:.0%}\n")
+        f.write(f"\nScoring Model: {model.model_id} (fitted {model.fitted_at})\n")
     print(f"[OK] Saved: dqi_model_report.txt")
 
     print("\n" + "=" * 70)
@@ -581,7 +886,68 @@ def calculate_dqi():
     return True
 
 
+def score_subjects(input_path):
+    """
+    Score only the subjects in input_path against the saved scoring model.
+
+    Cost is linear in the number of input rows: the master tables and the
+    rest of the portfolio are not read. Like master_subject_with_dqi, the
+    output carries no <feature>_component columns.
+    """
+    print("=" * 70)
+    print("JAVELIN.AI - DQI SCORING (FROZEN MODEL)")
+    print("=" * 70)
+
+    model = load_scoring_model(SCORING_MODEL_PATH)
+    if model is None:
+        print(f"\n[ERROR] No scoring model at {SCORING_MODEL_PATH}")
+        print("Please run 03_calculate_dqi.py first to create the baseline.")
+        return False
+
+    input_path = Path(input_path)
+    if not input_path.exists():
+        print(f"\n[ERROR] {input_path} not found!")
+        return False
+    df = pd.read_parquet(input_path) if input_path.suffix=='.parquet' else pd.read_csv(input_path)
+    print(f"\nModel {model.model_id} (fitted {model.fitted_at} on {model.n_subjects:,} subjects)")
+    print(f"Loaded {len(df):,} subjects from {input_path.name}")
+
+    try:
+        scored = model.score(df)
+    except ValueError as e:
+        print(f"\n[ERROR] {e}")
+        return False
+
+    SCORED_SUBJECTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    write_table(drop_component_columns(scored), SCORED_SUBJECTS_PATH)
+    risk_counts = scored['risk_category'].value_counts()
+    for cat in ['High', 'Medium', 'Low']:
+        print(f"  {cat:<8} {risk_counts.get(cat, 0):>8,} subjects")
+    print(f"\n[OK] Saved: {SCORED_SUBJECTS_PATH.name} ({len(scored):,} subjects)")
+    return True
+
+
 if __name__=="__main__":
-    success = calculate_dqi()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JAVELIN.AI Calculate DQI")
+    parser.add_argument("--frozen", action="store_true",
+                        help="Score against the saved scoring model instead of re-baselining")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Rescore only subjects changed since the last run (uses the saved model)")
+    parser.add_argument("--score", metavar="FILE", default=None,
+                        help="Score only the subject rows in FILE against the saved model")
+    parser.add_argument("--chunk-size", type=int, default=None, metavar="N",
+                        help="Out-of-core mode: stream subjects in chunks of N rows")
+
+    args = parser.parse_args()
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error("--chunk-size must be a positive number of rows")
+
+    if args.score:
+        success = score_subjects(args.score)
+    else:
+        success = calculate_dqi(frozen=args.frozen, incremental=args.incremental, chunk_size=args.chunk_size)
+
     if not success:
         exit(1)
@@ -69,6 +69,8 @@ STUDY_PATH = PHASE_DIRS['phase_03'] / "master_study_with_dqi.csv"
 REGION_PATH = PHASE_DIRS['phase_03'] / "master_region_with_dqi.csv"
 COUNTRY_PATH = PHASE_DIRS['phase_03'] / "master_country_with_dqi.csv"
 
+from utils.table_io import read_table, table_exists
+
 # ============================================================================
 # KNOWLEDGE GRAPH BUILDER
 # ============================================================================
@@ -313,23 +315,23 @@ def build_knowledge_graph(args):
     if _USING_CONFIG:
         print("(Using centralized config)")
 
-    if not SUBJECT_PATH.exists():
+    if not table_exists(SUBJECT_PATH):
         print(f"\n[ERROR] {SUBJECT_PATH} not found!")
         print("Please run 03_calculate_dqi.py first.")
         return False
 
-    if not SITE_PATH.exists():
+    if not table_exists(SITE_PATH):
         print(f"\n[ERROR] {SITE_PATH} not found!")
         print("Please run 03_calculate_dqi.py first.")
         return False
 
     print(f"\nLoading data...")
-    subject_df = pd.read_csv(SUBJECT_PATH)
-    site_df = pd.read_csv(SITE_PATH)
+    subject_df = read_table(SUBJECT_PATH)
+    site_df = read_table(SITE_PATH)
 
-    study_df = pd.read_csv(STUDY_PATH) if STUDY_PATH.exists() else None
-    region_df = pd.read_csv(REGION_PATH) if REGION_PATH.exists() else None
-    country_df = pd.read_csv(COUNTRY_PATH) if COUNTRY_PATH.exists() else None
+    study_df = read_table(STUDY_PATH) if table_exists(STUDY_PATH) else None
+    region_df = read_table(REGION_PATH) if table_exists(REGION_PATH) else None
+    country_df = read_table(COUNTRY_PATH) if table_exists(COUNTRY_PATH) else None
 
     print(f"  Subjects: {len(subject_df):,}")
     print(f"  Sites: {len(site_df):,}")
@@ -72,6 +72,10 @@ except ImportError:
 SUBJECT_DQI_PATH = PHASE_DIRS['phase_03'] / "master_subject_with_dqi.csv"
 SITE_DQI_PATH = PHASE_DIRS['phase_03'] / "master_site_with_dqi.csv"
 WEIGHTS_PATH = PHASE_DIRS['phase_03'] / "dqi_weights.csv"
+ROLLUP_CUBE_PATH = PHASE_DIRS['phase_03'] / "rollup_cube.parquet"
+
+from utils.table_io import read_table, write_table, table_exists
+from utils.rollup_cube import RollupCube, site_rollup_cube
 
 # Ollama Configuration
 OLLAMA_URL = "http://localhost:11434/api/generate"
@@ -304,18 +308,19 @@ def load_data() -> Dict[str, pd.DataFrame]:
     """Load all required data files."""
     data = {}
 
-    if SUBJECT_DQI_PATH.exists():
-        data['subjects'] = pd.read_csv(SUBJECT_DQI_PATH)
+    if table_exists(SUBJECT_DQI_PATH):
+        data['subjects'] = read_table(SUBJECT_DQI_PATH)
         print(f"  Loaded {len(data['subjects']):,} subjects")
     else:
         raise FileNotFoundError(f"{SUBJECT_DQI_PATH} not found. Run 03_calculate_dqi.py first.")
 
-    if SITE_DQI_PATH.exists():
-        data['sites'] = pd.read_csv(SITE_DQI_PATH)
+    if table_exists(SITE_DQI_PATH):
+        data['sites'] = read_table(SITE_DQI_PATH)
         print(f"  Loaded {len(data['sites']):,} sites")
+        data['cube'] = site_rollup_cube(data['sites'], ROLLUP_CUBE_PATH)
 
-    if WEIGHTS_PATH.exists():
-        data['weights'] = pd.read_csv(WEIGHTS_PATH)
+    if table_exists(WEIGHTS_PATH):
+        data['weights'] = read_table(WEIGHTS_PATH)
 
     return data
 
@@ -455,23 +460,22 @@ def generate_site_recommendations(df: pd.DataFrame, llm: Optional[OllamaLLM] = N
     return recommendations
 
 
-def generate_study_recommendations(site_df: pd.DataFrame, llm: Optional[OllamaLLM] = None) -> List[Dict]:
+def generate_study_recommendations(site_df: pd.DataFrame, llm: Optional[OllamaLLM] = None,
+                                   cube: Optional[RollupCube] = None) -> List[Dict]:
     """Generate study-level recommendations."""
     recommendations = []
-
-    study_summary = site_df.groupby('study').agg({
-        'site_id': 'count',
-        'subject_count': 'sum',
-        'avg_dqi_score': 'mean',
-        'high_risk_count': 'sum',
-        'sae_pending_count_sum': 'sum',
-        'missing_visit_count_sum': 'sum',
-        'uncoded_meddra_count_sum': 'sum'
-    }).reset_index()
-
-    study_summary.columns = ['study', 'n_sites', 'n_subjects', 'avg_dqi',
-                             'total_high_risk', 'total_sae_pending',
-                             'total_missing_visits', 'total_uncoded_meddra']
+    if cube is None:
+        cube = site_rollup_cube(site_df, ROLLUP_CUBE_PATH)
+
+    study_summary = cube.rollup('study').rename(columns={
+        'site_count': 'n_sites',
+        'subject_count': 'n_subjects',
+        'avg_dqi_score': 'avg_dqi',
+        'high_risk_subjects': 'total_high_risk',
+        'sae_pending_count_sum': 'total_sae_pending',
+        'missing_visit_count_sum': 'total_missing_visits',
+        'uncoded_meddra_count_sum': 'total_uncoded_meddra',
+    })
 
     for idx, (_, row) in enumerate(study_summary.iterrows()):
         rec = {
@@ -518,37 +522,33 @@ def generate_study_recommendations(site_df: pd.DataFrame, llm: Optional[OllamaLL
     return recommendations
 
 
-def generate_region_recommendations(site_df: pd.DataFrame, llm: Optional[OllamaLLM] = None) -> List[Dict]:
+def generate_region_recommendations(site_df: pd.DataFrame, llm: Optional[OllamaLLM] = None,
+                                    cube: Optional[RollupCube] = None) -> List[Dict]:
     """Generate region-level recommendations."""
     recommendations = []
-
-    region_summary = site_df.groupby('region').agg({
-        'site_id': 'count',
-        'subject_count': 'sum',
-        'avg_dqi_score': ['mean', 'max', 'std'],
-        'high_risk_count': 'sum',
-        'medium_risk_count': 'sum',
-        'sae_pending_count_sum': 'sum',
-        'missing_visit_count_sum': 'sum',
-        'missing_pages_count_sum': 'sum',
-        'study': 'nunique',
-        'country': 'nunique',
-    }).reset_index()
-
-    region_summary.columns = ['region', 'n_sites', 'n_subjects', 'avg_dqi', 'max_dqi', 'std_dqi',
-                              'high_risk_subjects', 'medium_risk_subjects',
-                              'pending_sae', 'missing_visits', 'missing_pages',
-                              'n_studies', 'n_countries']
-
-    region_summary['high_risk_rate'] = region_summary['high_risk_subjects'] / region_summary['n_subjects'] * 100
+    if cube is None:
+        cube = site_rollup_cube(site_df, ROLLUP_CUBE_PATH)
+
+    region_summary = cube.rollup('region').rename(columns={
+        'site_count': 'n_sites',
+        'subject_count': 'n_subjects',
+        'avg_dqi_score': 'avg_dqi',
+        'max_site_dqi_score': 'max_dqi',
+        'std_dqi_score': 'std_dqi',
+        'sae_pending_count_sum': 'pending_sae',
+        'missing_visit_count_sum': 'missing_visits',
+        'missing_pages_count_sum': 'missing_pages',
+        'study_count': 'n_studies',
+        'country_count': 'n_countries',
+    })
+
+    region_summary['high_risk_rate'] = region_summary['high_risk_rate'] * 100
     region_summary['avg_subjects_per_site'] = region_summary['n_subjects'] / region_summary['n_sites']
+    region_summary['high_risk_site_rate'] = region_summary['high_risk_site_rate'] * 100
 
-    high_risk_sites = site_df[site_df['site_risk_category'] == 'High'].groupby('region').size()
-    region_summary['high_risk_sites'] = region_summary['region'].map(high_risk_sites).fillna(0).astype(int)
-    region_summary['high_risk_site_rate'] = region_summary['high_risk_sites'] / region_summary['n_sites'] * 100
-
-    portfolio_avg_dqi = site_df['avg_dqi_score'].mean()
-    portfolio_high_risk_rate = (site_df['high_risk_count'].sum() / site_df['subject_count'].sum()) * 100
+    portfolio = cube.total()
+    portfolio_avg_dqi = portfolio['avg_dqi_score']
+    portfolio_high_risk_rate = portfolio['high_risk_rate'] * 100
 
     for _, row in region_summary.iterrows():
         rec = {
@@ -632,32 +632,29 @@ Focus on actionable regional-level insights."""
     return recommendations
 
 
-def generate_country_recommendations(site_df: pd.DataFrame, llm: Optional[OllamaLLM] = None) -> List[Dict]:
+def generate_country_recommendations(site_df: pd.DataFrame, llm: Optional[OllamaLLM] = None,
+                                     cube: Optional[RollupCube] = None) -> List[Dict]:
     """Generate country-level recommendations."""
     recommendations = []
+    if cube is None:
+        cube = site_rollup_cube(site_df, ROLLUP_CUBE_PATH)
 
-    country_summary = site_df.groupby(['country', 'region']).agg({
-        'site_id': 'count',
-        'subject_count': 'sum',
-        'avg_dqi_score': ['mean', 'max'],
-        'high_risk_count': 'sum',
-        'sae_pending_count_sum': 'sum',
-        'missing_visit_count_sum': 'sum',
-        'study': 'nunique',
-    }).reset_index()
-
-    country_summary.columns = ['country', 'region', 'n_sites', 'n_subjects', 'avg_dqi', 'max_dqi',
-                               'high_risk_subjects', 'pending_sae', 'missing_visits', 'n_studies']
-
-    country_summary = country_summary[country_summary['n_sites'] >= 2]
+    country_summary = cube.rollup(['country', 'region']).rename(columns={
+        'site_count': 'n_sites',
+        'subject_count': 'n_subjects',
+        'avg_dqi_score': 'avg_dqi',
+        'max_site_dqi_score': 'max_dqi',
+        'sae_pending_count_sum': 'pending_sae',
+        'missing_visit_count_sum': 'missing_visits',
+        'study_count': 'n_studies',
+    })
 
-    country_summary['high_risk_rate'] = country_summary['high_risk_subjects'] / country_summary['n_subjects'] * 100
+    country_summary = country_summary[country_summary['n_sites'] >= 2].copy()
 
-    high_risk_sites = site_df[site_df['site_risk_category'] == 'High'].groupby('country').size()
-    country_summary['high_risk_sites'] = country_summary['country'].map(high_risk_sites).fillna(0).astype(int)
-    country_summary['high_risk_site_rate'] = country_summary['high_risk_sites'] / country_summary['n_sites'] * 100
+    country_summary['high_risk_rate'] = country_summary['high_risk_rate'] * 100
+    country_summary['high_risk_site_rate'] = country_summary['high_risk_site_rate'] * 100
 
-    portfolio_avg_dqi = site_df['avg_dqi_score'].mean()
+    portfolio_avg_dqi = cube.total()['avg_dqi_score']
 
     flagged_countries = country_summary[
         (country_summary['avg_dqi'] > portfolio_avg_dqi * 1.2) |
@@ -1003,7 +1000,7 @@ def save_outputs(
             'top_recommendation': rec['recommendations'][0] if rec['recommendations'] else '',
             'ai_insight': rec.get('ai_insight', '')[:500] if rec.get('ai_insight') else ''
         })
-    pd.DataFrame(site_csv_data).to_csv(output_dir / "recommendations_by_site.csv", index=False)
+    write_table(pd.DataFrame(site_csv_data), output_dir / "recommendations_by_site.csv")
     print(f"  Saved: {output_dir}/recommendations_by_site.csv")
 
     # 4. Region Recommendations CSV
@@ -1026,7 +1023,7 @@ def save_outputs(
                 'top_recommendation': rec['recommendations'][0] if rec['recommendations'] else '',
                 'ai_insight': rec.get('ai_insight', '')[:500] if rec.get('ai_insight') else ''
             })
-        pd.DataFrame(region_csv_data).to_csv(output_dir / "recommendations_by_region.csv", index=False)
+        write_table(pd.DataFrame(region_csv_data), output_dir / "recommendations_by_region.csv")
         print(f"  Saved: {output_dir}/recommendations_by_region.csv")
 
     # 5. Country Recommendations CSV
@@ -1046,7 +1043,7 @@ def save_outputs(
                 'priority': rec['priority'],
                 'top_recommendation': rec['recommendations'][0] if rec['recommendations'] else ''
             })
-        pd.DataFrame(country_csv_data).to_csv(output_dir / "recommendations_by_country.csv", index=False)
+        write_table(pd.DataFrame(country_csv_data), output_dir / "recommendations_by_country.csv")
         print(f"  Saved: {output_dir}/recommendations_by_country.csv")
 
     # 6. Action Items JSON
@@ -1119,19 +1116,19 @@ def run_recommendations_engine(model: str = DEFAULT_MODEL, top_sites: int = 20):
 
     # Step 5: Generate Study Recommendations
     print("\n[5/8] Generating study-level insights...")
-    study_recs = generate_study_recommendations(data['sites'], llm if llm.available else None)
+    study_recs = generate_study_recommendations(data['sites'], llm if llm.available else None, cube=data.get('cube'))
     print(f"  Analyzed {len(study_recs)} studies")
 
     # Step 6: Generate Region Recommendations
     print("\n[6/8] Generating region-level insights...")
-    region_recs = generate_region_recommendations(data['sites'], llm if llm.available else None)
+    region_recs = generate_region_recommendations(data['sites'], llm if llm.available else None, cube=data.get('cube'))
     print(f"  Analyzed {len(region_recs)} regions")
     for rec in region_recs:
         print(f"    {rec['region']}: {rec['n_sites']} sites, DQI={rec['avg_dqi']:.3f}, Priority={rec['priority']}")
 
     # Step 7: Generate Country Recommendations
     print("\n[7/8] Generating country-level insights...")
-    country_recs = generate_country_recommendations(data['sites'], llm if llm.available else None)
+    country_recs = generate_country_recommendations(data['sites'], llm if llm.available else None, cube=data.get('cube'))
     print(f"  Flagged {len(country_recs)} countries for attention")
 
     # Step 8: Generate Reports
@@ -78,6 +78,8 @@ STUDY_DQI_PATH = PHASE_03_DIR / "master_study_with_dqi.csv"
 REGION_DQI_PATH = PHASE_03_DIR / "master_region_with_dqi.csv"
 COUNTRY_DQI_PATH = PHASE_03_DIR / "master_country_with_dqi.csv"
 
+from utils.table_io import read_table, write_table, table_exists
+
 # Anomaly Detection Thresholds (v2.0 - tightened)
 THRESHOLDS = {
     # Statistical outlier thresholds (tightened to reduce noise)
@@ -998,17 +1000,18 @@ def run_anomaly_detection():
     print("STEP 1: LOAD DATA")
     print("=" * 70)
 
-    if not SITE_DQI_PATH.exists():
+    if not table_exists(SITE_DQI_PATH):
         print(f"\n[ERROR] Site DQI file not found: {SITE_DQI_PATH}")
         print("   Please run 03_calculate_dqi.py first")
         return False
 
-    site_df = pd.read_csv(SITE_DQI_PATH)
+    site_df = read_table(SITE_DQI_PATH)
     print(f"\n[OK] Loaded site data: {len(site_df):,} sites")
 
     subject_df = None
-    if SUBJECT_DQI_PATH.exists():
-        subject_df = pd.read_csv(SUBJECT_DQI_PATH)
+    if table_exists(SUBJECT_DQI_PATH):
+        # Only the subject count is reported, so load just the key columns
+        subject_df = read_table(SUBJECT_DQI_PATH, columns=['study', 'subject_id'])
         print(f"[OK] Loaded subject data: {len(subject_df):,} subjects")
 
     # Load pre-computed aggregated data (optional - enhances regional analysis)
@@ -1016,16 +1019,16 @@ def run_anomaly_detection():
     region_df = None
     country_df = None
 
-    if STUDY_DQI_PATH.exists():
-        study_df = pd.read_csv(STUDY_DQI_PATH)
+    if table_exists(STUDY_DQI_PATH):
+        study_df = read_table(STUDY_DQI_PATH)
         print(f"[OK] Loaded study data: {len(study_df)} studies (pre-computed)")
 
-    if REGION_DQI_PATH.exists():
-        region_df = pd.read_csv(REGION_DQI_PATH)
+    if table_exists(REGION_DQI_PATH):
+        region_df = read_table(REGION_DQI_PATH)
         print(f"[OK] Loaded region data: {len(region_df)} regions (pre-computed)")
 
-    if COUNTRY_DQI_PATH.exists():
-        country_df = pd.read_csv(COUNTRY_DQI_PATH)
+    if table_exists(COUNTRY_DQI_PATH):
+        country_df = read_table(COUNTRY_DQI_PATH)
         print(f"[OK] Loaded country data: {len(country_df)} countries (pre-computed)")
 
     print(f"\nStudies: {site_df['study'].nunique()}")
@@ -1136,7 +1139,7 @@ def run_anomaly_detection():
     # Save all anomalies
     anomalies_df = pd.DataFrame(all_anomalies)
     anomalies_path = PHASE_06_DIR / "anomalies_detected.csv"
-    anomalies_df.to_csv(anomalies_path, index=False)
+    write_table(anomalies_df, anomalies_path)
     print(f"\n[OK] Saved: {anomalies_path}")
     print(f"   {len(anomalies_df)} anomalies")
 
@@ -1146,7 +1149,7 @@ def run_anomaly_detection():
     else:
         score_df['is_anomaly'] = False
     scores_path = PHASE_06_DIR / "site_anomaly_scores.csv"
-    score_df.to_csv(scores_path, index=False)
+    write_table(score_df, scores_path)
     print(f"\n[OK] Saved: {scores_path}")
     print(f"   {len(score_df)} sites scored")
 
@@ -11,6 +11,8 @@ Prerequisites:
     - Run 06_anomaly_detection.py (Phase 06)
     - outputs/phase03/master_site_with_dqi.csv must exist
     - outputs/phase06/site_anomaly_scores.csv must exist
+    - outputs/phase03/dqi_components.npy is used, when present, to name the
+      features driving each site's DQI
 
 Usage:
     python src/phases/07_multi_agent_system.py
@@ -105,12 +107,16 @@ REGION_DQI_PATH = PHASE_03_DIR / "master_region_with_dqi.csv"
 COUNTRY_DQI_PATH = PHASE_03_DIR / "master_country_with_dqi.csv"
 ANOMALIES_PATH = PHASE_06_DIR / "anomalies_detected.csv"
 SITE_ANOMALY_SCORES_PATH = PHASE_06_DIR / "site_anomaly_scores.csv"
+COMPONENT_STORE_PATH = PHASE_03_DIR / "dqi_components.npy"
 
 # Output paths (to Phase 07)
 RECOMMENDATIONS_PATH = PHASE_07_DIR / "multi_agent_recommendations.csv"
 AGENT_ANALYSIS_PATH = PHASE_07_DIR / "agent_analysis.json"
 REPORT_PATH = PHASE_07_DIR / "multi_agent_report.md"
 
+from utils.table_io import read_table, write_table, table_exists
+from utils.component_store import load_component_store
+
 # Configuration
 TOP_SITES_TO_ANALYZE = 50
 AGENT_TIMEOUT = 30
@@ -420,6 +426,12 @@ class DataQualityAgent(BaseAgent):
         dqi_score = site_data.get('avg_dqi_score', 0)
         metrics['dqi_score'] = dqi_score
 
+        # What drives the site's DQI (Phase 03 component store)
+        drivers = site_data.get('dqi_drivers') or []
+        if drivers:
+            metrics['dqi_drivers'] = {d['feature']: round(float(d['share']), 3) for d in drivers}
+            findings.append("DQI driven by " + ", ".join(f"{d['feature']} ({d['share']:.0%})" for d in drivers))
+
         risk_level = self._calculate_risk_level(quality_score)
         confidence = 0.85
 
@@ -891,18 +903,18 @@ def run_multi_agent_analysis(model: str = "mistral", top_sites: int = TOP_SITES_
     print("STEP 1: LOAD DATA")
     print("=" * 70)
 
-    if not SITE_DQI_PATH.exists():
+    if not table_exists(SITE_DQI_PATH):
         print(f"\n[ERROR] Site DQI file not found: {SITE_DQI_PATH}")
         print("Please run Phase 03 first.")
         return False
 
-    site_df = pd.read_csv(SITE_DQI_PATH)
+    site_df = read_table(SITE_DQI_PATH)
     print(f"  [OK] Loaded {len(site_df):,} sites")
 
     # Load optional files
-    study_df = pd.read_csv(STUDY_DQI_PATH) if STUDY_DQI_PATH.exists() else None
-    region_df = pd.read_csv(REGION_DQI_PATH) if REGION_DQI_PATH.exists() else None
-    country_df = pd.read_csv(COUNTRY_DQI_PATH) if COUNTRY_DQI_PATH.exists() else None
+    study_df = read_table(STUDY_DQI_PATH) if table_exists(STUDY_DQI_PATH) else None
+    region_df = read_table(REGION_DQI_PATH) if table_exists(REGION_DQI_PATH) else None
+    country_df = read_table(COUNTRY_DQI_PATH) if table_exists(COUNTRY_DQI_PATH) else None
 
     if study_df is not None:
         print(f"  [OK] Loaded {len(study_df)} studies")
@@ -913,8 +925,8 @@ def run_multi_agent_analysis(model: str = "mistral", top_sites: int = TOP_SITES_
 
     # Load anomalies if available
     anomalies_df = None
-    if SITE_ANOMALY_SCORES_PATH.exists():
-        anomalies_df = pd.read_csv(SITE_ANOMALY_SCORES_PATH)
+    if table_exists(SITE_ANOMALY_SCORES_PATH):
+        anomalies_df = read_table(SITE_ANOMALY_SCORES_PATH)
         print(f"  [OK] Loaded anomaly scores for {len(anomalies_df)} sites")
 
     # Enrich site data with anomaly info
@@ -927,6 +939,16 @@ def run_multi_agent_analysis(model: str = "mistral", top_sites: int = TOP_SITES_
         site_df['anomaly_score'] = site_df['anomaly_score'].fillna(0)
         site_df['is_anomaly'] = site_df['is_anomaly'].fillna(False)
 
+    # Component scores explain what drives each site's DQI
+    component_store, site_rows = load_component_store(COMPONENT_STORE_PATH), {}
+    if component_store is not None and table_exists(SUBJECT_DQI_PATH):
+        subject_keys = read_table(SUBJECT_DQI_PATH, columns=['study', 'site_id', 'subject_id'])
+        if component_store.aligned_with(subject_keys):
+            site_rows = subject_keys.groupby(['study', 'site_id']).indices
+            print(f"  [OK] Loaded DQI components for {len(component_store):,} subjects")
+        else:
+            print("  [WARN] DQI components do not match the subject table - re-run Phase 03")
+
     # Set portfolio context
     print("\n" + "=" * 70)
     print("STEP 2: SET PORTFOLIO CONTEXT")
@@ -971,6 +993,8 @@ def run_multi_agent_analysis(model: str = "mistral", top_sites: int = TOP_SITES_
         site_data = row.to_dict()
         site_id = site_data.get('site_id', 'Unknown')
         study = site_data.get('study', 'Unknown')
+        if (study, site_id) in site_rows:
+            site_data['dqi_drivers'] = component_store.drivers(site_rows[(study, site_id)], top=3).to_dict('records')
 
         print(f"  [{idx+1}/{len(top_sites_df)}] Analyzing {site_id} ({study})...", end="")
 
@@ -994,7 +1018,7 @@ def run_multi_agent_analysis(model: str = "mistral", top_sites: int = TOP_SITES_
     # Save recommendations CSV
     recs_data = [asdict(r) for r in recommendations]
     recs_df = pd.DataFrame(recs_data)
-    recs_df.to_csv(RECOMMENDATIONS_PATH, index=False, encoding='utf-8')
+    write_table(recs_df, RECOMMENDATIONS_PATH, encoding='utf-8')
     print(f"  [OK] Saved: {RECOMMENDATIONS_PATH}")
 
     # Save detailed analysis JSON
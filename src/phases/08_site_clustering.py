@@ -116,6 +116,8 @@ CLUSTER_DISTRIBUTION_PATH = PHASE_08_DIR / "cluster_distribution.png"
 CLUSTER_HEATMAP_PATH = PHASE_08_DIR / "cluster_heatmap.png"
 CLUSTER_PCA_PATH = PHASE_08_DIR / "cluster_pca.png"
 
+from utils.table_io import read_table, write_table, table_exists
+
 # Default parameters
 DEFAULT_N_CLUSTERS = 5
 DEFAULT_ALGORITHM = 'gmm'
@@ -948,17 +950,17 @@ def run_site_clustering(algorithm: str = DEFAULT_ALGORITHM,
     print("STEP 1: LOAD DATA")
     print("=" * 70)
 
-    if not SITE_DQI_PATH.exists():
+    if not table_exists(SITE_DQI_PATH):
         print(f"\n[ERROR] Site DQI file not found: {SITE_DQI_PATH}")
         print("Please run Phase 03 first.")
         return False
 
-    site_df = pd.read_csv(SITE_DQI_PATH)
+    site_df = read_table(SITE_DQI_PATH)
     print(f"  [OK] Loaded {len(site_df):,} sites")
 
     # Load anomaly scores if available
-    if SITE_ANOMALY_PATH.exists():
-        anomaly_df = pd.read_csv(SITE_ANOMALY_PATH)
+    if table_exists(SITE_ANOMALY_PATH):
+        anomaly_df = read_table(SITE_ANOMALY_PATH)
         site_df = site_df.merge(
             anomaly_df[['study', 'site_id', 'anomaly_score', 'is_anomaly']],
             on=['study', 'site_id'],
@@ -1072,12 +1074,12 @@ def run_site_clustering(algorithm: str = DEFAULT_ALGORITHM,
     site_df['cluster_name'] = site_df['cluster_id'].map(cluster_name_map).fillna('Noise')
 
     # Save site clusters
-    site_df.to_csv(SITE_CLUSTERS_PATH, index=False, encoding='utf-8')
+    write_table(site_df, SITE_CLUSTERS_PATH, encoding='utf-8')
     print(f"  [OK] Saved: {SITE_CLUSTERS_PATH}")
 
     # Save cluster profiles
     profiles_df = pd.DataFrame([asdict(p) for p in profiles])
-    profiles_df.to_csv(CLUSTER_PROFILES_PATH, index=False, encoding='utf-8')
+    write_table(profiles_df, CLUSTER_PROFILES_PATH, encoding='utf-8')
     print(f"  [OK] Saved: {CLUSTER_PROFILES_PATH}")
 
     # Save summary JSON
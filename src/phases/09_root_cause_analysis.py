@@ -114,6 +114,7 @@ SITE_DQI_PATH = PHASE_03_DIR / "master_site_with_dqi.csv"
 STUDY_DQI_PATH = PHASE_03_DIR / "master_study_with_dqi.csv"
 REGION_DQI_PATH = PHASE_03_DIR / "master_region_with_dqi.csv"
 COUNTRY_DQI_PATH = PHASE_03_DIR / "master_country_with_dqi.csv"
+ROLLUP_CUBE_PATH = PHASE_03_DIR / "rollup_cube.parquet"
 ANOMALIES_PATH = PHASE_06_DIR / "anomalies_detected.csv"
 SITE_CLUSTERS_PATH = PHASE_08_DIR / "site_clusters.csv"
 CLUSTER_PROFILES_PATH = PHASE_08_DIR / "cluster_profiles.csv"
@@ -126,6 +127,9 @@ COOCCURRENCE_PATH = PHASE_09_DIR / "issue_cooccurrence.csv"
 GEOGRAPHIC_PATH = PHASE_09_DIR / "geographic_patterns.csv"
 FACTORS_PATH = PHASE_09_DIR / "contributing_factors.csv"
 
+from utils.table_io import read_table, write_table, table_exists
+from utils.rollup_cube import RollupCube, site_rollup_cube
+
 # Issue columns for analysis
 ISSUE_COLUMNS = [
     'sae_pending_count',
@@ -453,7 +457,8 @@ def analyze_geographic_patterns(site_df: pd.DataFrame,
 # ============================================================================
 
 def analyze_contributing_factors(site_df: pd.DataFrame,
-                                 subject_df: pd.DataFrame = None) -> pd.DataFrame:
+                                 subject_df: pd.DataFrame = None,
+                                 cube: Optional[RollupCube] = None) -> pd.DataFrame:
     """
     Analyze factors that contribute to data quality issues.
 
@@ -491,34 +496,29 @@ def analyze_contributing_factors(site_df: pd.DataFrame,
                 'interpretation':_interpret_size_factor(str(size_label), size_sites)
             })
 
+    # Factors 2 and 3 are rollups of the Phase 03 cube
+    if cube is None and 'avg_dqi_score' in site_df.columns and 'subject_count' in site_df.columns:
+        cube = site_rollup_cube(site_df, ROLLUP_CUBE_PATH)
+
     # Factor 2: Study
-    if 'study' in site_df.columns and 'avg_dqi_score' in site_df.columns:
-        study_stats = site_df.groupby('study').agg({
-            'site_id':'count',
-            'avg_dqi_score':'mean',
-            'high_risk_count':'sum' if 'high_risk_count' in site_df else 'size',
-            'subject_count':'sum' if 'subject_count' in site_df else 'size'
-        }).reset_index()
+    if cube is not None and 'study' in site_df.columns:
+        study_stats = cube.rollup('study')
 
         for _, row in study_stats.iterrows():
             results.append({
                 'factor':'Study',
                 'category':row['study'],
-                'site_count':int(row['site_id']),
+                'site_count':int(row['site_count']),
                 'avg_dqi_score':round(row['avg_dqi_score'], 4),
-                'high_risk_rate':round(row['high_risk_count'] / max(row['subject_count'], 1),
-                                       4) if 'high_risk_count' in row else 0,
-                'interpretation':f"Study {row['study']} has {row['site_id']} sites with avg DQI {row['avg_dqi_score']:.4f}"
+                'high_risk_rate':round(row['high_risk_subjects'] / max(row['subject_count'], 1), 4),
+                'interpretation':f"Study {row['study']} has {row['site_count']} sites with avg DQI {row['avg_dqi_score']:.4f}"
             })
 
     # Factor 3: Region
-    if 'region' in site_df.columns and 'avg_dqi_score' in site_df.columns:
-        region_stats = site_df.groupby('region').agg({
-            'site_id':'count',
-            'avg_dqi_score':'mean'
-        }).reset_index()
+    if cube is not None and 'region' in site_df.columns:
+        region_stats = cube.rollup('region')
 
-        portfolio_avg = site_df['avg_dqi_score'].mean()
+        portfolio_avg = cube.total()['avg_dqi_score']
 
         for _, row in region_stats.iterrows():
             deviation = (row['avg_dqi_score'] - portfolio_avg) / portfolio_avg if portfolio_avg > 0 else 0
@@ -526,7 +526,7 @@ def analyze_contributing_factors(site_df: pd.DataFrame,
             results.append({
                 'factor':'Region',
                 'category':row['region'],
-                'site_count':int(row['site_id']),
+                'site_count':int(row['site_count']),
                 'avg_dqi_score':round(row['avg_dqi_score'], 4),
                 'high_risk_rate':round(deviation, 4),
                 'interpretation':f"{row['region']}: {'Above' if deviation > 0 else 'Below'} portfolio average by {abs(deviation) * 100:.1f}%"
@@ -1055,23 +1055,24 @@ def run_root_cause_analysis(include_clusters: bool = True,
     print("STEP 1: LOAD DATA")
     print("=" * 70)
 
-    if not SITE_DQI_PATH.exists():
+    if not table_exists(SITE_DQI_PATH):
         print(f"\n[ERROR] Site DQI file not found: {SITE_DQI_PATH}")
         print("Please run Phase 03 first.")
         return False
 
-    site_df = pd.read_csv(SITE_DQI_PATH)
+    site_df = read_table(SITE_DQI_PATH)
     print(f"  [OK] Loaded {len(site_df):,} sites")
 
     # Load subject data if available
     subject_df = None
-    if SUBJECT_DQI_PATH.exists():
-        subject_df = pd.read_csv(SUBJECT_DQI_PATH)
+    if table_exists(SUBJECT_DQI_PATH):
+        # Subject rows feed only the co-occurrence analysis and counts
+        subject_df = read_table(SUBJECT_DQI_PATH, columns=['study', 'site_id', 'subject_id'] + ISSUE_COLUMNS)
         print(f"  [OK] Loaded {len(subject_df):,} subjects")
 
     # Load region/country data if available
-    region_df = pd.read_csv(REGION_DQI_PATH) if REGION_DQI_PATH.exists() else None
-    country_df = pd.read_csv(COUNTRY_DQI_PATH) if COUNTRY_DQI_PATH.exists() else None
+    region_df = read_table(REGION_DQI_PATH) if table_exists(REGION_DQI_PATH) else None
+    country_df = read_table(COUNTRY_DQI_PATH) if table_exists(COUNTRY_DQI_PATH) else None
 
     if region_df is not None:
         print(f"  [OK] Loaded {len(region_df)} regions")
@@ -1080,8 +1081,8 @@ def run_root_cause_analysis(include_clusters: bool = True,
 
     # Load cluster data if available
     cluster_df = None
-    if include_clusters and SITE_CLUSTERS_PATH.exists():
-        cluster_df = pd.read_csv(SITE_CLUSTERS_PATH)
+    if include_clusters and table_exists(SITE_CLUSTERS_PATH):
+        cluster_df = read_table(SITE_CLUSTERS_PATH)
         print(f"  [OK] Loaded cluster assignments for {len(cluster_df)} sites")
 
     # Issue Co-occurrence Analysis
@@ -1147,23 +1148,23 @@ def run_root_cause_analysis(include_clusters: bool = True,
     # Save root causes
     root_causes_data = [asdict(rc) for rc in root_causes]
     root_causes_df = pd.DataFrame(root_causes_data)
-    root_causes_df.to_csv(ROOT_CAUSE_PATH, index=False, encoding='utf-8')
+    write_table(root_causes_df, ROOT_CAUSE_PATH, encoding='utf-8')
     print(f"  [OK] Saved: {ROOT_CAUSE_PATH}")
 
     # Save co-occurrence matrix
     if not cooccurrence_matrix.empty:
-        cooccurrence_matrix.to_csv(COOCCURRENCE_PATH, encoding='utf-8')
+        write_table(cooccurrence_matrix, COOCCURRENCE_PATH, index=True, encoding='utf-8')
         print(f"  [OK] Saved: {COOCCURRENCE_PATH}")
 
     # Save geographic patterns
     if geographic_patterns:
         geo_df = pd.DataFrame([asdict(p) for p in geographic_patterns])
-        geo_df.to_csv(GEOGRAPHIC_PATH, index=False, encoding='utf-8')
+        write_table(geo_df, GEOGRAPHIC_PATH, encoding='utf-8')
         print(f"  [OK] Saved: {GEOGRAPHIC_PATH}")
 
     # Save contributing factors
     if not factors_df.empty:
-        factors_df.to_csv(FACTORS_PATH, index=False)
+        write_table(factors_df, FACTORS_PATH)
         print(f"  [OK] Saved: {FACTORS_PATH}")
 
     # Save summary JSON
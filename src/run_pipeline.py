@@ -86,6 +86,13 @@ except ImportError:
     print("Make sure config.py exists in src/ directory")
     sys.exit(1)
 
+try:
+    from utils.table_io import table_exists
+except ImportError as e:
+    print(f"ERROR: Could not import utils.table_io ({e})")
+    print("Make sure src/utils/ exists and requirements.txt is installed")
+    sys.exit(1)
+
 
 # ============================================================================
 # LOGGING SETUP
@@ -280,7 +287,7 @@ def check_phase_dependencies(phase_num: str, logger: PipelineLogger) -> tuple:
             from config import OUTPUT_FILES
             if output_key in OUTPUT_FILES:
                 output_file = OUTPUT_FILES[output_key]
-                if output_file.exists():
+                if table_exists(output_file):
                     phase_output_exists = True
                     break
 
@@ -316,7 +323,7 @@ def check_phase_completed(phase_num: str, logger: PipelineLogger) -> bool:
         for output_key in core_outputs:
             if output_key in OUTPUT_FILES:
                 output_file = OUTPUT_FILES[output_key]
-                if not output_file.exists():
+                if not table_exists(output_file):
                     return False
         return True
 
@@ -325,7 +332,7 @@ def check_phase_completed(phase_num: str, logger: PipelineLogger) -> bool:
         for output_key in required_outputs:
             if output_key in OUTPUT_FILES:
                 output_file = OUTPUT_FILES[output_key]
-                if not output_file.exists():
+                if not table_exists(output_file):
                     all_exist = False
                     break
         return all_exist
@@ -439,7 +446,7 @@ def execute_phase(phase_num: str, logger: PipelineLogger, skip_completed: bool =
             from config import OUTPUT_FILES
             if output_key in OUTPUT_FILES:
                 output_file = OUTPUT_FILES[output_key]
-                if output_file.exists():
+                if table_exists(output_file):
                     outputs.append(str(output_file.relative_to(PROJECT_ROOT)))
 
         logger.phase_success(phase_num, duration, outputs)
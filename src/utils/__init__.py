@@ -7,8 +7,20 @@ to eliminate code duplication and ensure consistency.
 
 Modules:
     - data_loader: Excel reading, column finding, standardization
+    - column_resolver: Memoized column matching and per-header rename plans
     - validation: Data quality checks, outlier capping, safe aggregations
     - dqi_calculator: DQI scoring, risk categorization, aggregations
+    - workbook_cache: Persistent Parquet cache of parsed workbooks
+    - subject_index: Canonical subject keys and the subject -> site index
+    - source_aggregation: Spec-driven vectorized per-subject aggregation
+    - incremental: Input fingerprints and per-study partials for incremental runs
+    - table_io: Typed Parquet storage for inter-phase tables (CSV as export)
+    - scoring_model: Frozen DQI baseline for scoring subjects without a recompute
+    - quantile_sketch: Mergeable KLL sketches for percentile thresholds
+    - rollup_cube: Site-grain aggregate cube for study/region/country rollups
+    - component_store: Memory-mapped per-feature DQI component scores
+    - parallel: Process pools over inputs shared through shared memory
+    - result_cache: Content-addressed cache of results computed from tables
 
 Usage:
 ------
@@ -23,6 +35,62 @@ from .data_loader import (
     standardize_columns,
     read_excel_smart,
     detect_header_row,
+    detect_header_in_rows,
+    read_excel_sheets,
+    read_sheet_rows,
+    frame_from_rows,
+    parse_workbook,
+    read_pipeline_workbook,
+)
+
+# Column Resolver
+from .column_resolver import (
+    ColumnResolver,
+    get_column_resolver,
+)
+
+# Workbook Cache
+from .workbook_cache import (
+    read_workbook_cached,
+    file_fingerprint,
+    clear_workbook_cache,
+    is_cache_enabled,
+)
+
+# Subject Index
+from .subject_index import (
+    SubjectIndex,
+    normalize_subject_id,
+    normalize_subject_ids,
+    add_subject_key,
+)
+
+# Source Aggregation
+from .source_aggregation import (
+    get_aggregation_specs,
+    evaluate_predicate,
+    spec_metric_columns,
+    aggregate_source_frame,
+    merge_source_aggregates,
+)
+
+# Incremental Build State
+from .incremental import (
+    PartialStore,
+    fingerprint_inputs,
+    diff_fingerprints,
+    config_digest,
+)
+
+# Table Storage
+from .table_io import (
+    write_table,
+    read_table,
+    table_exists,
+    apply_table_schema,
+    widen_float32,
+    iter_table,
+    TableWriter,
 )
 
 # Validation Utilities
@@ -32,11 +100,17 @@ from .validation import (
     safe_max,
     safe_mean,
     fill_missing_categoricals,
+    clean_text,
     validate_required_columns,
 )
 
 # DQI Calculation Utilities
 from .dqi_calculator import (
+    feature_matrix,
+    reference_maxima,
+    component_basis,
+    dqi_kernel,
+    score_many,
     calculate_component_score,
     calculate_dqi_with_weights,
     assign_risk_categories,
@@ -46,6 +120,51 @@ from .dqi_calculator import (
     validate_dqi_weights,
 )
 
+# Quantile Sketches
+from .quantile_sketch import (
+    KLLSketch,
+    rank_error,
+    column_sketches,
+    merge_sketches,
+)
+
+# Scoring Model
+from .scoring_model import (
+    ScoringModel,
+    load_scoring_model,
+)
+
+# Rollup Cube
+from .rollup_cube import (
+    RollupCube,
+    CUBE_DIMENSIONS,
+    load_rollup_cube,
+    site_rollup_cube,
+)
+
+# Component Store
+from .component_store import (
+    ComponentStore,
+    ComponentWriter,
+    component_columns,
+    drop_component_columns,
+    load_component_store,
+)
+
+# Parallel Work
+from .parallel import (
+    SharedArrays,
+    parallel_map,
+    resolve_jobs,
+)
+
+# Result Cache
+from .result_cache import (
+    ResultCache,
+    frame_digest,
+    is_result_cache_enabled,
+)
+
 # Aggregation Utilities
 from .aggregation import (
     aggregate_to_site,
@@ -54,6 +173,8 @@ from .aggregation import (
     aggregate_to_country,
     assign_aggregated_risk,
     calculate_risk_rates,
+    group_codes,
+    group_means,
 )
 
 # Conditionally import encoding fix (only for non-Streamlit environments)
@@ -76,14 +197,58 @@ __all__ = [
     'standardize_columns',
     'read_excel_smart',
     'detect_header_row',
+    'detect_header_in_rows',
+    'read_excel_sheets',
+    'read_sheet_rows',
+    'frame_from_rows',
+    'parse_workbook',
+    'read_pipeline_workbook',
+    # Column Resolver
+    'ColumnResolver',
+    'get_column_resolver',
+    # Workbook Cache
+    'read_workbook_cached',
+    'file_fingerprint',
+    'clear_workbook_cache',
+    'is_cache_enabled',
+    # Subject Index
+    'SubjectIndex',
+    'normalize_subject_id',
+    'normalize_subject_ids',
+    'add_subject_key',
+    # Source Aggregation
+    'get_aggregation_specs',
+    'evaluate_predicate',
+    'spec_metric_columns',
+    'aggregate_source_frame',
+    'merge_source_aggregates',
+    # Incremental Build State
+    'PartialStore',
+    'fingerprint_inputs',
+    'diff_fingerprints',
+    'config_digest',
+    # Table Storage
+    'write_table',
+    'read_table',
+    'table_exists',
+    'apply_table_schema',
+    'widen_float32',
+    'iter_table',
+    'TableWriter',
     # Validation
     'validate_loaded_data',
     'cap_outliers',
     'safe_max',
     'safe_mean',
     'fill_missing_categoricals',
+    'clean_text',
     'validate_required_columns',
     # DQI Calculator
+    'feature_matrix',
+    'reference_maxima',
+    'component_basis',
+    'dqi_kernel',
+    'score_many',
     'calculate_component_score',
     'calculate_dqi_with_weights',
     'assign_risk_categories',
@@ -91,6 +256,33 @@ __all__ = [
     'calculate_subject_dqi',
     'get_risk_distribution',
     'validate_dqi_weights',
+    # Quantile Sketches
+    'KLLSketch',
+    'rank_error',
+    'column_sketches',
+    'merge_sketches',
+    # Scoring Model
+    'ScoringModel',
+    'load_scoring_model',
+    # Rollup Cube
+    'RollupCube',
+    'CUBE_DIMENSIONS',
+    'load_rollup_cube',
+    'site_rollup_cube',
+    # Component Store
+    'ComponentStore',
+    'ComponentWriter',
+    'component_columns',
+    'drop_component_columns',
+    'load_component_store',
+    # Parallel Work
+    'SharedArrays',
+    'parallel_map',
+    'resolve_jobs',
+    # Result Cache
+    'ResultCache',
+    'frame_digest',
+    'is_result_cache_enabled',
     # Aggregation
     'aggregate_to_site',
     'aggregate_to_study',
@@ -98,6 +290,8 @@ __all__ = [
     'aggregate_to_country',
     'assign_aggregated_risk',
     'calculate_risk_rates',
+    'group_codes',
+    'group_means',
     # Encoding
     'force_utf8'
 ]
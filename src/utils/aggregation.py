@@ -20,12 +20,16 @@ Functions:
     - aggregate_to_region: Study → Region aggregation
     - aggregate_to_country: Site → Country aggregation
     - assign_aggregated_risk: Assign risk categories at aggregated levels
+    - group_codes: Integer group codes for repeated aggregation
+    - group_means: Per-group means of many value columns via np.bincount
 """
 
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 
+from .quantile_sketch import KLLSketch
+
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -341,7 +345,8 @@ def assign_aggregated_risk(
     high_percentile: float = 0.85,
     medium_percentile: float = 0.50,
     min_high_threshold: float = 0.05,
-    min_medium_threshold: float = 0.02
+    min_medium_threshold: float = 0.02,
+    sketch: Optional[KLLSketch] = None
 ) -> Tuple[pd.DataFrame, Dict[str, float]]:
     """
     Assign risk categories for aggregated data (site/study/region/country).
@@ -356,6 +361,9 @@ def assign_aggregated_risk(
         medium_percentile: Percentile for medium-risk threshold
         min_high_threshold: Minimum score for high risk
         min_medium_threshold: Minimum score for medium risk
+        sketch: Sketch of the positive scores of all rows (e.g. merged
+            per-study sketches); thresholds are read from it, so df can be
+            one partition
 
     Returns:
         Tuple of (DataFrame with risk column, thresholds used)
@@ -365,7 +373,11 @@ def assign_aggregated_risk(
     # Get scores with issues
     scores_with_issues = df[df[score_col] > 0][score_col]
 
-    if len(scores_with_issues) > 0:
+    if sketch is not None and sketch.n > 0:
+        high_thresh, med_thresh = sketch.quantiles([high_percentile, medium_percentile])
+        high_thresh = max(high_thresh, min_high_threshold)
+        med_thresh = max(med_thresh, min_medium_threshold)
+    elif sketch is None and len(scores_with_issues) > 0:
         high_thresh = scores_with_issues.quantile(high_percentile)
         med_thresh = scores_with_issues.quantile(medium_percentile)
         high_thresh = max(high_thresh, min_high_threshold)
@@ -416,3 +428,55 @@ def calculate_risk_rates(
             df['low_risk_rate'] = 1 - df.get('high_risk_rate', 0) - df.get('medium_risk_rate', 0)
 
     return df
+
+
+def group_codes(df: pd.DataFrame, keys: List[str]) -> Tuple[np.ndarray, pd.MultiIndex]:
+    """
+    Compute integer group codes once, for repeated aggregation.
+
+    Codes follow the sorted group order of df.groupby(keys); rows with a
+    missing key get -1 and are left out, as groupby does.
+
+    Args:
+        df: Frame holding the key columns
+        keys: Grouping columns
+
+    Returns:
+        Tuple of (codes array aligned with df rows, group index)
+
+    Examples:
+        >>> codes, sites = group_codes(df, ['study', 'site_id'])
+    """
+    grouped = df.groupby(keys, sort=True)
+    codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    return codes, grouped.size().index
+
+
+def group_means(values: np.ndarray, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Per-group means of every column of a value matrix with one np.bincount.
+
+    Args:
+        values: (rows,) or (rows, K) array
+        codes: Group code per row from group_codes (-1 = excluded)
+        n_groups: Number of groups
+
+    Returns:
+        (n_groups,) or (n_groups, K) float64 array of means; missing values
+        are skipped as in pandas, and groups without values are NaN
+    """
+    values = np.asarray(values, dtype=np.float64)
+    flat = values.ndim == 1
+    if flat:
+        values = values[:, None]
+    keep = codes >= 0
+    values, codes = values[keep], codes[keep]
+    K = values.shape[1]
+
+    offsets = (codes[:, None] + n_groups * np.arange(K)).ravel()
+    valid = ~np.isnan(values)
+    sums = np.bincount(offsets, weights=np.where(valid, values, 0.0).ravel(), minlength=n_groups * K)
+    counts = np.bincount(offsets, weights=valid.ravel(), minlength=n_groups * K)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (sums / counts).reshape(K, n_groups).T
+    return means[:, 0] if flat else means
@@ -0,0 +1,213 @@
+"""
+JAVELIN.AI - Column Resolver
+============================
+
+Memoized fuzzy column matching and rename plans.
+
+find_column lowercases every column name and runs a names x columns
+substring search on each call, and standardize_columns repeats that for
+every mapping key of every file. Files of the same export share their
+headers, so ColumnResolver compiles the mappings once and caches each
+resolution on the tuple of column names: a header seen before costs one
+dict lookup.
+
+Match modes (all return the first hit in priority order):
+    - 'exact_first': exact match over all candidate names, then partial
+      (case-insensitive substring either way); utils.find_column
+    - 'per_name': for each candidate name, exact then partial before
+      trying the next name; the phase scripts' find_column
+    - 'partial': partial matches only
+
+Classes:
+    - ColumnResolver: Compiled mappings with cached lookups and rename plans
+
+Functions:
+    - get_column_resolver: Shared resolver over config.COLUMN_MAPPINGS
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+MATCH_MODES = ('exact_first', 'per_name', 'partial')
+
+# Distinct headers seen in one run are few; the cache is reset past this size
+_MAX_CACHE_ENTRIES = 4096
+
+
+class ColumnResolver:
+    """
+    Column mappings compiled once, with resolutions cached per header.
+
+    Args:
+        column_mappings: file_type -> {standard_name: [possible names]}
+            (e.g. config.COLUMN_MAPPINGS); may be None when only find() is used
+        mode: Match mode, one of MATCH_MODES
+
+    Examples:
+        >>> resolver = ColumnResolver(COLUMN_MAPPINGS, mode='per_name')
+        >>> resolver.rename_plan(df.columns, 'visit_tracker')
+        {'Subject': 'subject_id', 'Site': 'site_id', ...}
+        >>> df = resolver.standardize(df, 'visit_tracker')
+        >>> resolver.find(df.columns, ['Days Outstanding'])
+        '# Days Outstanding'
+    """
+
+    def __init__(self, column_mappings: Optional[Dict[str, Dict[str, List[str]]]] = None,
+                 mode: str = 'exact_first'):
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode: {mode} (expected one of {MATCH_MODES})")
+        self.mode = mode
+        self._mappings: Dict[str, Tuple[Tuple[str, Tuple[str, ...]], ...]] = {
+            file_type: tuple((standard, tuple(names)) for standard, names in mapping.items())
+            for file_type, mapping in (column_mappings or {}).items()
+        }
+        self._lowered: Dict[str, str] = {}
+        self._find_cache: Dict[Tuple, Optional[Any]] = {}
+        self._plan_cache: Dict[Tuple, Dict[Any, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _lower(self, name: str) -> str:
+        lowered = self._lowered.get(name)
+        if lowered is None:
+            lowered = self._lowered[name] = name.lower().strip()
+        return lowered
+
+    def _match(self, columns: Tuple, columns_lower: Tuple[str, ...],
+               names: Tuple[str, ...]) -> Optional[Any]:
+        if not columns or not names:
+            return None
+
+        def partial(name):
+            name_lower = self._lower(name)
+            for i, col_lower in enumerate(columns_lower):
+                if name_lower in col_lower or col_lower in name_lower:
+                    return columns[i]
+            return None
+
+        if self.mode == 'per_name':
+            for name in names:
+                if name in columns:
+                    return name
+                found = partial(name)
+                if found is not None:
+                    return found
+            return None
+
+        if self.mode == 'exact_first':
+            for name in names:
+                if name in columns:
+                    return name
+        for name in names:
+            found = partial(name)
+            if found is not None:
+                return found
+        return None
+
+    def _check_size(self):
+        if len(self._find_cache) + len(self._plan_cache) > _MAX_CACHE_ENTRIES:
+            self._find_cache.clear()
+            self._plan_cache.clear()
+
+    def find(self, columns: Sequence[Any], possible_names: Sequence[str]) -> Optional[Any]:
+        """
+        Find the column matching the first possible name.
+
+        Args:
+            columns: Actual column names
+            possible_names: Candidate names in priority order
+
+        Returns:
+            The actual column name, or None
+        """
+        columns = tuple(columns)
+        key = (columns, tuple(possible_names))
+        if key in self._find_cache:
+            self.hits += 1
+            return self._find_cache[key]
+        self.misses += 1
+        self._check_size()
+        columns_lower = tuple(str(c).lower().strip() for c in columns)
+        found = self._find_cache[key] = self._match(columns, columns_lower, key[1])
+        return found
+
+    def rename_plan(self, columns: Sequence[Any], file_type: str) -> Dict[Any, str]:
+        """
+        Resolve every mapping key of a file type against one header.
+
+        All keys are matched against the original column names, and a later
+        key that resolves to the same column overrides an earlier one.
+
+        Args:
+            columns: Actual column names
+            file_type: Key into the column mappings
+
+        Returns:
+            Dict of actual column -> standard name (columns already named
+            correctly are left out); treat as read-only, it is cached
+        """
+        columns = tuple(columns)
+        key = (file_type, columns)
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            self.hits += 1
+            return plan
+        self.misses += 1
+        self._check_size()
+
+        columns_lower = tuple(str(c).lower().strip() for c in columns)
+        plan = {}
+        for standard_name, names in self._mappings.get(file_type, ()):
+            actual = self._match(columns, columns_lower, names)
+            if actual and actual != standard_name:
+                plan[actual] = standard_name
+        self._plan_cache[key] = plan
+        return plan
+
+    def standardize(self, df: pd.DataFrame, file_type: str) -> pd.DataFrame:
+        """
+        Rename a frame's columns to the standard names of its file type.
+
+        Args:
+            df: Input DataFrame
+            file_type: Key into the column mappings
+
+        Returns:
+            Renamed DataFrame (the input itself when nothing needs renaming)
+        """
+        plan = self.rename_plan(df.columns, file_type)
+        return df.rename(columns=plan) if plan else df
+
+    def cache_info(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of cached resolutions."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'entries': len(self._find_cache) + len(self._plan_cache)}
+
+
+_SHARED: Dict[str, ColumnResolver] = {}
+
+
+def get_column_resolver(mode: str = 'exact_first') -> ColumnResolver:
+    """
+    Return the process-wide resolver over config.COLUMN_MAPPINGS.
+
+    Args:
+        mode: Match mode, one of MATCH_MODES
+
+    Returns:
+        Shared ColumnResolver for that mode
+    """
+    resolver = _SHARED.get(mode)
+    if resolver is None:
+        try:
+            from config import COLUMN_MAPPINGS
+        except ImportError:
+            from .data_loader import _get_default_column_mappings
+            COLUMN_MAPPINGS = _get_default_column_mappings()
+        resolver = _SHARED[mode] = ColumnResolver(COLUMN_MAPPINGS, mode=mode)
+    return resolver
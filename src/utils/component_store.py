@@ -0,0 +1,418 @@
+"""
+JAVELIN.AI - Component Score Store
+==================================
+
+Per-feature DQI component scores kept out of the subject table.
+
+A subject's DQI score is the sum of one weighted component per feature.
+Storing those components as <feature>_component columns used to give
+master_subject_with_dqi one float column per weighted feature, and every
+phase and the dashboard paid for them on each load, though only a score
+explanation needs them. Phase 03 now writes them once, as a float32 matrix
+(outputs/phase03/dqi_components.npy, one row per subject in subject-table
+order, one column per feature) with a JSON sidecar holding the feature
+names, weights, the scoring model id and a digest of the (study,
+subject_id) row keys.
+
+The matrix is memory-mapped on load, so explaining one subject reads one
+row, not the whole matrix. aligned_with() checks the row keys against a
+subject table before rows are looked up by position.
+
+Classes:
+    - ComponentStore: Memory-mapped component matrix with explain/drivers accessors
+    - ComponentWriter: Build the store chunk by chunk (out-of-core scoring)
+
+Functions:
+    - component_columns: The <feature>_component columns of a frame
+    - drop_component_columns: A frame without its component columns
+    - load_component_store: Open the saved store (None when absent)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .table_io import widen_float32
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Bump when the matrix or sidecar layout changes
+COMPONENT_STORE_VERSION = 1
+
+COMPONENT_SUFFIX = '_component'
+
+# Columns identifying a subject row (checked by aligned_with)
+_ROW_KEYS = ['study', 'subject_id']
+
+
+def _get_store_path() -> Path:
+    """Return the component store path from config, with a local fallback."""
+    try:
+        from config import OUTPUT_FILES
+        return Path(OUTPUT_FILES['dqi_components'])
+    except (ImportError, KeyError):
+        return Path(__file__).resolve().parent.parent.parent / "outputs" / "phase03" / "dqi_components.npy"
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_suffix('.json')
+
+
+def component_columns(df: pd.DataFrame) -> List[str]:
+    """Names of the <feature>_component columns in df, in column order."""
+    return [c for c in df.columns if str(c).endswith(COMPONENT_SUFFIX)]
+
+
+def drop_component_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """df without its <feature>_component columns."""
+    return df.drop(columns=component_columns(df))
+
+
+def _update_key_digest(digest, df: pd.DataFrame):
+    """Fold the row keys of df into a running sha256 (chunking does not change the result)."""
+    keys = df[[c for c in _ROW_KEYS if c in df.columns]].astype(str)
+    digest.update(pd.util.hash_pandas_object(keys, index=False).to_numpy().tobytes())
+
+
+def _key_digest(df: pd.DataFrame) -> str:
+    digest = hashlib.sha256()
+    _update_key_digest(digest, df)
+    return digest.hexdigest()[:16]
+
+
+def _store_meta(n_rows: int, features: Sequence[str], weights: Sequence[float],
+                model_id: Optional[str], key_digest: Optional[str]) -> Dict[str, Any]:
+    """Sidecar contents for a store of n_rows x len(features) components."""
+    return {
+        'version': COMPONENT_STORE_VERSION,
+        'n_rows': int(n_rows),
+        'model_id': model_id,
+        'key_digest': key_digest,
+        'features': [{'feature': f, 'weight': float(w)} for f, w in zip(features, weights)],
+    }
+
+
+def _write_meta(path: Path, meta: Dict[str, Any]):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp_', suffix='.json')
+    with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+        json.dump(meta, fh, indent=2)
+    os.replace(tmp, _meta_path(path))
+
+
+class ComponentStore:
+    """
+    DQI component scores of every subject, aligned to the subject table.
+
+    Row i holds the components of row i of master_subject_with_dqi; the
+    components of a row sum to its dqi_score.
+
+    Args:
+        matrix: (subjects, features) float32 matrix (may be a memmap)
+        features: Feature of each matrix column
+        weights: Weight of each feature (for explanations)
+        model_id: Id of the scoring model that produced the scores
+        key_digest: Digest of the (study, subject_id) row keys
+
+    Examples:
+        >>> store = load_component_store()
+        >>> subjects = read_table(OUTPUT_FILES['master_subject_with_dqi'])
+        >>> if store is not None and store.aligned_with(subjects):
+        ...     store.explain(store.locate(subjects, 'Study_1', 'Subject 42'))
+    """
+
+    def __init__(self, matrix: np.ndarray, features: Sequence[str],
+                 weights: Optional[Sequence[float]] = None, model_id: Optional[str] = None,
+                 key_digest: Optional[str] = None):
+        if matrix.ndim != 2 or matrix.shape[1] != len(features):
+            raise ValueError(f"Component matrix of shape {matrix.shape} does not match {len(features)} features")
+        self.matrix = matrix
+        self.features: List[str] = list(features)
+        self.weights: List[float] = [float(w) for w in weights] if weights is not None \
+            else [np.nan] * len(self.features)
+        self.model_id = model_id
+        self.key_digest = key_digest
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def __repr__(self) -> str:
+        return f"ComponentStore(subjects={len(self):,}, features={len(self.features)}, model={self.model_id})"
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, weights: Optional[Dict[str, float]] = None,
+                   model_id: Optional[str] = None) -> 'ComponentStore':
+        """
+        Collect the <feature>_component columns of a scored subject frame.
+
+        Args:
+            df: Subjects as calculate_subject_dqi / ScoringModel.score return them
+            weights: Weight per feature (e.g. dict(zip(model.features, model.weights)))
+            model_id: Id of the scoring model
+
+        Returns:
+            In-memory store with one row per row of df
+        """
+        columns = component_columns(df)
+        features = [c[:-len(COMPONENT_SUFFIX)] for c in columns]
+        matrix = df[columns].to_numpy(dtype=np.float32) if columns else np.empty((len(df), 0), dtype=np.float32)
+        return cls(matrix, features, weights=[(weights or {}).get(f, np.nan) for f in features],
+                   model_id=model_id, key_digest=_key_digest(df))
+
+    def aligned_with(self, subjects: pd.DataFrame) -> bool:
+        """Whether row i of the store belongs to row i of subjects (same length and row keys)."""
+        return len(subjects) == len(self) and (self.key_digest is None or _key_digest(subjects) == self.key_digest)
+
+    @staticmethod
+    def locate(subjects: pd.DataFrame, study: str, subject_id: str) -> Optional[int]:
+        """
+        Row position of a subject in the subject table.
+
+        Returns:
+            Position, or None when the subject is not in the table
+        """
+        match = np.flatnonzero((subjects['study'] == study).to_numpy() &
+                               (subjects['subject_id'].astype(str) == str(subject_id)).to_numpy())
+        return int(match[0]) if len(match) else None
+
+    def scores(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """DQI scores recomputed from the components (float64)."""
+        block = self.matrix if rows is None else self.matrix[np.asarray(rows, dtype=np.int64)]
+        return block.astype(np.float64).sum(axis=1)
+
+    def frame(self, rows: Optional[Sequence[int]] = None) -> pd.DataFrame:
+        """
+        Components as the legacy <feature>_component columns.
+
+        Args:
+            rows: Row positions (all rows when None)
+
+        Returns:
+            DataFrame indexed by row position
+        """
+        index = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        block = np.asarray(self.matrix[index])
+        return pd.DataFrame({f'{f}{COMPONENT_SUFFIX}': widen_float32(block[:, j])
+                             for j, f in enumerate(self.features)}, index=index)
+
+    def explain(self, row: int, top: Optional[int] = None) -> pd.DataFrame:
+        """
+        Break one subject's DQI score down by feature.
+
+        Args:
+            row: Row position in the subject table
+            top: Keep only the largest contributions
+
+        Returns:
+            DataFrame with feature, weight, component and share (of the
+            score), largest component first; features contributing nothing
+            are left out
+        """
+        values = widen_float32(np.asarray(self.matrix[int(row)]))
+        return self._contributions(values, top)
+
+    def drivers(self, rows: Sequence[int], top: Optional[int] = None) -> pd.DataFrame:
+        """
+        What drives the DQI of a group of subjects (e.g. one site).
+
+        Components are summed over rows, so share is each feature's part of
+        the group's total score.
+
+        Args:
+            rows: Row positions in the subject table
+            top: Keep only the largest contributions
+
+        Returns:
+            DataFrame with feature, weight, component (group mean) and share
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return self._contributions(np.zeros(len(self.features)), top)
+        values = np.asarray(self.matrix[rows], dtype=np.float64).mean(axis=0)
+        return self._contributions(values, top)
+
+    def _contributions(self, values: np.ndarray, top: Optional[int]) -> pd.DataFrame:
+        total = values.sum()
+        out = pd.DataFrame({
+            'feature': self.features,
+            'weight': self.weights,
+            'component': values,
+            'share': values / total if total > 0 else np.zeros(len(values)),
+        })
+        out = out[out['component'] > 0].sort_values('component', ascending=False, kind='stable')
+        return out.head(top).reset_index(drop=True) if top else out.reset_index(drop=True)
+
+    def _meta(self) -> Dict[str, Any]:
+        return _store_meta(len(self), self.features, self.weights, self.model_id, self.key_digest)
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Write the matrix (.npy, float32) and its sidecar, each atomically.
+
+        Args:
+            path: Target .npy file (defaults to OUTPUT_FILES['dqi_components'])
+
+        Returns:
+            Path written
+        """
+        path = Path(path) if path is not None else _get_store_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp_', suffix='.npy')
+        with os.fdopen(fd, 'wb') as fh:
+            np.save(fh, np.ascontiguousarray(self.matrix, dtype=np.float32))
+        os.replace(tmp, path)
+        _write_meta(path, self._meta())
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[Union[str, Path]] = None, mmap: bool = True) -> 'ComponentStore':
+        """
+        Open a saved store.
+
+        Args:
+            path: .npy file (defaults to OUTPUT_FILES['dqi_components'])
+            mmap: Memory-map the matrix instead of reading it
+
+        Raises:
+            FileNotFoundError: If the matrix or its sidecar does not exist
+            ValueError: If the store is from another format version or the
+                matrix does not match its sidecar
+        """
+        path = Path(path) if path is not None else _get_store_path()
+        with open(_meta_path(path), 'r', encoding='utf-8') as fh:
+            meta = json.load(fh)
+        if meta.get('version') != COMPONENT_STORE_VERSION:
+            raise ValueError(f"Component store version {meta.get('version')} is not supported "
+                             f"(expected {COMPONENT_STORE_VERSION}); re-run Phase 03")
+        matrix = np.load(path, mmap_mode='r' if mmap else None)
+        if matrix.shape[0] != meta['n_rows']:
+            raise ValueError(f"{path.name} has {matrix.shape[0]:,} rows, its sidecar {meta['n_rows']:,}")
+        return cls(matrix, [f['feature'] for f in meta['features']],
+                   weights=[f['weight'] for f in meta['features']],
+                   model_id=meta.get('model_id'), key_digest=meta.get('key_digest'))
+
+
+class ComponentWriter:
+    """
+    Build the component store chunk by chunk.
+
+    Each chunk's component rows are appended to a temporary file; close()
+    adds the .npy header and moves the store into place, so memory stays
+    bounded by the chunk size. The features are fixed by the first chunk.
+
+    Args:
+        path: Target .npy file (defaults to OUTPUT_FILES['dqi_components'])
+        weights: Weight per feature
+        model_id: Id of the scoring model
+
+    Examples:
+        >>> with ComponentWriter(weights=dict(zip(model.features, model.weights))) as components:
+        ...     for chunk in chunks:
+        ...         scored = model.score(chunk)
+        ...         components.write(scored)
+        ...         writer.write(drop_component_columns(scored))
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, weights: Optional[Dict[str, float]] = None,
+                 model_id: Optional[str] = None):
+        self.path = Path(path) if path is not None else _get_store_path()
+        self.weights = weights or {}
+        self.model_id = model_id
+        self.rows = 0
+        self.features: Optional[List[str]] = None
+        self._columns = None
+        self._digest = hashlib.sha256()
+        self._fh = None
+        self._tmp = None
+
+    def __enter__(self) -> 'ComponentWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, df: pd.DataFrame):
+        """
+        Append the component rows of one scored chunk.
+
+        Raises:
+            ValueError: If the chunk's component columns differ from the first chunk's
+        """
+        columns = component_columns(df)
+        if self._fh is None:
+            self._columns = columns
+            self.features = [c[:-len(COMPONENT_SUFFIX)] for c in columns]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, self._tmp = tempfile.mkstemp(dir=self.path.parent, prefix='.tmp_', suffix='.raw')
+            self._fh = os.fdopen(fd, 'wb')
+        elif columns != self._columns:
+            raise ValueError(f"Chunk component columns {columns} differ from {self._columns}")
+        self._fh.write(df[self._columns].to_numpy(dtype='<f4').tobytes())
+        _update_key_digest(self._digest, df)
+        self.rows += len(df)
+
+    def close(self) -> Optional[Path]:
+        """
+        Finish the store and move it into place.
+
+        Returns:
+            Path written, or None when no chunk was written
+        """
+        if self._fh is None:
+            return None
+        self._fh.close()
+        self._fh = None
+        header = {'descr': np.lib.format.dtype_to_descr(np.dtype(np.float32)), 'fortran_order': False,
+                  'shape': (self.rows, len(self.features))}
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix='.tmp_', suffix='.npy')
+        with os.fdopen(fd, 'wb') as out, open(self._tmp, 'rb') as raw:
+            np.lib.format.write_array_header_1_0(out, header)
+            shutil.copyfileobj(raw, out, 1 << 20)
+        os.remove(self._tmp)
+        self._tmp = None
+        os.replace(tmp, self.path)
+
+        _write_meta(self.path, _store_meta(self.rows, self.features,
+                                           [self.weights.get(f, np.nan) for f in self.features],
+                                           self.model_id, self._digest.hexdigest()[:16]))
+        return self.path
+
+    def abort(self):
+        """Discard the partial store; an existing store is left untouched."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self._tmp is not None and os.path.exists(self._tmp):
+            os.remove(self._tmp)
+        self._tmp = None
+
+
+def load_component_store(path: Optional[Union[str, Path]] = None, mmap: bool = True) -> Optional[ComponentStore]:
+    """
+    Open the saved component store, if there is a usable one.
+
+    Args:
+        path: .npy file (defaults to OUTPUT_FILES['dqi_components'])
+        mmap: Memory-map the matrix instead of reading it
+
+    Returns:
+        ComponentStore, or None when the store is missing, unreadable or
+        from another format version
+    """
+    try:
+        return ComponentStore.load(path, mmap=mmap)
+    except (OSError, ValueError, KeyError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"   [WARN] Ignoring component store ({e})")
+        return None
@@ -12,17 +12,57 @@ Functions:
     - find_column: Fuzzy match column names
     - standardize_columns: Rename columns to standard names
     - read_excel_smart: Intelligent Excel reading with header detection
+    - parse_workbook: Raw (unstandardized) frame of a study workbook
+    - read_pipeline_workbook: Raw (unstandardized) frame of a study workbook, as Phases 00 and 02 read it
     - detect_header_row: Find the actual header row in messy Excel files
+    - read_excel_sheets: Single-open streaming reader for one or many sheets
+    - read_sheet_rows / frame_from_rows: Raw rows and pandas-equivalent frames
+
+Parsed workbooks are cached on disk (see workbook_cache), so repeated
+reads of an unchanged file skip openpyxl entirely.
 """
 
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Callable
+from pandas.io.parsers import TextParser
+from pandas.errors import EmptyDataError
+
+try:
+    from openpyxl import load_workbook
+    from openpyxl.cell.cell import ERROR_CODES
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+    ERROR_CODES = ()
+
+from .workbook_cache import read_workbook_cached
+from .column_resolver import ColumnResolver, get_column_resolver
 
 import warnings
 warnings.filterwarnings('ignore')
 
+# Bump when parsing logic changes so cached workbook frames are invalidated
+LOADER_VERSION = 3
+
+# Parsing rules of the two workbook loaders (see parse_workbook). The
+# settings are part of each loader's cache key.
+SMART_PARSE_SETTINGS = {
+    'header_rows': 10,
+    'drop_rows': '(?i)Subject ID|Responsible|Total|Summary',
+    'skip_bad_sheets': True,
+}
+# Phase 00 and Phase 02 read through this loader, so they share cache entries
+PIPELINE_PARSE_SETTINGS = {
+    'header_rows': 5,
+    'drop_rows': 'Subject ID|Responsible',
+    'skip_bad_sheets': False,
+}
+
+# Workbook formats openpyxl can stream; anything else goes through pd.ExcelFile
+_OPENPYXL_SUFFIXES = ('.xlsx', '.xlsm', '.xltx', '.xltm')
+
 
 def find_column(
     df_columns: List[str],
@@ -33,7 +73,8 @@ def find_column(
     Find a column name from a list of possible names using fuzzy matching.
 
     Searches for exact matches first, then partial matches (substring).
-    Case-insensitive matching is used for partial matches.
+    Case-insensitive matching is used for partial matches. Results are
+    memoized per header by the shared ColumnResolver.
 
     Args:
         df_columns: List of actual column names in the DataFrame
@@ -51,28 +92,8 @@ def find_column(
         >>> find_column(cols, ['site_id', 'Site', 'Site Number'])
         'Site Number'
     """
-    if not df_columns or not possible_names:
-        return None
-
-    # Convert to list if needed
-    df_columns = list(df_columns)
-    df_columns_lower = [str(c).lower().strip() for c in df_columns]
-
-    # First pass: exact matches
-    if exact_match_first:
-        for name in possible_names:
-            if name in df_columns:
-                return name
-
-    # Second pass: case-insensitive partial matches
-    for name in possible_names:
-        name_lower = name.lower().strip()
-        for i, col_lower in enumerate(df_columns_lower):
-            # Check if either contains the other
-            if name_lower in col_lower or col_lower in name_lower:
-                return df_columns[i]
-
-    return None
+    mode = 'exact_first' if exact_match_first else 'partial'
+    return get_column_resolver(mode).find(df_columns, possible_names)
 
 
 def standardize_columns(
@@ -84,7 +105,8 @@ def standardize_columns(
     Rename DataFrame columns to standard names based on file type.
 
     Uses a mapping dictionary to find and rename columns to consistent
-    names across different data sources.
+    names across different data sources. With the config mappings, the
+    rename plan is cached per header (see ColumnResolver).
 
     Args:
         df: Input DataFrame
@@ -100,29 +122,11 @@ def standardize_columns(
         >>> list(df.columns)
         ['subject_id', 'site_id']
     """
-    # Import mappings from config if not provided
     if column_mappings is None:
-        try:
-            from config import COLUMN_MAPPINGS
-            column_mappings = COLUMN_MAPPINGS
-        except ImportError:
-            # Fallback mappings if config not available
-            column_mappings = _get_default_column_mappings()
-
-    mapping = column_mappings.get(file_type, {})
-    if not mapping:
-        return df
-
-    rename_dict = {}
-    for standard_name, possible_names in mapping.items():
-        actual_col = find_column(df.columns.tolist(), possible_names)
-        if actual_col and actual_col != standard_name:
-            rename_dict[actual_col] = standard_name
-
-    if rename_dict:
-        df = df.rename(columns=rename_dict)
-
-    return df
+        resolver = get_column_resolver()
+    else:
+        resolver = ColumnResolver(column_mappings)
+    return resolver.standardize(df, file_type)
 
 
 def detect_header_row(
@@ -164,6 +168,206 @@ def detect_header_row(
     return 0  # Default to first row
 
 
+def detect_header_in_rows(
+    rows: List[list],
+    header_indicators: List[str],
+    max_rows_to_check: int = 10
+) -> int:
+    """
+    Detect the header row in raw sheet rows (as returned by the streaming reader).
+
+    Same rule as detect_header_row, but works on the in-memory rows so the
+    workbook does not have to be parsed twice.
+
+    Args:
+        rows: Sheet rows, with empty cells as ''
+        header_indicators: Strings that indicate a header row
+        max_rows_to_check: Maximum number of rows to scan
+
+    Returns:
+        Row index of the detected header (0-indexed)
+    """
+    for i in range(min(max_rows_to_check, len(rows))):
+        row_str = ' '.join('nan' if v == '' else str(v) for v in rows[i])
+        for indicator in header_indicators:
+            if indicator in row_str:
+                return i
+
+    return 0
+
+
+def _convert_cell_value(value: Any) -> Any:
+    """Convert an openpyxl cell value the same way pandas' openpyxl reader does."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        as_int = int(value)
+        return as_int if as_int == value else float(value)
+    if isinstance(value, str) and value in ERROR_CODES:
+        return np.nan
+    return value
+
+
+def _stream_sheet_rows(ws, max_rows: Optional[int] = None) -> List[list]:
+    """Stream a read-only worksheet into row lists with trailing blanks trimmed."""
+    ws.reset_dimensions()
+    rows = []
+    for row in ws.iter_rows(max_row=max_rows, values_only=True):
+        converted = [_convert_cell_value(v) for v in row]
+        while converted and converted[-1] == '':
+            converted.pop()
+        rows.append(converted)
+    return rows
+
+
+def frame_from_rows(
+    rows: List[list],
+    header: Optional[int] = 0,
+    nrows: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Build a DataFrame from raw sheet rows exactly as pd.read_excel would.
+
+    Rows are padded in place; pass copies if the same rows are reused.
+
+    Args:
+        rows: Sheet rows from the streaming reader
+        header: Header row index, or None for no header
+        nrows: Optional number of data rows to keep
+
+    Returns:
+        DataFrame with pandas' usual header handling and type inference
+    """
+    if nrows is not None:
+        rows = rows[:(1 if header is None else header + 1) + nrows]
+
+    # Trim trailing empty rows, then pad to a rectangle
+    last = len(rows) - 1
+    while last >= 0 and not rows[last]:
+        last -= 1
+    rows = rows[:last + 1]
+    if not rows:
+        return pd.DataFrame()
+    width = max(len(r) for r in rows)
+    for r in rows:
+        r.extend([''] * (width - len(r)))
+
+    try:
+        return TextParser(rows, header=header, nrows=nrows, skip_blank_lines=False).read(nrows=nrows)
+    except EmptyDataError:
+        return pd.DataFrame()
+
+
+def read_sheet_rows(
+    filepath: Union[str, Path],
+    max_rows: Optional[int] = None
+) -> List[list]:
+    """
+    Stream the raw rows of the first worksheet without building a DataFrame.
+
+    Useful when several header candidates must be tried on the same rows
+    (see frame_from_rows).
+
+    Args:
+        filepath: Path to the Excel file
+        max_rows: Only stream this many rows
+
+    Returns:
+        List of rows, with empty cells as ''
+    """
+    filepath = Path(filepath)
+
+    if HAS_OPENPYXL and filepath.suffix.lower() in _OPENPYXL_SUFFIXES:
+        wb = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+        try:
+            if not wb.worksheets:
+                return []
+            return _stream_sheet_rows(wb.worksheets[0], max_rows)
+        finally:
+            wb.close()
+
+    raw = pd.read_excel(filepath, sheet_name=0, header=None, nrows=max_rows)
+    return raw.astype(object).where(raw.notna(), '').values.tolist()
+
+
+def read_excel_sheets(
+    filepath: Union[str, Path],
+    sheet_filter: Optional[List[str]] = None,
+    header: Union[int, None, Callable[[List[list]], Optional[int]]] = 0,
+    max_sheets: Optional[int] = None,
+    max_rows: Optional[int] = None,
+    skip_bad_sheets: bool = False
+) -> Dict[str, pd.DataFrame]:
+    """
+    Read sheets from a workbook with a single open, streaming rows.
+
+    The workbook is opened once with openpyxl in read-only mode and every
+    selected sheet is built from that handle, instead of re-opening the
+    zip for each pd.read_excel call. Header detection runs on the rows
+    already in memory. Formats openpyxl cannot stream (e.g. .xls) fall
+    back to a single pd.ExcelFile handle.
+
+    Args:
+        filepath: Path to the Excel file
+        sheet_filter: Only read sheets whose name contains one of these strings
+        header: Header row index, None, or a callable taking the raw rows
+            and returning the header row index
+        max_sheets: Stop after this many sheets (1 = first sheet only)
+        max_rows: Only stream this many rows per sheet
+        skip_bad_sheets: Skip sheets that fail to parse instead of raising
+
+    Returns:
+        Dict of sheet name -> DataFrame, in workbook order
+
+    Examples:
+        >>> frames = read_excel_sheets(path, sheet_filter=['SAE', 'Dashboard'])
+        >>> first = read_excel_sheets(path, max_sheets=1)
+    """
+    filepath = Path(filepath)
+    frames = {}
+
+    if HAS_OPENPYXL and filepath.suffix.lower() in _OPENPYXL_SUFFIXES:
+        wb = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+        try:
+            for ws in wb.worksheets:
+                if sheet_filter and not any(f in ws.title for f in sheet_filter):
+                    continue
+                try:
+                    rows = _stream_sheet_rows(ws, max_rows)
+                    header_row = header(rows) if callable(header) else header
+                    frames[ws.title] = frame_from_rows(rows, header_row)
+                except Exception:
+                    if not skip_bad_sheets:
+                        raise
+                if max_sheets and len(frames) >= max_sheets:
+                    break
+        finally:
+            wb.close()
+        return frames
+
+    with pd.ExcelFile(filepath) as xl:
+        for sheet in xl.sheet_names:
+            if sheet_filter and not any(f in sheet for f in sheet_filter):
+                continue
+            try:
+                if callable(header):
+                    raw = xl.parse(sheet, header=None, nrows=max_rows)
+                    rows = raw.astype(object).where(raw.notna(), '').values.tolist()
+                    header_row = header(rows)
+                else:
+                    header_row = header
+                nrows = None if max_rows is None else max_rows - (1 if header_row is None else header_row + 1)
+                frames[sheet] = xl.parse(sheet, header=header_row, nrows=nrows)
+            except Exception:
+                if not skip_bad_sheets:
+                    raise
+            if max_sheets and len(frames) >= max_sheets:
+                break
+    return frames
+
+
 def read_excel_smart(
     filepath: Union[str, Path],
     file_type: str,
@@ -194,17 +398,11 @@ def read_excel_smart(
     filepath = Path(filepath)
 
     try:
-        if file_type == 'edc_metrics':
-            df = _read_edc_metrics(filepath)
-
-        elif file_type == 'sae_dashboard':
-            df = _read_multi_sheet_file(filepath, sheet_filter=['SAE', 'Dashboard'])
-
-        elif file_type == 'missing_pages':
-            df = _read_multi_sheet_file(filepath, sheet_filter=None)
+        # Parsed frames come from the on-disk cache when the file is unchanged
+        df = _read_workbook(filepath, file_type, 'utils.read_excel_smart', SMART_PARSE_SETTINGS)
 
-        else:
-            df = pd.read_excel(filepath, sheet_name=0)
+        if file_type in ('sae_dashboard', 'missing_pages') and '_source_sheet' in df.columns:
+            print(f"      Combined {df['_source_sheet'].nunique()} sheets: {len(df)} total rows")
 
         # Apply validation if requested
         if validate and not df.empty:
@@ -222,55 +420,82 @@ def read_excel_smart(
         return pd.DataFrame()
 
 
-def _read_edc_metrics(filepath: Path) -> pd.DataFrame:
-    """Read EDC Metrics file with header detection."""
-    # First read without header to detect actual header row
-    df_raw = pd.read_excel(filepath, sheet_name=0, header=None)
+def parse_workbook(
+    filepath: Union[str, Path],
+    file_type: str,
+    header_rows: int = 5,
+    drop_rows: str = 'Subject ID|Responsible',
+    skip_bad_sheets: bool = False
+) -> pd.DataFrame:
+    """
+    Parse a study workbook into a raw DataFrame using type-specific handling.
 
-    header_row = detect_header_row(df_raw, ['Subject ID', 'Project Name'])
+    EDC Metrics detects its header in the first header_rows rows and drops
+    rows whose Subject ID is missing or matches drop_rows; SAE Dashboard and
+    Missing Pages combine their sheets with a '_source_sheet' column; other
+    types read the first sheet. Columns are not standardized.
+
+    Args:
+        filepath: Path to the Excel file
+        file_type: Classified file type
+        header_rows: Rows scanned for the EDC Metrics header
+        drop_rows: Regex of non-data Subject ID values in EDC Metrics
+            (prefix with '(?i)' to ignore case)
+        skip_bad_sheets: Skip multi-sheet tabs that fail to parse instead
+            of raising
 
-    # Re-read with correct header
-    df = pd.read_excel(filepath, sheet_name=0, header=header_row)
+    Returns:
+        Raw DataFrame (empty when the workbook has no data)
+    """
+    if file_type == 'edc_metrics':
+        frames = read_excel_sheets(
+            filepath, max_sheets=1,
+            header=lambda rows: detect_header_in_rows(rows, ['Subject ID', 'Project Name'],
+                                                      max_rows_to_check=header_rows)
+        )
+        df = next(iter(frames.values()), pd.DataFrame())
+        if 'Subject ID' in df.columns:
+            df = df[df['Subject ID'].notna()]
+            df = df[~df['Subject ID'].astype(str).str.contains(drop_rows, na=False)]
+        return df
+    if file_type in ('sae_dashboard', 'missing_pages'):
+        sheet_filter = ['SAE', 'Dashboard'] if file_type == 'sae_dashboard' else None
+        all_dfs = []
+        frames = read_excel_sheets(filepath, sheet_filter=sheet_filter, skip_bad_sheets=skip_bad_sheets)
+        for sheet, df_sheet in frames.items():
+            if not df_sheet.empty:
+                df_sheet['_source_sheet'] = sheet
+                all_dfs.append(df_sheet)
+        if all_dfs:
+            return pd.concat(all_dfs, ignore_index=True, sort=False)
+        return pd.DataFrame()
+    frames = read_excel_sheets(filepath, max_sheets=1)
+    return next(iter(frames.values()), pd.DataFrame())
 
-    # Filter out non-data rows
-    if 'Subject ID' in df.columns:
-        df = df[df['Subject ID'].notna()]
-        df = df[~df['Subject ID'].astype(str).str.contains(
-            'Subject ID|Responsible|Total|Summary', na=False, case=False
-        )]
 
-    return df
+def _read_workbook(filepath: Union[str, Path], file_type: str, loader_name: str,
+                   settings: Dict[str, Any]) -> pd.DataFrame:
+    """parse_workbook with the given settings, through the workbook cache."""
+    loader_version = f"{LOADER_VERSION}:" + ",".join(f"{k}={settings[k]!r}" for k in sorted(settings))
+    return read_workbook_cached(filepath, file_type, lambda p: parse_workbook(p, file_type, **settings),
+                                loader_name=loader_name, loader_version=loader_version)
 
 
-def _read_multi_sheet_file(
-    filepath: Path,
-    sheet_filter: Optional[List[str]] = None
-) -> pd.DataFrame:
-    """Read and combine multiple sheets from an Excel file."""
-    xl = pd.ExcelFile(filepath)
-    all_dfs = []
-
-    for sheet in xl.sheet_names:
-        # Apply sheet filter if provided
-        if sheet_filter:
-            if not any(f in sheet for f in sheet_filter):
-                continue
+def read_pipeline_workbook(filepath: Union[str, Path], file_type: str) -> pd.DataFrame:
+    """
+    Raw frame of a study workbook as the pipeline reads it (cached).
 
-        try:
-            df_sheet = pd.read_excel(filepath, sheet_name=sheet)
-            if not df_sheet.empty:
-                df_sheet['_source_sheet'] = sheet
-                all_dfs.append(df_sheet)
-        except Exception:
-            continue
+    Phase 00 diagnostics and the Phase 02 build share this loader, so a
+    workbook parsed by one is a cache hit for the other. Errors propagate.
 
-    if all_dfs:
-        df = pd.concat(all_dfs, ignore_index=True, sort=False)
-        total_rows = sum(len(d) for d in all_dfs)
-        print(f"      Combined {len(all_dfs)} sheets: {total_rows} total rows")
-        return df
+    Args:
+        filepath: Path to the Excel file
+        file_type: Classified file type
 
-    return pd.DataFrame()
+    Returns:
+        Raw DataFrame
+    """
+    return _read_workbook(filepath, file_type, 'utils.read_pipeline_workbook', PIPELINE_PARSE_SETTINGS)
 
 
 def _get_default_column_mappings() -> Dict[str, Dict[str, List[str]]]:
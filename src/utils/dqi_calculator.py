@@ -16,7 +16,21 @@ Risk Categories:
     - Medium: Any issue present, not High
     - Low: No issues detected
 
+Scoring Kernel:
+    All scoring goes through dqi_kernel, which works on one contiguous
+    (subjects x features) float32 matrix: reference maxima are computed per
+    column, binary and severity components for every feature in one
+    broadcast into a single preallocated component matrix, and the score
+    is accumulated feature by feature. The DataFrame wrappers below build
+    the matrix once and widen the float32 results at their stored precision
+    (see table_io.widen_float32).
+
 Functions:
+    - feature_matrix: Build the contiguous float32 feature matrix
+    - reference_maxima: Column-wise reference maxima for severity scaling
+    - component_basis: Weight-independent component matrix
+    - dqi_kernel: Score and component matrix from a feature matrix
+    - score_many: Scores for many weight vectors with one matrix multiply
     - calculate_reference_max: Compute reference maximum for severity scaling
     - calculate_component_score: Calculate weighted score for a feature
     - calculate_dqi_with_weights: Calculate full DQI score with custom weights
@@ -25,7 +39,10 @@ Functions:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, Optional, Any
+from typing import Dict, Sequence, Tuple, Optional, Any
+
+from .table_io import widen_float32
+from .quantile_sketch import KLLSketch
 
 import warnings
 warnings.filterwarnings('ignore')
@@ -38,6 +55,219 @@ DEFAULT_MIN_SAMPLES = 20
 DEFAULT_REFERENCE_PERCENTILE = 0.95
 
 
+def feature_matrix(
+    df: pd.DataFrame,
+    features: Sequence[str],
+    dtype: Any = np.float32
+) -> np.ndarray:
+    """
+    Build the feature matrix the scoring kernel works on.
+
+    Args:
+        df: Frame holding the feature columns
+        features: Feature columns, in scoring order (all must exist in df)
+        dtype: Matrix dtype (float32 by default; counts are exact up to 2**24)
+
+    Returns:
+        Fortran-ordered (len(df), len(features)) array, so every feature
+        is one contiguous column
+    """
+    matrix = np.empty((len(df), len(features)), dtype=dtype, order='F')
+    for j, feature in enumerate(features):
+        matrix[:, j] = pd.to_numeric(df[feature], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    return matrix
+
+
+def reference_maxima(
+    X: Optional[np.ndarray],
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    percentile: float = DEFAULT_REFERENCE_PERCENTILE,
+    min_reference: Optional[float] = 1.0,
+    sketches: Optional[Sequence[KLLSketch]] = None
+) -> np.ndarray:
+    """
+    Column-wise reference maxima for severity scaling.
+
+    Same rule as calculate_reference_max, applied to every column: the
+    percentile of the non-zero values when there are at least min_samples
+    of them, else their maximum, else 1.0. Computed in float64.
+
+    Args:
+        X: Feature matrix (subjects x features); unused when sketches given
+        min_samples: Minimum non-zero samples required for percentile
+        percentile: Percentile to use for reference
+        min_reference: Floor applied to every reference (None for no floor)
+        sketches: One sketch of the non-zero values per column (see
+            quantile_sketch.column_sketches), e.g. merged across studies
+
+    Returns:
+        float64 array with one reference maximum per column
+    """
+    if sketches is not None:
+        refs = np.ones(len(sketches), dtype=np.float64)
+        for j, sketch in enumerate(sketches):
+            if sketch.n >= min_samples:
+                ref_max = sketch.quantile(percentile)
+                refs[j] = ref_max if ref_max > 0 else sketch.max
+            elif sketch.n > 0:
+                refs[j] = sketch.max
+        if min_reference is not None:
+            np.maximum(refs, min_reference, out=refs)
+        return refs
+
+    refs = np.ones(X.shape[1], dtype=np.float64)
+    for j in range(X.shape[1]):
+        column = X[:, j]
+        non_zero = column[column > 0].astype(np.float64)
+        if len(non_zero) >= min_samples:
+            ref_max = np.quantile(non_zero, percentile)
+            refs[j] = ref_max if ref_max > 0 else non_zero.max()
+        elif len(non_zero) > 0:
+            refs[j] = non_zero.max()
+    if min_reference is not None:
+        np.maximum(refs, min_reference, out=refs)
+    return refs
+
+
+def component_basis(
+    X: np.ndarray,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    percentile: float = DEFAULT_REFERENCE_PERCENTILE,
+    binary_weight: float = 0.5,
+    severity_weight: float = 0.5,
+    min_reference: Optional[float] = 1.0,
+    refs: Optional[Sequence[float]] = None
+) -> np.ndarray:
+    """
+    Unweighted per-feature components, shared by every weight vector.
+
+    basis[i, j] = binary_weight * (X[i, j] > 0)
+                  + severity_weight * clip(X[i, j] / ref[j], 0, 1)
+
+    Columns whose maximum is 0 are exactly 0. Missing values stay missing.
+
+    Args:
+        X: Feature matrix from feature_matrix (float32 or float64)
+        min_samples: Minimum non-zero samples for the percentile reference
+        percentile: Percentile for the reference maximum
+        binary_weight: Weight for binary component
+        severity_weight: Weight for severity component
+        min_reference: Floor for reference maxima (None for no floor)
+        refs: Frozen reference maxima (e.g. from a ScoringModel); when
+            given, nothing is estimated from X
+
+    Returns:
+        Fortran-ordered matrix of X's shape and dtype (a single allocation)
+    """
+    dtype = X.dtype
+    n, k = X.shape
+    if refs is None:
+        refs = reference_maxima(X, min_samples, percentile, min_reference)
+    refs = np.asarray(refs, dtype=np.float64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        col_max = np.nanmax(X, axis=0) if n else np.zeros(k)
+
+    basis = np.empty((n, k), dtype=dtype, order='F')
+    np.divide(X, refs.astype(dtype), out=basis)
+    np.clip(basis, 0, 1, out=basis)
+    basis *= dtype.type(severity_weight)
+    np.add(basis, dtype.type(binary_weight), out=basis, where=X > 0)
+    basis[:, col_max == 0] = 0
+    return basis
+
+
+def dqi_kernel(
+    X: np.ndarray,
+    weights: Sequence[float],
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    percentile: float = DEFAULT_REFERENCE_PERCENTILE,
+    binary_weight: float = 0.5,
+    severity_weight: float = 0.5,
+    min_reference: Optional[float] = 1.0,
+    refs: Optional[Sequence[float]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every subject from the feature matrix in one pass.
+
+    component[i, j] = weight[j] * basis[i, j] (see component_basis)
+
+    Features whose maximum is 0 contribute exactly 0. Missing values score
+    as missing, as in the Series implementation.
+
+    Args:
+        X: Feature matrix from feature_matrix (float32 or float64)
+        weights: One weight per column
+        min_samples: Minimum non-zero samples for the percentile reference
+        percentile: Percentile for the reference maximum
+        binary_weight: Weight for binary component
+        severity_weight: Weight for severity component
+        min_reference: Floor for reference maxima (None for no floor)
+        refs: Frozen reference maxima to use instead of estimating them
+
+    Returns:
+        Tuple of (scores clipped to [0, 1], component matrix), both in
+        X's dtype; the DataFrame is never touched
+
+    Examples:
+        >>> X = feature_matrix(df, features)
+        >>> scores, components = dqi_kernel(X, [w[f] for f in features])
+    """
+    components = component_basis(X, min_samples, percentile, binary_weight,
+                                 severity_weight, min_reference, refs)
+    components *= np.asarray(weights, dtype=np.float64).astype(X.dtype)
+
+    # Accumulate in feature order, as the per-feature loop did
+    scores = np.zeros(X.shape[0], dtype=X.dtype)
+    for j in range(X.shape[1]):
+        scores += components[:, j]
+    np.clip(scores, 0, 1, out=scores)
+    return scores, components
+
+
+def score_many(
+    features: np.ndarray,
+    weight_matrix: np.ndarray,
+    basis: Optional[np.ndarray] = None,
+    **basis_kwargs
+) -> np.ndarray:
+    """
+    Score K weight vectors at once.
+
+    The components do not depend on the weights, so the basis is built
+    once and every scenario is a column of one matrix multiply.
+
+    Args:
+        features: Feature matrix from feature_matrix (subjects x features)
+        weight_matrix: (K, features) array, one weight vector per row
+        basis: Precomputed component_basis(features) to reuse across calls
+        **basis_kwargs: Passed to component_basis (e.g. min_reference)
+
+    Returns:
+        (subjects, K) array of scores clipped to [0, 1], in the features'
+        dtype
+
+    Examples:
+        >>> X = feature_matrix(df, features)
+        >>> W = np.random.dirichlet(np.ones(len(features)), size=2000)
+        >>> scores = score_many(X, W)   # shape (len(df), 2000)
+    """
+    if basis is None:
+        basis = component_basis(features, **basis_kwargs)
+    weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=np.float64)).astype(basis.dtype)
+    if weight_matrix.shape[1] != basis.shape[1]:
+        raise ValueError(f"weight_matrix has {weight_matrix.shape[1]} columns, "
+                         f"expected one per feature ({basis.shape[1]})")
+    scores = basis @ weight_matrix.T
+    np.clip(scores, 0, 1, out=scores)
+    return scores
+
+
+def _widen(values: np.ndarray) -> np.ndarray:
+    """Kernel output as float64 for DataFrame columns."""
+    return widen_float32(values) if values.dtype == np.float32 else values
+
+
 def calculate_reference_max(
     series: pd.Series,
     min_samples: int = DEFAULT_MIN_SAMPLES,
@@ -109,23 +339,10 @@ def calculate_component_score(
         0.0
         >>> scores.iloc[-1]  # Highest value
     """
-    # Handle edge case of all zeros
-    if series.max() == 0:
-        return pd.Series(0.0, index=series.index)
-
-    # Binary component: 1 if has issue, 0 otherwise
-    binary = (series > 0).astype(float)
-
-    # Calculate reference maximum for severity scaling
-    reference_max = calculate_reference_max(series, min_samples)
-
-    # Severity component: scaled by reference max
-    severity = (series / reference_max).clip(0, 1)
-
-    # Combined score with weights
-    score = weight * (binary_weight * binary + severity_weight * severity)
-
-    return score
+    X = feature_matrix(series.to_frame(), [series.name if series.name is not None else 0])
+    _, components = dqi_kernel(X, [weight], min_samples,
+                               binary_weight=binary_weight, severity_weight=severity_weight)
+    return pd.Series(_widen(components[:, 0]), index=series.index)
 
 
 def calculate_dqi_with_weights(
@@ -151,21 +368,9 @@ def calculate_dqi_with_weights(
         >>> weights = {'sae_pending_count': 0.20, 'missing_visit_count': 0.15, ...}
         >>> scores = calculate_dqi_with_weights(df, weights)
     """
-    df = df.copy()
-    df['dqi_score_calc'] = 0.0
-
-    for feature, weight in weights.items():
-        if feature not in df.columns:
-            continue
-
-        component = calculate_component_score(
-            df[feature],
-            weight=weight,
-            min_samples=min_samples
-        )
-        df['dqi_score_calc'] += component
-
-    return df['dqi_score_calc'].clip(0, 1)
+    features = [f for f in weights if f in df.columns]
+    scores, _ = dqi_kernel(feature_matrix(df, features), [weights[f] for f in features], min_samples)
+    return pd.Series(_widen(scores), index=df.index)
 
 
 def assign_risk_categories(
@@ -174,7 +379,9 @@ def assign_risk_categories(
     high_percentile: float = 0.90,
     min_high_threshold: float = 0.10,
     sae_col: str = 'sae_pending_count',
-    has_issues_col: str = 'has_issues'
+    has_issues_col: str = 'has_issues',
+    sketch: Optional[KLLSketch] = None,
+    high_threshold: Optional[float] = None
 ) -> Tuple[pd.DataFrame, Dict[str, float], Dict[str, int]]:
     """
     Assign risk categories based on DQI scores with clinical override.
@@ -192,6 +399,11 @@ def assign_risk_categories(
         min_high_threshold: Minimum score for High (default: 0.10)
         sae_col: Column name for SAE count
         has_issues_col: Column name for has_issues flag
+        sketch: Sketch of the non-SAE scores with issues across the whole
+            population (e.g. merged per-study sketches); the threshold is
+            read from it instead of from df, so df can be one partition
+        high_threshold: Frozen High threshold (e.g. a ScoringModel's); when
+            given, no threshold is estimated and df can be any subset
 
     Returns:
         Tuple of:
@@ -225,7 +437,12 @@ def assign_risk_categories(
     # Calculate threshold from non-SAE subjects with issues
     non_sae_with_issues = df[(df[has_issues_col] == 1) & (~sae_mask)]
 
-    if len(non_sae_with_issues) > 0:
+    if high_threshold is not None:
+        high_threshold = float(high_threshold)
+    elif sketch is not None:
+        high_threshold = max(sketch.quantile(high_percentile), min_high_threshold) \
+            if sketch.n > 0 else min_high_threshold * 2
+    elif len(non_sae_with_issues) > 0:
         high_threshold = non_sae_with_issues[dqi_score_col].quantile(high_percentile)
         high_threshold = max(high_threshold, min_high_threshold)
     else:
@@ -285,46 +502,51 @@ def calculate_subject_dqi(
         except ImportError:
             raise ValueError("feature_weights must be provided if config is not available")
 
-    df = df.copy()
-
     # Calculate n_issue_types
     issue_columns = [
         col for col in feature_weights.keys()
         if col in df.columns and col != 'n_issue_types'
     ]
-    df['n_issue_types'] = (df[issue_columns] > 0).sum(axis=1)
-
-    # Initialize DQI score
-    df['dqi_score'] = 0.0
-    components = {}
+    n_issue_types = (df[issue_columns] > 0).sum(axis=1)
 
-    # Calculate each component
-    for feature, config in feature_weights.items():
-        if feature not in df.columns:
-            continue
+    features = [f for f in feature_weights if f in df.columns or f == 'n_issue_types']
+    source = df.assign(n_issue_types=n_issue_types) if 'n_issue_types' in features else df
+    weights = [
+        feature_weights[f]['weight'] if isinstance(feature_weights[f], dict) else feature_weights[f]
+        for f in features
+    ]
 
-        weight = config['weight'] if isinstance(config, dict) else config
-        tier = config.get('tier', 'Unknown') if isinstance(config, dict) else 'Unknown'
+    X = feature_matrix(source, features)
+    scores, component_matrix = dqi_kernel(X, weights)
 
-        component = calculate_component_score(df[feature], weight)
-        df[f'{feature}_component'] = component
-        df['dqi_score'] += component
+    # Assemble all new columns at once instead of growing a copy column by column
+    new_columns = {'n_issue_types': n_issue_types}
+    components = {}
+    for j, (feature, weight) in enumerate(zip(features, weights)):
+        config = feature_weights[feature]
+        component = _widen(component_matrix[:, j])
+        new_columns[f'{feature}_component'] = component
 
         # Track component statistics
+        raw = source[feature]
         components[feature] = {
             'weight': weight,
-            'tier': tier,
-            'subjects_with_issue': (df[feature] > 0).sum(),
-            'mean_raw_value': df[feature].mean(),
-            'max_raw_value': df[feature].max(),
-            'mean_component': component.mean(),
-            'max_component': component.max(),
+            'tier': config.get('tier', 'Unknown') if isinstance(config, dict) else 'Unknown',
+            'subjects_with_issue': (raw > 0).sum(),
+            'mean_raw_value': raw.mean(),
+            'max_raw_value': raw.max(),
+            'mean_component': np.nanmean(component) if len(component) else np.nan,
+            'max_component': np.nanmax(component) if len(component) else np.nan,
         }
 
-    # Clip final score to [0, 1]
-    df['dqi_score'] = df['dqi_score'].clip(0, 1)
-
-    return df, components
+    # Same column order as adding them one by one: n_issue_types, dqi_score, components
+    new_columns = {'n_issue_types': new_columns.pop('n_issue_types'), 'dqi_score': _widen(scores), **new_columns}
+    added = pd.DataFrame({c: v for c, v in new_columns.items() if c not in df.columns}, index=df.index)
+    result = pd.concat([df, added], axis=1)
+    for c in new_columns:
+        if c in df.columns:
+            result[c] = new_columns[c]
+    return result, components
 
 
 def get_risk_distribution(df: pd.DataFrame, risk_col: str = 'risk_category') -> Dict[str, int]:
@@ -0,0 +1,251 @@
+"""
+JAVELIN.AI - Incremental Build State
+====================================
+
+Change detection and partial-result storage for incremental phase runs.
+
+A phase that can rebuild part of its output keeps, per key (e.g. per
+study), the partial result it produced last time together with a manifest
+of the input fingerprints that result was built from. On the next run only
+keys whose inputs changed are recomputed; the rest are read back from the
+store and spliced in.
+
+Store layout (under INCREMENTAL_BUILD['dir'] / <phase>):
+    manifest.json               config digest, input fingerprints, partial files
+    partials/<key>.parquet      per-key partial result
+    tables/<name>.parquet       full output tables of the last run
+
+The manifest is removed before a save and written last, so an interrupted
+save leaves no manifest and the next run falls back to a full build.
+
+Functions:
+    - fingerprint_inputs: Content fingerprints of input files, grouped by key
+    - diff_fingerprints: Keys whose inputs changed, appeared or disappeared
+    - config_digest: Stable hash of the configuration a build depends on
+
+Classes:
+    - PartialStore: Manifest, per-key partials and tables for one phase
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from .workbook_cache import file_fingerprint, HAS_PYARROW
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Bump when the manifest or partial encoding changes
+STATE_FORMAT_VERSION = 1
+
+
+def _get_state_root() -> Path:
+    """Return the incremental state directory from config, with a local fallback."""
+    try:
+        from config import INCREMENTAL_BUILD
+        return Path(INCREMENTAL_BUILD['dir'])
+    except ImportError:
+        return Path(__file__).resolve().parent.parent.parent / "outputs" / "cache" / "incremental"
+
+
+def fingerprint_inputs(
+    file_mapping_df: pd.DataFrame,
+    key_col: str = 'study',
+    path_col: str = 'filepath',
+    type_col: str = 'file_type'
+) -> Dict[str, List[List[Any]]]:
+    """
+    Fingerprint every input file and group the fingerprints by key.
+
+    Files that cannot be read get a None hash, so they count as changed
+    until they become readable again.
+
+    Args:
+        file_mapping_df: File mapping with key, path and type columns
+        key_col: Column to group by (the unit of recomputation)
+        path_col: Column holding the file path
+        type_col: Column holding the file type
+
+    Returns:
+        Dict of key -> sorted list of [file_type, path, sha256]
+
+    Examples:
+        >>> inputs = fingerprint_inputs(file_mapping_df)
+        >>> inputs['Study 1'][0]
+        ['edc_metrics', '/data/Study 1/EDC_Metrics.xlsx', '3f2a...']
+    """
+    inputs: Dict[str, List[List[Any]]] = {}
+    for key, path, file_type in zip(file_mapping_df[key_col], file_mapping_df[path_col],
+                                    file_mapping_df[type_col]):
+        try:
+            sha256 = file_fingerprint(path)['sha256']
+        except OSError:
+            sha256 = None
+        inputs.setdefault(str(key), []).append([str(file_type), str(path), sha256])
+    return {key: sorted(entries) for key, entries in inputs.items()}
+
+
+def diff_fingerprints(
+    previous: Dict[str, List[List[Any]]],
+    current: Dict[str, List[List[Any]]]
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Compare two fingerprint sets.
+
+    Args:
+        previous: Fingerprints recorded by the last build
+        current: Fingerprints of the current inputs
+
+    Returns:
+        Tuple of (keys to rebuild: changed or new, keys removed since last build)
+    """
+    dirty = {key for key, entries in current.items() if previous.get(key) != entries}
+    removed = set(previous) - set(current)
+    return dirty, removed
+
+
+def config_digest(*parts: Any) -> str:
+    """
+    Stable hash of the configuration objects a build depends on.
+
+    Args:
+        *parts: JSON-serialisable objects (non-serialisable values use str())
+
+    Returns:
+        Hex digest; a different digest invalidates all partials
+    """
+    payload = json.dumps([STATE_FORMAT_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _atomic_write_parquet(df: pd.DataFrame, target: Path):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix='.tmp_', suffix='.parquet')
+    os.close(fd)
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class PartialStore:
+    """
+    Manifest, per-key partial results and output tables of one phase.
+
+    Args:
+        name: Store name, usually the phase (e.g. 'phase02')
+        root: Parent directory (defaults to INCREMENTAL_BUILD['dir'])
+
+    Examples:
+        >>> store = PartialStore('phase02')
+        >>> manifest = store.load_manifest()
+        >>> dirty, removed = diff_fingerprints(manifest.get('inputs', {}), inputs)
+        >>> store.write_partial('Study 1', study_df)
+    """
+
+    def __init__(self, name: str, root: Optional[Path] = None):
+        self.name = name
+        self.dir = Path(root or _get_state_root()) / name
+        self.manifest_path = self.dir / "manifest.json"
+
+    @property
+    def available(self) -> bool:
+        """Whether partials can be stored (requires pyarrow)."""
+        return HAS_PYARROW
+
+    def _partial_path(self, key: str) -> Path:
+        digest = hashlib.sha1(str(key).encode('utf-8')).hexdigest()
+        return self.dir / "partials" / f"{digest}.parquet"
+
+    def _table_path(self, name: str) -> Path:
+        return self.dir / "tables" / f"{name}.parquet"
+
+    def load_manifest(self, digest: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Read the manifest of the last completed save.
+
+        Args:
+            digest: Expected config digest; a mismatch returns an empty manifest
+
+        Returns:
+            Manifest dict, or {} when missing, unreadable or stale
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as fh:
+                manifest = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('format') != STATE_FORMAT_VERSION:
+            return {}
+        if digest is not None and manifest.get('digest') != digest:
+            return {}
+        return manifest
+
+    def begin_save(self):
+        """Invalidate the manifest before partials and tables are overwritten."""
+        if self.manifest_path.exists():
+            self.manifest_path.unlink()
+
+    def save_manifest(self, inputs: Dict[str, List[List[Any]]], digest: str,
+                      keys_with_partials: Iterable[str], extra: Optional[Dict[str, Any]] = None):
+        """
+        Write the manifest, completing a save.
+
+        Args:
+            inputs: Fingerprints the stored partials were built from
+            digest: Config digest of the build
+            keys_with_partials: Keys that have a stored partial
+            extra: Additional phase-specific entries
+        """
+        manifest = {
+            'format': STATE_FORMAT_VERSION,
+            'digest': digest,
+            'inputs': inputs,
+            'partials': sorted(keys_with_partials),
+            **(extra or {}),
+        }
+        self.dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.dir, prefix='.tmp_', suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            json.dump(manifest, fh, indent=1)
+        os.replace(tmp, self.manifest_path)
+
+    def read_partial(self, key: str) -> pd.DataFrame:
+        """Read the stored partial for a key (empty frame if absent)."""
+        path = self._partial_path(key)
+        return pd.read_parquet(path) if path.exists() else pd.DataFrame()
+
+    def write_partial(self, key: str, df: pd.DataFrame):
+        """Store the partial for a key."""
+        _atomic_write_parquet(df.reset_index(drop=True), self._partial_path(key))
+
+    def delete_partial(self, key: str):
+        """Remove the stored partial for a key, if any."""
+        path = self._partial_path(key)
+        if path.exists():
+            path.unlink()
+
+    def read_table(self, name: str) -> Optional[pd.DataFrame]:
+        """Read a stored output table, or None if it is missing or unreadable."""
+        try:
+            return pd.read_parquet(self._table_path(name))
+        except Exception:
+            return None
+
+    def write_table(self, name: str, df: pd.DataFrame):
+        """Store an output table."""
+        _atomic_write_parquet(df.reset_index(drop=True), self._table_path(name))
+
+    def clear(self):
+        """Remove all state for this store."""
+        shutil.rmtree(self.dir, ignore_errors=True)
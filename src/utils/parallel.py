@@ -0,0 +1,154 @@
+"""
+JAVELIN.AI - Parallel Work
+==========================
+
+Process-pool helpers for numeric work that shares large read-only arrays.
+
+Resampling validation (k-fold, repeated k-fold, bootstrap) runs many
+independent tasks over the same feature matrix. Pickling that matrix (or a
+DataFrame) into every task costs more than the task itself. SharedArrays
+copies the inputs once into shared memory; worker processes attach to the
+blocks when they start, and each task only carries a small description
+(e.g. repeat and fold number). Results are yielded as they complete, so the
+caller can report progress and reduce them at the end.
+
+With jobs=1 tasks run in the calling process on the original arrays, with
+no pool and no shared memory.
+
+Classes:
+    - SharedArrays: Named numpy arrays copied into shared memory
+
+Functions:
+    - parallel_map: Run func(arrays, task) for every task, yielding results as they complete
+    - resolve_jobs: Worker count for a --jobs value
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Arrays attached by a worker process (set by the pool initializer)
+_WORKER_ARRAYS: Dict[str, np.ndarray] = {}
+_WORKER_BLOCKS = []
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Number of worker processes for jobs (0 or None = all CPUs)."""
+    return max(1, int(jobs)) if jobs else os.cpu_count() or 1
+
+
+class SharedArrays:
+    """
+    Read-only numpy arrays copied into shared memory for worker processes.
+
+    Use as a context manager: blocks are created the first time a pool
+    needs them (not at all for serial runs) and released on exit.
+
+    Args:
+        arrays: Name -> array (any dtype without Python objects)
+
+    Examples:
+        >>> with SharedArrays({'X': X, 'sae': sae_mask}) as shared:
+        ...     for task, result in parallel_map(score_fold, tasks, shared, jobs=4):
+        ...         ...
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = {name: np.asarray(a) for name, a in arrays.items()}
+        self._specs: Optional[Dict[str, Tuple[Optional[str], Tuple[int, ...], str, bool]]] = None
+        self._blocks = []
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    @property
+    def specs(self) -> Dict[str, Tuple[Optional[str], Tuple[int, ...], str, bool]]:
+        """Name, shape, dtype and layout of each shared block (creates the blocks)."""
+        if self._specs is None:
+            self._specs = self._share()
+        return self._specs
+
+    def _share(self) -> Dict[str, Tuple[Optional[str], Tuple[int, ...], str, bool]]:
+        specs = {}
+        for name, array in self.arrays.items():
+            if array.dtype.hasobject:
+                raise ValueError(f"Array '{name}' holds Python objects and cannot be shared")
+            fortran = array.flags.f_contiguous and not array.flags.c_contiguous
+            if array.nbytes == 0:
+                specs[name] = (None, array.shape, array.dtype.str, fortran)
+                continue
+            block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+            self._blocks.append(block)
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, order='F' if fortran else 'C')
+            view[...] = array
+            specs[name] = (block.name, array.shape, array.dtype.str, fortran)
+        return specs
+
+    def __exit__(self, exc_type, exc, tb):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+        self._specs = None
+
+
+def _attach(specs: Dict[str, Tuple[Optional[str], Tuple[int, ...], str, bool]]) -> Dict[str, np.ndarray]:
+    arrays = {}
+    for name, (block_name, shape, dtype, fortran) in specs.items():
+        if block_name is None:
+            arrays[name] = np.empty(shape, dtype=dtype)
+            continue
+        block = shared_memory.SharedMemory(name=block_name)
+        _WORKER_BLOCKS.append(block)
+        view = np.ndarray(shape, dtype=dtype, buffer=block.buf, order='F' if fortran else 'C')
+        view.flags.writeable = False
+        arrays[name] = view
+    return arrays
+
+
+def _init_worker(specs):
+    _WORKER_ARRAYS.clear()
+    _WORKER_ARRAYS.update(_attach(specs))
+
+
+def _run_task(func: Callable[[Dict[str, np.ndarray], Any], Any], task: Any) -> Any:
+    return func(_WORKER_ARRAYS, task)
+
+
+def parallel_map(
+    func: Callable[[Dict[str, np.ndarray], Any], Any],
+    tasks: Iterable[Any],
+    shared: SharedArrays,
+    jobs: Optional[int] = 1
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Run func(arrays, task) for every task.
+
+    Args:
+        func: Module-level function (it is pickled by reference); receives
+            the shared arrays by name and one task
+        tasks: Small picklable task descriptions
+        shared: Inputs, entered as a context manager by the caller
+        jobs: Worker processes (1 = run in this process; 0 or None = all CPUs)
+
+    Yields:
+        (task, result) pairs in completion order
+    """
+    tasks = list(tasks)
+    jobs = min(resolve_jobs(jobs), max(len(tasks), 1))
+    if jobs == 1:
+        for task in tasks:
+            yield task, func(shared.arrays, task)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(shared.specs,)) as executor:
+        futures = {executor.submit(_run_task, func, task): task for task in tasks}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
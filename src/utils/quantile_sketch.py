@@ -0,0 +1,248 @@
+"""
+JAVELIN.AI - Quantile Sketches
+==============================
+
+Mergeable KLL quantile sketches for reference maxima and risk thresholds.
+
+The DQI thresholds are percentiles: reference maxima use the 95th
+percentile of non-zero feature values, subject risk uses the 90th
+percentile of non-SAE scores, and site/study risk uses the 85th and 50th
+percentiles of aggregate scores. An exact percentile needs the whole column
+in memory. A KLL sketch needs O(k log(n/k)) memory instead. Sketches built
+per study partition, per chunk or per worker process can be merged, and a
+merged sketch answers the same queries as one built from all the data.
+
+Error bound:
+    Until it holds more than k values a sketch keeps every value, and
+    quantile() equals numpy/pandas linear interpolation exactly.
+    After that, the returned value's normalized rank is within
+    rank_error(k) of the requested quantile with 99% confidence:
+    2.446 / k**0.9433, the published fit for KLL sketches. That is about
+    1.7% for the default k=200 and 0.4% for k=1000.
+
+Classes:
+    - KLLSketch: Streaming, mergeable quantile sketch
+
+Functions:
+    - rank_error: Normalized rank error bound for a given k
+    - column_sketches: One sketch per matrix column, built from positive values
+    - merge_sketches: Merge an iterable of sketches into one
+"""
+
+from typing import Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+DEFAULT_K = 200
+
+# Capacity ratio between adjacent levels (the KLL paper's c)
+_LEVEL_RATIO = 2.0 / 3.0
+
+
+def _get_default_k() -> int:
+    """Return QUANTILE_SKETCH['k'] from config, with a local fallback."""
+    try:
+        from config import QUANTILE_SKETCH
+        return int(QUANTILE_SKETCH.get('k', DEFAULT_K))
+    except ImportError:
+        return DEFAULT_K
+
+
+def rank_error(k: int = DEFAULT_K) -> float:
+    """
+    Normalized rank error of a compacted sketch (99% confidence).
+
+    Args:
+        k: Sketch accuracy parameter
+
+    Returns:
+        Error as a fraction of the item count (e.g. 0.0165 for k=200)
+    """
+    return 2.446 / k ** 0.9433
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch over float values.
+
+    Level h stores items of weight 2**h. When the sketch exceeds its
+    capacity, the lowest full level is sorted and every other item
+    (random offset) is promoted to the next level. Count, minimum and
+    maximum are tracked exactly.
+
+    Args:
+        k: Accuracy parameter (memory is about 3k items)
+        seed: Seed for the compaction coin flips (for reproducible results)
+
+    Examples:
+        >>> sketches = [KLLSketch().update(part['dqi_score']) for _, part in df.groupby('study')]
+        >>> merged = merge_sketches(sketches)
+        >>> merged.quantile(0.90)
+    """
+
+    def __init__(self, k: Optional[int] = None, seed: Optional[int] = 0):
+        self.k = int(k or _get_default_k())
+        if self.k < 8:
+            raise ValueError(f"k must be at least 8, got {self.k}")
+        self.n = 0
+        self.min = np.nan
+        self.max = np.nan
+        self._levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __repr__(self) -> str:
+        return f"KLLSketch(k={self.k}, n={self.n}, retained={self.retained}, exact={self.exact})"
+
+    @property
+    def retained(self) -> int:
+        """Number of items currently stored."""
+        return sum(len(level) for level in self._levels)
+
+    @property
+    def exact(self) -> bool:
+        """Whether no compaction has happened (quantiles are exact)."""
+        return len(self._levels) == 1
+
+    @property
+    def error(self) -> float:
+        """Normalized rank error of this sketch's answers (0 while exact)."""
+        return 0.0 if self.exact else rank_error(self.k)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - 1 - level
+        return max(int(np.ceil(self.k * _LEVEL_RATIO ** depth)), 2)
+
+    def _compress(self):
+        while self.retained > sum(self._capacity(h) for h in range(len(self._levels))):
+            for h, items in enumerate(self._levels):
+                if len(items) < self._capacity(h):
+                    continue
+                if h + 1 == len(self._levels):
+                    self._levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                # An odd item stays behind so no weight is lost
+                keep, items = (items[:1], items[1:]) if len(items) % 2 else (items[:0], items)
+                promoted = items[self._rng.integers(2)::2]
+                self._levels[h] = keep
+                self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+                break
+
+    def update(self, values: Union[Sequence[float], np.ndarray]) -> 'KLLSketch':
+        """
+        Add values (NaN is ignored).
+
+        Args:
+            values: Array-like of numbers (a Series, array or list)
+
+        Returns:
+            self, for chaining
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.n += len(values)
+        self.min = np.fmin(self.min, values.min())
+        self.max = np.fmax(self.max, values.max())
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """
+        Fold another sketch into this one.
+
+        Args:
+            other: Sketch built with the same k
+
+        Returns:
+            self, for chaining
+
+        Raises:
+            ValueError: If the sketches use different k
+        """
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge sketches with k={self.k} and k={other.k}")
+        if not other.n:
+            return self
+        self.n += other.n
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0, dtype=np.float64))
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """
+        Values at several quantiles.
+
+        Args:
+            qs: Quantiles in [0, 1]
+
+        Returns:
+            float64 array, NaN for an empty sketch
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if not self.n:
+            return np.full(qs.shape, np.nan)
+        if self.exact:
+            return np.quantile(self._levels[0], qs)
+
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self._levels)])
+        order = np.argsort(items, kind='stable')
+        items, cum_weights = items[order], np.cumsum(weights[order])
+        idx = np.searchsorted(cum_weights, qs * cum_weights[-1], side='left')
+        result = items[np.minimum(idx, len(items) - 1)]
+        result = np.where(qs <= 0, self.min, np.where(qs >= 1, self.max, result))
+        return np.clip(result, self.min, self.max)
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q (NaN for an empty sketch)."""
+        return float(self.quantiles([q])[0])
+
+
+def merge_sketches(sketches: Iterable[KLLSketch]) -> KLLSketch:
+    """
+    Merge sketches (e.g. one per study or per worker) into a new sketch.
+
+    Args:
+        sketches: Sketches built with the same k
+
+    Returns:
+        New merged sketch (inputs are not modified)
+    """
+    sketches = list(sketches)
+    merged = KLLSketch(k=sketches[0].k if sketches else None)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+def column_sketches(X: np.ndarray, k: Optional[int] = None, positive_only: bool = True) -> List[KLLSketch]:
+    """
+    One sketch per column of a feature matrix.
+
+    Args:
+        X: (rows, columns) matrix (e.g. from feature_matrix)
+        k: Sketch accuracy parameter
+        positive_only: Sketch only values > 0 (the reference maxima input)
+
+    Returns:
+        List of sketches, one per column
+    """
+    sketches = []
+    for j in range(X.shape[1]):
+        column = X[:, j]
+        sketches.append(KLLSketch(k).update(column[column > 0] if positive_only else column))
+    return sketches
@@ -0,0 +1,184 @@
+"""
+JAVELIN.AI - Result Cache
+=========================
+
+Content-addressed storage for results computed from pipeline tables.
+
+An entry is stored under a key derived from everything that determines it:
+the content digest of the input table (frame_digest) plus the parameters of
+the computation (weights, folds, seed, ...). The same inputs always map to
+the same key, so a rerun reads the stored result instead of recomputing,
+and any change to an input or parameter simply misses and computes a new
+entry. Entries are never updated in place, so there is nothing to
+invalidate; clear() removes them all.
+
+Store layout (under VALIDATION_CACHE['dir'] / <name>):
+    <key[:2]>/<key>/entry.json      JSON payload and the names of its frames
+    <key[:2]>/<key>/<frame>.parquet DataFrames stored with the entry
+
+An entry directory is written under a temporary name and renamed into
+place, so readers see a complete entry or none.
+
+Classes:
+    - ResultCache: Content-addressed JSON payloads and DataFrames
+
+Functions:
+    - frame_digest: Content hash of a DataFrame (columns, dtypes and values)
+    - is_result_cache_enabled: Whether results should be read from and written to the cache
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from .incremental import config_digest
+from .workbook_cache import HAS_PYARROW
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Bump when the entry layout changes; callers version their own results
+RESULT_CACHE_VERSION = 1
+
+
+def _get_cache_settings() -> Dict[str, Any]:
+    """Return result cache settings from config, with a local fallback."""
+    try:
+        from config import VALIDATION_CACHE
+        return VALIDATION_CACHE
+    except ImportError:
+        return {
+            'enabled': True,
+            'dir': Path(__file__).resolve().parent.parent.parent / "outputs" / "cache" / "results",
+        }
+
+
+def is_result_cache_enabled() -> bool:
+    """
+    Check whether the result cache is active.
+
+    The cache is disabled when pyarrow is not installed, when the config
+    sets VALIDATION_CACHE['enabled'] to False, or when the JAVELIN_NO_CACHE
+    environment variable is set to a truthy value.
+
+    Returns:
+        True if results should be cached
+    """
+    if not HAS_PYARROW:
+        return False
+    if os.environ.get('JAVELIN_NO_CACHE', '').strip().lower() in ('1', 'true', 'yes'):
+        return False
+    return bool(_get_cache_settings().get('enabled', True))
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """
+    Content hash of a DataFrame.
+
+    Covers column names, dtypes and values in row order; the index is
+    ignored, so the same table read from CSV or Parquet hashes the same
+    as long as the dtypes agree.
+
+    Args:
+        df: Table to hash
+
+    Returns:
+        Hex sha256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed results: a JSON payload plus named DataFrames per key.
+
+    Args:
+        name: Cache namespace (e.g. 'validation')
+        root: Parent directory (defaults to VALIDATION_CACHE['dir'])
+        enabled: Force the cache on or off (defaults to is_result_cache_enabled())
+
+    Examples:
+        >>> cache = ResultCache('validation')
+        >>> key = cache.key('kfold', frame_digest(df), weights, n_folds, seed)
+        >>> hit = cache.get(key)
+        >>> if hit is None:
+        ...     cache.put(key, results, {'predictions': predictions_df})
+    """
+
+    def __init__(self, name: str, root: Optional[Path] = None, enabled: Optional[bool] = None):
+        self.name = name
+        self.dir = Path(root or _get_cache_settings()['dir']) / name
+        self.enabled = is_result_cache_enabled() if enabled is None else enabled
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Key of an entry from everything that determines it (JSON-serialisable parts)."""
+        return config_digest(RESULT_CACHE_VERSION, *parts)
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[Tuple[Any, Dict[str, pd.DataFrame]]]:
+        """
+        Read an entry.
+
+        Args:
+            key: Entry key from key()
+
+        Returns:
+            Tuple of (payload, frames by name), or None when disabled, missing or unreadable
+        """
+        if not self.enabled:
+            return None
+        entry = self._entry_dir(key)
+        try:
+            with open(entry / "entry.json", 'r', encoding='utf-8') as fh:
+                stored = json.load(fh)
+            frames = {name: pd.read_parquet(entry / f"{name}.parquet") for name in stored['frames']}
+        except Exception:
+            return None
+        return stored['payload'], frames
+
+    def put(self, key: str, payload: Any = None, frames: Optional[Dict[str, pd.DataFrame]] = None):
+        """
+        Store an entry (no-op when disabled or already present).
+
+        Args:
+            key: Entry key from key()
+            payload: JSON-serialisable result (non-serialisable values use str())
+            frames: DataFrames stored alongside, by name
+        """
+        if not self.enabled:
+            return
+        entry = self._entry_dir(key)
+        if entry.exists():
+            return
+        frames = frames or {}
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=entry.parent, prefix='.tmp_'))
+        try:
+            for name, df in frames.items():
+                df.reset_index(drop=True).to_parquet(tmp / f"{name}.parquet", index=False)
+            with open(tmp / "entry.json", 'w', encoding='utf-8') as fh:
+                json.dump({'payload': payload, 'frames': sorted(frames)}, fh, indent=1, default=str)
+            os.replace(tmp, entry)
+        except Exception:
+            # Another run stored the same entry first, or a frame cannot be
+            # stored as Parquet; the result is simply not cached
+            pass
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def clear(self):
+        """Remove all entries in this namespace."""
+        shutil.rmtree(self.dir, ignore_errors=True)
@@ -0,0 +1,522 @@
+"""
+JAVELIN.AI - Rollup Cube
+========================
+
+Site-grain aggregate cube that answers study, region and country rollups
+without rescanning subjects.
+
+Each cell is one site (study, site_id, country, region). It holds
+mergeable aggregates of that site's subjects: counts, the sum and sum of
+squares of dqi_score, the maximum score, risk counts and per-feature
+issue sums. Any coarser level is a group-by over these few thousand cells,
+not over the subject table. The site mean and standard deviation come from
+the sums. A cell can also be updated in place by retracting old subject
+rows and adding new ones.
+
+Phase 03 writes the cube to outputs/phase03/rollup_cube.parquet, including
+each site's risk category. Later phases and the dashboard read it instead
+of regrouping the site table.
+
+Level semantics (matching the Phase 03 study/region/country tables):
+    - avg_dqi_score, max_site_dqi_score and std_dqi_score describe the
+      site averages in the group (every site counts once)
+    - subject_avg_dqi_score and subject_std_dqi_score are pooled over the
+      group's subjects
+
+Classes:
+    - RollupCube: Site cells with slice, rollup, merge and delta-update operations
+
+Functions:
+    - load_rollup_cube: Read the saved cube (None when absent)
+    - site_rollup_cube: Saved cube for a site table, or one built from it
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .table_io import HAS_PYARROW
+
+if HAS_PYARROW:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Bump when the cell layout changes
+ROLLUP_CUBE_VERSION = 1
+_VERSION_KEY = b'javelin_rollup_cube_version'
+
+CUBE_DIMENSIONS = ['study', 'site_id', 'country', 'region']
+
+# Additive cell measures (retract/add with subtraction and addition)
+_SUM_MEASURES = ['subject_count', 'score_count', 'score_sum', 'score_sumsq', 'total_issue_types',
+                 'high_risk_count', 'medium_risk_count', 'subjects_with_issues']
+_FLOAT_MEASURES = ['score_sum', 'score_sumsq', 'max_dqi_score']
+
+
+def _get_cube_path() -> Path:
+    """Return the cube path from config, with a local fallback."""
+    try:
+        from config import OUTPUT_FILES
+        return Path(OUTPUT_FILES['rollup_cube'])
+    except (ImportError, KeyError):
+        return Path(__file__).resolve().parent.parent.parent / "outputs" / "phase03" / "rollup_cube.parquet"
+
+
+def _subject_cells(df: pd.DataFrame, sum_features: Sequence[str]) -> pd.DataFrame:
+    """Aggregate scored subject rows into cells indexed by CUBE_DIMENSIONS."""
+    scores = df['dqi_score']
+    parts = pd.DataFrame({
+        'subject_count': df['subject_id'].notna().astype(np.int64),
+        'score_count': scores.notna().astype(np.int64),
+        'score_sum': scores.fillna(0.0),
+        'score_sumsq': scores.fillna(0.0) ** 2,
+        'total_issue_types': df['n_issue_types'],
+        'high_risk_count': (df['risk_category'] == 'High').astype(np.int64),
+        'medium_risk_count': (df['risk_category'] == 'Medium').astype(np.int64),
+        'subjects_with_issues': df['has_issues'],
+        **{f'{feature}_sum': df[feature] for feature in sum_features},
+    }, index=df.index)
+    grouped = pd.concat([df[CUBE_DIMENSIONS], parts, scores], axis=1).groupby(CUBE_DIMENSIONS)
+    cells = grouped[list(parts.columns)].sum()
+    cells['max_dqi_score'] = grouped['dqi_score'].max()
+    return cells
+
+
+def _as_list(value: Any) -> List[Any]:
+    if isinstance(value, (list, tuple, set, frozenset, np.ndarray, pd.Index, pd.Series)):
+        return list(value)
+    return [value]
+
+
+class RollupCube:
+    """
+    Site-grain aggregate cells with rollups to any set of dimensions.
+
+    Args:
+        cells: One row per site with the CUBE_DIMENSIONS columns and the
+            cell measures (as built by from_subjects or from_sites)
+
+    Examples:
+        >>> cube = load_rollup_cube()
+        >>> cube.rollup('study')
+        >>> cube.rollup(['country', 'region'], study=['Study 1', 'Study 4'])
+        >>> cube.total(region='EMEA')['high_risk_rate']
+    """
+
+    def __init__(self, cells: pd.DataFrame):
+        missing = [c for c in CUBE_DIMENSIONS + _SUM_MEASURES + ['max_dqi_score'] if c not in cells.columns]
+        if missing:
+            raise ValueError(f"Rollup cube cells are missing columns: {missing}")
+        self.cells = cells.reset_index(drop=True)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __repr__(self) -> str:
+        return f"RollupCube(sites={len(self.cells)}, subjects={int(self.cells['subject_count'].sum())})"
+
+    @property
+    def sum_features(self) -> List[str]:
+        """Features with a per-site issue sum (the '<feature>_sum' cell columns)."""
+        return [c[:-len('_sum')] for c in self.cells.columns
+                if c.endswith('_sum') and c not in _SUM_MEASURES]
+
+    @property
+    def has_site_risk(self) -> bool:
+        """Whether the cells carry site_risk_category."""
+        return 'site_risk_category' in self.cells.columns
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_subjects(cls, df: pd.DataFrame, sum_features: Sequence[str] = ()) -> 'RollupCube':
+        """
+        Build the cube in one pass over scored subjects.
+
+        Args:
+            df: Scored subject table (dqi_score, n_issue_types, has_issues,
+                risk_category and the dimension columns); subjects without a
+                site are left out, as in the site table
+            sum_features: Feature columns to sum per site
+
+        Returns:
+            RollupCube without site risk (see with_site_risk)
+        """
+        return cls(_subject_cells(df, sum_features).reset_index())
+
+    @classmethod
+    def from_sites(cls, site_df: pd.DataFrame) -> 'RollupCube':
+        """
+        Build the cube from a site table in Phase 03's layout.
+
+        Score sums are reconstructed from the stored site mean and standard
+        deviation, so pooled subject statistics carry the table's precision.
+
+        Args:
+            site_df: master_site_with_dqi table
+
+        Returns:
+            RollupCube, with site risk when the table has site_risk_category
+        """
+        n = site_df['subject_count'].to_numpy(dtype=np.float64)
+        avg = site_df['avg_dqi_score'].to_numpy(dtype=np.float64)
+        std = site_df['std_dqi_score'].fillna(0).to_numpy(dtype=np.float64) \
+            if 'std_dqi_score' in site_df.columns else np.zeros(len(site_df))
+
+        cells = site_df[CUBE_DIMENSIONS].copy()
+        cells['subject_count'] = site_df['subject_count'].astype(np.int64).to_numpy()
+        cells['score_count'] = cells['subject_count']
+        cells['score_sum'] = avg * n
+        cells['score_sumsq'] = std ** 2 * np.maximum(n - 1, 0) + n * avg ** 2
+        for col in ['total_issue_types', 'high_risk_count', 'medium_risk_count', 'subjects_with_issues']:
+            cells[col] = site_df[col].to_numpy() if col in site_df.columns else 0
+        cells['max_dqi_score'] = site_df['max_dqi_score'].to_numpy() \
+            if 'max_dqi_score' in site_df.columns else avg
+        for col in site_df.columns:
+            if col.endswith('_sum') and col not in cells.columns:
+                cells[col] = site_df[col].to_numpy()
+        if 'site_risk_category' in site_df.columns:
+            cells['site_risk_category'] = site_df['site_risk_category'].to_numpy()
+        return cls(cells)
+
+    def with_site_risk(self, site_df: pd.DataFrame) -> 'RollupCube':
+        """
+        Return a copy carrying each site's risk category.
+
+        Args:
+            site_df: Site table with CUBE_DIMENSIONS and site_risk_category
+
+        Returns:
+            New RollupCube (sites absent from site_df get no category)
+        """
+        cells = self.cells.drop(columns='site_risk_category', errors='ignore')
+        cells = cells.merge(site_df[CUBE_DIMENSIONS + ['site_risk_category']], on=CUBE_DIMENSIONS, how='left')
+        return RollupCube(cells)
+
+    def apply_delta(self, retracted: pd.DataFrame, added: pd.DataFrame,
+                    subjects: Optional[pd.DataFrame] = None) -> 'RollupCube':
+        """
+        Update the cells for a change set of subject rows.
+
+        Sums are retracted and added. A site's maximum only goes up with
+        added rows; when the row holding it is retracted, the maximum is
+        recomputed from that site's rows in subjects. Sites left without
+        subjects are dropped. Site risk is dropped, because it depends on
+        all sites (re-attach it with with_site_risk).
+
+        Args:
+            retracted: Previous scored rows of changed and removed subjects
+            added: New scored rows of changed subjects
+            subjects: Full new scored subject table (read only for sites
+                whose maximum row was retracted)
+
+        Returns:
+            New RollupCube
+        """
+        sum_features = self.sum_features
+        acc = self.cells.drop(columns='site_risk_category', errors='ignore').set_index(CUBE_DIMENSIONS)
+        old = _subject_cells(retracted, sum_features)
+        new = _subject_cells(added, sum_features)
+        sum_cols = [c for c in acc.columns if c != 'max_dqi_score']
+
+        stale_max = old['max_dqi_score'].reindex(acc.index) >= acc['max_dqi_score']
+        updated = acc[sum_cols].sub(old[sum_cols], fill_value=0).add(new[sum_cols], fill_value=0)
+        updated['max_dqi_score'] = np.fmax(acc['max_dqi_score'].reindex(updated.index),
+                                           new['max_dqi_score'].reindex(updated.index))
+        updated = updated[updated['subject_count'] > 0]
+
+        stale = updated.index.intersection(stale_max[stale_max].index)
+        if len(stale):
+            if subjects is None:
+                raise ValueError("subjects is required when a site's maximum row is retracted")
+            in_stale = pd.MultiIndex.from_frame(subjects[CUBE_DIMENSIONS]).isin(stale)
+            updated.loc[stale, 'max_dqi_score'] = \
+                subjects[in_stale].groupby(CUBE_DIMENSIONS)['dqi_score'].max()
+
+        int_cols = [c for c in updated.columns if c not in _FLOAT_MEASURES and acc[c].dtype.kind in 'iub']
+        updated[int_cols] = updated[int_cols].round().astype(np.int64)
+        return RollupCube(updated.sort_index().reset_index())
+
+    def merge(self, other: 'RollupCube') -> 'RollupCube':
+        """
+        Combine with the cube of another subject partition (e.g. the next
+        chunk); cells of the same site are added together.
+
+        Args:
+            other: Cube built from disjoint subject rows
+
+        Returns:
+            New RollupCube without site risk
+        """
+        cells = pd.concat([self.cells, other.cells], ignore_index=True)
+        cells = cells.drop(columns='site_risk_category', errors='ignore')
+        grouped = cells.groupby(CUBE_DIMENSIONS, sort=True)
+        sum_cols = [c for c in cells.columns if c not in CUBE_DIMENSIONS and c != 'max_dqi_score']
+        merged = grouped[sum_cols].sum()
+        merged['max_dqi_score'] = grouped['max_dqi_score'].max()
+        return RollupCube(merged.reset_index())
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def site_scores(self) -> pd.DataFrame:
+        """
+        Per-site mean and standard deviation of dqi_score from the sums.
+
+        Returns:
+            DataFrame aligned with cells: avg_dqi_score, std_dqi_score
+            (0 for single-subject sites)
+        """
+        n = self.cells['score_count'].to_numpy(dtype=np.float64)
+        total = self.cells['score_sum'].to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / n
+            var = (self.cells['score_sumsq'].to_numpy(dtype=np.float64) - total * mean) / (n - 1)
+        std = np.where(n > 1, np.sqrt(np.maximum(var, 0.0)), 0.0)
+        return pd.DataFrame({'avg_dqi_score': mean, 'std_dqi_score': std}, index=self.cells.index)
+
+    def _mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, value in filters.items():
+            if dim not in CUBE_DIMENSIONS:
+                raise ValueError(f"Unknown cube dimension '{dim}' (expected one of {CUBE_DIMENSIONS})")
+            mask &= self.cells[dim].isin(_as_list(value)).to_numpy()
+        return mask
+
+    def slice(self, **filters) -> 'RollupCube':
+        """
+        Restrict the cube to sites matching every filter.
+
+        Args:
+            **filters: dimension=value or dimension=[values]
+
+        Returns:
+            New RollupCube over the matching cells
+
+        Raises:
+            ValueError: If a filter names an unknown dimension
+        """
+        return RollupCube(self.cells[self._mask(filters)])
+
+    def rollup(self, by: Union[str, Sequence[str], None] = None, **filters) -> pd.DataFrame:
+        """
+        Aggregate the (filtered) cells to the given dimensions.
+
+        Args:
+            by: Dimension or dimensions to group by (None for one total row)
+            **filters: dimension=value or dimension=[values], applied first
+
+        Returns:
+            One row per group, sorted by the group keys: site_count,
+            subject_count, avg_dqi_score, max_site_dqi_score, std_dqi_score,
+            subject_avg_dqi_score, subject_std_dqi_score, max_dqi_score,
+            total_issue_types, high_risk_subjects, medium_risk_subjects,
+            subjects_with_issues, <feature>_sum, high_risk_rate, issue_rate,
+            high_risk_sites and high_risk_site_rate (with site risk), and
+            <dimension>_count for each dimension not grouped on
+
+        Raises:
+            ValueError: If by or a filter names an unknown dimension
+        """
+        keys = [by] if isinstance(by, str) else list(by or [])
+        unknown = [k for k in keys if k not in CUBE_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown cube dimension(s) {unknown} (expected from {CUBE_DIMENSIONS})")
+
+        mask = self._mask(filters)
+        cells = self.cells[mask]
+        site_avg = self.site_scores()['avg_dqi_score'][mask]
+        work = cells.assign(
+            _site_n=site_avg.notna().astype(np.int64),
+            _site_avg=site_avg,
+            _site_avg_sum=site_avg.fillna(0.0),
+            _site_avg_sumsq=site_avg.fillna(0.0) ** 2,
+        )
+        sum_cols = ['subject_count', 'score_count', 'score_sum', 'score_sumsq', 'total_issue_types',
+                    'high_risk_count', 'medium_risk_count', 'subjects_with_issues', '_site_n',
+                    '_site_avg_sum', '_site_avg_sumsq'] + [f'{f}_sum' for f in self.sum_features]
+        if self.has_site_risk:
+            work['_high_site'] = (cells['site_risk_category'] == 'High').astype(np.int64)
+            sum_cols.append('_high_site')
+        other_dims = [d for d in CUBE_DIMENSIONS if d not in keys]
+
+        group_keys = keys or [np.zeros(len(work), dtype=np.int8)]
+        grouped = work.groupby(group_keys, sort=True, observed=True)
+        out = grouped[sum_cols].sum()
+        out['site_count'] = grouped.size()
+        out['max_site_dqi_score'] = grouped['_site_avg'].max()
+        out['max_dqi_score'] = grouped['max_dqi_score'].max()
+        for dim in other_dims:
+            out[f'{dim}_count'] = grouped[dim].nunique()
+        if not keys:
+            out = out.reset_index(drop=True)
+            if out.empty:
+                out.loc[0] = 0
+        else:
+            out = out.reset_index()
+
+        n_sites = out['_site_n'].to_numpy(dtype=np.float64)
+        n_scores = out['score_count'].to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            site_mean = out['_site_avg_sum'].to_numpy() / n_sites
+            site_var = (out['_site_avg_sumsq'].to_numpy() - out['_site_avg_sum'].to_numpy() * site_mean) / (n_sites - 1)
+            subject_mean = out['score_sum'].to_numpy() / n_scores
+            subject_var = (out['score_sumsq'].to_numpy() - out['score_sum'].to_numpy() * subject_mean) / (n_scores - 1)
+            subjects = out['subject_count'].to_numpy(dtype=np.float64)
+            high_risk_rate = out['high_risk_count'].to_numpy() / subjects
+            issue_rate = out['subjects_with_issues'].to_numpy() / subjects
+
+        columns = {
+            'site_count': out['site_count'].to_numpy(dtype=np.int64),
+            'subject_count': out['subject_count'].to_numpy(dtype=np.int64),
+            'avg_dqi_score': site_mean,
+            'max_site_dqi_score': out['max_site_dqi_score'].to_numpy(),
+            'std_dqi_score': np.where(n_sites > 1, np.sqrt(np.maximum(site_var, 0.0)), 0.0),
+            'subject_avg_dqi_score': subject_mean,
+            'subject_std_dqi_score': np.where(n_scores > 1, np.sqrt(np.maximum(subject_var, 0.0)), 0.0),
+            'max_dqi_score': out['max_dqi_score'].to_numpy(),
+            'total_issue_types': out['total_issue_types'].to_numpy(),
+            'high_risk_subjects': out['high_risk_count'].to_numpy(),
+            'medium_risk_subjects': out['medium_risk_count'].to_numpy(),
+            'subjects_with_issues': out['subjects_with_issues'].to_numpy(),
+            **{f'{f}_sum': out[f'{f}_sum'].to_numpy() for f in self.sum_features},
+            'high_risk_rate': high_risk_rate,
+            'issue_rate': issue_rate,
+        }
+        if self.has_site_risk:
+            high_sites = out['_high_site'].to_numpy(dtype=np.int64)
+            columns['high_risk_sites'] = high_sites
+            with np.errstate(invalid='ignore', divide='ignore'):
+                columns['high_risk_site_rate'] = high_sites / columns['site_count']
+        for dim in other_dims:
+            columns[f'{dim}_count'] = out[f'{dim}_count'].to_numpy(dtype=np.int64)
+        return pd.concat([out[keys], pd.DataFrame(columns, index=out.index)], axis=1)
+
+    def total(self, **filters) -> pd.Series:
+        """
+        Aggregate of all (filtered) cells as one row.
+
+        Args:
+            **filters: dimension=value or dimension=[values]
+
+        Returns:
+            Series with the rollup columns
+        """
+        return self.rollup(None, **filters).iloc[0]
+
+    def values(self, dimension: str, **filters) -> List[Any]:
+        """Sorted distinct values of a dimension among the (filtered) cells."""
+        if dimension not in CUBE_DIMENSIONS:
+            raise ValueError(f"Unknown cube dimension '{dimension}' (expected one of {CUBE_DIMENSIONS})")
+        return sorted(self.cells.loc[self._mask(filters), dimension].dropna().unique().tolist())
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Write the cube as Parquet (atomically).
+
+        Cell sums keep float64: a float32 schema would lose precision in the
+        score sums that every rollup derives its means from.
+
+        Args:
+            path: Target file (defaults to OUTPUT_FILES['rollup_cube'])
+
+        Returns:
+            Path written
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required to save the rollup cube")
+        path = Path(path) if path is not None else _get_cube_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(self.cells, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_VERSION_KEY] = str(ROLLUP_CUBE_VERSION).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp_', suffix='.parquet')
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[Union[str, Path]] = None) -> 'RollupCube':
+        """
+        Read a saved cube.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ImportError: If pyarrow is not installed
+            ValueError: If the file is from another cube version
+        """
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required to load the rollup cube")
+        path = Path(path) if path is not None else _get_cube_path()
+        if not path.exists():
+            raise FileNotFoundError(f"Rollup cube not found: {path}")
+        table = pq.read_table(path)
+        version = (table.schema.metadata or {}).get(_VERSION_KEY, b'').decode()
+        if version != str(ROLLUP_CUBE_VERSION):
+            raise ValueError(f"Rollup cube version {version or 'unknown'} is not supported "
+                             f"(expected {ROLLUP_CUBE_VERSION}); re-run Phase 03")
+        return cls(table.to_pandas())
+
+
+def load_rollup_cube(path: Optional[Union[str, Path]] = None) -> Optional[RollupCube]:
+    """
+    Read the saved rollup cube, if there is a usable one.
+
+    Args:
+        path: Cube file (defaults to OUTPUT_FILES['rollup_cube'])
+
+    Returns:
+        RollupCube, or None when the file is missing, unreadable or from
+        another version
+    """
+    try:
+        return RollupCube.load(path)
+    except (OSError, ValueError, ImportError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"   [WARN] Ignoring rollup cube ({e})")
+        return None
+
+
+def site_rollup_cube(site_df: pd.DataFrame, path: Optional[Union[str, Path]] = None) -> RollupCube:
+    """
+    Cube for a site table: the saved cube when it describes the same sites,
+    otherwise one built from the table.
+
+    Args:
+        site_df: master_site_with_dqi table the caller works from
+        path: Cube file (defaults to OUTPUT_FILES['rollup_cube'])
+
+    Returns:
+        RollupCube with site risk when available
+    """
+    cube = load_rollup_cube(path)
+    if cube is not None and len(cube) == len(site_df) \
+            and int(cube.cells['subject_count'].sum()) == int(site_df['subject_count'].sum()) \
+            and set(f'{f}_sum' for f in cube.sum_features) >= {c for c in site_df.columns if c.endswith('_sum')}:
+        return cube
+    return RollupCube.from_sites(site_df)
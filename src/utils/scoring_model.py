@@ -0,0 +1,230 @@
+"""
+JAVELIN.AI - DQI Scoring Model
+==============================
+
+Frozen DQI reference statistics for scoring subjects without a full
+recompute.
+
+Severity scaling divides each feature by its reference maximum (the 95th
+percentile of non-zero values across all subjects), and the High risk
+threshold is the 90th percentile of non-SAE scores. Both are population
+statistics. Phase 03 writes them, together with the weights, to a versioned
+scoring model (outputs/phase03/dqi_scoring_model.json). Scoring new or
+changed subjects against that model touches only those rows.
+
+Re-baselining (re-estimating the statistics) happens only on a full Phase 03
+run without --frozen; everything else scores against the saved model.
+
+Classes:
+    - ScoringModel: Weights, reference maxima and risk threshold of one baseline
+
+Functions:
+    - load_scoring_model: Read the saved model (None when absent)
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from .dqi_calculator import feature_matrix, dqi_kernel, assign_risk_categories
+from .incremental import config_digest
+from .table_io import widen_float32
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Bump when the model file layout or the scoring rule changes
+SCORING_MODEL_VERSION = 1
+
+
+def _get_model_path() -> Path:
+    """Return the scoring model path from config, with a local fallback."""
+    try:
+        from config import OUTPUT_FILES
+        return Path(OUTPUT_FILES['dqi_scoring_model'])
+    except (ImportError, KeyError):
+        return Path(__file__).resolve().parent.parent.parent / "outputs" / "phase03" / "dqi_scoring_model.json"
+
+
+class ScoringModel:
+    """
+    Frozen DQI baseline: weights, reference maxima and the High threshold.
+
+    Args:
+        features: Scored features, in scoring order
+        weights: One weight per feature
+        reference_maxima: One severity reference per feature
+        high_threshold: Score at or above which a non-SAE subject is High
+        binary_weight: Weight for binary component
+        severity_weight: Weight for severity component
+        n_subjects: Size of the baseline population
+        fitted_at: ISO timestamp of the baseline
+
+    Examples:
+        >>> model = load_scoring_model()
+        >>> scored = model.score(changed_subjects)
+        >>> scored[['subject_id', 'dqi_score', 'risk_category']]
+    """
+
+    def __init__(self, features: Sequence[str], weights: Sequence[float],
+                 reference_maxima: Sequence[float], high_threshold: float,
+                 binary_weight: float = 0.5, severity_weight: float = 0.5,
+                 n_subjects: int = 0, fitted_at: Optional[str] = None):
+        if not (len(features) == len(weights) == len(reference_maxima)):
+            raise ValueError("features, weights and reference_maxima must have the same length")
+        self.features: List[str] = list(features)
+        self.weights: List[float] = [float(w) for w in weights]
+        self.reference_maxima: List[float] = [float(r) for r in reference_maxima]
+        self.high_threshold = float(high_threshold)
+        self.binary_weight = float(binary_weight)
+        self.severity_weight = float(severity_weight)
+        self.n_subjects = int(n_subjects)
+        self.fitted_at = fitted_at or datetime.now().isoformat(timespec='seconds')
+
+    @property
+    def model_id(self) -> str:
+        """Short digest of the scoring parameters (identical models share it)."""
+        return config_digest(self.features, self.weights, self.reference_maxima,
+                             self.high_threshold, self.binary_weight, self.severity_weight)[:12]
+
+    def weights_match(self, feature_weights: Dict[str, Any]) -> bool:
+        """Whether the model was fitted with these weights (e.g. config.DQI_WEIGHTS)."""
+        current = {f: w['weight'] if isinstance(w, dict) else w for f, w in feature_weights.items()}
+        return all(abs(current.get(f, -1.0) - w) < 1e-12 for f, w in zip(self.features, self.weights)) \
+            and set(current) >= set(self.features)
+
+    def score(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score subjects against the frozen baseline.
+
+        Cost is linear in len(df); no other subjects are read.
+
+        Args:
+            df: Subject rows with the model's feature columns (n_issue_types
+                is derived from the other features)
+
+        Returns:
+            Copy of df with n_issue_types, dqi_score, <feature>_component,
+            has_issues and risk_category, as Phase 03 produces them
+
+        Raises:
+            ValueError: If a feature column is missing from df
+        """
+        issue_columns = [f for f in self.features if f != 'n_issue_types']
+        missing = [f for f in issue_columns if f not in df.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns for scoring: {missing}")
+
+        n_issue_types = (df[issue_columns] > 0).sum(axis=1)
+        source = df.assign(n_issue_types=n_issue_types)
+        scores, components = dqi_kernel(
+            feature_matrix(source, self.features), self.weights,
+            binary_weight=self.binary_weight, severity_weight=self.severity_weight,
+            refs=self.reference_maxima,
+        )
+
+        new_columns = {'n_issue_types': n_issue_types, 'dqi_score': widen_float32(scores)}
+        for j, feature in enumerate(self.features):
+            new_columns[f'{feature}_component'] = widen_float32(components[:, j])
+        new_columns['has_issues'] = (n_issue_types > 0).astype(int)
+
+        replaced = [*new_columns, 'risk_category']
+        df = df.drop(columns=[c for c in replaced if c in df.columns])
+        df = pd.concat([df, pd.DataFrame(new_columns, index=df.index)], axis=1)
+        df, _, _ = assign_risk_categories(df, high_threshold=self.high_threshold)
+        return df
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialisable form of the model."""
+        return {
+            'version': SCORING_MODEL_VERSION,
+            'model_id': self.model_id,
+            'fitted_at': self.fitted_at,
+            'n_subjects': self.n_subjects,
+            'binary_weight': self.binary_weight,
+            'severity_weight': self.severity_weight,
+            'thresholds': {'high': self.high_threshold},
+            'features': [
+                {'feature': f, 'weight': w, 'reference_max': r}
+                for f, w, r in zip(self.features, self.weights, self.reference_maxima)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScoringModel':
+        """
+        Rebuild a model from to_dict output.
+
+        Raises:
+            ValueError: If the model was written by another format version
+        """
+        if data.get('version') != SCORING_MODEL_VERSION:
+            raise ValueError(f"Scoring model version {data.get('version')} is not supported "
+                             f"(expected {SCORING_MODEL_VERSION}); re-run Phase 03 to re-baseline")
+        rows = data['features']
+        return cls(
+            features=[r['feature'] for r in rows],
+            weights=[r['weight'] for r in rows],
+            reference_maxima=[r['reference_max'] for r in rows],
+            high_threshold=data['thresholds']['high'],
+            binary_weight=data.get('binary_weight', 0.5),
+            severity_weight=data.get('severity_weight', 0.5),
+            n_subjects=data.get('n_subjects', 0),
+            fitted_at=data.get('fitted_at'),
+        )
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Write the model as JSON (atomically, so readers never see half a model).
+
+        Args:
+            path: Target file (defaults to OUTPUT_FILES['dqi_scoring_model'])
+
+        Returns:
+            Path written
+        """
+        path = Path(path) if path is not None else _get_model_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp_', suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[Union[str, Path]] = None) -> 'ScoringModel':
+        """
+        Read a saved model.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is from another format version
+        """
+        path = Path(path) if path is not None else _get_model_path()
+        with open(path, 'r', encoding='utf-8') as fh:
+            return cls.from_dict(json.load(fh))
+
+
+def load_scoring_model(path: Optional[Union[str, Path]] = None) -> Optional[ScoringModel]:
+    """
+    Read the saved scoring model, if there is a usable one.
+
+    Args:
+        path: Model file (defaults to OUTPUT_FILES['dqi_scoring_model'])
+
+    Returns:
+        ScoringModel, or None when the file is missing, unreadable or from
+        another format version
+    """
+    try:
+        return ScoringModel.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"   [WARN] Ignoring scoring model ({e})")
+        return None
@@ -0,0 +1,244 @@
+"""
+JAVELIN.AI - Source Aggregation Engine
+======================================
+
+Declarative, vectorized reduction of source files to one row per subject.
+
+Each non-EDC file type is described by a spec (see AGGREGATION_SPECS in
+config.py) listing its row filters, count columns (optionally with a
+status predicate), numeric max columns and numeric sum columns. The engine
+turns a spec into one groupby per file and resolves missing sites through
+the SubjectIndex with a join, so cost grows linearly with row count.
+
+Functions:
+    - get_aggregation_specs: Specs from config (src/config.py is their only definition)
+    - evaluate_predicate: Boolean mask for one spec predicate
+    - spec_metric_columns: Ordered metric columns and merge aggregations
+    - aggregate_source_frame: One parsed file -> one row per subject
+    - merge_source_aggregates: Left-merge per-type results onto the base table
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .data_loader import find_column
+from .subject_index import SubjectIndex, SUBJECT_KEY, normalize_subject_ids
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.py"
+
+
+def get_aggregation_specs() -> Dict[str, Dict[str, Any]]:
+    """
+    Return AGGREGATION_SPECS from config.
+
+    When config is not importable (src/ is not on sys.path), src/config.py
+    is loaded from its file instead, so the specs have a single definition.
+    """
+    try:
+        from config import AGGREGATION_SPECS
+        return AGGREGATION_SPECS
+    except ImportError:
+        spec = importlib.util.spec_from_file_location('javelin_config', _CONFIG_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.AGGREGATION_SPECS
+
+
+def evaluate_predicate(df: pd.DataFrame, predicate: Dict[str, Any]) -> pd.Series:
+    """
+    Evaluate a spec predicate against every row of a frame.
+
+    Args:
+        df: Source frame
+        predicate: Dict with 'column', 'op' ('eq', 'ne', 'contains', 'in',
+            'notna'), 'value' and optional 'if_missing'
+
+    Returns:
+        Boolean Series aligned with df
+
+    Examples:
+        >>> evaluate_predicate(df, {'column': 'review_status', 'op': 'ne',
+        ...                         'value': 'Review Completed', 'if_missing': True})
+    """
+    column = predicate['column']
+    if column not in df.columns:
+        return pd.Series(bool(predicate.get('if_missing', False)), index=df.index)
+
+    values = df[column]
+    op = predicate.get('op', 'eq')
+    target = predicate.get('value')
+
+    if op == 'eq':
+        return values == target
+    if op == 'ne':
+        return values != target
+    if op == 'contains':
+        return values.notna() & values.astype(str).str.contains(
+            target, case=predicate.get('case', False), na=False
+        )
+    if op == 'in':
+        return values.isin(target)
+    if op == 'notna':
+        return values.notna()
+    raise ValueError(f"Unknown predicate op: {op}")
+
+
+def spec_metric_columns(spec: Dict[str, Any]) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Return a spec's metric columns (counts, then max, then sum) and merge aggs.
+
+    Args:
+        spec: Aggregation spec
+
+    Returns:
+        Tuple of (ordered metric columns, {column: 'sum' | 'max'})
+    """
+    merge_aggs = {}
+    for col in spec.get('counts', {}):
+        merge_aggs[col] = 'sum'
+    for col in spec.get('max', {}):
+        merge_aggs[col] = 'max'
+    for col in spec.get('sum', {}):
+        merge_aggs[col] = 'sum'
+    return list(merge_aggs), merge_aggs
+
+
+def aggregate_source_frame(
+    df: pd.DataFrame,
+    study: str,
+    spec: Dict[str, Any],
+    subject_index: Optional[SubjectIndex] = None,
+    column_finder: Callable[[List[str], List[str]], Optional[str]] = find_column
+) -> pd.DataFrame:
+    """
+    Reduce one standardized source file to one row per subject.
+
+    Rows without a subject ID are dropped and spec filters applied. Rows
+    are grouped on the canonical subject_key (taken from the frame when
+    present, else computed once from subject_id), so formatting variants
+    of one ID collapse into one subject. Each count column counts rows
+    passing its predicate, max columns take the numeric max (0 when
+    absent) and sum columns add per-row integer values. The site comes
+    from the file's own site_id column when the spec allows it and the
+    subject has one there, otherwise from the SubjectIndex.
+
+    Args:
+        df: Parsed frame with a 'subject_id' column
+        study: Study name
+        spec: Aggregation spec for the file type
+        subject_index: Index used to resolve missing sites
+        column_finder: find_column variant used to locate max/sum sources
+
+    Returns:
+        DataFrame with 'study', 'subject_id' (first spelling seen),
+        'subject_key', 'site_id' and the metric columns
+
+    Examples:
+        >>> spec = get_aggregation_specs()['visit_tracker']
+        >>> aggregate_source_frame(visit_df, 'Study 1', spec, subject_index)
+    """
+    metric_cols, _ = spec_metric_columns(spec)
+    columns = ['study', 'subject_id', SUBJECT_KEY, 'site_id'] + metric_cols
+
+    df = df[df['subject_id'].notna()]
+    for predicate in spec.get('filters', []):
+        df = df[evaluate_predicate(df, predicate)]
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+
+    key = df[SUBJECT_KEY] if SUBJECT_KEY in df.columns else normalize_subject_ids(df['subject_id'])
+    work = pd.DataFrame({SUBJECT_KEY: key}, index=df.index)
+    aggs = {}
+
+    for col, predicate in spec.get('counts', {}).items():
+        work[col] = 1 if predicate is None else evaluate_predicate(df, predicate).astype(int)
+        aggs[col] = 'sum'
+
+    source_columns = df.columns.tolist()
+    for col, candidates in spec.get('max', {}).items():
+        source = column_finder(source_columns, candidates)
+        work[col] = pd.to_numeric(df[source], errors='coerce') if source else np.nan
+        aggs[col] = 'max'
+
+    for col, candidates in spec.get('sum', {}).items():
+        source = column_finder(source_columns, candidates)
+        if source:
+            work[col] = np.trunc(pd.to_numeric(df[source], errors='coerce').fillna(0)).astype('int64')
+        else:
+            work[col] = 0
+        aggs[col] = 'sum'
+
+    result = work.groupby(SUBJECT_KEY, sort=True).agg(aggs).reset_index() if aggs \
+        else work.drop_duplicates(SUBJECT_KEY).sort_values(SUBJECT_KEY).reset_index(drop=True)
+    for col in spec.get('max', {}):
+        result[col] = result[col].fillna(0)
+
+    def first_per_key(values):
+        first = pd.Series(values, index=key.values)
+        return first[~first.index.duplicated(keep='first')]
+
+    # Site: first row of the subject in the source file, else the EDC lookup
+    site = pd.Series('', index=result.index, dtype=object)
+    has_source_site = pd.Series(False, index=result.index)
+    if spec.get('site_from_source', True) and 'site_id' in df.columns:
+        first_site = first_per_key(df['site_id'].values)
+        any_site = df['site_id'].notna().groupby(key.values).any()
+        has_source_site = result[SUBJECT_KEY].map(any_site).fillna(False).astype(bool)
+        site = site.where(~has_source_site,
+                          result[SUBJECT_KEY].map(first_site).astype(str).str.strip())
+
+    need_lookup = ~has_source_site
+    if subject_index is not None and need_lookup.any():
+        resolved = subject_index.resolve_frame(
+            result.loc[need_lookup, [SUBJECT_KEY]].assign(study=study), fields=['site_id']
+        )
+        site[need_lookup] = resolved['site_id_lookup'].fillna('')
+
+    result.insert(0, 'study', study)
+    result.insert(1, 'subject_id',
+                  result[SUBJECT_KEY].map(first_per_key(df['subject_id'].astype(str).str.strip().values)))
+    result.insert(3, 'site_id', site)
+    return result[columns]
+
+
+def merge_source_aggregates(
+    base_df: pd.DataFrame,
+    source_frames: Dict[str, pd.DataFrame],
+    specs: Dict[str, Dict[str, Any]],
+    merge_keys: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Left-merge per-type subject aggregates onto the base (EDC) table.
+
+    Each type is first collapsed on the merge keys (a subject may appear in
+    several files) using the spec's merge aggregations, then joined in spec
+    order so the master column order is stable. Join on 'subject_key' so
+    formatting variants of an ID still match the base table.
+
+    Args:
+        base_df: Base subject table
+        source_frames: file_type -> concatenated aggregate_source_frame output
+        specs: Aggregation specs (iteration order = column order)
+        merge_keys: Join keys (default: ['study', 'subject_key'])
+
+    Returns:
+        Merged DataFrame
+    """
+    merge_keys = merge_keys or ['study', SUBJECT_KEY]
+    master = base_df.copy()
+    for file_type, spec in specs.items():
+        frame = source_frames.get(file_type)
+        if frame is None or frame.empty:
+            continue
+        _, merge_aggs = spec_metric_columns(spec)
+        collapsed = frame.groupby(merge_keys).agg(merge_aggs).reset_index()
+        master = master.merge(collapsed, on=merge_keys, how='left')
+    return master
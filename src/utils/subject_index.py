@@ -0,0 +1,273 @@
+"""
+JAVELIN.AI - Subject Index
+==========================
+
+Hash index over the EDC subject -> site lookup table.
+
+Source files other than EDC Metrics often lack a site column, so each
+subject has to be resolved against the EDC lookup. Filtering the lookup
+DataFrame per subject is O(subjects x lookup rows); this index is built
+once and answers each lookup in O(1), or resolves a whole frame with a
+single join.
+
+Keys are (study, subject_key), where subject_key is the canonical form of
+the subject ID: trimmed, upper-cased, without a leading 'Subject'/'Patient'
+style prefix (only when a number or nothing follows it, so 'PATHWAY-3'
+keeps its name), without an Excel '.0' suffix and without leading zeros, so
+'Subject 0101', 'SUBJ-101', 101.0 and ' 101' join to the same subject. An
+ID that is only a prefix ('Patient') has no key. Keys are computed once per column with
+pandas string methods (normalize_subject_ids). When the lookup holds the
+same subject more than once, the first row wins, matching the previous
+`lookup_match.iloc[0]` behaviour.
+
+Classes:
+    - SubjectIndex: Build once from the lookup, resolve per subject or in bulk
+
+Functions:
+    - normalize_subject_id: Canonical key of one subject ID
+    - normalize_subject_ids: Vectorized canonical keys of a whole column
+    - add_subject_key: Add the 'subject_key' join column to a frame
+"""
+
+import re
+
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+LOOKUP_FIELDS = ('site_id', 'country', 'region')
+SUBJECT_KEY = 'subject_key'
+
+# Prefixes that carry no identity ('Subject 101' and '101' are the same subject);
+# stripped only before a number or the end, so 'PATHWAY-3' and 'SUBSTUDY1' stay
+_SUBJECT_PREFIX = re.compile(r'^(SUBJECT|SUBJ|SUB|PATIENT|PAT|PT)[_\-\s]*(?=\d|$)')
+
+# Integral numbers read from Excel as floats ('101.0' is subject 101)
+_INTEGRAL_FLOAT = re.compile(r'^(\d+)\.0+$')
+
+
+def normalize_subject_id(value: Any) -> Optional[str]:
+    """
+    Return the canonical key of a subject ID used for joins and lookups.
+
+    Scalar form of normalize_subject_ids; both give the same key.
+
+    Args:
+        value: Raw subject ID (any type)
+
+    Returns:
+        Canonical key, or None for a missing value or a bare prefix
+
+    Examples:
+        >>> normalize_subject_id('  Subject 0101 ')
+        '101'
+        >>> normalize_subject_id('SUBJ-101')
+        '101'
+        >>> normalize_subject_id(101.0)
+        '101'
+        >>> normalize_subject_id('PATHWAY-3')
+        'PATHWAY-3'
+        >>> normalize_subject_id('Patient') is None
+        True
+    """
+    if pd.isna(value):
+        return None
+    key = _SUBJECT_PREFIX.sub('', str(value).strip().upper())
+    if not key:
+        return None
+    key = _INTEGRAL_FLOAT.sub(r'\1', key)
+    return key.lstrip('0') or '0'
+
+
+def normalize_subject_ids(values: pd.Series) -> pd.Series:
+    """
+    Vectorized canonical keys for a column of subject IDs.
+
+    Args:
+        values: Raw subject IDs
+
+    Returns:
+        Series of keys aligned with values (None where the ID is missing)
+
+    Examples:
+        >>> normalize_subject_ids(pd.Series(['Subject 0101', 'SUBJ-101', 101, '101.0', 'PT']))
+        0     101
+        1     101
+        2     101
+        3     101
+        4    None
+        dtype: object
+    """
+    keys = (values.astype(str).str.strip().str.upper()
+            .str.replace(_SUBJECT_PREFIX, '', regex=True))
+    missing = values.isna() | (keys == '')
+    keys = keys.str.replace(_INTEGRAL_FLOAT, r'\1', regex=True).str.lstrip('0')
+    keys = keys.where(keys != '', '0')
+    return keys.astype(object).where(~missing, None)
+
+
+def add_subject_key(df: pd.DataFrame, subject_col: str = 'subject_id') -> pd.DataFrame:
+    """
+    Add the canonical 'subject_key' column, computed once for the frame.
+
+    Args:
+        df: Frame with a subject ID column
+        subject_col: Name of the subject ID column
+
+    Returns:
+        Copy of df with a 'subject_key' column
+    """
+    return df.assign(**{SUBJECT_KEY: normalize_subject_ids(df[subject_col])})
+
+
+class SubjectIndex:
+    """
+    Hash index over the subject lookup, keyed on (study, subject_id).
+
+    Args:
+        lookup_df: DataFrame with 'study', 'subject_id' and lookup fields
+            (as produced by Phase 02's load_edc_metrics)
+        fields: Lookup fields to index
+
+    Examples:
+        >>> index = SubjectIndex(lookup_df)
+        >>> index.get('Study 1', 'Subject 1001')
+        'Site 12'
+        >>> index.resolve_frame(visit_df, fields=['site_id'])
+    """
+
+    def __init__(self, lookup_df: Optional[pd.DataFrame] = None,
+                 fields: Iterable[str] = LOOKUP_FIELDS):
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self._by_study: Dict[Any, Dict[str, Tuple]] = {}
+
+        if lookup_df is None or lookup_df.empty or 'subject_id' not in lookup_df.columns:
+            return
+
+        keys = lookup_df[SUBJECT_KEY] if SUBJECT_KEY in lookup_df.columns \
+            else normalize_subject_ids(lookup_df['subject_id'])
+        table = pd.DataFrame({'study': lookup_df['study'].values, SUBJECT_KEY: keys.values})
+        for f in self.fields:
+            table[f] = lookup_df[f].values if f in lookup_df.columns else ''
+        table = table[table[SUBJECT_KEY].notna()].drop_duplicates(['study', SUBJECT_KEY], keep='first')
+
+        for study, rows in table.groupby('study', sort=False):
+            values = zip(*(rows[f].tolist() for f in self.fields))
+            self._by_study[study] = dict(zip(rows[SUBJECT_KEY].tolist(), values))
+
+    def __len__(self) -> int:
+        return sum(len(subjects) for subjects in self._by_study.values())
+
+    def __contains__(self, key: Tuple[Any, Any]) -> bool:
+        study, subject_id = key
+        return normalize_subject_id(subject_id) in self._by_study.get(study, {})
+
+    @property
+    def studies(self) -> List[Any]:
+        """Studies present in the index."""
+        return list(self._by_study)
+
+    def get(self, study: Any, subject_id: Any, field: str = 'site_id', default: Any = '') -> Any:
+        """
+        Look up one field for a single subject.
+
+        Args:
+            study: Study name
+            subject_id: Subject ID (normalized before lookup)
+            field: Lookup field to return
+            default: Value returned when the subject is unknown
+
+        Returns:
+            The field value, or default
+        """
+        values = self._by_study.get(study, {}).get(normalize_subject_id(subject_id))
+        if values is None:
+            return default
+        return values[self.fields.index(field)]
+
+    def for_study(self, study: Any) -> 'SubjectIndex':
+        """
+        Return an index restricted to one study (cheap to send to a worker).
+
+        Args:
+            study: Study name
+
+        Returns:
+            New SubjectIndex sharing this index's per-study table
+        """
+        subset = SubjectIndex(fields=self.fields)
+        if study in self._by_study:
+            subset._by_study[study] = self._by_study[study]
+        return subset
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the deduplicated lookup as a DataFrame.
+
+        Returns:
+            DataFrame with 'study', 'subject_id' (the canonical key) and the
+            indexed fields
+        """
+        rows = [
+            (study, subject_id, *values)
+            for study, subjects in self._by_study.items()
+            for subject_id, values in subjects.items()
+        ]
+        return pd.DataFrame(rows, columns=['study', 'subject_id', *self.fields])
+
+    def resolve(self, study: Any, subject_ids: pd.Series, field: str = 'site_id',
+                default: Any = '') -> pd.Series:
+        """
+        Vectorized lookup of one field for many subjects of one study.
+
+        Args:
+            study: Study name
+            subject_ids: Series of subject IDs
+            field: Lookup field to return
+            default: Value for unknown subjects
+
+        Returns:
+            Series aligned with subject_ids
+        """
+        pos = self.fields.index(field)
+        mapping = {key: values[pos] for key, values in self._by_study.get(study, {}).items()}
+        resolved = normalize_subject_ids(subject_ids).map(mapping)
+        return resolved.where(resolved.notna(), default)
+
+    def resolve_frame(
+        self,
+        df: pd.DataFrame,
+        fields: Optional[Iterable[str]] = None,
+        study_col: str = 'study',
+        subject_col: str = 'subject_id',
+        suffix: str = '_lookup'
+    ) -> pd.DataFrame:
+        """
+        Resolve lookup fields for every row of a frame with a single join.
+
+        A 'subject_key' column in df is used as is; otherwise keys are
+        computed from subject_col.
+
+        Args:
+            df: Frame with study and subject ID columns
+            fields: Lookup fields to add (default: all indexed fields)
+            study_col: Name of the study column in df
+            subject_col: Name of the subject ID column in df
+            suffix: Suffix for the added columns (e.g. 'site_id_lookup')
+
+        Returns:
+            Copy of df with one '<field><suffix>' column per field; NaN
+            where the subject is not in the index
+        """
+        fields = list(fields) if fields is not None else list(self.fields)
+        lookup = self.to_frame()[['study', 'subject_id', *fields]]
+        lookup = lookup.rename(columns={'study': study_col, 'subject_id': '_subject_key',
+                                        **{f: f"{f}{suffix}" for f in fields}})
+        keys = df[SUBJECT_KEY] if SUBJECT_KEY in df.columns else normalize_subject_ids(df[subject_col])
+        keyed = df.assign(_subject_key=keys)
+        merged = keyed.merge(lookup, on=[study_col, '_subject_key'], how='left')
+        merged.index = df.index
+        return merged.drop(columns='_subject_key')
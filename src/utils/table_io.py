@@ -0,0 +1,456 @@
+"""
+JAVELIN.AI - Table Storage
+==========================
+
+Typed columnar storage for the tables phases hand to each other.
+
+Phase outputs keep their CSV paths (see OUTPUT_FILES in config.py) as the
+logical table name. write_table stores the table as Parquet next to that
+path (master_subject.csv -> master_subject.parquet) with an explicit schema:
+dictionary-encoded identifiers, int32 counts and float32 scores. The CSV is
+still written as an export unless TABLE_STORAGE['csv_export'] is False.
+
+read_table prefers the Parquet file when it is at least as new as the CSV,
+supports column projection, and by default returns the same dtypes a CSV
+read would have produced (object text, int64, float64), so downstream code
+does not change. float32 scores are widened at their stored precision
+(7 significant digits). Pass compact=True to keep the stored
+categorical/32-bit dtypes.
+
+Large tables can be streamed: iter_table yields fixed-size chunks with
+the same dtypes as read_table, and TableWriter writes a table chunk by
+chunk (one Parquet row group per chunk, CSV export appended), so memory is
+bounded by the chunk size rather than the table size.
+
+Classes:
+    - TableWriter: Write a table in chunks (same layout as write_table)
+
+Functions:
+    - write_table: Write a table as typed Parquet plus an optional CSV export
+    - read_table: Read a table, preferring Parquet, with column projection
+    - iter_table: Stream a table in fixed-size chunks
+    - table_exists: Whether a table exists in either format
+    - apply_table_schema: Cast a frame to the storage schema
+    - widen_float32: float32 -> float64 at stored precision
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+_INT32_MIN, _INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def _get_storage_settings() -> Dict[str, Any]:
+    """Return TABLE_STORAGE from config, with a local fallback."""
+    try:
+        from config import TABLE_STORAGE
+        return TABLE_STORAGE
+    except ImportError:
+        return {'format': 'parquet', 'csv_export': True}
+
+
+def _get_table_schema() -> Dict[str, Any]:
+    """Return TABLE_SCHEMA from config, with a local fallback."""
+    try:
+        from config import TABLE_SCHEMA
+        return TABLE_SCHEMA
+    except ImportError:
+        return {
+            'dictionary': ['study', 'site_id', 'country', 'region', 'subject_status',
+                           'risk_category', 'site_risk_category'],
+            'float32_patterns': ['dqi', 'score', '_component'],
+        }
+
+
+def _parquet_path(path: Union[str, Path]) -> Path:
+    return Path(path).with_suffix('.parquet')
+
+
+def _use_parquet() -> bool:
+    return HAS_PYARROW and _get_storage_settings().get('format', 'parquet') == 'parquet'
+
+
+def apply_table_schema(df: pd.DataFrame, schema: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    Cast a frame to the storage schema.
+
+    - Columns listed under 'dictionary' become categoricals (stored as
+      Parquet dictionary columns); empty strings become missing, as a CSV
+      round trip would make them
+    - Other text columns holding mixed Python types are stringified
+    - Integer columns become int32 when their values fit
+    - Float columns whose name contains a 'float32_patterns' entry become
+      float32
+
+    Args:
+        df: Frame to store
+        schema: Schema rules (defaults to TABLE_SCHEMA)
+
+    Returns:
+        New DataFrame with storage dtypes
+
+    Examples:
+        >>> stored = apply_table_schema(master_subject)
+        >>> stored['dqi_score'].dtype
+        dtype('float32')
+    """
+    schema = schema or _get_table_schema()
+    dictionary = set(schema.get('dictionary', []))
+    float32_patterns = schema.get('float32_patterns', [])
+
+    out = df.copy()
+    for col in out.columns:
+        series = out[col]
+        if series.dtype == object:
+            series = series.where(series != '', None)
+            kinds = set(type(v) for v in series.dropna())
+            if col in dictionary and kinds <= {str}:
+                out[col] = series.astype('category')
+            elif len(kinds) > 1 and not kinds <= {bool, np.bool_}:
+                # Mixed Python types cannot be stored in one Parquet column
+                out[col] = series.where(series.isna(), series.astype(str))
+            else:
+                out[col] = series
+        elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            if series.empty or (series.min() >= _INT32_MIN and series.max() <= _INT32_MAX):
+                out[col] = series.astype(np.int32)
+        elif pd.api.types.is_float_dtype(series):
+            if any(pattern in str(col) for pattern in float32_patterns):
+                out[col] = series.astype(np.float32)
+    return out
+
+
+def _atomic_to_parquet(df: pd.DataFrame, target: Path):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix='.tmp_', suffix='.parquet')
+    os.close(fd)
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def write_table(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    index: bool = False,
+    csv_export: Optional[bool] = None,
+    **csv_kwargs
+) -> Path:
+    """
+    Write a phase table as typed Parquet, plus the CSV export.
+
+    Args:
+        df: Table to write
+        path: Logical table path (the .csv path used before)
+        index: Store the index as the first column (e.g. a labelled matrix)
+        csv_export: Override TABLE_STORAGE['csv_export'] for this table
+        **csv_kwargs: Passed to DataFrame.to_csv for the export
+
+    Returns:
+        Path of the primary file written (Parquet, or the CSV when
+        Parquet is disabled or unavailable)
+
+    Examples:
+        >>> write_table(master_subject, PHASE_DIRS['phase_02'] / "master_subject.csv")
+    """
+    path = Path(path)
+    parquet_path = _parquet_path(path)
+    if csv_export is None:
+        csv_export = _get_storage_settings().get('csv_export', True)
+
+    # The CSV goes first so the Parquet file is never older than its export
+    if csv_export:
+        df.to_csv(path, index=index, **csv_kwargs)
+    elif path.exists():
+        path.unlink()  # a stale CSV export would be mistaken for current data
+
+    if _use_parquet():
+        table = (df.reset_index() if index else df).rename(columns=str)
+        try:
+            _atomic_to_parquet(apply_table_schema(table), parquet_path)
+            return parquet_path
+        except Exception as e:
+            print(f"   [WARN] Parquet write failed for {path.name} ({e}) - keeping CSV only")
+
+    if parquet_path.exists():
+        parquet_path.unlink()  # never leave a stale Parquet next to a newer CSV
+    if not csv_export:
+        df.to_csv(path, index=index, **csv_kwargs)
+    return path
+
+
+def table_exists(path: Union[str, Path]) -> bool:
+    """Check whether a table exists as Parquet or CSV."""
+    path = Path(path)
+    return _parquet_path(path).exists() or path.exists()
+
+
+def widen_float32(values: np.ndarray) -> np.ndarray:
+    """
+    Widen float32 to float64 at float32 precision (7 significant digits).
+
+    A plain cast exposes binary noise (0.3875 -> 0.38749998807907104) that
+    then shows up in downstream rounding and exports; snapping to 7
+    significant digits recovers the decimal value that was stored.
+    """
+    wide = values.astype(np.float64)
+    finite = np.isfinite(wide) & (wide != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exponent = np.floor(np.log10(np.abs(wide, where=finite, out=np.ones_like(wide))))
+        scale = 10.0 ** (6 - exponent)
+        snapped = np.round(wide * scale) / scale
+    return np.where(finite, snapped, wide)
+
+
+def _restore_csv_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Undo storage dtypes so readers see what a CSV read would return."""
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object).where(df[col].notna(), np.nan)
+        elif dtype == object and df[col].isna().any():
+            df[col] = df[col].where(df[col].notna(), np.nan)
+        elif dtype == np.int32:
+            df[col] = df[col].astype(np.int64)
+        elif dtype == np.float32:
+            df[col] = widen_float32(df[col].to_numpy())
+    return df
+
+
+def _prefer_parquet(path: Path) -> bool:
+    """Whether the Parquet file exists and is at least as new as the CSV."""
+    parquet_path = _parquet_path(path)
+    return HAS_PYARROW and parquet_path.exists() and (
+        not path.exists() or parquet_path.stat().st_mtime_ns >= path.stat().st_mtime_ns
+    )
+
+
+def read_table(
+    path: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    compact: bool = False
+) -> pd.DataFrame:
+    """
+    Read a phase table, preferring the Parquet file.
+
+    The Parquet file is used when it exists and is at least as new as the
+    CSV; otherwise the CSV is read (e.g. outputs of an older run).
+
+    Args:
+        path: Logical table path (the .csv path)
+        columns: Columns to load; names not present in the table are ignored
+        compact: Keep storage dtypes (categoricals, int32, float32)
+
+    Returns:
+        DataFrame
+
+    Raises:
+        FileNotFoundError: If neither the Parquet file nor the CSV exists
+
+    Examples:
+        >>> sites = read_table(SITE_DQI_PATH, columns=['study', 'site_id', 'avg_dqi_score'])
+    """
+    path = Path(path)
+    parquet_path = _parquet_path(path)
+    wanted: Optional[List[str]] = list(columns) if columns is not None else None
+
+    if _prefer_parquet(path):
+        if wanted is not None:
+            available = set(pq.read_schema(parquet_path).names)
+            wanted = [c for c in wanted if c in available]
+        df = pd.read_parquet(parquet_path, columns=wanted)
+        return df if compact else _restore_csv_dtypes(df)
+
+    if not path.exists():
+        raise FileNotFoundError(f"Table not found: {path}")
+    if wanted is not None:
+        wanted_set = set(wanted)
+        return pd.read_csv(path, usecols=lambda c: c in wanted_set)
+    return pd.read_csv(path)
+
+
+def iter_table(
+    path: Union[str, Path],
+    chunk_size: int,
+    columns: Optional[Sequence[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a phase table in chunks of at most chunk_size rows.
+
+    Uses the same file choice and dtypes as read_table. Each chunk is
+    independent (its index starts at 0).
+
+    Args:
+        path: Logical table path (the .csv path)
+        chunk_size: Maximum rows per chunk
+        columns: Columns to load; names not present in the table are ignored
+
+    Yields:
+        DataFrame chunks in table order
+
+    Raises:
+        FileNotFoundError: If neither the Parquet file nor the CSV exists
+
+    Examples:
+        >>> for chunk in iter_table(MASTER_SUBJECT_PATH, 500_000, columns=['study', 'dqi_score']):
+        ...     total += chunk['dqi_score'].sum()
+    """
+    path = Path(path)
+    parquet_path = _parquet_path(path)
+    wanted: Optional[List[str]] = list(columns) if columns is not None else None
+
+    if _prefer_parquet(path):
+        parquet_file = pq.ParquetFile(parquet_path)
+        if wanted is not None:
+            available = set(parquet_file.schema_arrow.names)
+            wanted = [c for c in wanted if c in available]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=wanted):
+            yield _restore_csv_dtypes(batch.to_pandas())
+        return
+
+    if not path.exists():
+        raise FileNotFoundError(f"Table not found: {path}")
+    usecols = None
+    if wanted is not None:
+        wanted_set = set(wanted)
+        usecols = lambda c: c in wanted_set
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_size):
+        yield chunk.reset_index(drop=True)
+
+
+def _stable_schema(schema: 'pa.Schema') -> 'pa.Schema':
+    """Writer schema that later chunks can be cast to (wide dictionary indices, no null columns)."""
+    fields = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            value_type = pa.string() if pa.types.is_null(field.type.value_type) else field.type.value_type
+            field = field.with_type(pa.dictionary(pa.int32(), value_type))
+        elif pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+class TableWriter:
+    """
+    Write a phase table chunk by chunk.
+
+    Produces the same files as write_table: typed Parquet (one row group
+    per chunk) next to the logical path, plus the CSV export. Both files
+    are moved into place on close, so readers never see a partial table.
+    The storage schema is fixed by the first chunk.
+
+    Args:
+        path: Logical table path (the .csv path)
+        csv_export: Override TABLE_STORAGE['csv_export'] for this table
+
+    Examples:
+        >>> with TableWriter(PHASE_DIRS['phase_03'] / "master_subject_with_dqi.csv") as writer:
+        ...     for chunk in chunks:
+        ...         writer.write(score(chunk))
+    """
+
+    def __init__(self, path: Union[str, Path], csv_export: Optional[bool] = None):
+        self.path = Path(path)
+        self.parquet_path = _parquet_path(self.path)
+        self.csv_export = _get_storage_settings().get('csv_export', True) if csv_export is None else csv_export
+        self.rows = 0
+        self.chunks = 0
+        self._use_parquet = _use_parquet()
+        self._write_csv = self.csv_export or not self._use_parquet
+        self._schema = None
+        self._writer = None
+        self._tmp = None
+        self._csv_tmp = None
+
+    def __enter__(self) -> 'TableWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, df: pd.DataFrame):
+        """
+        Append one chunk.
+
+        Raises:
+            ValueError: If the chunk's columns or types cannot be stored with
+                the schema of the first chunk
+        """
+        if self._write_csv:
+            if self._csv_tmp is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, self._csv_tmp = tempfile.mkstemp(dir=self.path.parent, prefix='.tmp_', suffix='.csv')
+                os.close(fd)
+            df.to_csv(self._csv_tmp, index=False, mode='w' if self.chunks==0 else 'a', header=self.chunks==0)
+        if self._use_parquet:
+            table = pa.Table.from_pandas(apply_table_schema(df.rename(columns=str)), preserve_index=False)
+            if self._writer is None:
+                self._schema = _stable_schema(table.schema)
+                self.parquet_path.parent.mkdir(parents=True, exist_ok=True)
+                fd, self._tmp = tempfile.mkstemp(dir=self.parquet_path.parent, prefix='.tmp_', suffix='.parquet')
+                os.close(fd)
+                self._writer = pq.ParquetWriter(self._tmp, self._schema)
+            try:
+                table = table.select(self._schema.names).cast(self._schema)
+            except (KeyError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                raise ValueError(f"Chunk {self.chunks} of {self.path.name} does not match the table schema ({e})")
+            self._writer.write_table(table)
+        self.rows += len(df)
+        self.chunks += 1
+
+    def close(self) -> Path:
+        """
+        Finish the table and move the Parquet file into place.
+
+        Returns:
+            Path of the primary file written
+        """
+        # The CSV goes first so the Parquet file is never older than its export
+        if self._csv_tmp is not None:
+            os.replace(self._csv_tmp, self.path)
+            self._csv_tmp = None
+        elif self.path.exists():
+            self.path.unlink()  # a stale CSV export would be mistaken for current data
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            os.replace(self._tmp, self.parquet_path)
+            self._tmp = None
+            return self.parquet_path
+        if self.parquet_path.exists():
+            self.parquet_path.unlink()  # never leave a stale Parquet next to a newer CSV
+        return self.path
+
+    def abort(self):
+        """Discard a partially written table (the previous files stay in place)."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for tmp in (self._tmp, self._csv_tmp):
+            if tmp and os.path.exists(tmp):
+                os.remove(tmp)
+        self._tmp = self._csv_tmp = None
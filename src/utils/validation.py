@@ -11,6 +11,7 @@ Functions:
     - safe_max: Safely compute maximum with NaN handling
     - safe_mean: Safely compute mean with NaN handling
     - fill_missing_categoricals: Fill missing categorical values
+    - clean_text: Vectorized str() + strip with a default for missing values
     - validate_required_columns: Check for required columns
 """
 
@@ -252,6 +253,43 @@ def fill_missing_categoricals(
     return df
 
 
+def clean_text(
+    df: pd.DataFrame,
+    column: str,
+    default: str = ''
+) -> pd.Series:
+    """
+    Convert a column to stripped strings, with a default for missing values.
+
+    Vectorized equivalent of applying
+    ``str(v).strip() if pd.notna(v) else default`` to every row. A column
+    that is absent yields the default for every row.
+
+    Args:
+        df: Input DataFrame
+        column: Column to clean
+        default: Value for missing entries (and for an absent column)
+
+    Returns:
+        Series of str aligned with df.index
+
+    Examples:
+        >>> df = pd.DataFrame({'site_id': [' Site 1 ', np.nan, 12]})
+        >>> clean_text(df, 'site_id').tolist()
+        ['Site 1', '', '12']
+    """
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+
+    values = df[column]
+    if pd.api.types.is_datetime64_any_dtype(values) or isinstance(values.dtype, pd.PeriodDtype):
+        # astype(str) drops midnight times; str() on the scalars does not
+        text = values.map(str)
+    else:
+        text = values.astype(str)
+    return text.str.strip().where(values.notna(), default)
+
+
 def validate_required_columns(
     df: pd.DataFrame,
     required_columns: List[str],
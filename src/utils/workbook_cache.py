@@ -0,0 +1,291 @@
+"""
+JAVELIN.AI - Parsed Workbook Cache
+==================================
+
+Persistent on-disk cache of parsed Excel workbooks. Parsing the study
+workbooks with openpyxl dominates the runtime of phases 00-02, while the
+source files themselves change only a few times a week. Parsed frames are
+therefore stored as Parquet and reused until the source file changes.
+
+Cache layout (under WORKBOOK_CACHE['dir']):
+    stat/<key>.json        path + size + mtime -> content hash
+    frames/<key>.parquet   parsed DataFrame
+
+A frame entry is keyed by the content hash of the source file, the
+file_type and the identity/version of the loader that produced it. The
+stat entry lets unchanged files skip re-hashing; a file that is touched
+but not modified re-hashes once and then hits the same frame entry.
+
+Entries are lossless: a cached read returns the same frame as calling the
+loader. Object columns holding anything other than text (numbers, dates
+or a mix of types from a free-form column) are stored as pickled cells,
+and the original column labels are kept in the Parquet metadata.
+
+Functions:
+    - read_workbook_cached: Return a cached frame or parse and store it
+    - file_fingerprint: Size, mtime and content hash of a file
+    - clear_workbook_cache: Remove all cached entries
+    - is_cache_enabled: Whether the cache is active for this run
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Bump when the on-disk frame encoding changes; loaders carry their own version
+CACHE_FORMAT_VERSION = 2
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def _get_cache_settings() -> Dict:
+    """Return cache settings from config, with a local fallback."""
+    try:
+        from config import WORKBOOK_CACHE
+        return WORKBOOK_CACHE
+    except ImportError:
+        return {
+            'enabled': True,
+            'dir': Path(__file__).resolve().parent.parent.parent / "outputs" / "cache" / "workbooks",
+        }
+
+
+def is_cache_enabled() -> bool:
+    """
+    Check whether the workbook cache is active.
+
+    The cache is disabled when pyarrow is not installed, when the config
+    sets WORKBOOK_CACHE['enabled'] to False, or when the JAVELIN_NO_CACHE
+    environment variable is set to a truthy value.
+
+    Returns:
+        True if cached reads should be used
+    """
+    if not HAS_PYARROW:
+        return False
+    if os.environ.get('JAVELIN_NO_CACHE', '').strip().lower() in ('1', 'true', 'yes'):
+        return False
+    return bool(_get_cache_settings().get('enabled', True))
+
+
+def _cache_dir() -> Path:
+    return Path(_get_cache_settings()['dir'])
+
+
+def _sha256_file(filepath: Path) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _short_key(*parts) -> str:
+    return hashlib.sha1('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+
+
+def _atomic_write_bytes(target: Path, data: bytes):
+    """Write bytes via a temp file + rename so readers never see partial files."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix='.tmp_', suffix=target.suffix)
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp, target)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def file_fingerprint(filepath: Union[str, Path], cache_dir: Optional[Path] = None) -> Dict:
+    """
+    Compute the fingerprint of a file: resolved path, size, mtime and sha256.
+
+    The content hash is memoised in the stat index so that repeated calls
+    for an unchanged file only cost an os.stat().
+
+    Args:
+        filepath: Path to the file
+        cache_dir: Cache root (defaults to WORKBOOK_CACHE['dir'])
+
+    Returns:
+        Dict with 'path', 'size', 'mtime_ns' and 'sha256'
+    """
+    filepath = Path(filepath).resolve()
+    st = filepath.stat()
+    fingerprint = {
+        'path': str(filepath),
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha256': None,
+    }
+
+    stat_file = None
+    if cache_dir is not None or is_cache_enabled():
+        root = Path(cache_dir) if cache_dir is not None else _cache_dir()
+        stat_file = root / "stat" / f"{_short_key(filepath, st.st_size, st.st_mtime_ns)}.json"
+        try:
+            with open(stat_file, 'r', encoding='utf-8') as fh:
+                fingerprint['sha256'] = json.load(fh).get('sha256')
+        except (OSError, ValueError):
+            pass
+
+    if not fingerprint['sha256']:
+        fingerprint['sha256'] = _sha256_file(filepath)
+        if stat_file is not None:
+            try:
+                _atomic_write_bytes(stat_file, json.dumps(fingerprint).encode('utf-8'))
+            except OSError:
+                pass
+
+    return fingerprint
+
+
+_META_COLUMNS = b'javelin.columns'
+_META_PICKLED = b'javelin.pickled'
+
+
+def _to_columnar(df: pd.DataFrame) -> 'pa.Table':
+    """
+    Encode a parsed Excel frame as an Arrow table without losing anything.
+
+    Text and typed columns are stored natively. Object columns holding
+    other Python values (ints, datetimes, or a mix of types in a free-form
+    column) are stored cell by cell as pickles, so they come back with the
+    same values and types. Column labels (which may repeat or not be
+    strings) are stored in the schema metadata.
+    """
+    encoded = df.copy()
+    pickled = []
+    for i in range(encoded.shape[1]):
+        series = encoded.iloc[:, i]
+        if series.dtype != object:
+            continue
+        if all(type(v) is str for v in series.dropna()):
+            continue
+        encoded.isetitem(i, series.map(pickle.dumps))
+        pickled.append(i)
+    encoded.columns = [f"c{i}" for i in range(encoded.shape[1])]
+    table = pa.Table.from_pandas(encoded)
+    return table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _META_COLUMNS: pickle.dumps(list(df.columns)),
+        _META_PICKLED: json.dumps(pickled).encode('utf-8'),
+    })
+
+
+def _from_columnar(table: 'pa.Table') -> pd.DataFrame:
+    """Decode a table written by _to_columnar back into the loader's frame."""
+    meta = table.schema.metadata
+    df = table.to_pandas()
+    pickled = set(json.loads(meta[_META_PICKLED]))
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        if i in pickled:
+            df.isetitem(i, pd.Series([pickle.loads(v) for v in series], index=series.index, dtype=object))
+        elif series.dtype == object and series.isna().any():
+            # Parquet yields None for missing text; the loader had NaN
+            df.isetitem(i, series.where(series.notna(), np.nan))
+    df.columns = pickle.loads(meta[_META_COLUMNS])
+    return df
+
+
+def read_workbook_cached(
+    filepath: Union[str, Path],
+    file_type: str,
+    loader: Callable[[Path], pd.DataFrame],
+    loader_name: str,
+    loader_version: Union[int, str] = 1,
+) -> pd.DataFrame:
+    """
+    Return the parsed frame for a workbook, using the on-disk cache.
+
+    On a miss the loader is called, its result stored, and the frame
+    returned. Errors raised by the loader propagate to the caller so
+    existing error handling keeps working; cache I/O errors never do.
+
+    Args:
+        filepath: Path to the Excel file
+        file_type: File type used for type-specific parsing
+        loader: Callable that parses the file into a DataFrame
+        loader_name: Stable identifier of the loader (part of the key)
+        loader_version: Bump when the loader's parsing logic changes
+
+    Returns:
+        Parsed DataFrame (a fresh copy the caller may mutate)
+
+    Examples:
+        >>> df = read_workbook_cached(path, 'edc_metrics', lambda p: parse_workbook(p, 'edc_metrics'),
+        ...                           'utils.data_loader', 1)
+    """
+    filepath = Path(filepath)
+    if not is_cache_enabled():
+        return loader(filepath)
+
+    root = _cache_dir()
+    try:
+        fingerprint = file_fingerprint(filepath, cache_dir=root)
+    except OSError:
+        return loader(filepath)
+
+    key = _short_key(fingerprint['sha256'], file_type, loader_name,
+                     loader_version, CACHE_FORMAT_VERSION)
+    frame_file = root / "frames" / f"{key}.parquet"
+
+    if frame_file.exists():
+        try:
+            return _from_columnar(pq.read_table(frame_file))
+        except Exception:
+            pass  # Corrupt entry - fall through and rebuild it
+
+    df = loader(filepath)
+
+    try:
+        frame_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=frame_file.parent, prefix='.tmp_', suffix='.parquet')
+        os.close(fd)
+        try:
+            pq.write_table(_to_columnar(df), tmp)
+            os.replace(tmp, frame_file)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    except Exception:
+        pass  # Cache is best-effort; the parsed frame is still valid
+
+    return df
+
+
+def clear_workbook_cache() -> int:
+    """
+    Remove all cached workbook entries.
+
+    Returns:
+        Number of files removed
+    """
+    root = _cache_dir()
+    if not root.exists():
+        return 0
+    removed = sum(1 for p in root.rglob('*') if p.is_file())
+    shutil.rmtree(root, ignore_errors=True)
+    return removed
@@ -12,7 +12,8 @@ VALIDATION METRICS:
 2. Category Agreement     - % subjects with same risk category across folds
 3. Ranking Correlation    - Spearman correlation of site rankings across folds
 4. SAE Capture Rate       - 100% SAE->High maintained in all folds
-5. Cluster Stability      - Sites land in same clusters across folds
+5. Cluster Stability      - Phase 08 clusters refit on site resamples agree
+                              with production (adjusted Rand, Jaccard)
 
 OUTPUTS:
 --------
@@ -22,12 +23,26 @@ OUTPUTS:
     - outputs/validation/test_predictions.csv
     - outputs/validation/VALIDATION_METHODOLOGY.md
     - outputs/validation/sensitivity_analysis_results.csv (if --include-sensitivity)
+    - outputs/validation/monte_carlo_sensitivity_draws.csv (if --monte-carlo N)
+    - outputs/validation/monte_carlo_sensitivity_summary.csv (if --monte-carlo N)
+    - outputs/validation/bootstrap_ci.csv (if --bootstrap B)
 
 USAGE:
 ------
     python src/validate_dqi.py
     python src/validate_dqi.py --folds 10
+    python src/validate_dqi.py --folds 10 --repeats 10 --jobs 8
     python src/validate_dqi.py --include-sensitivity
+    python src/validate_dqi.py --monte-carlo 5000 --mc-method perturb
+    python src/validate_dqi.py --bootstrap 2000 --jobs 8
+    python src/validate_dqi.py --cluster-bootstrap 100 --jobs 8
+
+Folds run in a process pool with --jobs N; the feature matrix is shared
+with the workers through shared memory instead of being pickled per fold.
+
+Results are cached under outputs/cache/results/validation, keyed by the
+subject table's content and the run parameters; a rerun on unchanged
+inputs reuses them (--no-cache to recompute).
 
 Author: JAVELIN.AI Team
 Version: 2.1.0
@@ -41,7 +56,7 @@ import numpy as np
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Any, Optional
-from scipy.stats import spearmanr
+from scipy.stats import rankdata
 
 import warnings
 
@@ -66,7 +81,7 @@ sys.path.insert(0, str(SCRIPT_DIR))
 try:
     from config import (
         PROJECT_ROOT, OUTPUT_DIR, PHASE_DIRS,
-        DQI_WEIGHTS, THRESHOLDS
+        DQI_WEIGHTS, THRESHOLDS, MONTE_CARLO_SENSITIVITY, BOOTSTRAP
     )
 
     _USING_CONFIG = True
@@ -91,14 +106,25 @@ except ImportError:
         'n_issue_types':{'weight':0.05},
         'inactivated_forms_count':{'weight':0.03},
     }
+    MONTE_CARLO_SENSITIVITY = {
+        'method':'dirichlet', 'concentration':50.0, 'max_perturbation':0.30, 'batch_size':256, 'seed':42,
+    }
+    BOOTSTRAP = {'confidence':0.95, 'block_size':50}
 
 SUBJECT_PATH = PHASE_DIRS.get('phase_03', OUTPUT_DIR / "phase03") / "master_subject_with_dqi.csv"
 SITE_PATH = PHASE_DIRS.get('phase_03', OUTPUT_DIR / "phase03") / "master_site_with_dqi.csv"
 CLUSTER_PATH = PHASE_DIRS.get('phase_08', OUTPUT_DIR / "phase08") / "site_clusters.csv"
+CLUSTER_SUMMARY_PATH = PHASE_DIRS.get('phase_08', OUTPUT_DIR / "phase08") / "cluster_summary.json"
 VALIDATION_DIR = PHASE_DIRS.get('validation', OUTPUT_DIR / "validation")
 
 VALIDATION_DIR.mkdir(parents=True, exist_ok=True)
 
+from utils.table_io import read_table, table_exists, widen_float32
+from utils.dqi_calculator import feature_matrix, dqi_kernel, component_basis, score_many
+from utils.aggregation import group_codes, group_means
+from utils.parallel import SharedArrays, parallel_map, resolve_jobs
+from utils.result_cache import ResultCache, frame_digest
+
 WEIGHT_VALUES = {k:v['weight'] if isinstance(v, dict) else v for k, v in DQI_WEIGHTS.items()}
 
 
@@ -142,32 +168,10 @@ class StratifiedKFold:
 # DQI SCORING FUNCTIONS
 # ============================================================================
 
-def calculate_reference_max(series, min_samples=20):
-    non_zero = series[series > 0]
-    if len(non_zero) >= min_samples:
-        ref_max = non_zero.quantile(0.95)
-        if ref_max <= 0:
-            ref_max = non_zero.max()
-    elif len(non_zero) > 0:
-        ref_max = non_zero.max()
-    else:
-        ref_max = 1.0
-    return max(ref_max, 1.0)
-
-
 def calculate_dqi_scores(df, weights):
-    scores = pd.Series(0.0, index=df.index)
-    for feature, weight in weights.items():
-        if feature not in df.columns:
-            continue
-        series = df[feature]
-        if series.max()==0:
-            continue
-        binary = (series > 0).astype(float)
-        ref_max = calculate_reference_max(series)
-        severity = (series / ref_max).clip(0, 1)
-        scores += weight * (0.5 * binary + 0.5 * severity)
-    return scores.clip(0, 1)
+    features = [f for f in weights if f in df.columns]
+    scores, _ = dqi_kernel(feature_matrix(df, features), [weights[f] for f in features])
+    return pd.Series(widen_float32(scores), index=df.index)
 
 
 def derive_threshold(df, score_col='dqi_score', sae_col='sae_pending_count'):
@@ -210,38 +214,31 @@ def calculate_threshold_stability(fold_thresholds):
     }
 
 
-def calculate_category_agreement(all_predictions, original_categories):
-    all_fold_predictions = pd.concat(all_predictions.values())
-    common_indices = all_fold_predictions.index.intersection(original_categories.index)
-
-    if len(common_indices)==0:
-        return {'agreement_rate':0.0, 'perfect_agreement_rate':0.0, 'subjects_evaluated':0}
-
-    fold_preds = all_fold_predictions[common_indices]
-    original_cats = original_categories[common_indices]
-    matches = (fold_preds==original_cats)
-    agreement_rate = matches.mean()
-
-    return {
-        'agreement_rate':float(agreement_rate),
-        'perfect_agreement_rate':float(agreement_rate),
-        'subjects_evaluated':len(common_indices),
-    }
-
-
 def calculate_ranking_correlation(fold_site_rankings):
+    """
+    Spearman correlation of site scores between every pair of folds.
+
+    Each pair is compared on the sites both folds scored (more than 10).
+    The rankings are aligned into one site x fold matrix once, so each pair
+    costs two rankdata calls rather than two index intersections.
+    """
     if len(fold_site_rankings) < 2:
         return {'mean_correlation':1.0, 'min_correlation':1.0}
 
+    aligned = pd.concat(fold_site_rankings, axis=1, ignore_index=True)
+    values = aligned.to_numpy(dtype=np.float64)
+    present = np.column_stack([aligned.index.isin(r.index) for r in fold_site_rankings])
+
     correlations = []
     for i in range(len(fold_site_rankings)):
         for j in range(i + 1, len(fold_site_rankings)):
-            common_sites = fold_site_rankings[i].index.intersection(fold_site_rankings[j].index)
-            if len(common_sites) > 10:
-                corr, _ = spearmanr(
-                    fold_site_rankings[i][common_sites],
-                    fold_site_rankings[j][common_sites]
-                )
+            common = present[:, i] & present[:, j]
+            if common.sum() > 10:
+                a, b = values[common, i], values[common, j]
+                if np.isnan(a).any() or np.isnan(b).any():
+                    continue
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    corr = np.corrcoef(rankdata(a), rankdata(b))[0, 1]
                 if not np.isnan(corr):
                     correlations.append(corr)
 
@@ -256,44 +253,205 @@ def calculate_ranking_correlation(fold_site_rankings):
     }
 
 
-def calculate_sae_capture_rate(df, predictions, sae_col='sae_pending_count'):
-    if sae_col not in df.columns:
-        return {'capture_rate':1.0, 'sae_count':0, 'captured':0}
-
-    sae_subjects = df[df[sae_col] > 0].index
-    if len(sae_subjects)==0:
-        return {'capture_rate':1.0, 'sae_count':0, 'captured':0}
-
-    sae_in_predictions = predictions.index.intersection(sae_subjects)
-    captured = (predictions[sae_in_predictions]=='High').sum()
+# ============================================================================
+# CLUSTER STABILITY
+# ============================================================================
 
+CLUSTER_STABLE_JACCARD = 0.75
+CLUSTER_DISSOLVED_JACCARD = 0.50
+
+_CLUSTERING = None
+
+
+def _clustering_module():
+    """Phase 08 module (its file name starts with a digit, so it is loaded by path)."""
+    global _CLUSTERING
+    if _CLUSTERING is None:
+        import importlib.util
+        path = SCRIPT_DIR / "phases" / "08_site_clustering.py"
+        spec = importlib.util.spec_from_file_location("site_clustering", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _CLUSTERING = module
+    return _CLUSTERING
+
+
+def _contingency(truth, labels):
+    """Contingency table of two label arrays (codes >= 0)."""
+    n_truth, n_labels = truth.max() + 1, labels.max() + 1
+    return np.bincount(truth * n_labels + labels, minlength=n_truth * n_labels).reshape(n_truth, n_labels)
+
+
+def adjusted_rand_index(truth, labels):
+    """Adjusted Rand index of two labelings (1 = identical up to renaming, ~0 = chance)."""
+    table = _contingency(truth, labels).astype(np.float64)
+    pairs = lambda x: (x * (x - 1) / 2).sum()
+    index = pairs(table)
+    rows, cols = pairs(table.sum(axis=1)), pairs(table.sum(axis=0))
+    expected = rows * cols / pairs(np.array([table.sum()]))
+    maximum = (rows + cols) / 2
+    return 1.0 if maximum==expected else float((index - expected) / (maximum - expected))
+
+
+def cluster_jaccard(truth, labels, n_truth):
+    """Per truth cluster: best Jaccard overlap with any cluster in labels (NaN if absent)."""
+    table = _contingency(truth, labels).astype(np.float64)
+    union = table.sum(axis=1, keepdims=True) + table.sum(axis=0, keepdims=True) - table
+    with np.errstate(invalid='ignore', divide='ignore'):
+        best = (table / union).max(axis=1)
+    jaccard = np.full(n_truth, np.nan)
+    present = table.sum(axis=1) > 0
+    jaccard[:len(best)][present] = best[present]
+    return jaccard
+
+
+def refit_clusters(arrays, task):
+    """
+    Refit the phase 08 clustering on one resample of sites.
+
+    The resample is a row of site multiplicities (0 = held out); the
+    normalized feature matrix is indexed, not rebuilt. Agreement with the
+    production labels is measured on the distinct sites in the resample.
+
+    Args:
+        arrays: Shared arrays from cluster_stability_arrays
+        task: (resample, algorithm, n_clusters, random_state)
+
+    Returns:
+        Dict with the resample's adjusted Rand index and per-cluster Jaccard
+    """
+    resample, algorithm, n_clusters, random_state = task
+    module = _clustering_module()
+    fit = module.cluster_kmeans if algorithm=='kmeans' else module.cluster_gmm
+    counts = arrays['counts'][resample]
+    rows = np.repeat(np.arange(len(counts)), counts)
+    labels, _, _ = fit(arrays['X'][rows], n_clusters, random_state=random_state)
+
+    distinct = np.r_[True, rows[1:] != rows[:-1]]
+    truth = arrays['labels'][rows[distinct]]
+    labels = np.asarray(labels)[distinct]
+    n_truth = int(arrays['labels'].max()) + 1
     return {
-        'capture_rate':float(captured / len(sae_in_predictions)) if len(sae_in_predictions) > 0 else 1.0,
-        'sae_count':int(len(sae_in_predictions)),
-        'captured':int(captured),
-        'missed':int(len(sae_in_predictions) - captured),
+        'ari':adjusted_rand_index(truth, labels),
+        'jaccard':cluster_jaccard(truth, labels, n_truth),
+        'n_sites':int(distinct.sum()),
     }
 
 
-def calculate_cluster_stability(site_df, cluster_df, fold_site_scores):
+def cluster_stability_arrays(cluster_df, features=None):
+    """Normalized phase 08 feature matrix and production label codes (shared with workers)."""
+    X, features = _clustering_module().prepare_clustering_features(cluster_df.copy(), features)
+    codes, cluster_ids = pd.factorize(cluster_df['cluster_id'], sort=True)
+    arrays = {'X':X.to_numpy(dtype=np.float64), 'labels':codes.astype(np.int64)}
+    return arrays, cluster_ids, features
+
+
+def _site_resamples(n_sites, n_folds, n_repeats, n_bootstrap, random_state):
+    """Site multiplicities per resample: k-fold training sets, or bootstrap draws if n_bootstrap > 0."""
+    if n_bootstrap:
+        rng = np.random.default_rng(random_state)
+        return np.stack([np.bincount(rng.integers(0, n_sites, n_sites), minlength=n_sites)
+                         for _ in range(n_bootstrap)]).astype(np.int32)
+    counts = []
+    for r in range(n_repeats):
+        order = np.random.default_rng(random_state + r).permutation(n_sites)
+        for held_out in np.array_split(order, n_folds):
+            train = np.ones(n_sites, dtype=np.int32)
+            train[held_out] = 0
+            counts.append(train)
+    return np.stack(counts)
+
+
+def calculate_cluster_stability(cluster_df, n_folds=5, n_repeats=1, n_bootstrap=0, summary=None,
+                                random_state=42, jobs=1):
+    """
+    Refit the phase 08 clustering on site resamples and compare with production.
+
+    Each resample (the training sites of every k-fold split, or n_bootstrap
+    bootstrap draws of sites) is clustered again with the production
+    algorithm and cluster count. The resamples run in a process pool when
+    jobs > 1 and share one normalized feature matrix. Agreement with the
+    production labels is the adjusted Rand index per refit, and per
+    production cluster the best Jaccard overlap (>= 0.75 stable, < 0.50
+    dissolved).
+
+    Args:
+        cluster_df: Phase 08 site_clusters table (features and cluster_id)
+        n_folds: Site folds per repeat (k-fold mode)
+        n_repeats: Number of k-fold repeats
+        n_bootstrap: Bootstrap resamples of sites (0 = k-fold mode)
+        summary: Phase 08 cluster_summary.json (algorithm, n_clusters, features_used)
+        random_state: Seed for the site resamples and the refits
+        jobs: Worker processes (1 = serial; 0 = all CPUs)
+
+    Returns:
+        Dict with 'stability' (mean adjusted Rand index, None if skipped),
+        ARI spread, per-cluster Jaccard and a summary 'message'
+    """
     if cluster_df is None or cluster_df.empty:
         return {'stability':None, 'message':'No cluster data available'}
-    if 'cluster' not in cluster_df.columns:
-        return {'stability':None, 'message':'No cluster column in data'}
-    return {'stability':None, 'message':'Cluster stability check skipped'}
+    if 'cluster_id' not in cluster_df.columns:
+        return {'stability':None, 'message':'No cluster_id column in data'}
+    summary = summary or {}
+    algorithm = summary.get('algorithm', _clustering_module().DEFAULT_ALGORITHM)
+    if algorithm not in ('gmm', 'kmeans'):
+        return {'stability':None, 'message':f'Cluster stability not supported for {algorithm}'}
+
+    arrays, cluster_ids, features = cluster_stability_arrays(cluster_df, summary.get('features_used'))
+    n_truth = len(cluster_ids)
+    n_clusters = int(summary.get('n_clusters', n_truth))
+    arrays['counts'] = _site_resamples(len(cluster_df), n_folds, n_repeats, n_bootstrap, random_state)
+    method = f"{n_bootstrap} bootstrap resamples" if n_bootstrap else \
+        f"{n_repeats}x{n_folds} site folds" if n_repeats > 1 else f"{n_folds} site folds"
+    tasks = [(r, algorithm, n_clusters, random_state) for r in range(len(arrays['counts']))]
+    print(f"   Refitting {algorithm.upper()} (k={n_clusters}) on {method}")
+
+    refits = {}
+    with SharedArrays(arrays) as shared:
+        for task, result in parallel_map(refit_clusters, tasks, shared, jobs=jobs):
+            refits[task[0]] = result
+            print(f"\r   Refits: {len(refits)}/{len(tasks)}", end="", flush=True)
+    print()
+    ordered = [refits[task[0]] for task in tasks]
+    ari = np.array([res['ari'] for res in ordered])
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        jaccard = np.nanmean(np.stack([res['jaccard'] for res in ordered]), axis=0)
+
+    names = cluster_df.groupby('cluster_id')['cluster_name'].first() if 'cluster_name' in cluster_df.columns \
+        else pd.Series(dtype=object)
+    sizes = cluster_df['cluster_id'].value_counts()
+    clusters = []
+    for cluster_id, value in zip(cluster_ids, jaccard):
+        status = 'Stable' if value >= CLUSTER_STABLE_JACCARD else \
+            'Dissolved' if value < CLUSTER_DISSOLVED_JACCARD else 'Moderate'
+        clusters.append({'cluster_id':cluster_id.item() if hasattr(cluster_id, 'item') else cluster_id,
+                         'cluster_name':names.get(cluster_id, ''), 'sites':int(sizes.get(cluster_id, 0)),
+                         'mean_jaccard':float(value), 'status':status})
+    n_stable = sum(c['status']=='Stable' for c in clusters)
+
+    return {
+        'stability':float(ari.mean()),
+        'algorithm':algorithm,
+        'n_clusters':n_clusters,
+        'features':features,
+        'method':method,
+        'n_resamples':len(tasks),
+        'ari_mean':float(ari.mean()),
+        'ari_std':float(ari.std(ddof=1)) if len(ari) > 1 else 0.0,
+        'ari_min':float(ari.min()),
+        'stable_clusters':int(n_stable),
+        'clusters':clusters,
+        'message':f"Mean ARI {ari.mean():.4f} (min {ari.min():.4f}) over {method}; "
+                  f"{n_stable}/{n_truth} clusters stable (Jaccard >= {CLUSTER_STABLE_JACCARD})",
+    }
 
 
 # ============================================================================
 # SENSITIVITY ANALYSIS
 # ============================================================================
 
-def run_sensitivity_analysis(df, original_weights):
-    results = []
-
-    baseline_scores = calculate_dqi_scores(df, original_weights)
-    baseline_threshold = derive_threshold(df.assign(dqi_score=baseline_scores))
-    baseline_risk = assign_risk_with_threshold(df.assign(dqi_score=baseline_scores), baseline_threshold)
-
+def build_sensitivity_scenarios(original_weights):
     scenarios = {'Baseline':original_weights.copy()}
 
     for pct in [10, 20, 30]:
@@ -315,166 +473,601 @@ def run_sensitivity_analysis(df, original_weights):
     sorted_weights = sorted(original_weights.items(), key=lambda x:x[1])
     inverted_values = [w for _, w in sorted_weights][::-1]
     scenarios['Inverted'] = dict(zip([k for k, _ in sorted_weights], inverted_values))
+    return scenarios
+
+
+def _score_scenarios(df, features, weight_matrix, chunk_size=256):
+    """
+    Score weight vectors in batches against the first one (the baseline).
+
+    The component basis and site codes are computed once. Each batch of
+    weight vectors is one score_many matrix multiply, and site means come
+    from one np.bincount per batch, so memory is bounded by
+    len(df) x chunk_size scores however many vectors there are.
+
+    Yields:
+        (start, metrics) per batch; metrics holds one array entry per
+        vector: category_shifts, sae_capture_pct, rank_correlation and
+        high/medium/low counts
+    """
+    basis = component_basis(feature_matrix(df, features))
+    codes, sites = group_codes(df, ['study', 'site_id'])
+    sae_mask = (df['sae_pending_count'] > 0).to_numpy() if 'sae_pending_count' in df.columns \
+        else np.zeros(len(df), dtype=bool)
+    has_issues_col = (df['has_issues']==1).to_numpy()[:, None] if 'has_issues' in df.columns else None
+
+    baseline_risk, baseline_rank = None, None
+    for start in range(0, len(weight_matrix), chunk_size):
+        scores = widen_float32(score_many(None, weight_matrix[start:start + chunk_size], basis=basis))
+
+        # derive_threshold for every scenario at once
+        has_issues = has_issues_col if has_issues_col is not None else scores > 0
+        candidates = np.where(has_issues & ~sae_mask[:, None], scores, np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            thresholds = np.nanquantile(candidates, 0.90, axis=0)
+        thresholds = np.where(np.isnan(thresholds), 0.20, np.maximum(thresholds, 0.10))
+
+        # assign_risk_with_threshold: 0 = Low, 1 = Medium, 2 = High
+        risk = np.broadcast_to(has_issues, scores.shape).astype(np.int8)
+        risk[(~sae_mask[:, None]) & (scores >= thresholds)] = 2
+        risk[sae_mask] = 2
+
+        site_scores = group_means(scores, codes, len(sites))
+        site_ranks = rankdata(site_scores, axis=0)
+        if baseline_risk is None:
+            baseline_risk, baseline_rank = risk[:, 0].copy(), site_ranks[:, 0].copy()
+
+        n = risk.shape[1]
+        if len(sites) > 10:
+            # Pearson correlation of each column of ranks with the baseline ranks
+            centered = site_ranks - site_ranks.mean(axis=0)
+            base = baseline_rank - baseline_rank.mean()
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rank_corr = centered.T @ base / (np.linalg.norm(centered, axis=0) * np.linalg.norm(base))
+        else:
+            rank_corr = np.ones(n)
+        yield start, {
+            'category_shifts':(risk != baseline_risk[:, None]).sum(axis=0),
+            'sae_capture_pct':(risk[sae_mask]==2).mean(axis=0) * 100 if sae_mask.any() else np.full(n, 100.0),
+            'rank_correlation':rank_corr,
+            'high_count':(risk==2).sum(axis=0),
+            'medium_count':(risk==1).sum(axis=0),
+            'low_count':(risk==0).sum(axis=0),
+        }
+
+
+def run_sensitivity_analysis(df, original_weights, scenarios=None, chunk_size=256):
+    """
+    Score every weight scenario against the baseline (the first scenario).
+
+    See _score_scenarios; thousands of scenarios stay interactive.
+    """
+    scenarios = scenarios if scenarios is not None else build_sensitivity_scenarios(original_weights)
+    names = list(scenarios)
+    features = [f for f in original_weights if f in df.columns]
+    weight_matrix = np.array([[scenarios[name].get(f, 0.0) for f in features] for name in names])
 
-    for name, weights in scenarios.items():
-        scores = calculate_dqi_scores(df, weights)
-        threshold = derive_threshold(df.assign(dqi_score=scores))
-        risk = assign_risk_with_threshold(df.assign(dqi_score=scores), threshold)
-
-        shifts = (risk!=baseline_risk).sum()
-        shift_pct = shifts / len(df) * 100
-
-        sae_mask = df['sae_pending_count'] > 0 if 'sae_pending_count' in df.columns else pd.Series(False,
-                                                                                                   index=df.index)
-        sae_capture = (risk[sae_mask]=='High').mean() * 100 if sae_mask.any() else 100
-
-        df_temp = df.copy()
-        df_temp['score'] = scores
-        site_scores = df_temp.groupby(['study', 'site_id'])['score'].mean()
-        df_temp['baseline_score'] = baseline_scores
-        site_baseline = df_temp.groupby(['study', 'site_id'])['baseline_score'].mean()
-
-        common = site_scores.index.intersection(site_baseline.index)
-        rank_corr = 1.0
-        if len(common) > 10:
-            rank_corr, _ = spearmanr(site_scores[common], site_baseline[common])
-
-        results.append({
-            'scenario':name,
-            'category_shifts':shifts,
-            'shift_pct':round(shift_pct, 2),
-            'sae_capture_pct':round(sae_capture, 1),
-            'rank_correlation':round(rank_corr, 4),
-            'high_count':(risk=='High').sum(),
-            'medium_count':(risk=='Medium').sum(),
-            'low_count':(risk=='Low').sum(),
-        })
+    results = []
+    for start, metrics in _score_scenarios(df, features, weight_matrix, chunk_size):
+        for j, name in enumerate(names[start:start + chunk_size]):
+            results.append({
+                'scenario':name,
+                'category_shifts':int(metrics['category_shifts'][j]),
+                'shift_pct':round(metrics['category_shifts'][j] / len(df) * 100, 2),
+                'sae_capture_pct':round(metrics['sae_capture_pct'][j], 1),
+                'rank_correlation':round(metrics['rank_correlation'][j], 4),
+                'high_count':int(metrics['high_count'][j]),
+                'medium_count':int(metrics['medium_count'][j]),
+                'low_count':int(metrics['low_count'][j]),
+            })
 
     return pd.DataFrame(results)
 
 
+def draw_weight_vectors(original_weights, n_draws, method='dirichlet', concentration=50.0,
+                        max_perturbation=0.30, seed=42):
+    """
+    Random weight vectors around the configured weights.
+
+    - 'dirichlet': Dirichlet(concentration x weights); the mean is the
+      configured weights, larger concentration means smaller spread
+    - 'perturb': every weight scaled by an independent U(1 - p, 1 + p)
+      factor (p = max_perturbation), then renormalised to sum to 1
+
+    Returns:
+        (n_draws, len(original_weights)) array, columns in original_weights order
+    """
+    weights = np.array(list(original_weights.values()), dtype=np.float64)
+    weights = weights / weights.sum()
+    rng = np.random.default_rng(seed)
+    if method=='dirichlet':
+        return rng.dirichlet(concentration * weights, size=n_draws)
+    if method=='perturb':
+        draws = weights * rng.uniform(1 - max_perturbation, 1 + max_perturbation, size=(n_draws, len(weights)))
+        return draws / draws.sum(axis=1, keepdims=True)
+    raise ValueError(f"Unknown Monte Carlo method '{method}' (expected 'dirichlet' or 'perturb')")
+
+
+MONTE_CARLO_PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def run_monte_carlo_sensitivity(df, original_weights, n_draws, method=None, concentration=None,
+                                max_perturbation=None, batch_size=None, seed=None):
+    """
+    Monte Carlo weight robustness: score thousands of random weight vectors.
+
+    Draws come from draw_weight_vectors (defaults from
+    MONTE_CARLO_SENSITIVITY) and are scored in batches against the
+    configured weights with _score_scenarios, so memory is bounded by the
+    batch size, not n_draws.
+
+    Returns:
+        Tuple of (one row per draw: its weights, shift_pct, sae_capture_pct,
+        rank_correlation and risk counts; one row per metric: mean, std,
+        min, max and percentile bands p5/p25/p50/p75/p95)
+    """
+    settings = {**MONTE_CARLO_SENSITIVITY, **{k:v for k, v in {
+        'method':method, 'concentration':concentration, 'max_perturbation':max_perturbation,
+        'batch_size':batch_size, 'seed':seed}.items() if v is not None}}
+    features = [f for f in original_weights if f in df.columns]
+    baseline = np.array([original_weights[f] for f in features], dtype=np.float64)
+    draws = draw_weight_vectors({f:original_weights[f] for f in features}, n_draws, settings['method'],
+                                settings['concentration'], settings['max_perturbation'], settings['seed'])
+    weight_matrix = np.vstack([baseline, draws])
+
+    columns = {name:np.empty(len(weight_matrix)) for name in
+               ['category_shifts', 'sae_capture_pct', 'rank_correlation', 'high_count', 'medium_count', 'low_count']}
+    for start, metrics in _score_scenarios(df, features, weight_matrix, settings['batch_size']):
+        for name, values in metrics.items():
+            columns[name][start:start + len(values)] = values
+
+    draws_df = pd.DataFrame(draws, columns=[f'w_{f}' for f in features])
+    draws_df.insert(0, 'draw', np.arange(1, n_draws + 1))
+    draws_df['shift_pct'] = columns['category_shifts'][1:] / len(df) * 100
+    draws_df['sae_capture_pct'] = columns['sae_capture_pct'][1:]
+    draws_df['rank_correlation'] = columns['rank_correlation'][1:]
+    for name in ['high_count', 'medium_count', 'low_count']:
+        draws_df[name] = columns[name][1:].astype(int)
+
+    summary = []
+    for metric in ['shift_pct', 'sae_capture_pct', 'rank_correlation', 'high_count']:
+        values = draws_df[metric].to_numpy(dtype=np.float64)
+        row = {'metric':metric, 'method':settings['method'], 'n_draws':n_draws,
+               'mean':np.nanmean(values), 'std':np.nanstd(values),
+               'min':np.nanmin(values), 'max':np.nanmax(values)}
+        row.update({f'p{q}':v for q, v in zip(MONTE_CARLO_PERCENTILES,
+                                              np.nanpercentile(values, MONTE_CARLO_PERCENTILES))})
+        summary.append(row)
+    return draws_df, pd.DataFrame(summary)
+
+
+# ============================================================================
+# BOOTSTRAP CONFIDENCE INTERVALS
+# ============================================================================
+
+def bootstrap_arrays(df, score_col='dqi_score', sae_col='sae_pending_count'):
+    """
+    Inputs of bootstrap_block as plain arrays (shared with worker processes).
+
+    Subjects are resampled within their site (a stratified bootstrap), so
+    every site keeps its size in every replicate. Rows are grouped by site
+    once (perm, starts, sizes), and a replicate is then one index array.
+    The High threshold candidates (non-SAE subjects with issues, as in
+    derive_threshold) are pre-sorted by score.
+    """
+    codes, sites = group_codes(df, ['study', 'site_id'])
+    scores = df[score_col].to_numpy(dtype=np.float64)
+    strata = np.where(codes >= 0, codes, len(sites))  # subjects without a site form one extra stratum
+    perm = np.argsort(strata, kind='stable')
+    sizes = np.bincount(strata, minlength=len(sites) + 1)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    sae_mask = (df[sae_col] > 0).to_numpy() if sae_col in df.columns else np.zeros(len(df), dtype=bool)
+    has_issues = (df['has_issues']==1).to_numpy() if 'has_issues' in df.columns else scores > 0
+    candidates = np.flatnonzero(has_issues & ~sae_mask & ~np.isnan(scores))
+    candidates = candidates[np.argsort(scores[candidates], kind='stable')]
+
+    arrays = {
+        'scores':scores,
+        'site_codes':codes,
+        'perm':perm,
+        'sorted_strata':strata[perm],
+        'starts':starts,
+        'sizes':sizes,
+        'candidates':candidates,
+        'n_sites':np.array([len(sites)], dtype=np.int64),
+    }
+    return arrays, sites
+
+
+def _weighted_quantile(sorted_values, counts, q):
+    """np.quantile (linear) of sorted_values repeated counts times, without expanding them."""
+    cum = np.cumsum(counts)
+    m = cum[-1] if len(cum) else 0
+    if m==0:
+        return np.nan
+    h = q * (m - 1)
+    lo = int(np.floor(h))
+    x_lo = sorted_values[np.searchsorted(cum, lo, side='right')]
+    x_hi = sorted_values[np.searchsorted(cum, min(lo + 1, m - 1), side='right')]
+    return x_lo + (h - lo) * (x_hi - x_lo)
+
+
+def _site_ranks(site_means):
+    """Rank 1 = highest average DQI; sites without a score get NaN."""
+    ranks = rankdata(np.where(np.isnan(site_means), np.inf, -site_means), method='min', axis=-1).astype(np.float32)
+    ranks[np.isnan(site_means)] = np.nan
+    return ranks
+
+
+def bootstrap_block(arrays, task):
+    """
+    Run one block of bootstrap replicates on the shared arrays.
+
+    Each replicate draws one index array (subjects resampled within their
+    site); subject multiplicities come from np.bincount, and site sums
+    from a weighted np.bincount. No frame is copied.
+
+    Args:
+        arrays: Shared arrays from bootstrap_arrays
+        task: (block, n_replicates, seed); block b uses seed [seed, b], so
+            results do not depend on how blocks are spread over workers
+
+    Returns:
+        Dict with the block's thresholds (n_replicates,), site means and
+        site ranks (n_replicates, n_sites)
+    """
+    block, n_replicates, seed = task
+    scores, codes = arrays['scores'], arrays['site_codes']
+    sorted_strata, candidates = arrays['sorted_strata'], arrays['candidates']
+    n, n_sites = len(scores), int(arrays['n_sites'][0])
+    first, span = arrays['starts'][sorted_strata], arrays['sizes'][sorted_strata]
+    valid = ~np.isnan(scores)
+    in_site = codes >= 0
+    site_codes = codes[in_site]
+    clean_scores = np.where(valid, scores, 0.0)
+    candidate_scores = scores[candidates]
+
+    rng = np.random.default_rng([seed, block])
+    thresholds = np.empty(n_replicates)
+    site_means = np.empty((n_replicates, n_sites), dtype=np.float32)
+    for b in range(n_replicates):
+        rows = arrays['perm'][first + (rng.random(n) * span).astype(np.int64)]
+        counts = np.bincount(rows, minlength=n).astype(np.float64)
+
+        # derive_threshold on the replicate
+        threshold = _weighted_quantile(candidate_scores, counts[candidates], 0.90)
+        thresholds[b] = 0.20 if np.isnan(threshold) else max(threshold, 0.10)
+
+        sums = np.bincount(site_codes, weights=(counts * clean_scores)[in_site], minlength=n_sites)
+        weights = np.bincount(site_codes, weights=(counts * valid)[in_site], minlength=n_sites)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            site_means[b] = sums / weights
+    return {'thresholds':thresholds, 'site_means':site_means, 'site_ranks':_site_ranks(site_means)}
+
+
+def run_bootstrap_ci(df, n_boot=2000, confidence=None, seed=42, jobs=1, block_size=None):
+    """
+    Bootstrap confidence intervals for the High threshold and site DQI.
+
+    Subjects are resampled within sites n_boot times (see bootstrap_block),
+    in blocks spread over a process pool when jobs > 1. The intervals are
+    percentile intervals over the replicates.
+
+    Args:
+        df: Subjects with dqi_score (and has_issues, sae_pending_count)
+        n_boot: Number of bootstrap replicates
+        confidence: Interval coverage (defaults to BOOTSTRAP['confidence'])
+        seed: Base seed
+        jobs: Worker processes (1 = serial; 0 = all CPUs)
+        block_size: Replicates per task (defaults to BOOTSTRAP['block_size'])
+
+    Returns:
+        Long-format DataFrame: one 'portfolio' row for the High threshold
+        and, per site, 'avg_dqi_score' and 'rank' rows (rank 1 = highest
+        DQI), each with estimate, std_error, ci_low and ci_high
+    """
+    confidence = confidence or BOOTSTRAP.get('confidence', 0.95)
+    block_size = block_size or BOOTSTRAP.get('block_size', 50)
+    arrays, sites = bootstrap_arrays(df)
+    n_sites = len(sites)
+
+    tasks = [(block, min(block_size, n_boot - start), seed)
+             for block, start in enumerate(range(0, n_boot, block_size))]
+    blocks = {}
+    with SharedArrays(arrays) as shared:
+        for task, result in parallel_map(bootstrap_block, tasks, shared, jobs=jobs):
+            blocks[task[0]] = result
+            done = sum(len(r['thresholds']) for r in blocks.values())
+            print(f"\r  Replicates: {done:,}/{n_boot:,}", end="", flush=True)
+    print()
+    ordered = [blocks[task[0]] for task in tasks]
+    thresholds = np.concatenate([r['thresholds'] for r in ordered])
+    site_means = np.concatenate([r['site_means'] for r in ordered])
+    site_ranks = np.concatenate([r['site_ranks'] for r in ordered])
+
+    tail = (1 - confidence) / 2 * 100
+    observed_means = group_means(arrays['scores'], arrays['site_codes'], n_sites)
+    observed_ranks = _site_ranks(observed_means)
+    site_keys = sites.to_frame(index=False)
+
+    def interval(replicates):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            low, high = np.nanpercentile(replicates, [tail, 100 - tail], axis=0)
+            return low, high, np.nanstd(replicates, axis=0, ddof=1)
+
+    rows = []
+    low, high, se = interval(thresholds)
+    rows.append(pd.DataFrame({'level':['portfolio'], 'study':[None], 'site_id':[None], 'metric':['high_threshold'],
+                              'estimate':[derive_threshold(df)], 'std_error':[se], 'ci_low':[low], 'ci_high':[high]}))
+    for metric, observed, replicates in [('avg_dqi_score', observed_means, site_means),
+                                         ('rank', observed_ranks, site_ranks)]:
+        low, high, se = interval(replicates.astype(np.float64))
+        rows.append(site_keys.assign(level='site', metric=metric, estimate=observed, std_error=se,
+                                     ci_low=low, ci_high=high))
+    result = pd.concat(rows, ignore_index=True)
+    result['confidence'] = confidence
+    result['n_boot'] = n_boot
+    return result[['level', 'study', 'site_id', 'metric', 'estimate', 'std_error', 'ci_low', 'ci_high',
+                   'confidence', 'n_boot']]
+
+
+def bootstrap_summary(bootstrap_ci):
+    """Headline numbers of run_bootstrap_ci output (for the JSON details and report)."""
+    threshold = bootstrap_ci[bootstrap_ci['metric']=='high_threshold'].iloc[0]
+    widths = (bootstrap_ci['ci_high'] - bootstrap_ci['ci_low']).groupby(bootstrap_ci['metric']).median()
+    return {
+        'n_boot':int(threshold['n_boot']),
+        'confidence':float(threshold['confidence']),
+        'threshold':float(threshold['estimate']),
+        'threshold_std_error':float(threshold['std_error']),
+        'threshold_ci_low':float(threshold['ci_low']),
+        'threshold_ci_high':float(threshold['ci_high']),
+        'median_site_ci_width':float(widths.get('avg_dqi_score', np.nan)),
+        'median_rank_ci_width':float(widths.get('rank', np.nan)),
+    }
+
+
 # ============================================================================
 # K-FOLD VALIDATION
 # ============================================================================
 
-def run_kfold_validation(df, site_df=None, cluster_df=None, n_folds=5, random_state=42):
-    print(f"\n{'=' * 70}")
-    print(f"RUNNING {n_folds}-FOLD STRATIFIED CROSS-VALIDATION")
-    print(f"{'=' * 70}")
+RISK_CODES = {'Low':0, 'Medium':1, 'High':2}
+RISK_LABELS = np.array(['Low', 'Medium', 'High'], dtype=object)
 
+
+def add_has_issues(df):
+    """Add the has_issues flag used by derive_threshold (in place, if missing)."""
     if 'has_issues' not in df.columns:
         df['has_issues'] = (df['n_issue_types'] > 0).astype(int) if 'n_issue_types' in df.columns else (
                     df['dqi_score'] > 0).astype(int)
+    return df
+
+
+def kfold_labels(y, n_folds=5, n_repeats=1, random_state=42):
+    """
+    Test-fold number of every subject, for each repeat.
+
+    Repeat r uses StratifiedKFold with seed random_state + r, so the first
+    repeat is the plain k-fold split.
+
+    Returns:
+        (n_repeats, len(y)) int16 array
+    """
+    labels = np.empty((n_repeats, len(y)), dtype=np.int16)
+    for r in range(n_repeats):
+        kfold = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state + r)
+        for fold_idx, (_, test_idx) in enumerate(kfold.split(None, y)):
+            labels[r, test_idx] = fold_idx
+    return labels
+
+
+def score_fold(arrays, task):
+    """
+    Evaluate one fold of one repeat on the shared validation arrays.
+
+    Same steps as scoring train and test frames with calculate_dqi_scores,
+    derive_threshold and assign_risk_with_threshold, but on row indices into
+    the feature matrix: no frame is copied.
+
+    Args:
+        arrays: Shared arrays from kfold_arrays
+        task: (repeat, fold) pair
+
+    Returns:
+        Dict of fold metrics; the first repeat also returns the test rows,
+        scores and predicted risk codes (for test_predictions.csv)
+    """
+    repeat, fold = task
+    X, weights = arrays['X'], arrays['weights']
+    has_issues, sae_mask = arrays['has_issues'], arrays['sae']
+    labels = arrays['fold_labels'][repeat]
+    test_idx, train_idx = np.flatnonzero(labels==fold), np.flatnonzero(labels!=fold)
+
+    # derive_threshold on the train fold
+    train_scores = widen_float32(dqi_kernel(X[train_idx], weights)[0])
+    candidates = train_scores[has_issues[train_idx] & ~sae_mask[train_idx]]
+    candidates = candidates[~np.isnan(candidates)]
+    threshold = max(float(np.quantile(candidates, 0.90)), 0.10) if len(candidates) else 0.20
+
+    # assign_risk_with_threshold on the test fold
+    test_scores = widen_float32(dqi_kernel(X[test_idx], weights)[0])
+    test_sae = sae_mask[test_idx]
+    risk = has_issues[test_idx].astype(np.int8)
+    risk[(~test_sae) & (test_scores >= threshold)] = 2
+    risk[test_sae] = 2
+
+    site_codes = arrays['site_codes'][test_idx]
+    n_sites = int(arrays['n_sites'][0])
+    present = np.bincount(site_codes[site_codes >= 0], minlength=n_sites)
+    site_idx = np.flatnonzero(present)
+    site_means = group_means(test_scores, site_codes, n_sites)[site_idx]
+
+    matches = risk==arrays['original_risk'][test_idx]
+    captured = int((risk[test_sae]==2).sum())
+    result = {
+        'repeat':repeat + 1,
+        'fold':fold + 1,
+        'train_size':len(train_idx),
+        'test_size':len(test_idx),
+        'threshold':threshold,
+        'sae_count':int(test_sae.sum()),
+        'sae_captured':captured,
+        'matches':int(matches.sum()),
+        'high_count':int((risk==2).sum()),
+        'medium_count':int((risk==1).sum()),
+        'low_count':int((risk==0).sum()),
+        'site_idx':site_idx,
+        'site_means':site_means,
+    }
+    if repeat==0:
+        result.update({'test_idx':test_idx, 'test_scores':test_scores, 'test_risk':risk})
+    return result
+
+
+def kfold_arrays(df, fold_labels, weights=None):
+    """Inputs of score_fold as plain arrays (shared with worker processes)."""
+    weights = weights or WEIGHT_VALUES
+    features = [f for f in weights if f in df.columns]
+    codes, sites = group_codes(df, ['study', 'site_id'])
+    sae_mask = (df['sae_pending_count'] > 0).to_numpy() if 'sae_pending_count' in df.columns \
+        else np.zeros(len(df), dtype=bool)
+    arrays = {
+        'X':feature_matrix(df, features),
+        'weights':np.array([weights[f] for f in features], dtype=np.float64),
+        'has_issues':(df['has_issues']==1).to_numpy(),
+        'sae':sae_mask,
+        'original_risk':df['risk_category'].map(RISK_CODES).fillna(-1).to_numpy(dtype=np.int8),
+        'site_codes':codes,
+        'n_sites':np.array([len(sites)], dtype=np.int64),
+        'fold_labels':fold_labels,
+    }
+    return arrays, sites
+
+
+def run_kfold_validation(df, site_df=None, cluster_df=None, n_folds=5, random_state=42, n_repeats=1, jobs=1,
+                         cluster_summary=None, cluster_bootstrap=0):
+    """
+    Stratified k-fold (optionally repeated) validation of the DQI thresholds.
+
+    The feature matrix, masks, site codes and fold assignments are built
+    once and placed in shared memory; every (repeat, fold) task is scored by
+    score_fold in a process pool (jobs > 1) or in this process. Per-fold
+    metrics stream back as folds finish and are reduced at the end, in
+    repeat/fold order, so results do not depend on jobs.
+
+    Args:
+        df: Subjects with DQI scores and risk categories
+        site_df: Site table (unused; cluster stability reads its features from cluster_df)
+        cluster_df: Phase 08 site clusters (for cluster stability)
+        n_folds: Folds per repeat
+        random_state: Seed of the first repeat (repeat r uses random_state + r)
+        n_repeats: Number of k-fold repeats with different seeds
+        jobs: Worker processes (1 = serial; 0 = all CPUs)
+        cluster_summary: Phase 08 cluster_summary.json (algorithm and cluster count to refit)
+        cluster_bootstrap: Bootstrap resamples of sites for cluster stability
+            (0 = refit on the training sites of each site fold)
+
+    Returns:
+        Tuple of (results dict, test predictions of the first repeat)
+    """
+    title = f"{n_repeats}x{n_folds}-FOLD REPEATED" if n_repeats > 1 else f"{n_folds}-FOLD"
+    print(f"\n{'=' * 70}")
+    print(f"RUNNING {title} STRATIFIED CROSS-VALIDATION")
+    print(f"{'=' * 70}")
 
-    y = df['risk_category']
-
-    fold_thresholds = []
-    fold_predictions = {}
-    fold_site_rankings = []
-    fold_site_scores = []
-    fold_sae_results = []
-    fold_details = []
-    all_test_predictions = []
-
-    kfold = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    add_has_issues(df)
 
+    y = df['risk_category']
     print(f"\nTotal subjects: {len(df):,}")
     print(f"Risk distribution: {dict(y.value_counts())}")
 
-    for fold_idx, (train_idx, test_idx) in enumerate(kfold.split(df, y)):
-        print(f"\n--- Fold {fold_idx + 1}/{n_folds} ---")
-
-        train_df = df.iloc[train_idx].copy()
-        test_df = df.iloc[test_idx].copy()
-
-        print(f"  Train: {len(train_df):,} | Test: {len(test_df):,}")
-
-        train_scores = calculate_dqi_scores(train_df, WEIGHT_VALUES)
-        train_df['dqi_score_fold'] = train_scores
-
-        threshold = derive_threshold(train_df, score_col='dqi_score_fold')
-        fold_thresholds.append(threshold)
-        print(f"  Threshold (from train): {threshold:.4f}")
-
-        test_scores = calculate_dqi_scores(test_df, WEIGHT_VALUES)
-        test_df['dqi_score_fold'] = test_scores
-
-        test_risk = assign_risk_with_threshold(test_df, threshold, score_col='dqi_score_fold')
-        fold_predictions[fold_idx] = test_risk
-
-        # Store test predictions for output file
-        test_pred_df = test_df.copy()
-        test_pred_df['dqi_score_pred'] = test_scores
-        test_pred_df['risk_category_pred'] = test_risk
-        test_pred_df['fold'] = fold_idx + 1
-        test_pred_df['threshold_used'] = threshold
-        all_test_predictions.append(test_pred_df)
-
-        test_df['site_score'] = test_scores
-        site_ranking = test_df.groupby(['study', 'site_id'])['site_score'].mean()
-        fold_site_rankings.append(site_ranking)
-
-        site_agg = test_df.groupby(['study', 'site_id']).agg({
-            'site_score':'mean', 'subject_id':'count'
-        }).reset_index()
-        site_agg.columns = ['study', 'site_id', 'avg_dqi_score', 'subject_count']
-        fold_site_scores.append(site_agg)
-
-        sae_result = calculate_sae_capture_rate(test_df, test_risk)
-        fold_sae_results.append(sae_result)
-        print(
-            f"  SAE Capture: {sae_result['capture_rate'] * 100:.1f}% ({sae_result['captured']}/{sae_result['sae_count']})")
-
-        original_test = df.iloc[test_idx]['risk_category']
-        agreement = (test_risk==original_test).mean()
-        print(f"  Agreement with original: {agreement * 100:.1f}%")
-
+    arrays, _ = kfold_arrays(df, kfold_labels(y, n_folds, n_repeats, random_state))
+    tasks = [(r, f) for r in range(n_repeats) for f in range(n_folds)]
+    jobs = resolve_jobs(jobs)
+    if jobs > 1:
+        print(f"Running {len(tasks)} folds on {min(jobs, len(tasks))} worker processes")
+
+    fold_results = {}
+    with SharedArrays(arrays) as shared:
+        for (r, f), result in parallel_map(score_fold, tasks, shared, jobs=jobs):
+            fold_results[(r, f)] = result
+            sae_rate = result['sae_captured'] / result['sae_count'] if result['sae_count'] else 1.0
+            label = f"{r + 1}.{f + 1}" if n_repeats > 1 else f"{f + 1}/{n_folds}"
+            print(f"  Fold {label}: train {result['train_size']:,} | test {result['test_size']:,} | "
+                  f"threshold {result['threshold']:.4f} | SAE capture {sae_rate * 100:.1f}% | "
+                  f"agreement {result['matches'] / max(result['test_size'], 1) * 100:.1f}%")
+
+    # Reduce in repeat/fold order
+    ordered = [fold_results[task] for task in tasks]
+    fold_thresholds = [res['threshold'] for res in ordered]
+    fold_site_rankings, fold_details = [], []
+    for res in ordered:
+        fold_site_rankings.append(pd.Series(res['site_means'], index=res['site_idx']))
         fold_details.append({
-            'fold':fold_idx + 1,
-            'train_size':len(train_df),
-            'test_size':len(test_df),
-            'threshold':threshold,
-            'sae_capture':sae_result['capture_rate'],
-            'agreement':agreement,
-            'high_count':(test_risk=='High').sum(),
-            'medium_count':(test_risk=='Medium').sum(),
-            'low_count':(test_risk=='Low').sum(),
+            'repeat':res['repeat'],
+            'fold':res['fold'],
+            'train_size':res['train_size'],
+            'test_size':res['test_size'],
+            'threshold':res['threshold'],
+            'sae_capture':res['sae_captured'] / res['sae_count'] if res['sae_count'] else 1.0,
+            'agreement':res['matches'] / res['test_size'] if res['test_size'] else 0.0,
+            'high_count':res['high_count'],
+            'medium_count':res['medium_count'],
+            'low_count':res['low_count'],
         })
 
-    predictions_df = pd.concat(all_test_predictions, ignore_index=True)
+    # Test predictions from the first repeat (every subject tested exactly once)
+    first = [fold_results[(0, f)] for f in range(n_folds)]
+    predictions_df = pd.concat([
+        df.iloc[res['test_idx']].assign(
+            dqi_score_pred=res['test_scores'], risk_category_pred=RISK_LABELS[res['test_risk']],
+            fold=res['fold'], threshold_used=res['threshold'])
+        for res in first
+    ], ignore_index=True)
 
     print(f"\n{'=' * 70}")
     print("COMPUTING VALIDATION METRICS")
     print(f"{'=' * 70}")
 
     threshold_metrics = calculate_threshold_stability(fold_thresholds)
-    print(f"\n1. THRESHOLD STABILITY:")
+    print("\n1. THRESHOLD STABILITY:")
     print(f"   Mean +/- Std: {threshold_metrics['mean']:.4f} +/- {threshold_metrics['std']:.4f}")
     print(f"   CV: {threshold_metrics['cv']:.2%}")
     print(f"   Range: [{threshold_metrics['min']:.4f}, {threshold_metrics['max']:.4f}]")
 
-    category_metrics = calculate_category_agreement(fold_predictions, df['risk_category'])
-    print(f"\n2. CATEGORY AGREEMENT:")
+    evaluated = sum(res['test_size'] for res in ordered)
+    agreement_rate = sum(res['matches'] for res in ordered) / evaluated if evaluated else 0.0
+    category_metrics = {
+        'agreement_rate':float(agreement_rate),
+        'perfect_agreement_rate':float(agreement_rate),
+        'subjects_evaluated':int(sum(res['test_size'] for res in first)),
+    }
+    print("\n2. CATEGORY AGREEMENT:")
     print(f"   Overall Agreement: {category_metrics['agreement_rate']:.1%}")
     print(f"   Perfect Agreement: {category_metrics['perfect_agreement_rate']:.1%}")
 
     ranking_metrics = calculate_ranking_correlation(fold_site_rankings)
-    print(f"\n3. RANKING CORRELATION (Site-level):")
+    print("\n3. RANKING CORRELATION (Site-level):")
     print(f"   Mean Spearman: {ranking_metrics['mean_correlation']:.4f}")
     print(f"   Min Spearman: {ranking_metrics['min_correlation']:.4f}")
 
-    sae_captures = [r['capture_rate'] for r in fold_sae_results]
-    print(f"\n4. SAE CAPTURE RATE:")
+    sae_captures = [fd['sae_capture'] for fd in fold_details]
+    print("\n4. SAE CAPTURE RATE:")
     print(f"   All Folds: {[f'{c:.1%}' for c in sae_captures]}")
     print(f"   Mean: {np.mean(sae_captures):.1%}")
     print(f"   100% in all folds: {'YES' if all(c==1.0 for c in sae_captures) else 'NO'}")
 
-    cluster_metrics = calculate_cluster_stability(site_df, cluster_df, fold_site_scores)
-    print(f"\n5. CLUSTER STABILITY:")
+    print("\n5. CLUSTER STABILITY:")
+    cluster_metrics = calculate_cluster_stability(cluster_df, n_folds, n_repeats, cluster_bootstrap, cluster_summary,
+                                                  random_state=random_state, jobs=jobs)
     print(f"   {cluster_metrics.get('message', 'Not computed')}")
 
     results = {
         'n_folds':n_folds,
+        'n_repeats':n_repeats,
         'n_subjects':len(df),
         'timestamp':datetime.now().isoformat(),
         'threshold_stability':threshold_metrics,
@@ -492,11 +1085,101 @@ def run_kfold_validation(df, site_df=None, cluster_df=None, n_folds=5, random_st
     return results, predictions_df
 
 
+# ============================================================================
+# RESULT CACHE
+# ============================================================================
+
+# Bump when a cached computation changes its results for the same inputs
+VALIDATION_CACHE_VERSION = 1
+
+
+def cached_kfold_validation(cache, table_key, df, site_df=None, cluster_df=None, n_folds=5, random_state=42,
+                            n_repeats=1, jobs=1, cluster_summary=None, cluster_bootstrap=0):
+    """
+    run_kfold_validation through the result cache.
+
+    The key covers the subject table digest, the weights, folds, repeats
+    and seed, and the cluster inputs; jobs is left out because results do
+    not depend on it.
+    """
+    cluster_summary = {k:(cluster_summary or {}).get(k) for k in ('algorithm', 'n_clusters', 'features_used')}
+    key = cache.key('kfold', VALIDATION_CACHE_VERSION, table_key, WEIGHT_VALUES, n_folds, n_repeats, random_state,
+                    frame_digest(cluster_df) if cluster_df is not None else None, cluster_summary, cluster_bootstrap)
+    hit = cache.get(key)
+    if hit is not None:
+        results, frames = hit
+        add_has_issues(df)
+        print(f"\n[OK] K-fold results reused from cache (key {key[:12]}, computed {results['timestamp']})")
+        return results, frames['predictions']
+
+    results, predictions_df = run_kfold_validation(
+        df=df, site_df=site_df, cluster_df=cluster_df, n_folds=n_folds, random_state=random_state,
+        n_repeats=n_repeats, jobs=jobs, cluster_summary=cluster_summary, cluster_bootstrap=cluster_bootstrap
+    )
+    cache.put(key, json.loads(json.dumps(results, default=str)), {'predictions':predictions_df})
+    return results, predictions_df
+
+
+def cached_sensitivity_analysis(cache, table_key, df, original_weights):
+    """
+    run_sensitivity_analysis with one cache entry per scenario.
+
+    A scenario's key covers the subject table digest, the baseline weights
+    and its own weights, so changing one scenario recomputes only that one
+    (scored together with the baseline it is compared against).
+    """
+    scenarios = build_sensitivity_scenarios(original_weights)
+    baseline = next(iter(scenarios))
+    keys = {name:cache.key('sensitivity', VALIDATION_CACHE_VERSION, table_key, original_weights, name, weights)
+            for name, weights in scenarios.items()}
+    rows, missing = {}, {}
+    for name, key in keys.items():
+        hit = cache.get(key)
+        if hit is None:
+            missing[name] = scenarios[name]
+        else:
+            rows[name] = hit[0]
+
+    if missing:
+        computed = run_sensitivity_analysis(df, original_weights, {baseline:scenarios[baseline], **missing})
+        for row in computed.to_dict('records'):
+            if row['scenario'] in missing:
+                rows[row['scenario']] = row
+                cache.put(keys[row['scenario']], row)
+    if len(missing) < len(scenarios):
+        print(f"[OK] {len(scenarios) - len(missing)} of {len(scenarios)} scenarios reused from cache")
+    return pd.DataFrame([rows[name] for name in scenarios])
+
+
+def cached_frames(cache, key, label, compute):
+    """Frames returned by compute() (a dict by name), read from the cache when stored under key."""
+    hit = cache.get(key)
+    if hit is not None:
+        print(f"[OK] {label} reused from cache (key {key[:12]})")
+        return hit[1]
+    frames = compute()
+    cache.put(key, frames=frames)
+    return frames
+
+
 # ============================================================================
 # REPORT GENERATION
 # ============================================================================
 
-def generate_validation_report(kfold_results, sensitivity_results=None, output_path=None):
+def _monte_carlo_table(summary):
+    """Markdown rows of the Monte Carlo percentile bands."""
+    labels = {'shift_pct':'Category Shift %', 'sae_capture_pct':'SAE Capture %',
+              'rank_correlation':'Site Rank Spearman', 'high_count':'High-Risk Subjects'}
+    lines = ["| Metric | Mean | P5 | P25 | Median | P75 | P95 |\n",
+             "|--------|------|----|-----|--------|-----|-----|\n"]
+    for _, row in summary.iterrows():
+        fmt = '{:,.0f}' if row['metric']=='high_count' else '{:.4f}' if row['metric']=='rank_correlation' else '{:.2f}'
+        values = ' | '.join(fmt.format(row[c]) for c in ['mean', 'p5', 'p25', 'p50', 'p75', 'p95'])
+        lines.append(f"| {labels.get(row['metric'], row['metric'])} | {values} |\n")
+    return lines
+
+
+def generate_validation_report(kfold_results, sensitivity_results=None, output_path=None, monte_carlo_summary=None):
     threshold = kfold_results['threshold_stability']
     category = kfold_results['category_agreement']
     ranking = kfold_results['ranking_correlation']
@@ -506,7 +1189,9 @@ def generate_validation_report(kfold_results, sensitivity_results=None, output_p
     report.append("# JAVELIN.AI - DQI Validation Report\n")
     report.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
     report.append(f"**Subjects Analyzed:** {kfold_results['n_subjects']:,}\n")
-    report.append(f"**Validation Method:** {kfold_results['n_folds']}-Fold Stratified Cross-Validation\n")
+    n_repeats = kfold_results.get('n_repeats', 1)
+    method = f"{n_repeats}x{kfold_results['n_folds']} Repeated" if n_repeats > 1 else f"{kfold_results['n_folds']}-Fold"
+    report.append(f"**Validation Method:** {method} Stratified Cross-Validation\n")
 
     report.append("\n---\n")
     report.append("## Executive Summary\n\n")
@@ -520,14 +1205,19 @@ def generate_validation_report(kfold_results, sensitivity_results=None, output_p
         f"| Ranking Correlation | {ranking['mean_correlation']:.4f} | {'PASS' if ranking['mean_correlation'] > 0.95 else 'REVIEW'} |\n")
     report.append(
         f"| SAE Capture (100% all folds) | {sae['mean']:.1%} | {'PASS' if sae['all_100_pct'] else 'FAIL'} |\n")
+    cluster = kfold_results.get('cluster_stability', {})
+    if cluster.get('stability') is not None:
+        report.append(
+            f"| Cluster Stability (ARI) | {cluster['ari_mean']:.4f} | {'PASS' if cluster['ari_mean'] > 0.80 else 'REVIEW'} |\n")
 
     report.append("\n---\n")
     report.append("## Fold Details\n\n")
     report.append("| Fold | Train | Test | Threshold | SAE Capture | Agreement | High | Med | Low |\n")
     report.append("|------|-------|------|-----------|-------------|-----------|------|-----|-----|\n")
     for fd in kfold_results['fold_details']:
+        fold = f"{fd['repeat']}.{fd['fold']}" if n_repeats > 1 else fd['fold']
         report.append(
-            f"| {fd['fold']} | {fd['train_size']:,} | {fd['test_size']:,} | {fd['threshold']:.4f} | {fd['sae_capture']:.1%} | {fd['agreement']:.1%} | {fd['high_count']:,} | {fd['medium_count']:,} | {fd['low_count']:,} |\n")
+            f"| {fold} | {fd['train_size']:,} | {fd['test_size']:,} | {fd['threshold']:.4f} | {fd['sae_capture']:.1%} | {fd['agreement']:.1%} | {fd['high_count']:,} | {fd['medium_count']:,} | {fd['low_count']:,} |\n")
 
     if sensitivity_results is not None:
         report.append("\n---\n")
@@ -538,6 +1228,39 @@ def generate_validation_report(kfold_results, sensitivity_results=None, output_p
             report.append(
                 f"| {row['scenario']} | {row['category_shifts']:,} | {row['shift_pct']:.2f}% | {row['sae_capture_pct']:.0f}% | {row['rank_correlation']:.4f} |\n")
 
+    if cluster.get('stability') is not None:
+        report.append("\n---\n")
+        report.append("## Cluster Stability\n\n")
+        report.append(f"Phase 08 {cluster['algorithm'].upper()} (k={cluster['n_clusters']}) refit on "
+                      f"{cluster['method']}. ARI {cluster['ari_mean']:.4f} +/- {cluster['ari_std']:.4f} "
+                      f"(min {cluster['ari_min']:.4f}) against the production labels.\n\n")
+        report.append("| Cluster | Name | Sites | Mean Jaccard | Status |\n")
+        report.append("|---------|------|-------|--------------|--------|\n")
+        for c in cluster['clusters']:
+            report.append(f"| {c['cluster_id']} | {c['cluster_name']} | {c['sites']:,} | {c['mean_jaccard']:.3f} | "
+                          f"{c['status']} |\n")
+
+    bootstrap = kfold_results.get('bootstrap')
+    if bootstrap:
+        report.append("\n---\n")
+        report.append("## Bootstrap Confidence Intervals\n\n")
+        report.append(f"{bootstrap['n_boot']:,} replicates, subjects resampled within sites "
+                      f"({bootstrap['confidence']:.0%} percentile intervals; per-site values in `bootstrap_ci.csv`).\n\n")
+        report.append("| Quantity | Estimate | CI | Std Error |\n")
+        report.append("|----------|----------|----|-----------|\n")
+        report.append(f"| High threshold | {bootstrap['threshold']:.4f} | [{bootstrap['threshold_ci_low']:.4f}, "
+                      f"{bootstrap['threshold_ci_high']:.4f}] | {bootstrap['threshold_std_error']:.4f} |\n")
+        report.append(f"| Site avg DQI (median CI width) | - | {bootstrap['median_site_ci_width']:.4f} | - |\n")
+        report.append(f"| Site rank (median CI width) | - | {bootstrap['median_rank_ci_width']:.1f} positions | - |\n")
+
+    if monte_carlo_summary is not None and not monte_carlo_summary.empty:
+        first = monte_carlo_summary.iloc[0]
+        report.append("\n---\n")
+        report.append("## Monte Carlo Weight Robustness\n\n")
+        report.append(f"{int(first['n_draws']):,} random weight vectors ({first['method']}), "
+                      f"each compared with the configured weights.\n\n")
+        report.extend(_monte_carlo_table(monte_carlo_summary))
+
     report.append("\n---\n")
     report.append("*Report generated by JAVELIN.AI Validation Engine*\n")
 
@@ -548,13 +1271,14 @@ def generate_validation_report(kfold_results, sensitivity_results=None, output_p
     return report_text
 
 
-def generate_methodology_document(kfold_results, sensitivity_results=None, output_path=None):
+def generate_methodology_document(kfold_results, sensitivity_results=None, output_path=None, monte_carlo_summary=None):
     threshold = kfold_results['threshold_stability']
     category = kfold_results['category_agreement']
     sae = kfold_results['sae_capture']
     fold_details = kfold_results['fold_details']
     n_subjects = kfold_results['n_subjects']
     n_folds = kfold_results['n_folds']
+    n_repeats = kfold_results.get('n_repeats', 1)
 
     doc = []
     doc.append("# JAVELIN.AI - Model Validation Methodology\n\n")
@@ -563,10 +1287,14 @@ def generate_methodology_document(kfold_results, sensitivity_results=None, outpu
     doc.append("---\n\n")
 
     doc.append("## Executive Summary\n\n")
-    doc.append(f"This document describes the validation approach for the JAVELIN.AI DQI scoring system. ")
+    doc.append("This document describes the validation approach for the JAVELIN.AI DQI scoring system. ")
     doc.append(
         f"Since no explicit test dataset was provided, we employed **{n_folds}-fold stratified cross-validation**. ")
     doc.append("This is more robust than a single train-test split.\n\n")
+    if n_repeats > 1:
+        doc.append(f"The split was repeated **{n_repeats} times** with different seeds "
+                   f"({n_repeats * n_folds} folds); fold metrics below cover every repeat, "
+                   f"test predictions come from the first.\n\n")
 
     doc.append("---\n\n")
     doc.append("## 1. Why K-Fold Cross-Validation?\n\n")
@@ -593,7 +1321,8 @@ def generate_methodology_document(kfold_results, sensitivity_results=None, outpu
     doc.append("### Threshold Per Fold\n\n")
     doc.append("```\n")
     for fd in fold_details:
-        doc.append(f"Fold {fd['fold']}: {fd['threshold']:.4f}\n")
+        fold = f"{fd['repeat']}.{fd['fold']}" if n_repeats > 1 else fd['fold']
+        doc.append(f"Fold {fold}: {fd['threshold']:.4f}\n")
     doc.append(f"\nMean: {threshold['mean']:.4f}, Std: {threshold['std']:.4f}, CV: {threshold['cv']:.2%}\n")
     doc.append("```\n\n")
 
@@ -625,6 +1354,16 @@ def generate_methodology_document(kfold_results, sensitivity_results=None, outpu
             doc.append(f"| {row['scenario']} | {row['shift_pct']:.2f}% | {row['sae_capture_pct']:.0f}% |\n")
         doc.append("\n")
 
+    if monte_carlo_summary is not None and not monte_carlo_summary.empty:
+        first = monte_carlo_summary.iloc[0]
+        doc.append("---\n\n")
+        doc.append("## 6. Monte Carlo Weight Robustness\n\n")
+        doc.append(f"Beyond the hand-picked scenarios, {int(first['n_draws']):,} weight vectors were drawn at random "
+                   f"({first['method']}) around the configured weights. Each draw re-derives the High threshold "
+                   f"and is compared with the configured weights. The bands below are percentiles over all draws.\n\n")
+        doc.extend(_monte_carlo_table(monte_carlo_summary))
+        doc.append("\n")
+
     doc.append("---\n\n")
     doc.append("## Conclusion\n\n")
     doc.append("**DQI METHODOLOGY VALIDATED**\n\n")
@@ -651,7 +1390,27 @@ def main():
     parser.add_argument('--folds', type=int, default=5)
     parser.add_argument('--include-sensitivity', action='store_true')
     parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=1,
+                        help='Repeat k-fold with this many seeds (seed, seed+1, ...)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes for the folds (default: 1 = serial, 0 = all CPUs)')
+    parser.add_argument('--monte-carlo', type=int, default=0, metavar='N',
+                        help='Score N random weight vectors for robustness percentile bands (default: off)')
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='B',
+                        help='Bootstrap B replicates for threshold and site DQI/rank CIs (default: off; uses --jobs)')
+    parser.add_argument('--cluster-bootstrap', type=int, default=0, metavar='B',
+                        help='Refit the phase 08 clusters on B bootstrap resamples of sites '
+                             '(default: refit on each site fold)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Recompute everything instead of reusing cached results')
+    parser.add_argument('--mc-method', choices=['dirichlet', 'perturb'], default=None,
+                        help="Weight draws: 'dirichlet' around the weights or bounded 'perturb' "
+                             "(default: MONTE_CARLO_SENSITIVITY['method'])")
     args = parser.parse_args()
+    if args.folds < 2 or args.repeats < 1 or min(args.jobs, args.monte_carlo, args.bootstrap,
+                                                               args.cluster_bootstrap) < 0:
+        parser.error("--folds must be at least 2, --repeats at least 1, --jobs, --monte-carlo, --bootstrap and "
+                     "--cluster-bootstrap non-negative")
 
     print("=" * 70)
     print("JAVELIN.AI - DQI K-FOLD CROSS-VALIDATION")
@@ -665,22 +1424,31 @@ def main():
     print("STEP 1: LOAD DATA")
     print("=" * 70)
 
-    if not SUBJECT_PATH.exists():
+    if not table_exists(SUBJECT_PATH):
         print(f"\nERROR: {SUBJECT_PATH} not found!")
         return False
 
-    df = pd.read_csv(SUBJECT_PATH)
+    df = read_table(SUBJECT_PATH)
     print(f"\n[OK] Loaded {len(df):,} subjects from {SUBJECT_PATH.name}")
 
-    site_df = pd.read_csv(SITE_PATH) if SITE_PATH.exists() else None
+    cache = ResultCache('validation', enabled=False if args.no_cache else None)
+    table_key = frame_digest(df)
+    if cache.enabled:
+        print(f"[OK] Result cache: {cache.dir} (table {table_key[:12]})")
+
+    site_df = read_table(SITE_PATH) if table_exists(SITE_PATH) else None
     if site_df is not None:
         print(f"[OK] Loaded {len(site_df):,} sites from {SITE_PATH.name}")
 
-    cluster_df = pd.read_csv(CLUSTER_PATH) if CLUSTER_PATH.exists() else None
+    cluster_df = read_table(CLUSTER_PATH) if table_exists(CLUSTER_PATH) else None
+    cluster_summary = None
     if cluster_df is not None:
         print(f"[OK] Loaded cluster data from {CLUSTER_PATH.name}")
+        if CLUSTER_SUMMARY_PATH.exists():
+            with open(CLUSTER_SUMMARY_PATH) as f:
+                cluster_summary = json.load(f)
 
-    print(f"\nOriginal Risk Distribution:")
+    print("\nOriginal Risk Distribution:")
     for cat in ['High', 'Medium', 'Low']:
         count = (df['risk_category']==cat).sum()
         print(f"  {cat:<8}: {count:>6,} ({count / len(df) * 100:>5.1f}%)")
@@ -690,9 +1458,10 @@ def main():
     print("STEP 2: K-FOLD CROSS-VALIDATION")
     print("=" * 70)
 
-    kfold_results, predictions_df = run_kfold_validation(
-        df=df, site_df=site_df, cluster_df=cluster_df,
-        n_folds=args.folds, random_state=args.seed
+    kfold_results, predictions_df = cached_kfold_validation(
+        cache, table_key, df=df, site_df=site_df, cluster_df=cluster_df,
+        n_folds=args.folds, random_state=args.seed, n_repeats=args.repeats, jobs=args.jobs,
+        cluster_summary=cluster_summary, cluster_bootstrap=args.cluster_bootstrap
     )
 
     # Sensitivity Analysis
@@ -701,10 +1470,43 @@ def main():
         print("\n" + "=" * 70)
         print("STEP 3: WEIGHT SENSITIVITY ANALYSIS")
         print("=" * 70)
-        sensitivity_results = run_sensitivity_analysis(df, WEIGHT_VALUES)
+        sensitivity_results = cached_sensitivity_analysis(cache, table_key, df, WEIGHT_VALUES)
         print("\nSensitivity Analysis Results:")
         print(sensitivity_results.to_string(index=False))
 
+    # Monte Carlo weight robustness
+    mc_draws, mc_summary = None, None
+    if args.monte_carlo:
+        print("\n" + "=" * 70)
+        print("STEP 3b: MONTE CARLO WEIGHT ROBUSTNESS")
+        print("=" * 70)
+        key = cache.key('monte_carlo', VALIDATION_CACHE_VERSION, table_key, WEIGHT_VALUES, args.monte_carlo,
+                        args.mc_method, MONTE_CARLO_SENSITIVITY)
+        frames = cached_frames(cache, key, "Monte Carlo draws", lambda:dict(zip(
+            ['draws', 'summary'], run_monte_carlo_sensitivity(df, WEIGHT_VALUES, args.monte_carlo,
+                                                              method=args.mc_method))))
+        mc_draws, mc_summary = frames['draws'], frames['summary']
+        print(f"\n{args.monte_carlo:,} draws ({mc_summary['method'].iloc[0]}), percentile bands:")
+        print(mc_summary.drop(columns=['method', 'n_draws']).to_string(index=False))
+
+    # Bootstrap confidence intervals
+    bootstrap_ci = None
+    if args.bootstrap:
+        print("\n" + "=" * 70)
+        print("STEP 3c: BOOTSTRAP CONFIDENCE INTERVALS")
+        print("=" * 70)
+        print(f"\n{args.bootstrap:,} replicates (subjects resampled within sites)")
+        key = cache.key('bootstrap', VALIDATION_CACHE_VERSION, table_key, args.bootstrap, args.seed, BOOTSTRAP)
+        bootstrap_ci = cached_frames(cache, key, "Bootstrap replicates", lambda:{
+            'ci':run_bootstrap_ci(df, n_boot=args.bootstrap, seed=args.seed, jobs=args.jobs)})['ci']
+        kfold_results['bootstrap'] = bootstrap_summary(bootstrap_ci)
+        summary = kfold_results['bootstrap']
+        print(f"  High threshold: {summary['threshold']:.4f} "
+              f"[{summary['threshold_ci_low']:.4f}, {summary['threshold_ci_high']:.4f}] "
+              f"({summary['confidence']:.0%} CI)")
+        print(f"  Median site DQI CI width: {summary['median_site_ci_width']:.4f}")
+        print(f"  Median site rank CI width: {summary['median_rank_ci_width']:.1f} positions")
+
     # Save Outputs
     print("\n" + "=" * 70)
     print("STEP 4: SAVE OUTPUTS")
@@ -713,21 +1515,31 @@ def main():
     # 1. Fold results CSV
     fold_df = pd.DataFrame(kfold_results['fold_details'])
     fold_df.to_csv(VALIDATION_DIR / "kfold_validation_results.csv", index=False)
-    print(f"\n[OK] Saved: kfold_validation_results.csv")
+    print("\n[OK] Saved: kfold_validation_results.csv")
 
     # 2. Full results JSON
     with open(VALIDATION_DIR / "kfold_validation_details.json", 'w') as f:
         json.dump(kfold_results, f, indent=2, default=str)
-    print(f"[OK] Saved: kfold_validation_details.json")
+    print("[OK] Saved: kfold_validation_details.json")
 
     # 3. Sensitivity results
     if sensitivity_results is not None:
         sensitivity_results.to_csv(VALIDATION_DIR / "sensitivity_analysis_results.csv", index=False)
-        print(f"[OK] Saved: sensitivity_analysis_results.csv")
+        print("[OK] Saved: sensitivity_analysis_results.csv")
+
+    if bootstrap_ci is not None:
+        bootstrap_ci.to_csv(VALIDATION_DIR / "bootstrap_ci.csv", index=False)
+        print("[OK] Saved: bootstrap_ci.csv")
+
+    if mc_summary is not None:
+        mc_draws.to_csv(VALIDATION_DIR / "monte_carlo_sensitivity_draws.csv", index=False)
+        mc_summary.to_csv(VALIDATION_DIR / "monte_carlo_sensitivity_summary.csv", index=False)
+        print("[OK] Saved: monte_carlo_sensitivity_draws.csv, monte_carlo_sensitivity_summary.csv")
 
     # 4. Validation report
-    generate_validation_report(kfold_results, sensitivity_results, VALIDATION_DIR / "kfold_validation_report.md")
-    print(f"[OK] Saved: kfold_validation_report.md")
+    generate_validation_report(kfold_results, sensitivity_results, VALIDATION_DIR / "kfold_validation_report.md",
+                               monte_carlo_summary=mc_summary)
+    print("[OK] Saved: kfold_validation_report.md")
 
     # 5. Test predictions
     output_cols = ['study', 'subject_id', 'site_id', 'country', 'region',
@@ -738,11 +1550,12 @@ def main():
     output_df['prediction_correct'] = (output_df['risk_category']==output_df['risk_category_pred']).astype(int)
     output_df = output_df.sort_values(['study', 'subject_id']).reset_index(drop=True)
     output_df.to_csv(VALIDATION_DIR / "test_predictions.csv", index=False)
-    print(f"[OK] Saved: test_predictions.csv")
+    print("[OK] Saved: test_predictions.csv")
 
     # 6. Methodology document
-    generate_methodology_document(kfold_results, sensitivity_results, VALIDATION_DIR / "VALIDATION_METHODOLOGY.md")
-    print(f"[OK] Saved: VALIDATION_METHODOLOGY.md")
+    generate_methodology_document(kfold_results, sensitivity_results, VALIDATION_DIR / "VALIDATION_METHODOLOGY.md",
+                                  monte_carlo_summary=mc_summary)
+    print("[OK] Saved: VALIDATION_METHODOLOGY.md")
 
     # Summary
     print("\n" + "=" * 70)
@@ -761,9 +1574,12 @@ def main():
 | Threshold Stability (CV)      | {threshold['cv']:>8.2%}          | {'PASS' if threshold['cv'] < 0.10 else 'REVIEW':>17} |
 | Category Agreement            | {category['agreement_rate']:>8.1%}          | {'PASS' if category['agreement_rate'] > 0.90 else 'REVIEW':>17} |
 | Ranking Correlation           | {ranking['mean_correlation']:>8.4f}          | {'PASS' if ranking['mean_correlation'] > 0.95 else 'REVIEW':>17} |
-| SAE Capture (100% all folds)  | {sae['mean']:>8.1%}          | {'PASS' if sae['all_100_pct'] else 'FAIL':>17} |
-+-----------------------------------------------------------------------+
-""")
+| SAE Capture (100% all folds)  | {sae['mean']:>8.1%}          | {'PASS' if sae['all_100_pct'] else 'FAIL':>17} |""")
+    cluster = kfold_results['cluster_stability']
+    if cluster.get('stability') is not None:
+        print(f"| Cluster Stability (ARI)       | {cluster['ari_mean']:>8.4f}          | "
+              f"{'PASS' if cluster['ari_mean'] > 0.80 else 'REVIEW':>17} |")
+    print("+-----------------------------------------------------------------------+\n")
 
     all_pass = (threshold['cv'] < 0.10 and category['agreement_rate'] > 0.90 and
                 ranking['mean_correlation'] > 0.95 and sae['all_100_pct'])
@@ -784,6 +1600,10 @@ def main():
 5. VALIDATION_METHODOLOGY.md      - Methodology document""")
     if sensitivity_results is not None:
         print("6. sensitivity_analysis_results.csv - Weight perturbation results")
+    if mc_summary is not None:
+        print("7. monte_carlo_sensitivity_*.csv    - Monte Carlo draws and percentile bands")
+    if bootstrap_ci is not None:
+        print("8. bootstrap_ci.csv                 - Bootstrap CIs (threshold, site DQI, site rank)")
 
     return True
 
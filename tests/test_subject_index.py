@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from utils.subject_index import normalize_subject_id, normalize_subject_ids
+
+
+CASES = [
+    ('Subject 0101', '101'),
+    ('SUBJ-101', '101'),
+    ('PT_7', '7'),
+    (' 101 ', '101'),
+    (101, '101'),
+    (101.0, '101'),
+    ('101.0', '101'),
+    ('Subject 101.00', '101'),
+    ('000', '0'),
+    (0, '0'),
+    ('PATHWAY-3', 'PATHWAY-3'),
+    ('SUBSTUDY1', 'SUBSTUDY1'),
+    ('PATIENT-A1', 'PATIENT-A1'),
+    ('101.5', '101.5'),
+    ('Patient', None),
+    ('PT', None),
+    ('Subject - ', None),
+    ('', None),
+    (None, None),
+    (float('nan'), None),
+]
+
+
+@pytest.mark.parametrize('raw, expected', CASES)
+def test_normalize_subject_id(raw, expected):
+    assert normalize_subject_id(raw) == expected
+
+
+def test_vectorized_matches_scalar():
+    raw = pd.Series([value for value, _ in CASES], dtype=object)
+    keys = normalize_subject_ids(raw)
+    assert keys.tolist() == [expected for _, expected in CASES]
+
+
+def test_bare_prefixes_do_not_collide_with_subject_zero():
+    keys = normalize_subject_ids(pd.Series(['Patient', 'PT', '0'], dtype=object))
+    assert keys.tolist() == [None, None, '0']
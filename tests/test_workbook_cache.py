@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from utils.workbook_cache import read_workbook_cached
+
+
+def _frame():
+    return pd.DataFrame({
+        'Subject': ['Subject 1', 'Subject 2', np.nan],
+        'Visits': pd.Series([1, 2, 3], dtype=object),
+        'Mixed': pd.Series([101, 'n/a', 2.5], dtype=object),
+        'Visit Date': pd.Series([datetime(2024, 1, 5), np.nan, datetime(2024, 2, 1)], dtype=object),
+        'Flag': pd.Series([True, False, None], dtype=object),
+        'Days': [1.5, np.nan, 3.0],
+        'Count': [1, 2, 3],
+    }).set_axis([3, 7, 9])
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    monkeypatch.delenv('JAVELIN_NO_CACHE', raising=False)
+    monkeypatch.setattr('utils.workbook_cache._cache_dir', lambda: tmp_path / "cache")
+    path = tmp_path / "Study.xlsx"
+    path.write_bytes(b'not really a workbook')
+    return path
+
+
+def test_cached_read_matches_loader(workbook):
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        return _frame()
+
+    miss = read_workbook_cached(workbook, 'edc_metrics', loader, 'test.loader')
+    hit = read_workbook_cached(workbook, 'edc_metrics', loader, 'test.loader')
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(miss, _frame())
+    pd.testing.assert_frame_equal(hit, _frame())
+    assert [type(v) for v in hit['Mixed']] == [int, str, float]
+    assert type(hit['Visits'].iloc[0]) is int
+
+
+def test_non_string_and_duplicate_labels_round_trip(workbook):
+    frame = pd.DataFrame([[1, 'a', 2]], columns=[0, 'Site', 'Site'])
+    read_workbook_cached(workbook, 'sae', lambda p: frame, 'test.loader')
+    hit = read_workbook_cached(workbook, 'sae', lambda p: frame, 'test.loader')
+    pd.testing.assert_frame_equal(hit, frame)